@@ -0,0 +1,128 @@
+"""
+Benchmark the set cover engine against the previous set-based greedy loop.
+
+By default it runs on the country catalogue shipped with the add-on
+(repo/plugin_video_mubi/resources/data/country_catalogue.json: every film id
+and the countries it is available in), i.e. the real catalogue size; a
+films.json can be given instead. Both implementations must pick the same
+countries; the script exits with status 1 if they do not.
+
+    python backend/benchmark_set_cover.py [--catalogue PATH | --films PATH] [--repeat N]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Set
+
+try:
+    from backend.set_cover import BitsetIndex, greedy_cover
+except ImportError:
+    from set_cover import BitsetIndex, greedy_cover
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOGUE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'repo', 'plugin_video_mubi',
+                                 'resources', 'data', 'country_catalogue.json')
+
+
+def load_subsets(catalogue: str = None, films: str = None) -> Dict[str, Set[int]]:
+    """
+    :return: {country code: set of film ids}, countries in sorted order.
+    """
+    subsets: Dict[str, Set[int]] = {}
+    if films:
+        with open(films, 'r', encoding='utf-8') as f:
+            pairs = [(film['mubi_id'], (film.get('available_countries') or {}).keys())
+                     for film in json.load(f).get('items', [])]
+    else:
+        with open(catalogue or DEFAULT_CATALOGUE, 'r', encoding='utf-8') as f:
+            pairs = [(int(film_id), countries) for film_id, countries in json.load(f)['films'].items()]
+    for film_id, countries in pairs:
+        for country in countries:
+            subsets.setdefault(country.upper(), set()).add(film_id)
+    return dict(sorted(subsets.items()))
+
+
+def legacy_greedy(subsets: Dict[str, Set[int]], universe: Iterable[int]) -> List[str]:
+    """
+    The loop the scraper used before set_cover: recompute every country's gain each round.
+    """
+    universe = set(universe)
+    selected: List[str] = []
+    covered: Set[int] = set()
+    while len(covered) < len(universe):
+        best_country, best_gain = None, 0
+        remaining = universe - covered
+        for country, films in subsets.items():
+            if country in selected:
+                continue
+            gain = len(films.intersection(remaining))
+            if gain > best_gain:
+                best_country, best_gain = country, gain
+        if best_country is None:
+            break
+        selected.append(best_country)
+        covered.update(subsets[best_country])
+    return selected
+
+
+def _best_of(repeat: int, function, *args):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(subsets: Dict[str, Set[int]], repeat: int = 5) -> Dict[str, float]:
+    """
+    :return: Best-of-repeat timings in seconds and the size of the cover.
+    """
+    universe = set().union(*subsets.values()) if subsets else set()
+
+    legacy_time, legacy = _best_of(repeat, legacy_greedy, subsets, universe)
+    build_time, index = _best_of(repeat, BitsetIndex, subsets, universe)
+    cover_time, result = _best_of(repeat, greedy_cover, index)
+    total_time, _ = _best_of(repeat, greedy_cover, subsets, universe)
+
+    if result.selected != legacy:
+        raise AssertionError(f"Selections differ: {result.selected} != {legacy}")
+
+    return {
+        'films': len(universe),
+        'countries': len(subsets),
+        'selected': len(legacy),
+        'legacy_seconds': legacy_time,
+        'index_seconds': build_time,
+        'cover_seconds': cover_time,
+        'total_seconds': total_time,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the lazy-greedy set cover engine")
+    parser.add_argument('--catalogue', default=None, help="country_catalogue.json (defaults to the add-on's copy)")
+    parser.add_argument('--films', default=None, help="films.json to use instead of a country catalogue")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (best time is kept)")
+
+    args = parser.parse_args()
+    try:
+        stats = run_benchmark(load_subsets(args.catalogue, args.films), args.repeat)
+    except AssertionError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    logger.info(f"{stats['films']} films, {stats['countries']} countries, {stats['selected']} selected")
+    logger.info(f"Set-based greedy:        {stats['legacy_seconds'] * 1000:8.2f} ms")
+    logger.info(f"Bitset index build:      {stats['index_seconds'] * 1000:8.2f} ms")
+    logger.info(f"Lazy-greedy cover:       {stats['cover_seconds'] * 1000:8.2f} ms "
+                f"({stats['legacy_seconds'] / stats['cover_seconds']:.1f}x)")
+    logger.info(f"Build + cover:           {stats['total_seconds'] * 1000:8.2f} ms "
+                f"({stats['legacy_seconds'] / stats['total_seconds']:.1f}x)")
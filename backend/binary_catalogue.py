@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped reader for the binary film catalogue (films.bin).
+
+generate_binary.py (whose docstring describes the layout) publishes the
+columns consumers filter and sort on as fixed-width little-endian arrays.
+This reader maps the file and exposes each column as a zero-copy
+memoryview, so scanning, filtering and sorting thousands of films touches
+only the columns involved; strings are decoded on access.
+
+generate_binary validates every file it writes with this reader. The
+add-on does not read films.bin yet; its availability rules are mirrored in
+BinaryCatalogue._window.
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Must match plugin_video_mubi.resources.lib.availability
+OPEN_START = -(2 ** 62)
+OPEN_END = 2 ** 62
+NEVER = (OPEN_END, OPEN_START)
+ALWAYS = (OPEN_START, OPEN_END)
+
+# Must match generate_binary.py
+MAGIC = b'MUBICAT1'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<IIIII')
+SECTION_ENTRY = struct.Struct('<QQ')
+MISSING = -(2 ** 63)
+INVALID = MISSING + 1
+FLAG_LIVE = 1
+
+SECTIONS = (
+    ('ids', 'I'),
+    ('years', 'H'),
+    ('durations', 'H'),
+    ('ratings', 'f'),
+    ('bayesian', 'f'),
+    ('popularity', 'I'),
+    ('titles', 'I'),
+    ('synopses', 'I'),
+    ('window_offsets', 'I'),
+    ('window_films', 'I'),
+    ('window_countries', 'H'),
+    ('window_flags', 'H'),
+    ('window_available_at', 'q'),
+    ('window_expires_at', 'q'),
+    ('window_ends_at', 'q'),
+    ('string_offsets', 'I'),
+    ('countries', None),
+    ('strings', None),
+    ('meta', None),
+)
+
+
+class BinaryCatalogue:
+    """
+    Read-only view of a films.bin file.
+
+    Columns (ids, years, durations, ratings, bayesian, popularity, ...) are
+    indexed by film position; films are sorted by mubi_id.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        :param path: Path of the films.bin file.
+        :raises ValueError: If the file is not a supported binary catalogue.
+        :raises OSError: If the file cannot be read.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{self.path} is not a binary catalogue")
+        self._views: List[memoryview] = []
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        data = memoryview(self._map)
+        self._views.append(data)
+        header_end = len(MAGIC) + HEADER.size
+        if bytes(data[:len(MAGIC)]) != MAGIC or len(data) < header_end + SECTION_ENTRY.size * len(SECTIONS):
+            raise ValueError(f"{self.path} is not a binary catalogue")
+        version, self.film_count, self.window_count, country_count, self.string_count = \
+            HEADER.unpack_from(data, len(MAGIC))
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary catalogue version {version}")
+
+        sections = {}
+        for i, (name, code) in enumerate(SECTIONS):
+            offset, length = SECTION_ENTRY.unpack_from(data, header_end + i * SECTION_ENTRY.size)
+            if offset + length > len(data):
+                raise ValueError(f"Truncated binary catalogue: section {name} out of bounds")
+            section = data[offset:offset + length]
+            self._views.append(section)
+            if code:
+                section = self._column(section, code)
+            sections[name] = section
+
+        expected = {
+            'ids': self.film_count, 'window_offsets': self.film_count + 1,
+            'window_films': self.window_count, 'string_offsets': self.string_count + 1,
+        }
+        for name, count in expected.items():
+            if len(sections[name]) != count:
+                raise ValueError(f"Corrupt binary catalogue: {name} holds {len(sections[name])} entries, expected {count}")
+
+        self.ids = sections['ids']
+        self.years = sections['years']
+        self.durations = sections['durations']
+        self.ratings = sections['ratings']
+        self.bayesian = sections['bayesian']
+        self.popularity = sections['popularity']
+        self.window_offsets = sections['window_offsets']
+        self._titles = sections['titles']
+        self._synopses = sections['synopses']
+        self._window_films = sections['window_films']
+        self._window_countries = sections['window_countries']
+        self._window_flags = sections['window_flags']
+        self._available_at = sections['window_available_at']
+        self._expires_at = sections['window_expires_at']
+        self._ends_at = sections['window_ends_at']
+        self._string_offsets = sections['string_offsets']
+        self._strings = sections['strings']
+
+        codes = bytes(sections['countries']).decode('ascii')
+        self.countries = [codes[i:i + 2] for i in range(0, 2 * country_count, 2)]
+        self._country_ids = {code: i for i, code in enumerate(self.countries)}
+        self.meta: Dict[str, Any] = json.loads(bytes(sections['meta']).decode('utf-8') or '{}')
+
+    def _column(self, section: memoryview, code: str):
+        if sys.byteorder == 'little':
+            column = section.cast(code)
+            self._views.append(column)
+            return column
+        # Big-endian hosts get a byte-swapped copy instead of a view
+        column = array(code, bytes(section))
+        column.byteswap()
+        return column
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if getattr(self, '_map', None) is not None and not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryCatalogue':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.film_count
+
+    def _string(self, string_id: int) -> str:
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._strings[start:end]).decode('utf-8')
+
+    def title(self, position: int) -> str:
+        return self._string(self._titles[position])
+
+    def synopsis(self, position: int) -> str:
+        return self._string(self._synopses[position])
+
+    def position(self, mubi_id: int) -> Optional[int]:
+        """
+        :return: Position of the film with this mubi_id, or None if it is not in the catalogue.
+        """
+        position = bisect.bisect_left(self.ids, mubi_id)
+        if position < self.film_count and self.ids[position] == mubi_id:
+            return position
+        return None
+
+    def _window(self, row: int, rule: str):
+        """
+        Window of an availability row: MISSING stands for an absent date, INVALID for an unparseable one.
+        """
+        available_at, expires_at, ends_at = self._available_at[row], self._expires_at[row], self._ends_at[row]
+        if rule == 'playable':
+            # Same as availability.playable_window
+            if available_at in (MISSING, INVALID) or ends_at == INVALID:
+                return NEVER
+            return available_at, OPEN_END if ends_at == MISSING else ends_at
+        # Same as availability.catalogue_window: unparseable dates fall back to the status
+        if (available_at != MISSING or expires_at != MISSING) and INVALID not in (available_at, expires_at):
+            return (OPEN_START if available_at == MISSING else available_at,
+                    OPEN_END if expires_at == MISSING else expires_at)
+        return ALWAYS if self._window_flags[row] & FLAG_LIVE else NEVER
+
+    def live_mask(self, countries: Iterable[str] = None, at: int = None, rule: str = 'catalogue') -> bytearray:
+        """
+        :param countries: Upper-case codes to consider (defaults to all).
+        :param at: Epoch seconds to check (defaults to now).
+        :param rule: 'catalogue' or 'playable', as in the availability module.
+        :return: One byte per film, 1 if it is live in any of the countries.
+        """
+        at = int(time.time()) if at is None else at
+        mask = bytearray(self.film_count)
+        wanted = None
+        if countries is not None:
+            wanted = {self._country_ids[c.upper()] for c in countries if c.upper() in self._country_ids}
+            if not wanted:
+                return mask
+        window_countries = self._window_countries
+        window_films = self._window_films
+        for row in range(self.window_count):
+            if wanted is not None and window_countries[row] not in wanted:
+                continue
+            start, end = self._window(row, rule)
+            if start <= at <= end:
+                mask[window_films[row]] = 1
+        return mask
+
+    def film(self, position: int) -> Dict[str, Any]:
+        """
+        Materialise one film's columns as a dict (for display or debugging).
+        """
+        countries = {}
+        for row in range(self.window_offsets[position], self.window_offsets[position + 1]):
+            details = {'availability': 'live' if self._window_flags[row] & FLAG_LIVE else None}
+            for field, column in (('available_at', self._available_at), ('expires_at', self._expires_at),
+                                  ('availability_ends_at', self._ends_at)):
+                details[field] = None if column[row] in (MISSING, INVALID) else column[row]
+            countries[self.countries[self._window_countries[row]]] = details
+        rating = self.ratings[position]
+        bayesian = self.bayesian[position]
+        return {
+            'mubi_id': self.ids[position],
+            'title': self.title(position),
+            'short_synopsis': self.synopsis(position) or None,
+            'year': self.years[position] or None,
+            'duration': self.durations[position] or None,
+            'average_rating_out_of_ten': None if rating != rating else rating,
+            'bayesian_rating': None if bayesian != bayesian else bayesian,
+            'popularity': self.popularity[position] or None,
+            'available_countries': countries,
+        }
@@ -0,0 +1,245 @@
+"""
+Write the film database as a compact, column-oriented binary file.
+
+films.bin holds the fields consumers filter and sort on as fixed-width
+little-endian columns, so readers can memory-map it and scan thousands of
+films without building a dict per film. Layout:
+
+    header   b'MUBICAT1', then <IIIII: version, film_count, window_count,
+             country_count, string_count, then one <QQ (offset, length)
+             per section in SECTIONS order
+    sections each starting on an 8-byte boundary
+
+Films are sorted by mubi_id. Per film: ids (u32), years and durations (u16,
+0 when unknown), ratings and bayesian (f32, NaN when unknown), popularity
+(u32), titles and synopses (u32 ids into the string table; 0 is the empty
+string) and window_offsets (u32, film_count + 1 entries) delimiting its rows
+in the window columns. Per availability window: window_films (u32 film
+position), window_countries (u16 index into countries, two ASCII bytes per
+code), window_flags (u16, bit 0 = status 'live') and the available_at,
+expires_at and availability_ends_at timestamps (i64 epoch seconds,
+MISSING when absent, INVALID when present but unparseable: the add-on's
+availability rules treat the two differently). string_offsets (u32,
+string_count + 1 entries) index the UTF-8 strings blob. meta is the
+release's meta object as JSON.
+
+The reader is binary_catalogue.BinaryCatalogue; every written file is
+opened with it before the checksum is published.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+import dateutil.parser
+
+try:
+    from backend.binary_catalogue import BinaryCatalogue
+except ImportError:
+    from binary_catalogue import BinaryCatalogue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MUBICAT1'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<IIIII')
+SECTION_ENTRY = struct.Struct('<QQ')
+MISSING = -(2 ** 63)
+INVALID = MISSING + 1
+FLAG_LIVE = 1
+
+# (name, array typecode or None for raw bytes)
+SECTIONS = (
+    ('ids', 'I'),
+    ('years', 'H'),
+    ('durations', 'H'),
+    ('ratings', 'f'),
+    ('bayesian', 'f'),
+    ('popularity', 'I'),
+    ('titles', 'I'),
+    ('synopses', 'I'),
+    ('window_offsets', 'I'),
+    ('window_films', 'I'),
+    ('window_countries', 'H'),
+    ('window_flags', 'H'),
+    ('window_available_at', 'q'),
+    ('window_expires_at', 'q'),
+    ('window_ends_at', 'q'),
+    ('string_offsets', 'I'),
+    ('countries', None),
+    ('strings', None),
+    ('meta', None),
+)
+
+
+def _to_epoch(value: Optional[str]) -> int:
+    """
+    Must parse like plugin_video_mubi.resources.lib.availability.to_epoch.
+
+    :return: Epoch seconds, MISSING for an empty value or INVALID for an unparseable one.
+    """
+    if not value:
+        return MISSING
+    if not isinstance(value, str):
+        return INVALID
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = dateutil.parser.parse(value)
+        except (ValueError, OverflowError, TypeError):
+            return INVALID
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _uint(value: Any, limit: int) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= limit else 0
+
+
+def _float(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def _bayesian(film: Dict[str, Any]) -> float:
+    for rating in film.get('ratings') or []:
+        if isinstance(rating, dict) and rating.get('source') == 'bayesian':
+            return _float(rating.get('score_over_10'))
+    return math.nan
+
+
+class _StringTable:
+    """UTF-8 strings stored once each; id 0 is the empty string."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {'': 0}
+        self.offsets = array('I', [0, 0])
+        self.blob = bytearray()
+
+    def add(self, value: Optional[str]) -> int:
+        if not value or not isinstance(value, str):
+            return 0
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.ids)
+            self.blob += value.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def build_catalogue(data: Dict[str, Any]) -> bytes:
+    """
+    :param data: Parsed films.json.
+    :return: The binary catalogue.
+    """
+    films = [f for f in data.get('items', []) if isinstance(f.get('mubi_id'), int)]
+    films.sort(key=lambda f: f['mubi_id'])
+
+    columns = {name: array(code) for name, code in SECTIONS if code}
+    strings = _StringTable()
+    country_ids: Dict[str, int] = {}
+    columns['window_offsets'].append(0)
+
+    for position, film in enumerate(films):
+        columns['ids'].append(_uint(film['mubi_id'], 0xFFFFFFFF))
+        columns['years'].append(_uint(film.get('year'), 0xFFFF))
+        columns['durations'].append(_uint(film.get('duration'), 0xFFFF))
+        columns['ratings'].append(_float(film.get('average_rating_out_of_ten')))
+        columns['bayesian'].append(_bayesian(film))
+        columns['popularity'].append(_uint(film.get('popularity'), 0xFFFFFFFF))
+        columns['titles'].append(strings.add(film.get('title')))
+        columns['synopses'].append(strings.add(film.get('short_synopsis')))
+
+        for code, details in sorted((film.get('available_countries') or {}).items()):
+            if not isinstance(details, dict):
+                continue
+            code = code.upper()
+            if code not in country_ids:
+                country_ids[code] = len(country_ids)
+            columns['window_films'].append(position)
+            columns['window_countries'].append(country_ids[code])
+            columns['window_flags'].append(FLAG_LIVE if details.get('availability') == 'live' else 0)
+            columns['window_available_at'].append(_to_epoch(details.get('available_at')))
+            columns['window_expires_at'].append(_to_epoch(details.get('expires_at')))
+            columns['window_ends_at'].append(_to_epoch(details.get('availability_ends_at')))
+        columns['window_offsets'].append(len(columns['window_films']))
+
+    sections: List[bytes] = []
+    for name, code in SECTIONS:
+        if code:
+            column = columns[name] if name != 'string_offsets' else strings.offsets
+            if sys.byteorder != 'little':
+                column = array(code, column)
+                column.byteswap()
+            sections.append(column.tobytes())
+        elif name == 'countries':
+            sections.append(''.join(country_ids).encode('ascii'))
+        elif name == 'strings':
+            sections.append(bytes(strings.blob))
+        else:
+            sections.append(json.dumps(data.get('meta', {}), sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+    header_size = len(MAGIC) + HEADER.size + SECTION_ENTRY.size * len(SECTIONS)
+    directory = []
+    body = bytearray()
+    offset = header_size + (-header_size % 8)
+    for section in sections:
+        directory.append(SECTION_ENTRY.pack(offset + len(body), len(section)))
+        body += section
+        body += b'\0' * (-len(body) % 8)
+
+    header = MAGIC + HEADER.pack(FORMAT_VERSION, len(films), len(columns['window_films']),
+                                 len(country_ids), len(strings.offsets) - 1)
+    header += b''.join(directory)
+    header += b'\0' * (-len(header) % 8)
+    return header + bytes(body)
+
+
+def generate_binary(input_file: str = 'films.json', output_file: str = None) -> Optional[str]:
+    """
+    Write films.bin and films.bin.md5 next to the input file.
+
+    :param input_file: films.json of the current release.
+    :param output_file: Path to write (defaults to films.bin in the input's directory).
+    :return: MD5 of the written file, or None if the input is missing.
+    """
+    if not os.path.exists(input_file):
+        logger.error(f"Input file {input_file} not found.")
+        return None
+    output_file = output_file or os.path.join(os.path.dirname(os.path.abspath(input_file)), 'films.bin')
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    content = build_catalogue(data)
+    with open(output_file, 'wb') as f:
+        f.write(content)
+    # Fails the release (ValueError) rather than publishing a file readers reject
+    with BinaryCatalogue(output_file) as catalogue:
+        live = sum(catalogue.live_mask())
+    logger.info(f"Binary catalogue check: {live} films live now")
+
+    md5 = hashlib.md5(content).hexdigest()
+    with open(output_file + '.md5', 'w') as f:
+        f.write(md5)
+    logger.info(f"Wrote binary catalogue of {len(data.get('items', []))} films ({len(content)} bytes) to {output_file}")
+    return md5
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the binary film catalogue")
+    parser.add_argument('--file', default='films.json', help="Input films.json")
+    parser.add_argument('--output', default=None, help="Output file (defaults to films.bin next to the input)")
+
+    args = parser.parse_args()
+    generate_binary(args.file, args.output)
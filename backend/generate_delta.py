@@ -0,0 +1,225 @@
+"""
+Generate a per-film delta between two consecutive database releases.
+
+The delta lists the film records added, changed and removed (keyed by
+mubi_id) since the previous films.json.gz. Deltas from earlier releases are
+carried forward from the database branch, so a client that is a few releases
+behind can replay the chain instead of downloading the full file. The
+deltas/index.json manifest describes the chain:
+
+    {
+      "version": 1,
+      "latest": "<md5 of the current films.json.gz>",
+      "full_size": <bytes of the current films.json.gz>,
+      "deltas": [
+        {"from": "<md5>", "to": "<md5>", "file": "<from md5>.json.gz",
+         "md5": "<md5 of the delta file>", "size": <bytes>,
+         "to_digest": "<items digest after applying>",
+         "added": n, "changed": n, "removed": n},
+        ...
+      ]
+    }
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DELTA_VERSION = 1
+DELTAS_DIR = 'deltas'
+INDEX_FILE = 'index.json'
+DEFAULT_KEEP = 10
+
+
+def film_key(record: Dict[str, Any]) -> Optional[str]:
+    """
+    :return: The record's mubi_id as a string, or None if it has none.
+    """
+    key = record.get('mubi_id', record.get('id'))
+    return str(key) if key is not None else None
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """
+    Hash of a film record's canonical JSON form.
+
+    Must stay identical to plugin_video_mubi.resources.lib.database_delta.record_hash.
+    """
+    encoded = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def items_digest(items) -> str:
+    """
+    Order-independent digest of a list of film records.
+
+    Must stay identical to plugin_video_mubi.resources.lib.database_delta.items_digest.
+    """
+    hashes = sorted(record_hash(record) for record in items)
+    return hashlib.sha256('\n'.join(hashes).encode('utf-8')).hexdigest()
+
+
+def compute_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare two releases film by film.
+
+    :param previous: Parsed previous films.json.
+    :param current: Parsed current films.json.
+    :return: Dict with 'added' and 'changed' records, 'removed' mubi_ids and the
+             current top-level 'fields' (everything except 'items').
+    """
+    previous_items = {film_key(r): r for r in previous.get('items', []) if film_key(r) is not None}
+    current_items = {film_key(r): r for r in current.get('items', []) if film_key(r) is not None}
+
+    added = [current_items[k] for k in current_items if k not in previous_items]
+    changed = [
+        current_items[k] for k in current_items
+        if k in previous_items and record_hash(current_items[k]) != record_hash(previous_items[k])
+    ]
+    removed = sorted(k for k in previous_items if k not in current_items)
+
+    return {
+        'fields': {k: v for k, v in current.items() if k != 'items'},
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+    }
+
+
+def _file_md5(path: str) -> str:
+    file_hash = hashlib.md5()
+    with open(path, 'rb') as f:
+        while chunk := f.read(8192):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _read_md5(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def _load_index(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == DELTA_VERSION:
+            return index
+        logger.warning(f"Ignoring delta index with unsupported version {index.get('version')}")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable delta index {path}: {e}")
+    return {'version': DELTA_VERSION, 'deltas': []}
+
+
+def generate_delta(previous_path: str, current_path: str, history_dir: str, output_dir: str,
+                   keep: int = DEFAULT_KEEP) -> Optional[Dict[str, Any]]:
+    """
+    Write deltas/<previous md5>.json.gz and deltas/index.json into output_dir.
+
+    Run after generate_repo.py so films.json.gz(.md5) exist in output_dir.
+
+    :param previous_path: Decompressed films.json of the previous release.
+    :param current_path: films.json of the current release.
+    :param history_dir: Checkout of the previous release (holds films.json.gz.md5 and deltas/).
+    :param output_dir: Directory being deployed (holds the new films.json.gz).
+    :param keep: Number of deltas to keep in the chain.
+    :return: The new manifest, or None if no delta could be generated.
+    """
+    current_gz = os.path.join(output_dir, 'films.json.gz')
+    if not os.path.exists(current_gz):
+        logger.error(f"{current_gz} not found. Run generate_repo.py first.")
+        return None
+
+    current_md5 = _read_md5(current_gz + '.md5') or _file_md5(current_gz)
+    previous_md5 = _read_md5(os.path.join(history_dir, 'films.json.gz.md5'))
+
+    history_deltas = os.path.join(history_dir, DELTAS_DIR)
+    output_deltas = os.path.join(output_dir, DELTAS_DIR)
+    os.makedirs(output_deltas, exist_ok=True)
+
+    index = _load_index(os.path.join(history_deltas, INDEX_FILE))
+    entries: List[Dict[str, Any]] = [e for e in index.get('deltas', []) if e.get('to') != current_md5]
+
+    with open(current_path, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    if previous_md5 and previous_md5 != current_md5 and os.path.exists(previous_path):
+        with open(previous_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+        delta = compute_delta(previous, current)
+        delta['meta'] = {'version': DELTA_VERSION, 'from': previous_md5, 'to': current_md5}
+
+        file_name = f"{previous_md5}.json.gz"
+        delta_path = os.path.join(output_deltas, file_name)
+        with gzip.open(delta_path, 'wt', encoding='utf-8') as f:
+            json.dump(delta, f, ensure_ascii=False, separators=(',', ':'))
+
+        entries = [e for e in entries if e.get('from') != previous_md5]
+        entries.append({
+            'from': previous_md5,
+            'to': current_md5,
+            'file': file_name,
+            'md5': _file_md5(delta_path),
+            'size': os.path.getsize(delta_path),
+            'to_digest': items_digest(current.get('items', [])),
+            'added': len(delta['added']),
+            'changed': len(delta['changed']),
+            'removed': len(delta['removed']),
+        })
+        logger.info(
+            f"Delta {previous_md5[:8]} -> {current_md5[:8]}: {len(delta['added'])} added, "
+            f"{len(delta['changed'])} changed, {len(delta['removed'])} removed "
+            f"({os.path.getsize(delta_path)} bytes)"
+        )
+    else:
+        logger.info("No previous release to diff against (or it is identical); carrying deltas forward only.")
+
+    # Carry forward the most recent deltas that still exist in the history
+    kept = []
+    for entry in entries[-keep:]:
+        target = os.path.join(output_deltas, entry['file'])
+        source = os.path.join(history_deltas, entry['file'])
+        if not os.path.exists(target):
+            if not os.path.exists(source):
+                logger.warning(f"Dropping delta {entry['file']}: file missing from history")
+                continue
+            shutil.copyfile(source, target)
+        kept.append(entry)
+
+    manifest = {
+        'version': DELTA_VERSION,
+        'latest': current_md5,
+        'full_size': os.path.getsize(current_gz),
+        'deltas': kept,
+    }
+    with open(os.path.join(output_deltas, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Delta chain holds {len(kept)} release(s)")
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the per-film delta between database releases")
+    parser.add_argument('--previous', required=True, help="Decompressed films.json of the previous release")
+    parser.add_argument('--current', required=True, help="films.json of the current release")
+    parser.add_argument('--history-dir', required=True, help="Previous release directory (database branch v1/)")
+    parser.add_argument('--output-dir', required=True, help="Directory being deployed (database/v1)")
+    parser.add_argument('--keep', type=int, default=DEFAULT_KEEP, help="Number of deltas to keep in the chain")
+
+    args = parser.parse_args()
+    generate_delta(args.previous, args.current, args.history_dir, args.output_dir, keep=args.keep)
@@ -0,0 +1,149 @@
+"""
+Split the film database into per-country shards.
+
+For every country in the catalogue, countries/<CC>.json.gz holds the full
+records of the films listed there (same shape as films.json), so a
+country-local sync downloads and parses only that country's catalogue. The
+countries/index.json manifest maps each ISO code to its shard:
+
+    {
+      "version": 1,
+      "source_md5": "<md5 of the films.json.gz the shards were cut from>",
+      "countries": {
+        "CH": {"file": "CH.json.gz", "md5": "<md5>", "size": <bytes>, "count": n},
+        ...
+      }
+    }
+
+A film is listed in a country unless its availability window there has
+already ended; films whose window opens later stay in, since the shard must
+remain valid until the next scrape and clients check the dates themselves.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SHARD_VERSION = 1
+SHARDS_DIR = 'countries'
+INDEX_FILE = 'index.json'
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def is_listed(details: Dict[str, Any], now: datetime.datetime) -> bool:
+    """
+    :return: True unless the film's availability window in this country has ended.
+    """
+    if not isinstance(details, dict):
+        return False
+    for field in ('expires_at', 'availability_ends_at'):
+        ends = _parse_date(details.get(field))
+        if ends is not None and ends < now:
+            return False
+    return True
+
+
+def build_shards(data: Dict[str, Any], now: datetime.datetime = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    :param data: Parsed films.json.
+    :return: {country code: [film records listed there]}, in catalogue order.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    shards: Dict[str, List[Dict[str, Any]]] = {}
+    for film in data.get('items', []):
+        for country, details in (film.get('available_countries') or {}).items():
+            if is_listed(details, now):
+                shards.setdefault(country.upper(), []).append(film)
+    return shards
+
+
+def _file_md5(path: str) -> str:
+    file_hash = hashlib.md5()
+    with open(path, 'rb') as f:
+        while chunk := f.read(8192):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def generate_shards(input_file: str = 'films.json', output_dir: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Write countries/<CC>.json.gz and countries/index.json next to the input file.
+
+    Run after generate_repo.py so films.json.gz.md5 exists.
+
+    :param input_file: films.json of the current release.
+    :param output_dir: Directory to write into (defaults to the input file's directory).
+    :return: The manifest, or None if the input is missing.
+    """
+    if not os.path.exists(input_file):
+        logger.error(f"Input file {input_file} not found.")
+        return None
+    output_dir = output_dir or os.path.dirname(os.path.abspath(input_file))
+    shards_dir = os.path.join(output_dir, SHARDS_DIR)
+    os.makedirs(shards_dir, exist_ok=True)
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    source_md5 = None
+    md5_file = os.path.join(output_dir, 'films.json.gz.md5')
+    if os.path.exists(md5_file):
+        with open(md5_file, 'r') as f:
+            source_md5 = f.read().strip().split()[0]
+
+    meta = data.get('meta', {})
+    countries = {}
+    for country, films in sorted(build_shards(data).items()):
+        file_name = f"{country}.json.gz"
+        path = os.path.join(shards_dir, file_name)
+        shard = {
+            'meta': dict(meta, country=country, total_count=len(films)),
+            'items': films,
+        }
+        # mtime=0 keeps unchanged shards byte-identical between releases
+        with open(path, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+                gz.write(json.dumps(shard, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        countries[country] = {
+            'file': file_name,
+            'md5': _file_md5(path),
+            'size': os.path.getsize(path),
+            'count': len(films),
+        }
+
+    manifest = {'version': SHARD_VERSION, 'source_md5': source_md5, 'countries': countries}
+    with open(os.path.join(shards_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    total = len(data.get('items', []))
+    logger.info(f"Generated {len(countries)} country shards from {total} films")
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate per-country shards of the film database")
+    parser.add_argument('--file', default='films.json', help="Input films.json")
+    parser.add_argument('--output-dir', default=None, help="Output directory (defaults to the input's directory)")
+
+    args = parser.parse_args()
+    generate_shards(args.file, args.output_dir)
@@ -13,6 +13,11 @@ from datetime import datetime
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    from backend.set_cover import greedy_cover
+except ImportError:
+    from set_cover import greedy_cover
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -190,38 +195,20 @@ class MubiScraper:
         
         logger.info(f"Universe size: {len(universe)} films across {len(self.COUNTRIES)} countries.")
         
-        # 2. Greedy Loop
-        selected_countries = []
-        covered_films = set()
-        
-        while len(covered_films) < len(universe):
-            # Find country that covers the most *uncovered* films
-            best_country = None
-            best_new_coverage = 0
-            
-            remaining_needed = universe - covered_films
-            
-            for country, films in country_coverage.items():
-                if country in selected_countries:
-                    continue
-                
-                # Intersection of this country's films with what we still need
-                newly_covered = len(films.intersection(remaining_needed))
-                
-                if newly_covered > best_new_coverage:
-                    best_new_coverage = newly_covered
-                    best_country = country
-            
-            if best_country is None:
-                # This happens if remaining films are not available in any known country (should not happen if data is consistent)
-                logger.warning(f"Could not find coverage for {len(remaining_needed)} remaining films. Stopping greedy search.")
-                break
-            
-            selected_countries.append(best_country)
-            covered_films.update(country_coverage[best_country])
-            logger.info(f"Selected {best_country} (Covers {best_new_coverage} new films). Total covered: {len(covered_films)}/{len(universe)}")
-            
-        logger.info(f"Optimal set found: {len(selected_countries)} countries cover {len(covered_films)} films.")
+        # 2. Lazy-greedy cover over bitsets (first country in COUNTRIES order wins ties)
+        result = greedy_cover(country_coverage, universe=universe)
+        selected_countries = result.selected
+
+        covered = 0
+        for country, gain in zip(result.selected, result.gains):
+            covered += gain
+            logger.info(f"Selected {country} (Covers {gain} new films). Total covered: {covered}/{len(universe)}")
+
+        if result.covered < result.universe:
+            # This happens if remaining films are not available in any known country (should not happen if data is consistent)
+            logger.warning(f"Could not find coverage for {result.universe - result.covered} remaining films. Stopping greedy search.")
+
+        logger.info(f"Optimal set found: {len(selected_countries)} countries cover {result.covered} films.")
         # Sort for consistent execution order
         return sorted(selected_countries)
 
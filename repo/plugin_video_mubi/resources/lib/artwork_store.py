@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed store for downloaded artwork.
+
+Images are stored once in the profile cache, named by the SHA-256 of their
+content, with a small index file per URL recording the image hash and its
+ETag / Last-Modified validators. Film folders get a hard link to the stored
+image (or a copy where the filesystem cannot link), so a film whose folder
+is recreated - renamed after a title change, or removed and re-added - gets
+its artwork back without any download. Identical images served under
+different URLs are stored once.
+
+An index entry is trusted for FRESH_FOR seconds; after that it is
+revalidated with If-None-Match / If-Modified-Since, so an unchanged image
+costs a 304 instead of a full transfer.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+import xbmc
+
+from .profile_cache import atomic_write_bytes, get_cache_dir
+
+
+class ArtworkStore:
+    """
+    objects/<sha256[:2]>/<sha256> image files and urls/<sha256(url)>.json index entries.
+    """
+
+    FRESH_FOR = 7 * 24 * 3600  # seconds an index entry is used without revalidation
+    RETENTION = 30 * 24 * 3600  # seconds an image no film folder links to is kept
+    PRUNE_INTERVAL = 24 * 3600
+    TIMEOUT = 30
+    CHUNK_SIZE = 8192
+    # Keep-alive connections per image host, shared by the sync workers
+    POOL_MAXSIZE = 10
+
+    _http_session = None
+    _http_lock = threading.Lock()
+
+    def __init__(self, store_dir: Path):
+        """
+        :param store_dir: Directory holding the store.
+        """
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / 'objects'
+        self.urls_dir = self.store_dir / 'urls'
+
+    @classmethod
+    def open(cls) -> Optional['ArtworkStore']:
+        """
+        :return: The store in the profile cache folder, or None if it cannot be created.
+        """
+        try:
+            return cls(get_cache_dir('artwork'))
+        except OSError as e:
+            xbmc.log(f"Artwork store unavailable, downloading artwork directly: {e}", xbmc.LOGWARNING)
+            return None
+
+    @classmethod
+    def http_get(cls, url: str, **kwargs):
+        """
+        GET over the pooled session shared by all artwork downloads. The caller
+        must close the response.
+        """
+        with cls._http_lock:
+            if cls._http_session is None:
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=cls.POOL_MAXSIZE)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._http_session = session
+            session = cls._http_session
+        return session.get(url, **kwargs)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.urls_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _load_entry(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or not self._object_path(entry.get('sha256', '')).is_file():
+            return None
+        return entry
+
+    def _save_entry(self, entry: dict):
+        path = self._entry_path(entry['url'])
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, json.dumps(entry).encode('utf-8'))
+        except OSError as e:
+            xbmc.log(f"Artwork store: could not save entry for {entry['url']}: {e}", xbmc.LOGDEBUG)
+
+    @staticmethod
+    def _header(response, name: str) -> Optional[str]:
+        value = (getattr(response, 'headers', None) or {}).get(name)
+        return value if isinstance(value, str) else None
+
+    def fetch(self, url: str, dest: Path) -> str:
+        """
+        Place the image at url in dest, from the store if possible.
+
+        :param url: Image URL.
+        :param dest: File to create in the film folder.
+        :return: 'stored' (no request), 'revalidated' (304) or 'downloaded'.
+        :raises Exception: Whatever the download raised (network or HTTP errors).
+        """
+        entry = self._load_entry(url)
+        now = time.time()
+        if entry and now - entry.get('checked_at', 0) < self.FRESH_FOR:
+            self._materialize(entry['sha256'], dest)
+            return 'stored'
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.http_get(url, timeout=self.TIMEOUT, stream=True, headers=headers)
+        try:
+            if entry and headers and response.status_code == 304:
+                entry['checked_at'] = now
+                entry['etag'] = self._header(response, 'ETag') or entry.get('etag')
+                entry['last_modified'] = self._header(response, 'Last-Modified') or entry.get('last_modified')
+                self._save_entry(entry)
+                self._materialize(entry['sha256'], dest)
+                return 'revalidated'
+
+            response.raise_for_status()
+            digest = self._store_body(response)
+            entry = {
+                'url': url,
+                'sha256': digest,
+                'etag': self._header(response, 'ETag'),
+                'last_modified': self._header(response, 'Last-Modified'),
+                'checked_at': now,
+            }
+        finally:
+            # Returns the connection to the pool (or drops it if the body was not read)
+            response.close()
+        self._save_entry(entry)
+        self._materialize(digest, dest)
+        return 'downloaded'
+
+    def _store_body(self, response) -> str:
+        """
+        Stream a response body into the store.
+
+        :return: SHA-256 of the content.
+        """
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.objects_dir / f"download.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            object_path = self._object_path(digest.hexdigest())
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, object_path)
+        except Exception:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        return digest.hexdigest()
+
+    def _materialize(self, digest: str, dest: Path):
+        """
+        Hard link a stored image to dest, or copy it where linking is not possible.
+        """
+        object_path = self._object_path(digest)
+        try:
+            os.link(object_path, dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            # Filesystems without hard links (FAT, some network shares), or another device
+            shutil.copyfile(object_path, dest)
+        try:
+            os.utime(object_path)  # Marks the image as in use for prune()
+        except OSError:
+            pass
+
+    def prune(self, now: float = None) -> int:
+        """
+        Delete images no film folder links to and that were not used for RETENTION
+        seconds, at most once per PRUNE_INTERVAL.
+
+        :return: Number of images deleted.
+        """
+        now = time.time() if now is None else now
+        marker = self.store_dir / 'pruned_at'
+        try:
+            if now - marker.stat().st_mtime < self.PRUNE_INTERVAL:
+                return 0
+        except OSError:
+            pass
+
+        removed = 0
+        kept = set()
+        for object_path in self.objects_dir.glob('*/*'):
+            try:
+                stat = object_path.stat()
+                if stat.st_nlink <= 1 and now - stat.st_mtime > self.RETENTION:
+                    object_path.unlink()
+                    removed += 1
+                else:
+                    kept.add(object_path.name)
+            except OSError:
+                continue
+        for entry_path in self.urls_dir.glob('*.json'):
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    if json.load(f).get('sha256') not in kept:
+                        entry_path.unlink()
+            except (OSError, ValueError):
+                continue
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+        if removed:
+            xbmc.log(f"Artwork store: removed {removed} unused images", xbmc.LOGINFO)
+        return removed
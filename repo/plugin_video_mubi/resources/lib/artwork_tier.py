@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Artwork resolution tiers.
+
+The 'artwork_tier' setting trades image quality for bandwidth and disk
+space: it picks the size of the film stills (MUBI serves them as small,
+medium, standard and retina) and which artwork types are downloaded into
+the film folders. Types that are not downloaded are left out of the NFO,
+except the thumbnail, which then points at its (tier-sized) URL.
+"""
+
+from typing import Iterable, Optional
+
+import xbmc
+import xbmcaddon
+
+RETINA = 'retina'
+STANDARD = 'standard'
+SMALL = 'small'
+POSTERS_ONLY = 'posters_only'
+
+# Index = value of the artwork_tier setting
+TIERS = (RETINA, STANDARD, SMALL, POSTERS_ONLY)
+
+# Still sizes to use, best match first
+STILL_SIZES = {
+    RETINA: ('retina', 'standard', 'medium', 'small'),
+    STANDARD: ('standard', 'medium', 'retina', 'small'),
+    SMALL: ('medium', 'small', 'standard', 'retina'),
+    POSTERS_ONLY: ('medium', 'small', 'standard', 'retina'),
+}
+
+# Artwork types downloaded into the film folder (None: all of them)
+DOWNLOADED_TYPES = {
+    RETINA: None,
+    STANDARD: None,
+    SMALL: frozenset({'thumb', 'poster', 'clearlogo'}),
+    POSTERS_ONLY: frozenset({'poster'}),
+}
+
+# Rough average file sizes (bytes), only used to estimate what a tier saves
+APPROX_STILL_BYTES = {'retina': 400_000, 'standard': 150_000, 'medium': 60_000, 'small': 20_000}
+APPROX_ARTWORK_BYTES = {'poster': 250_000, 'fanart': 500_000, 'banner': 200_000, 'clearlogo': 30_000}
+
+
+def get_artwork_tier() -> str:
+    """
+    :return: The tier selected in the add-on settings (RETINA if unset or invalid).
+    """
+    try:
+        value = xbmcaddon.Addon().getSettingInt('artwork_tier')
+    except Exception as e:
+        xbmc.log(f"Could not read artwork tier setting: {e}", xbmc.LOGDEBUG)
+        return RETINA
+    if not isinstance(value, int) or not 0 <= value < len(TIERS):
+        return RETINA
+    return TIERS[value]
+
+
+def select_still(stills: dict, tier: str = RETINA) -> Optional[str]:
+    """
+    :param stills: MUBI 'stills' object ({size: url}).
+    :return: URL of the still size the tier prefers, or None if there is none.
+    """
+    if not isinstance(stills, dict):
+        return None
+    for size in STILL_SIZES.get(tier, STILL_SIZES[RETINA]):
+        if stills.get(size):
+            return stills[size]
+    return None
+
+
+def is_downloaded(artwork_type: str, tier: str) -> bool:
+    """
+    :return: True if the tier stores this artwork type in the film folder.
+    """
+    kept = DOWNLOADED_TYPES.get(tier)
+    return kept is None or artwork_type in kept
+
+
+def estimate_savings(artwork_types: Iterable[str], tier: str) -> int:
+    """
+    Estimate the bytes a tier avoids downloading for one film, compared with RETINA.
+
+    :param artwork_types: Artwork types available for the film (e.g. from its artwork URLs).
+    :return: Approximate bytes saved.
+    """
+    saved = 0
+    for artwork_type in artwork_types:
+        if artwork_type == 'thumb':
+            full = APPROX_STILL_BYTES['retina']
+            if not is_downloaded('thumb', tier):
+                saved += full
+            else:
+                saved += full - APPROX_STILL_BYTES[STILL_SIZES[tier][0]]
+        elif not is_downloaded(artwork_type, tier):
+            saved += APPROX_ARTWORK_BYTES.get(artwork_type, 0)
+    return saved
+
+
+def format_size(size: int) -> str:
+    """
+    :return: Human readable size, e.g. '12.3 MB'.
+    """
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
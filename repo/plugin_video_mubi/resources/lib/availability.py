@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Shared availability checks for film catalogues.
+
+A film's per-country availability comes as ISO 8601 strings. Every check
+first turns a country's details into a window of integer epoch seconds
+(start, end), inclusive at both ends, so comparing against "now" is two
+integer comparisons. Timestamps are parsed once and memoised, since the same
+release and expiry dates recur across thousands of films.
+
+Two rules exist, matching how the catalogue and the library read the data:
+
+- catalogue_window: available_at / expires_at bound the window; without
+  (parseable) dates the 'availability' status decides ('live' or never).
+- playable_window: the window starts at available_at (required) and ends at
+  availability_ends_at; the status string is ignored.
+
+AvailabilityIndex stores the windows of a batch of films in compact
+per-country columns and answers "live in any of these countries at time T"
+for the whole batch in one pass.
+"""
+
+import datetime
+import functools
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import dateutil.parser
+
+OPEN_START = -(2 ** 62)
+OPEN_END = 2 ** 62
+NEVER = (OPEN_END, OPEN_START)
+ALWAYS = (OPEN_START, OPEN_END)
+
+Window = Tuple[int, int]
+
+DEFAULT_BATCH_SIZE = 512
+
+
+@functools.lru_cache(maxsize=8192)
+def to_epoch(value: str) -> Optional[int]:
+    """
+    Parse an ISO 8601 timestamp (naive values are taken as UTC).
+
+    :return: Epoch seconds, or None if the value cannot be parsed.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = dateutil.parser.parse(value)
+        except (ValueError, OverflowError, TypeError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+def now_epoch() -> int:
+    return int(time.time())
+
+
+def catalogue_window(details: Dict[str, Any]) -> Window:
+    """
+    Window of a country entry as used for catalogue filtering and playback checks.
+    """
+    if not isinstance(details, dict):
+        return NEVER
+    available_at = details.get('available_at')
+    expires_at = details.get('expires_at')
+    if available_at or expires_at:
+        start = to_epoch(available_at) if available_at else OPEN_START
+        end = to_epoch(expires_at) if expires_at else OPEN_END
+        if start is not None and end is not None:
+            return start, end
+        # Unparseable dates: fall back to the status below
+    return ALWAYS if details.get('availability') == 'live' else NEVER
+
+
+def playable_window(details: Dict[str, Any]) -> Window:
+    """
+    Window of a country entry as used to decide whether a film belongs in the library.
+    """
+    if not isinstance(details, dict):
+        return NEVER
+    # Without a start date the film is treated as not released yet
+    start = to_epoch(details.get('available_at'))
+    if start is None:
+        return NEVER
+    ends_at = details.get('availability_ends_at')
+    if not ends_at:
+        return start, OPEN_END
+    end = to_epoch(ends_at)
+    return (start, end) if end is not None else NEVER
+
+
+def is_live(details: Dict[str, Any], at: int = None,
+            rule: Callable[[Dict[str, Any]], Window] = catalogue_window) -> bool:
+    """
+    :param details: Availability details of one country.
+    :param at: Epoch seconds to check (defaults to now).
+    :return: True if the country's window contains the time.
+    """
+    start, end = rule(details)
+    at = now_epoch() if at is None else at
+    return start <= at <= end
+
+
+def is_live_in(available_countries: Dict[str, Dict[str, Any]], countries: Iterable[str] = None,
+               at: int = None, rule: Callable[[Dict[str, Any]], Window] = catalogue_window) -> bool:
+    """
+    :param available_countries: A film's {country code: details}.
+    :param countries: Upper-case codes to consider (defaults to all of them).
+    :return: True if the film is live in any of the countries.
+    """
+    if not isinstance(available_countries, dict) or not available_countries:
+        return False
+    at = now_epoch() if at is None else at
+    codes = available_countries.keys() if countries is None else countries
+    for code in codes:
+        if code in available_countries and is_live(available_countries[code], at, rule):
+            return True
+    return False
+
+
+class AvailabilityIndex:
+    """
+    Epoch windows of a batch of films, stored per country as parallel arrays
+    of (film position, start, end).
+    """
+
+    def __init__(self, countries: Iterable[str] = None,
+                 rule: Callable[[Dict[str, Any]], Window] = catalogue_window):
+        """
+        :param countries: Only keep windows for these codes (defaults to all).
+        :param rule: Function turning a country's details into a window.
+        """
+        self._countries = {c.upper() for c in countries} if countries else None
+        self._rule = rule
+        self._columns: Dict[str, Tuple[array, array, array]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_films(cls, films: Iterable[Dict[str, Any]], countries: Iterable[str] = None,
+                   rule: Callable[[Dict[str, Any]], Window] = catalogue_window) -> 'AvailabilityIndex':
+        index = cls(countries, rule)
+        for film in films:
+            index.add(film.get('available_countries'))
+        return index
+
+    def add(self, available_countries: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Add one film.
+
+        :param available_countries: The film's {country code: details}.
+        :return: Position of the film in the batch.
+        """
+        position = self._size
+        self._size += 1
+        if not isinstance(available_countries, dict):
+            return position
+        for code, details in available_countries.items():
+            code = code.upper()
+            if self._countries is not None and code not in self._countries:
+                continue
+            start, end = self._rule(details)
+            if start > end:
+                continue
+            columns = self._columns.get(code)
+            if columns is None:
+                columns = self._columns[code] = (array('q'), array('q'), array('q'))
+            columns[0].append(position)
+            columns[1].append(start)
+            columns[2].append(end)
+        return position
+
+    def live_mask(self, countries: Iterable[str] = None, at: int = None) -> bytearray:
+        """
+        :param countries: Upper-case codes to consider (defaults to every indexed country).
+        :param at: Epoch seconds to check (defaults to now).
+        :return: One byte per film, 1 if it is live in any of the countries.
+        """
+        at = now_epoch() if at is None else at
+        mask = bytearray(self._size)
+        codes = self._columns.keys() if countries is None else {c.upper() for c in countries}
+        for code in codes:
+            columns = self._columns.get(code)
+            if columns is None:
+                continue
+            for position, start, end in zip(*columns):
+                if start <= at <= end:
+                    mask[position] = 1
+        return mask
+
+    def live_countries(self, at: int = None) -> List[str]:
+        """
+        :return: Codes with at least one live film at the time.
+        """
+        at = now_epoch() if at is None else at
+        return sorted(
+            code for code, (_, starts, ends) in self._columns.items()
+            if any(start <= at <= end for start, end in zip(starts, ends))
+        )
+
+
+def filter_available(films: Iterable[Dict[str, Any]], countries: Iterable[str] = None, at: int = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the films live in any of the countries, checking them batch by batch.
+
+    :param films: Film dictionaries with 'available_countries'.
+    :param countries: Upper-case codes; if empty, every film is yielded.
+    :param at: Epoch seconds to check (defaults to now).
+    :param batch_size: Films held in memory per batch.
+    """
+    if not countries:
+        yield from films
+        return
+    at = now_epoch() if at is None else at
+    batch = []
+    index = AvailabilityIndex(countries)
+    for film in films:
+        batch.append(film)
+        index.add(film.get('available_countries'))
+        if len(batch) >= batch_size:
+            yield from _select(batch, index.live_mask(countries, at))
+            batch = []
+            index = AvailabilityIndex(countries)
+    if batch:
+        yield from _select(batch, index.live_mask(countries, at))
+
+
+def _select(films: List[Dict[str, Any]], mask: bytearray) -> Iterator[Dict[str, Any]]:
+    return (film for film, live in zip(films, mask) if live)
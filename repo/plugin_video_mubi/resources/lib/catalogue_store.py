@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite catalogue of the films written to the local library.
+
+Library.sync_locally records every film it writes or verifies: its folder
+and NFO path, the NFO content hash, external ids, local artwork files and
+per-country availability (as published, plus its catalogue window in epoch
+seconds). Later lookups (playback pre-checks, menus, incremental syncs)
+query the database instead of walking the film folders and parsing XML.
+
+The database lives in the profile cache folder and is only a derived index:
+if it is missing, corrupt or from an older schema it is rebuilt on the next
+sync.
+"""
+
+import hashlib
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import xbmc
+
+from .availability import catalogue_window, now_epoch
+from .profile_cache import get_cache_dir
+
+SCHEMA = """
+CREATE TABLE films (
+    mubi_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    year INTEGER,
+    folder TEXT NOT NULL,
+    nfo_path TEXT NOT NULL,
+    strm_path TEXT NOT NULL,
+    nfo_hash TEXT,
+    imdb_id TEXT,
+    tmdb_id TEXT,
+    synced_at INTEGER NOT NULL
+);
+CREATE INDEX films_folder ON films (folder);
+CREATE TABLE availability (
+    mubi_id TEXT NOT NULL REFERENCES films (mubi_id) ON DELETE CASCADE,
+    country TEXT NOT NULL,
+    status TEXT,
+    available_at TEXT,
+    expires_at TEXT,
+    availability_ends_at TEXT,
+    start_epoch INTEGER NOT NULL,
+    end_epoch INTEGER NOT NULL,
+    PRIMARY KEY (mubi_id, country)
+);
+CREATE INDEX availability_country ON availability (country, start_epoch, end_epoch);
+CREATE TABLE artwork (
+    mubi_id TEXT NOT NULL REFERENCES films (mubi_id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (mubi_id, kind)
+);
+"""
+
+AVAILABILITY_FIELDS = ('available_at', 'expires_at', 'availability_ends_at')
+
+
+def nfo_content_hash(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
+class CatalogueStore:
+    """
+    Local SQLite index of the synced library.
+    """
+
+    FILE_NAME = 'catalogue.db'
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: Path):
+        """
+        :param path: Database file (created if missing).
+        :raises sqlite3.Error: If the database cannot be opened.
+        """
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.row_factory = sqlite3.Row
+        try:
+            self._prepare()
+        except sqlite3.DatabaseError as e:
+            # A corrupt file is only a lost index: start over
+            xbmc.log(f"Rebuilding unreadable catalogue database: {e}", xbmc.LOGWARNING)
+            self._conn.close()
+            self.path.unlink()
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.row_factory = sqlite3.Row
+            self._prepare()
+
+    @classmethod
+    def open(cls, create: bool = True) -> Optional['CatalogueStore']:
+        """
+        :param create: If False, return None instead of creating a missing database.
+        :return: The store in the profile cache folder, or None if it cannot be opened.
+        """
+        try:
+            path = get_cache_dir() / cls.FILE_NAME
+            if not create and not path.exists():
+                return None
+            return cls(path)
+        except (sqlite3.Error, OSError) as e:
+            xbmc.log(f"Catalogue database unavailable: {e}", xbmc.LOGWARNING)
+            return None
+
+    def _prepare(self):
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            return
+        with self._conn:
+            for table in ('artwork', 'availability', 'films'):
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'CatalogueStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Writing
+
+    def record_films(self, films: Iterable[Any], library_path: Path, unchanged_ids: Iterable = ()) -> int:
+        """
+        Record films written to (or verified in) the library, in one transaction.
+
+        :param films: Film objects.
+        :param library_path: Directory holding the film folders.
+        :param unchanged_ids: mubi_ids of films the sync left untouched (their NFO and
+            availability are unchanged): if already indexed, only their synced_at is refreshed
+            and their folder is not read.
+        :return: Number of films recorded.
+        """
+        now = int(time.time())
+        unchanged_ids = {str(mubi_id) for mubi_id in unchanged_ids}
+        indexed = set()
+        if unchanged_ids:
+            indexed = {row['mubi_id'] for row in self._conn.execute("SELECT mubi_id FROM films")}
+        touched = []
+        count = 0
+        with self._conn:
+            for film in films:
+                mubi_id = str(film.mubi_id)
+                if mubi_id in unchanged_ids and mubi_id in indexed:
+                    touched.append((now, mubi_id))
+                    count += 1
+                elif self._record_film(film, Path(library_path), now):
+                    count += 1
+            self._conn.executemany("UPDATE films SET synced_at = ? WHERE mubi_id = ?", touched)
+        return count
+
+    def _record_film(self, film, library_path: Path, now: int) -> bool:
+        mubi_id = str(film.mubi_id)
+        folder = film.get_sanitized_folder_name()
+        film_path = library_path / folder
+        nfo_path = film_path / f"{folder}.nfo"
+        try:
+            content = nfo_path.read_bytes()
+        except OSError as e:
+            xbmc.log(f"Not indexing '{film.title}': {e}", xbmc.LOGDEBUG)
+            return False
+
+        nfo_hash = nfo_content_hash(content)
+        row = self._conn.execute("SELECT nfo_hash FROM films WHERE mubi_id = ?", (mubi_id,)).fetchone()
+        unchanged = row is not None and row['nfo_hash'] == nfo_hash
+
+        year = getattr(film.metadata, 'year', None)
+        values = (folder, str(nfo_path), str(film_path / f"{folder}.strm"), nfo_hash, now, film.title,
+                  year if isinstance(year, int) else None)
+        if unchanged:
+            self._conn.execute(
+                "UPDATE films SET folder = ?, nfo_path = ?, strm_path = ?, nfo_hash = ?, synced_at = ?, "
+                "title = ?, year = ? WHERE mubi_id = ?", values + (mubi_id,)
+            )
+        else:
+            # Only a changed NFO is parsed for its ids and artwork
+            imdb_id, tmdb_id, artwork = self._read_nfo(content, film_path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO films (folder, nfo_path, strm_path, nfo_hash, synced_at, title, year, "
+                "imdb_id, tmdb_id, mubi_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values + (imdb_id, tmdb_id, mubi_id)
+            )
+            self._conn.execute("DELETE FROM artwork WHERE mubi_id = ?", (mubi_id,))
+            self._conn.executemany(
+                "INSERT INTO artwork (mubi_id, kind, path) VALUES (?, ?, ?)",
+                [(mubi_id, kind, path) for kind, path in artwork.items()]
+            )
+
+        self._conn.execute("DELETE FROM availability WHERE mubi_id = ?", (mubi_id,))
+        self._conn.executemany(
+            "INSERT INTO availability (mubi_id, country, status, available_at, expires_at, availability_ends_at, "
+            "start_epoch, end_epoch) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._availability_row(mubi_id, code, details)
+             for code, details in (film.available_countries or {}).items() if isinstance(details, dict)]
+        )
+        return True
+
+    @staticmethod
+    def _availability_row(mubi_id: str, code: str, details: Dict[str, Any]) -> tuple:
+        dates = [details.get(field) for field in AVAILABILITY_FIELDS]
+        dates = [str(value) if value else None for value in dates]
+        return (mubi_id, code.upper(), details.get('availability'), *dates, *catalogue_window(details))
+
+    @staticmethod
+    def _read_nfo(content: bytes, film_path: Path):
+        """
+        :return: Tuple (imdb_id, tmdb_id, {kind: absolute artwork path}) from an NFO file.
+        """
+        try:
+            root = ET.fromstring(content)
+        except ET.ParseError:
+            return None, None, {}
+        ids = {uid.get('type'): (uid.text or '').strip() for uid in root.findall('uniqueid')}
+        imdb_id = ids.get('imdb') or (root.findtext('imdbid') or '').strip() or None
+        tmdb_id = ids.get('tmdb') or None
+        artwork = {}
+        for kind, xpath in (('poster', 'poster'), ('fanart', 'fanart/thumb'), ('clearlogo', 'clearlogo'),
+                            ('thumb', 'thumb')):
+            name = (root.findtext(xpath) or '').strip()
+            if name and '://' not in name:
+                artwork[kind] = str(film_path / name)
+        return imdb_id, tmdb_id, artwork
+
+    def prune(self, keep_folders: Iterable[str]) -> int:
+        """
+        Drop films whose folder is no longer part of the library.
+
+        :return: Number of films removed.
+        """
+        keep = set(keep_folders)
+        stale = [row['mubi_id'] for row in self._conn.execute("SELECT mubi_id, folder FROM films")
+                 if row['folder'] not in keep]
+        with self._conn:
+            self._conn.executemany("DELETE FROM films WHERE mubi_id = ?", [(mubi_id,) for mubi_id in stale])
+        return len(stale)
+
+    # Lookups
+
+    def get_film(self, mubi_id) -> Optional[Dict[str, Any]]:
+        """
+        :return: The film's row with 'artwork' and 'available_countries' added, or None.
+        """
+        film = self.get_entry(mubi_id)
+        if film is None:
+            return None
+        film['artwork'] = {
+            r['kind']: r['path']
+            for r in self._conn.execute("SELECT kind, path FROM artwork WHERE mubi_id = ?", (str(mubi_id),))
+        }
+        film['available_countries'] = self.get_availability(mubi_id)
+        return film
+
+    def get_entry(self, mubi_id) -> Optional[Dict[str, Any]]:
+        """
+        :return: The film's row (paths, NFO hash, ids), or None if it is not indexed.
+        """
+        row = self._conn.execute("SELECT * FROM films WHERE mubi_id = ?", (str(mubi_id),)).fetchone()
+        return dict(row) if row else None
+
+    def get_nfo_path(self, mubi_id) -> Optional[Path]:
+        row = self._conn.execute("SELECT nfo_path FROM films WHERE mubi_id = ?", (str(mubi_id),)).fetchone()
+        return Path(row['nfo_path']) if row else None
+
+    def get_availability(self, mubi_id) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: {country code: details} in the shape stored in NFO files.
+        """
+        countries = {}
+        for row in self._conn.execute("SELECT * FROM availability WHERE mubi_id = ?", (str(mubi_id),)):
+            details = {'availability': row['status']} if row['status'] else {}
+            for field in AVAILABILITY_FIELDS:
+                if row[field]:
+                    details[field] = row[field]
+            countries[row['country']] = details
+        return countries
+
+    def films_in_country(self, country: str, at: int = None) -> List[str]:
+        """
+        :return: mubi_ids of films live in the country at the time (see availability.catalogue_window).
+        """
+        at = now_epoch() if at is None else at
+        rows = self._conn.execute(
+            "SELECT mubi_id FROM availability WHERE country = ? AND start_epoch <= ? AND end_epoch >= ? "
+            "ORDER BY mubi_id",
+            (country.upper(), at, at)
+        )
+        return [row['mubi_id'] for row in rows]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM films").fetchone()[0]
@@ -64,25 +64,14 @@ def load_country_catalogue() -> Optional[Dict]:
         return None
 
 
-def get_optimal_countries(user_country: str) -> List[str]:
+def _build_country_films(catalogue: Dict):
     """
-    Use the greedy set cover algorithm to find the minimum set of countries
-    needed for 100% catalogue coverage, starting with the user's country.
-
-    Args:
-        user_country: ISO 3166-1 alpha-2 country code (e.g., 'CH', 'US')
+    Invert the catalogue's film -> countries mapping.
 
     Returns:
-        List of country codes in optimal order (user's country first),
-        or empty list if catalogue not available.
+        Tuple (country_films, all_films): lower-case country code -> set of
+        film ids, and the set of every film id.
     """
-    catalogue = load_country_catalogue()
-    if not catalogue:
-        return []
-
-    user_country_lower = user_country.lower()
-
-    # Build country -> films mapping from film -> countries
     country_films = defaultdict(set)
     all_films = set()
 
@@ -92,87 +81,180 @@ def get_optimal_countries(user_country: str) -> List[str]:
         for country in countries:
             country_films[country].add(film_id_int)
 
-    if not all_films:
-        return []
+    return country_films, all_films
+
+
+def _greedy_cover(country_films: Dict, all_films: set, user_country_lower: str) -> List[str]:
+    """
+    Greedy set cover (set_cover.greedy_cover), starting with the user's country.
 
+    Returns:
+        List of upper-case country codes in selection order.
+    """
     # Import COUNTRIES for VPN tier lookup
     try:
         from .countries import COUNTRIES
+        from .set_cover import greedy_cover
     except ImportError:
         from countries import COUNTRIES
+        from set_cover import greedy_cover
 
-    # Greedy set cover algorithm
-    covered = set()
-    selected = []
-    remaining = dict(country_films)
-
-    # Always start with user's country
-    if user_country_lower in remaining:
-        covered.update(remaining[user_country_lower])
-        selected.append(user_country_lower.upper())
-        del remaining[user_country_lower]
-
-    # Greedily select countries that cover the most uncovered films
-    # Tiebreaker: prefer countries with lower VPN tier (better infrastructure)
-    while covered != all_films and remaining:
-        def country_score(c):
-            new_films_count = len(remaining[c] - covered)
-            # VPN tier: 1=best, 4=worst. Use negative for descending sort on coverage
-            vpn_tier = COUNTRIES.get(c, {}).get('vpn_tier', 4)
-            # Return tuple: (new_films DESC, vpn_tier ASC)
-            return (-new_films_count, vpn_tier)
-        
-        best = min(remaining.keys(), key=country_score)
-        new_films = remaining[best] - covered
-
-        if not new_films:
-            break  # No more films to cover
-
-        covered.update(new_films)
-        selected.append(best.upper())
-        del remaining[best]
+    # Tiebreaker: prefer countries with lower VPN tier (1=best, 4=worst)
+    def vpn_tier(country):
+        return COUNTRIES.get(country, {}).get('vpn_tier', 4)
+
+    result = greedy_cover(country_films, universe=all_films, first=user_country_lower, tie_break=vpn_tier)
+    return [country.upper() for country in result.selected]
+
+
+def _compute_plan(catalogue: Dict, user_country: str) -> dict:
+    """Run the set cover once and gather the statistics shown in the menu."""
+    user_country_lower = user_country.lower()
+    country_films, all_films = _build_country_films(catalogue)
+    optimal = _greedy_cover(country_films, all_films, user_country_lower) if all_films else []
 
     if RUNNING_IN_KODI:
         xbmc.log(
-            f"Coverage optimizer: {len(selected)} countries needed for 100% coverage "
+            f"Coverage optimizer: {len(optimal)} countries needed for 100% coverage "
             f"(starting with {user_country.upper()})",
             xbmc.LOGINFO
         )
 
-    return selected
+    return {
+        'total_films': len(all_films),
+        'total_countries_available': len(country_films),
+        'optimal_countries': optimal,
+        'optimal_country_count': len(optimal),
+        'user_country_films': len(country_films.get(user_country_lower, set())),
+    }
+
 
+# Coverage plans are cached per catalogue version ('generated' stamp) and user
+# country, in memory and in the profile cache. The catalogue file's size and
+# mtime identify the version without parsing it; the stamp is only read
+# (by loading the catalogue) when those change.
+PLAN_CACHE_FILE = 'coverage_plans.json'
+PLAN_CACHE_VERSION = 1
 
-def get_coverage_stats(user_country: str) -> dict:
+_plan_cache: Dict[str, dict] = {}  # catalogue path -> cache document
+
+
+def _catalogue_signature(catalogue_path: str) -> Optional[list]:
+    try:
+        stat = os.stat(catalogue_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _get_plan_cache_file() -> Optional[str]:
+    """Path of the on-disk plan cache, or None outside Kodi."""
+    try:
+        try:
+            from .profile_cache import get_cache_dir
+        except ImportError:
+            from profile_cache import get_cache_dir
+        return str(get_cache_dir() / PLAN_CACHE_FILE)
+    except Exception:
+        return None
+
+
+def _read_plan_cache(catalogue_path: str) -> Optional[dict]:
+    cached = _plan_cache.get(catalogue_path)
+    if cached is not None:
+        return cached
+    cache_file = _get_plan_cache_file()
+    if not cache_file:
+        return None
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != PLAN_CACHE_VERSION \
+            or data.get('path') != catalogue_path or not isinstance(data.get('plans'), dict):
+        return None
+    _plan_cache[catalogue_path] = data
+    return data
+
+
+def _write_plan_cache(data: dict):
+    _plan_cache[data['path']] = data
+    cache_file = _get_plan_cache_file()
+    if not cache_file:
+        return
+    try:
+        try:
+            from .profile_cache import atomic_write_bytes
+        except ImportError:
+            from profile_cache import atomic_write_bytes
+        from pathlib import Path
+        atomic_write_bytes(Path(cache_file), json.dumps(data).encode('utf-8'))
+    except Exception as e:
+        if RUNNING_IN_KODI:
+            xbmc.log(f"Could not save coverage plan cache: {e}", xbmc.LOGDEBUG)
+
+
+def get_coverage_plan(user_country: str) -> dict:
     """
-    Get statistics about coverage optimization.
+    Get the coverage plan for a user country, computing it at most once per
+    catalogue version.
+
+    Args:
+        user_country: ISO 3166-1 alpha-2 country code (e.g., 'CH', 'US')
 
     Returns:
         dict with 'total_films', 'total_countries_available', 'optimal_countries',
-        'user_country_films' (films available in user's country)
+        'optimal_country_count' and 'user_country_films', or an empty dict if the
+        catalogue is not available.
     """
+    catalogue_path = _get_catalogue_path()
+    signature = _catalogue_signature(catalogue_path)
+    if signature is None:
+        return {}
+    country_key = user_country.upper()
+
+    cache = _read_plan_cache(catalogue_path)
+    if cache is not None and cache.get('signature') == signature and country_key in cache['plans']:
+        return cache['plans'][country_key]
+
     catalogue = load_country_catalogue()
     if not catalogue:
         return {}
+    generated = catalogue.get('generated')
+    if cache is None or generated is None or cache.get('generated') != generated:
+        # New catalogue version: earlier plans no longer apply
+        cache = {'version': PLAN_CACHE_VERSION, 'path': catalogue_path, 'generated': generated, 'plans': {}}
+    cache['signature'] = signature
 
-    user_country_lower = user_country.lower()
+    plan = cache['plans'].get(country_key)
+    if plan is None:
+        plan = cache['plans'][country_key] = _compute_plan(catalogue, user_country)
+    _write_plan_cache(cache)
+    return plan
 
-    # Build mappings
-    country_films = defaultdict(set)
-    all_films = set()
 
-    for film_id, countries in catalogue['films'].items():
-        film_id_int = int(film_id)
-        all_films.add(film_id_int)
-        for country in countries:
-            country_films[country].add(film_id_int)
+def get_optimal_countries(user_country: str) -> List[str]:
+    """
+    Use the greedy set cover algorithm to find the minimum set of countries
+    needed for 100% catalogue coverage, starting with the user's country.
 
-    optimal = get_optimal_countries(user_country)
+    Args:
+        user_country: ISO 3166-1 alpha-2 country code (e.g., 'CH', 'US')
+
+    Returns:
+        List of country codes in optimal order (user's country first),
+        or empty list if catalogue not available.
+    """
+    return list(get_coverage_plan(user_country).get('optimal_countries', []))
 
-    return {
-        'total_films': len(all_films),
-        'total_countries_available': len(country_films),
-        'optimal_countries': optimal,
-        'optimal_country_count': len(optimal),
-        'user_country_films': len(country_films.get(user_country_lower, set())),
-    }
 
+def get_coverage_stats(user_country: str) -> dict:
+    """
+    Get statistics about coverage optimization.
+
+    Returns:
+        dict with 'total_films', 'total_countries_available', 'optimal_countries',
+        'user_country_films' (films available in user's country)
+    """
+    return dict(get_coverage_plan(user_country))
@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 import xbmc
 import time
-from typing import List, Dict, Any, Callable
+import contextlib
+from typing import List, Dict, Any, Callable, Iterator, Optional
 from abc import ABC, abstractmethod
 
-import datetime
-import dateutil.parser
 
 class FilmDataSource:
     """
@@ -15,6 +14,14 @@ class FilmDataSource:
     def get_films(self, *args, **kwargs) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    def iter_films(self, *args, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Same films as get_films, yielded as soon as each one is final. By default
+        the full list is fetched first; sources that can release films earlier
+        override this.
+        """
+        yield from self.get_films(*args, **kwargs)
+
 class MubiApiDataSource(FilmDataSource):
     """
     Fetches film data directly from the Mubi API.
@@ -24,11 +31,51 @@ class MubiApiDataSource(FilmDataSource):
     # Countries to sync catalogues from (ISO 3166-1 alpha-2 codes)
     SYNC_COUNTRIES = ['CH', 'DE', 'US', 'GB', 'FR', 'JP']
 
-    def __init__(self, mubi_client):
+    # Parallel fetch defaults (overridable via addon settings)
+    DEFAULT_COUNTRY_WORKERS = 4
+    DEFAULT_REQUESTS_PER_SECOND = 5
+    MAX_COUNTRY_WORKERS = 8
+
+    # How often (seconds) the main thread wakes up to report progress while
+    # countries are being fetched in parallel
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, mubi_client, max_workers: int = None, requests_per_second: float = None):
         """
         :param mubi_client: Instance of the Mubi class to use for API calls
+        :param max_workers: Number of countries fetched concurrently. 1 = sequential.
+                            Defaults to the 'sync_country_workers' setting.
+        :param requests_per_second: Request budget shared by all workers.
+                                    Defaults to the 'sync_requests_per_second' setting.
         """
         self.mubi = mubi_client
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+
+    def _get_setting_int(self, setting_id: str, default: int) -> int:
+        """Read a positive integer addon setting, falling back to a default."""
+        try:
+            import xbmcaddon
+            value = xbmcaddon.Addon().getSettingInt(setting_id)
+            if isinstance(value, int) and value > 0:
+                return value
+        except Exception as e:
+            xbmc.log(f"Could not read setting '{setting_id}': {e}", xbmc.LOGDEBUG)
+        return default
+
+    def _resolve_parallel_settings(self):
+        """
+        :return: Tuple of (max_workers, requests_per_second) for this fetch.
+        """
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = self._get_setting_int("sync_country_workers", self.DEFAULT_COUNTRY_WORKERS)
+        max_workers = max(1, min(int(max_workers), self.MAX_COUNTRY_WORKERS))
+
+        rate = self.requests_per_second
+        if rate is None:
+            rate = self._get_setting_int("sync_requests_per_second", self.DEFAULT_REQUESTS_PER_SECOND)
+        return max_workers, rate
 
     def get_films(
         self, 
@@ -38,6 +85,10 @@ class MubiApiDataSource(FilmDataSource):
     ) -> List[Dict[str, Any]]:
         """
         Retrieves all films from MUBI API by syncing across specified countries.
+
+        When more than one country is requested and more than one worker is
+        configured, countries are fetched concurrently under a shared
+        request-rate budget and merged as each one completes.
         
         :param playable_only: If True, only fetch currently playable films.
         :param progress_callback: Optional callback function to report progress.
@@ -62,14 +113,89 @@ class MubiApiDataSource(FilmDataSource):
         all_film_ids = set()  # All unique film IDs across all countries
         all_film_data = {}  # {film_id: film_data} - merged data from all countries
         film_country_map = {}  # {film_id: {country: consumable_data}}
-        total_pages_fetched = 0
 
         xbmc.log(f"=" * 60, xbmc.LOGINFO)
         xbmc.log(f"MULTI-COUNTRY CATALOGUE SYNC (DataSource)", xbmc.LOGINFO)
         xbmc.log(f"Countries to sync: {', '.join(countries)} ({len(countries)} total)", xbmc.LOGINFO)
         xbmc.log(f"=" * 60, xbmc.LOGINFO)
 
-        # Fetch films from each country
+        max_workers, requests_per_second = self._resolve_parallel_settings()
+        if max_workers > 1 and len(countries) > 1:
+            completed = self._fetch_countries_parallel(
+                countries, playable_only, progress_callback, max_workers, requests_per_second,
+                all_film_ids, all_film_data, film_country_map, country_stats
+            )
+        elif max_workers > 1:
+            # Single country: parallelise its pages instead
+            with self._shared_rate_limiter(requests_per_second, max_workers):
+                completed = self._fetch_countries_sequential(
+                    countries, playable_only, progress_callback,
+                    all_film_ids, all_film_data, film_country_map, country_stats,
+                    page_workers=max_workers
+                )
+        else:
+            completed = self._fetch_countries_sequential(
+                countries, playable_only, progress_callback,
+                all_film_ids, all_film_data, film_country_map, country_stats
+            )
+
+        if not completed:
+            # User cancelled: return what was merged so far
+            return list(all_film_data.values())
+
+        total_pages_fetched = sum(stats['pages'] for stats in country_stats.values())
+
+        # Log comprehensive statistics
+        self._log_stats(countries, total_pages_fetched, all_film_ids, country_stats, film_country_map)
+        self._log_connection_stats()
+        self._log_throttle_stats()
+
+        # Attach available countries to the raw data so the hydrator can use it
+        output_list = []
+        for film_id, data in all_film_data.items():
+            # We inject the available countries into the raw data dictionary
+            # This avoids changing the API structure but allows passing this info along
+            data['available_countries'] = film_country_map.get(film_id, {})
+            output_list.append(data)
+            
+        return output_list
+
+    @contextlib.contextmanager
+    def _shared_rate_limiter(self, requests_per_second, burst):
+        """
+        Apply the sync's request budget to the process-wide API rate limiter.
+
+        The limiter keeps adapting (AIMD) within the budget; the previous
+        budget is restored when the fetch ends.
+        """
+        from .rate_limiter import AdaptiveRateLimiter, get_api_rate_limiter
+
+        installed = False
+        limiter = getattr(self.mubi, 'rate_limiter', None)
+        if not isinstance(limiter, AdaptiveRateLimiter):
+            previous_limiter = limiter
+            limiter = get_api_rate_limiter()
+            self.mubi.rate_limiter = limiter
+            installed = True
+
+        previous_budget = limiter.configure(max_rate=requests_per_second, burst=burst)
+        try:
+            yield limiter
+        finally:
+            limiter.configure(*previous_budget)
+            if installed:
+                self.mubi.rate_limiter = previous_limiter
+
+    def _fetch_countries_sequential(
+        self, countries, playable_only, progress_callback,
+        all_film_ids, all_film_data, film_country_map, country_stats, page_workers: int = 1
+    ) -> bool:
+        """
+        Fetch countries one after another, merging each into the shared maps.
+
+        :param page_workers: Pages fetched concurrently per country (1 = follow next_page links).
+        :return: False if the user cancelled, True otherwise.
+        """
         for country_idx, country in enumerate(countries, 1):
             xbmc.log("", xbmc.LOGINFO)
             xbmc.log(f"--- Country {country_idx}/{len(countries)}: {country} ---", xbmc.LOGINFO)
@@ -116,83 +242,216 @@ class MubiApiDataSource(FilmDataSource):
                     )
                 except Exception as e:
                     xbmc.log(f"Progress callback exception (user cancel): {e}", xbmc.LOGINFO)
-                    return list(all_film_data.values())
+                    return False
 
             # Use the mubi client's internal helper to fetch pages
             # We assume mubi._fetch_films_for_country is still available or we move it here?
             # Ideally we move it here or make it public. 
             # For now, we will access it as protected member since Mubi class is passed in.
+            fetch_kwargs = {}
+            if page_workers > 1:
+                fetch_kwargs['page_workers'] = page_workers
             film_ids, film_data, total_count, pages = self.mubi._fetch_films_for_country(
                 country_code=country,
                 playable_only=playable_only,
                 page_callback=page_cb,
-                global_film_ids=all_film_ids
+                global_film_ids=all_film_ids,
+                **fetch_kwargs
             )
 
             # Check if user cancelled during fetch
             if user_cancelled:
-                return list(all_film_data.values())
-
-            # Track statistics
-            country_stats[country] = {
-                'total_reported': total_count,
-                'unique_fetched': len(film_ids),
-                'pages': pages,
-                'film_ids': film_ids
-            }
-            total_pages_fetched += pages
-
-            # Track which films are in which countries and their consumable data
-            for film_id in film_ids:
-                if film_id not in film_country_map:
-                    film_country_map[film_id] = {}
-                
-                # Extract consumable data for this film in this country
-                this_film_data = film_data.get(film_id, {})
-                consumable = this_film_data.get('consumable') or {}  # Handle explicit null
-                
-                if consumable:
-                    # Prune playback_languages from country-specific data (now global)
-                    if 'playback_languages' in consumable:
-                        consumable = consumable.copy()
-                        consumable.pop('playback_languages', None)
-                    
-                    film_country_map[film_id][country] = consumable
-
-            # Merge new films into all_film_data
-            new_films_count = 0
-            for film_id, data in film_data.items():
-                if film_id not in all_film_data:
-                    # Clean the data - remove global 'consumable' if it exists to avoid confusion
-                    # We store country-specific consumable data in film_country_map
-                    clean_data = data.copy()
-                    
-                    # EXTRACT PLAYBACK LANGUAGES (Schema Update)
-                    # We promote playback_languages to top-level if present in consumable
-                    consumable = clean_data.get('consumable') or {}  # Handle explicit null
-                    if consumable and 'playback_languages' in consumable:
-                        clean_data['playback_languages'] = consumable['playback_languages']
-                    
-                    clean_data.pop('consumable', None) # Remove core consumable
-                    
-                    all_film_data[film_id] = clean_data
-                    all_film_ids.add(film_id)
-                    new_films_count += 1
-            
-            xbmc.log(f"[{country}] Added {new_films_count} new unique films to merged catalogue", xbmc.LOGINFO)
+                return False
 
-        # Log comprehensive statistics
-        self._log_stats(countries, total_pages_fetched, all_film_ids, country_stats, film_country_map)
+            self._merge_country_result(
+                country, film_ids, film_data, total_count, pages,
+                all_film_ids, all_film_data, film_country_map, country_stats
+            )
 
-        # Attach available countries to the raw data so the hydrator can use it
-        output_list = []
-        for film_id, data in all_film_data.items():
-            # We inject the available countries into the raw data dictionary
-            # This avoids changing the API structure but allows passing this info along
-            data['available_countries'] = film_country_map.get(film_id, {})
-            output_list.append(data)
+        return True
+
+    def _fetch_countries_parallel(
+        self, countries, playable_only, progress_callback, max_workers, requests_per_second,
+        all_film_ids, all_film_data, film_country_map, country_stats
+    ) -> bool:
+        """
+        Fetch several countries concurrently under a shared request-rate budget.
+
+        Worker threads only talk to the API; merging and progress reporting
+        happen on the calling thread, so the shared maps and the (UI-bound)
+        progress callback are never touched concurrently. A worker exception
+        stops the remaining workers and is re-raised.
+
+        :return: False if the user cancelled, True otherwise.
+        """
+        import concurrent.futures
+        import threading
+
+        workers = min(max_workers, len(countries))
+        xbmc.log(
+            f"Fetching {len(countries)} countries in parallel "
+            f"({workers} workers, {requests_per_second} requests/s budget)",
+            xbmc.LOGINFO
+        )
+
+        cancel_event = threading.Event()
+        running_lock = threading.Lock()
+        running_new_films = {}  # {country: globally new films seen so far (in flight)}
+
+        def create_page_callback(c_code):
+            def page_callback(new_films_this_page):
+                with running_lock:
+                    running_new_films[c_code] = running_new_films.get(c_code, 0) + new_films_this_page
+                return not cancel_event.is_set()
+            return page_callback
+
+        def fetch(c_code):
+            if cancel_event.is_set():
+                return None
+            # Snapshot of ids merged so far; the set itself keeps changing on the main thread
+            with running_lock:
+                known_ids = frozenset(all_film_ids)
+            return self.mubi._fetch_films_for_country(
+                country_code=c_code,
+                playable_only=playable_only,
+                page_callback=create_page_callback(c_code),
+                global_film_ids=known_ids
+            )
+
+        def report(completed_count, c_code):
+            if not progress_callback:
+                return True
+            with running_lock:
+                in_flight = sum(running_new_films.values())
+            try:
+                progress_callback(
+                    current_films=len(all_film_ids) + in_flight,
+                    total_films=0,
+                    current_country=min(completed_count + 1, len(countries)),
+                    total_countries=len(countries),
+                    country_code=c_code
+                )
+            except Exception as e:
+                xbmc.log(f"Progress callback exception (user cancel): {e}", xbmc.LOGINFO)
+                return False
+            return True
+
+        # Initial progress update before fetching
+        if not report(0, countries[0]):
+            return False
+
+        with self._shared_rate_limiter(requests_per_second, workers):
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            try:
+                future_to_country = {executor.submit(fetch, country): country for country in countries}
+                pending = set(future_to_country)
+                completed_count = 0
+                last_country = countries[0]
+                user_cancelled = False
+
+                while pending:
+                    done, pending = concurrent.futures.wait(
+                        pending,
+                        timeout=self.PROGRESS_INTERVAL,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+
+                    for future in done:
+                        country = future_to_country[future]
+                        try:
+                            result = future.result()
+                        except Exception:
+                            cancel_event.set()
+                            raise
+                        if result is None:
+                            continue
+
+                        film_ids, film_data, total_count, pages = result
+                        with running_lock:
+                            running_new_films.pop(country, None)
+                            self._merge_country_result(
+                                country, film_ids, film_data, total_count, pages,
+                                all_film_ids, all_film_data, film_country_map, country_stats
+                            )
+                        completed_count += 1
+                        last_country = country
+                        xbmc.log(
+                            f"[{country}] Completed ({completed_count}/{len(countries)} countries)",
+                            xbmc.LOGINFO
+                        )
+                        if not report(completed_count, country):
+                            user_cancelled = True
+                            break
+
+                    # Periodic update while countries are still in flight
+                    if not user_cancelled and not done and not report(completed_count, last_country):
+                        user_cancelled = True
+
+                    if user_cancelled:
+                        cancel_event.set()
+                        for future in pending:
+                            future.cancel()
+                        return False
+
+                return True
+            finally:
+                cancel_event.set()
+                # Do not block on workers that are finishing their current page after a cancel
+                executor.shutdown(wait=False)
+
+    def _merge_country_result(
+        self, country, film_ids, film_data, total_count, pages,
+        all_film_ids, all_film_data, film_country_map, country_stats
+    ):
+        """
+        Merge one country's fetch result into the shared catalogue maps.
+        """
+        # Track statistics
+        country_stats[country] = {
+            'total_reported': total_count,
+            'unique_fetched': len(film_ids),
+            'pages': pages,
+            'film_ids': film_ids
+        }
+
+        # Track which films are in which countries and their consumable data
+        for film_id in film_ids:
+            if film_id not in film_country_map:
+                film_country_map[film_id] = {}
             
-        return output_list
+            # Extract consumable data for this film in this country
+            this_film_data = film_data.get(film_id, {})
+            consumable = this_film_data.get('consumable') or {}  # Handle explicit null
+            
+            if consumable:
+                # Prune playback_languages from country-specific data (now global)
+                if 'playback_languages' in consumable:
+                    consumable = consumable.copy()
+                    consumable.pop('playback_languages', None)
+                
+                film_country_map[film_id][country] = consumable
+
+        # Merge new films into all_film_data
+        new_films_count = 0
+        for film_id, data in film_data.items():
+            if film_id not in all_film_data:
+                # Clean the data - remove global 'consumable' if it exists to avoid confusion
+                # We store country-specific consumable data in film_country_map
+                clean_data = data.copy()
+                
+                # EXTRACT PLAYBACK LANGUAGES (Schema Update)
+                # We promote playback_languages to top-level if present in consumable
+                consumable = clean_data.get('consumable') or {}  # Handle explicit null
+                if consumable and 'playback_languages' in consumable:
+                    clean_data['playback_languages'] = consumable['playback_languages']
+                
+                clean_data.pop('consumable', None) # Remove core consumable
+                
+                all_film_data[film_id] = clean_data
+                all_film_ids.add(film_id)
+                new_films_count += 1
+        
+        xbmc.log(f"[{country}] Added {new_films_count} new unique films to merged catalogue", xbmc.LOGINFO)
 
     def _log_stats(self, countries, total_pages_fetched, all_film_ids, country_stats, film_country_map):
         xbmc.log(f"", xbmc.LOGINFO)
@@ -232,34 +491,163 @@ class MubiApiDataSource(FilmDataSource):
 
         xbmc.log(f"=" * 60, xbmc.LOGINFO)
 
+    def _log_connection_stats(self):
+        """Log how many API requests reused a pooled keep-alive connection."""
+        try:
+            stats = self.mubi.get_connection_stats()
+            xbmc.log(
+                f"HTTP connection reuse: {stats['requests']} requests, "
+                f"{stats['connections_opened']} connections opened, "
+                f"{stats['connections_reused']} reused",
+                xbmc.LOGINFO
+            )
+        except Exception as e:
+            xbmc.log(f"Could not read connection stats: {e}", xbmc.LOGDEBUG)
+
+        try:
+            cache_stats = self.mubi.get_cache_stats()
+            xbmc.log(
+                f"HTTP response cache: {cache_stats['hits']} fresh hits, "
+                f"{cache_stats['revalidated']} not modified (304), "
+                f"{cache_stats['misses']} downloaded",
+                xbmc.LOGINFO
+            )
+        except Exception as e:
+            xbmc.log(f"Could not read cache stats: {e}", xbmc.LOGDEBUG)
+
+    def _log_throttle_stats(self):
+        """Log how the shared API rate limiter behaved during the fetch."""
+        try:
+            stats = self.mubi.rate_limiter.get_stats()
+            xbmc.log(
+                f"API rate limiter: {stats['requests']} requests, "
+                f"{stats['total_wait']:.1f}s waited, {stats['rate_limited']} rate-limit responses, "
+                f"rate {stats['current_rate']:.1f}/{stats['max_rate']:.1f} req/s",
+                xbmc.LOGINFO
+            )
+        except Exception as e:
+            xbmc.log(f"Could not read rate limiter stats: {e}", xbmc.LOGDEBUG)
+
+
+class _HashingReader:
+    """
+    File-like reader over downloaded chunks that hashes every byte it hands out.
+    """
+
+    def __init__(self, chunks, hasher, sink=None):
+        """
+        :param chunks: Iterable of downloaded byte chunks.
+        :param hasher: hashlib object updated with every chunk.
+        :param sink: Optional callable receiving every chunk (e.g. to keep a copy on disk).
+        """
+        self._chunks = iter(chunks)
+        self._hasher = hasher
+        self._sink = sink
+        self._pending = b''
+        self.bytes_read = 0
+
+    def _next_chunk(self) -> bytes:
+        for chunk in self._chunks:
+            if chunk:
+                self._hasher.update(chunk)
+                if self._sink is not None:
+                    self._sink(chunk)
+                self.bytes_read += len(chunk)
+                return chunk
+        return b''
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            data = self._pending + b''.join(iter(self._next_chunk, b''))
+            self._pending = b''
+            return data
+        while len(self._pending) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._pending += chunk
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def drain(self):
+        """Consume (and hash) whatever the parser did not read."""
+        self._pending = b''
+        while self._next_chunk():
+            pass
+
 
 class GithubDataSource(FilmDataSource):
     """
     Fetches film data from a pre-computed JSON file hosted on GitHub.
     URL: https://github.com/kubi2021/plugin.video.mubi/raw/database/v1/films.json.gz
+
+    The file is streamed: chunks are hashed as they arrive, decompressed
+    incrementally and parsed one film at a time, so only the films that pass
+    the country filter are kept in memory.
+
+    A verified copy of the database and its parsed index is kept in the addon
+    profile. The small .md5 file is fetched first and, when it matches the
+    local copy, the download and decompression are skipped entirely. When the
+    local copy is only a few releases behind, the published per-film deltas
+    are applied to it instead of downloading the full file. A single-country
+    sync without a local copy downloads only that country's shard.
     """
 
     GITHUB_URL = "https://github.com/kubi2021/plugin.video.mubi/raw/database/v1/films.json.gz"
+    DELTAS_URL = "https://github.com/kubi2021/plugin.video.mubi/raw/database/v1/deltas/"
+    SHARDS_URL = "https://github.com/kubi2021/plugin.video.mubi/raw/database/v1/countries/"
+    SHARD_VERSION = 1
     SUPPORTED_VERSIONS = [1]  # Supported schema versions
+    STREAM_CHUNK_SIZE = 64 * 1024
+    # Replay at most this many deltas, and only if they are much smaller than the full file
+    MAX_DELTA_STEPS = 10
+    MAX_DELTA_SIZE_RATIO = 0.5
 
-    def get_films(self, *args, **kwargs) -> List[Dict[str, Any]]:
+    def __init__(self, cache=None):
         """
-        Downloads, decompresses, and parses films.json.gz from GitHub.
-        
-        :kwargs countries: List[str] of country codes to filter by (optional). 
-                           If provided, only films available in at least one of these countries 
-                           (and currently live/within date range) will be returned.
+        :param cache: Optional GithubDatabaseCache; defaults to one in the profile cache directory.
+        """
+        self._cache = cache
+
+    def _get_cache(self):
         """
+        :return: The local GithubDatabaseCache, or None if the profile is not writable.
+        """
+        if self._cache is None:
+            try:
+                from .github_cache import GithubDatabaseCache
+                from .profile_cache import get_cache_dir
+            except ImportError:
+                from github_cache import GithubDatabaseCache
+                from profile_cache import get_cache_dir
+            try:
+                self._cache = GithubDatabaseCache(get_cache_dir('github'))
+            except OSError as e:
+                xbmc.log(f"GitHub database cache unavailable: {e}", xbmc.LOGWARNING)
+                self._cache = False
+        return self._cache or None
+
+    def _get_shard_cache(self, country: str):
+        """
+        :return: GithubDatabaseCache holding the local copy of one country's shard, or None.
+        """
+        try:
+            from .github_cache import GithubDatabaseCache
+            from .profile_cache import get_cache_dir
+        except ImportError:
+            from github_cache import GithubDatabaseCache
+            from profile_cache import get_cache_dir
+        try:
+            return GithubDatabaseCache(get_cache_dir('github', 'countries', country))
+        except OSError as e:
+            xbmc.log(f"GitHub shard cache unavailable: {e}", xbmc.LOGWARNING)
+            return None
+
+    def _create_session(self):
         import requests
         from requests.adapters import HTTPAdapter
         from requests.packages.urllib3.util.retry import Retry
-        import hashlib
-        import gzip
-        import json
-        import io
-        
-        xbmc.log(f"Starting GitHub Sync from {self.GITHUB_URL}", xbmc.LOGINFO)
-        
+
         # Configure retry strategy
         retry_strategy = Retry(
             total=3,
@@ -271,129 +659,95 @@ class GithubDataSource(FilmDataSource):
         session = requests.Session()
         session.mount("https://", adapter)
         session.mount("http://", adapter)
+        return session
+
+    def _fetch_expected_md5(self, session) -> str:
+        md5_url = self.GITHUB_URL + ".md5"
+        xbmc.log(f"Downloading MD5 checksum from {md5_url}", xbmc.LOGINFO)
+        md5_response = session.get(md5_url, timeout=10)
+        md5_response.raise_for_status()
+        return md5_response.text.strip().split()[0] # Handle potentially "hash filename" format
+
+    def get_films(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Downloads, decompresses, and parses films.json.gz from GitHub.
+        
+        :kwargs countries: List[str] of country codes to filter by (optional). 
+                           If provided, only films available in at least one of these countries 
+                           (and currently live/within date range) will be returned.
+        """
+        return self._fetch_films(kwargs.get('countries'), stream=False)
+
+    def iter_films(self, *args, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Like get_films, but when the local copy is current its films are read,
+        filtered and yielded one at a time instead of being collected first.
+        A download is only released once its MD5 has been verified.
+        """
+        yield from self._fetch_films(kwargs.get('countries'), stream=True)
+
+    def _fetch_films(self, target_countries, stream: bool):
+        """
+        :param stream: If True and the local copy is current, return a lazy iterator over its films.
+        :return: List of films (or an iterator, see stream).
+        """
+        import requests
+        import gzip
+        import json
+        import zlib
+        
+        xbmc.log(f"Starting GitHub Sync from {self.GITHUB_URL}", xbmc.LOGINFO)
+
+        if target_countries:
+            # Normalize countries to uppercase
+            target_countries = [c.upper() for c in target_countries]
+            xbmc.log(f"Filtering films for countries: {target_countries}", xbmc.LOGINFO)
+        
+        session = self._create_session()
+        cache = self._get_cache()
         
         try:
             # 1. Download MD5 checksum
-            md5_url = self.GITHUB_URL + ".md5"
-            xbmc.log(f"Downloading MD5 checksum from {md5_url}", xbmc.LOGINFO)
-            md5_response = session.get(md5_url, timeout=10)
-            md5_response.raise_for_status()
-            expected_md5 = md5_response.text.strip().split()[0] # Handle potentially "hash filename" format
-            
-            # 2. Download the file content
-            xbmc.log(f"Downloading database from {self.GITHUB_URL}", xbmc.LOGINFO)
-            response = session.get(self.GITHUB_URL, stream=True, timeout=30)
-            response.raise_for_status()
-            content = response.content
-
-            # 3. Verify MD5
-            calculated_md5 = hashlib.md5(content).hexdigest()
-            if calculated_md5 != expected_md5:
-                # Log detailed error for debugging
-                xbmc.log(f"MD5 Mismatch! Expected: {expected_md5}, Calculated: {calculated_md5}", xbmc.LOGERROR)
-                raise ValueError(f"MD5 verification failed. Integrity check failed for {self.GITHUB_URL}")
-            
-            xbmc.log("MD5 verification successful", xbmc.LOGINFO)
+            try:
+                expected_md5 = self._fetch_expected_md5(session)
+            except requests.exceptions.RequestException as e:
+                header = cache.read_header() if cache else None
+                if not header:
+                    raise
+                xbmc.log(f"Could not check for a newer database ({e}), using the local copy", xbmc.LOGWARNING)
+                expected_md5 = header.get('md5')
 
-            # 4. Decompress and parse
-            with gzip.GzipFile(fileobj=io.BytesIO(content)) as gz:
-                data = json.load(gz)
-            
-            # 5. Check version compatibility
-            meta = data.get("meta", {})
-            version = meta.get("version", 1)
-            version_label = meta.get("version_label", "unknown")
-            
-            if version not in self.SUPPORTED_VERSIONS:
-                xbmc.log(f"Warning: Schema version {version} ({version_label}) not officially supported", xbmc.LOGWARNING)
-            else:
-                xbmc.log(f"Schema version: {version} ({version_label})", xbmc.LOGINFO)
-            
-            # 6. Parse films (best-effort - outer exception handler will catch failures)
-            films_list = data.get("items", [])
-            
-            # Normalization: Map 'mubi_id' to 'id' if 'id' is missing
-            # The plugin expects 'id'
-            for film in films_list:
-                if 'id' not in film and 'mubi_id' in film:
-                    film['id'] = film['mubi_id']
-                
-                # Normalize 'directors' from list of strings to list of dicts
-                # API returns [{'name': 'Director Name'}], GitHub JSON has ['Director Name']
-                if 'directors' in film and isinstance(film['directors'], list):
-                    if film['directors'] and isinstance(film['directors'][0], str):
-                        film['directors'] = [{'name': d} for d in film['directors']]
+            # 2. Use the local copy if it is still current, or patch it with the published deltas
+            if cache and stream and cache.has_index(expected_md5):
+                return self._stream_cached_films(cache, target_countries)
+            if cache:
+                films = self._get_cached_films(cache, expected_md5, target_countries)
+                if films is not None:
+                    return films
+                if self._apply_deltas(session, cache, expected_md5):
+                    films = self._get_cached_films(cache, expected_md5, target_countries)
+                    if films is not None:
+                        return films
 
-            xbmc.log(f"Successfully downloaded and parsed {len(films_list)} films from GitHub", xbmc.LOGINFO)
-            
-            # --- FILTERING LOGIC ---
-            target_countries = kwargs.get('countries')
-            if target_countries:
-                # Normalize countries to uppercase
-                target_countries = [c.upper() for c in target_countries]
-                xbmc.log(f"Filtering films for countries: {target_countries}", xbmc.LOGINFO)
-                
-                filtered_list = []
-                now = datetime.datetime.now(datetime.timezone.utc)
-                
-                for film in films_list:
-                    available_countries = film.get('available_countries', {})
-                    if not available_countries:
-                        continue
-                        
-                    is_available = False
-                    
-                    # Check if film is available in ANY of the target countries
-                    for country_code in target_countries:
-                        if country_code in available_countries:
-                            details = available_countries[country_code]
-                            
-                            # Check date availability (logic mirrored from NavigationHandler._is_country_available)
-                            # 1. Date range check
-                            available_at = details.get('available_at')
-                            expires_at = details.get('expires_at')
-                            
-                            country_available = True
-                            
-                            if available_at or expires_at:
-                                try:
-                                    if available_at:
-                                        start_dt = dateutil.parser.parse(available_at)
-                                        if not start_dt.tzinfo:
-                                            start_dt = start_dt.replace(tzinfo=datetime.timezone.utc)
-                                        if now < start_dt:
-                                            country_available = False
-                                    
-                                    if country_available and expires_at:
-                                        end_dt = dateutil.parser.parse(expires_at)
-                                        if not end_dt.tzinfo:
-                                            end_dt = end_dt.replace(tzinfo=datetime.timezone.utc)
-                                        if now > end_dt:
-                                            country_available = False
-                                except Exception as e:
-                                    xbmc.log(f"Error parsing dates for film {film.get('id', '?')}: {e}", xbmc.LOGWARNING)
-                                    # Fallback to simple check
-                                    country_available = details.get('availability') == 'live'
-                            else:
-                                # 2. Simple check
-                                country_available = details.get('availability') == 'live'
-                            
-                            if country_available:
-                                is_available = True
-                                break # Found a valid country, keep the film
-                    
-                    if is_available:
-                        filtered_list.append(film)
-                
-                xbmc.log(f"Filtered count: {len(filtered_list)} (from {len(films_list)} total)", xbmc.LOGINFO)
-                return filtered_list
+            # 3. A single country only needs its own shard
+            if target_countries and len(target_countries) == 1:
+                films = self._get_shard_films(session, target_countries[0], expected_md5)
+                if films is not None:
+                    return films
 
-            return films_list
+            # 4. Stream the file: hash, decompress, parse and filter film by film
+            xbmc.log(f"Downloading database from {self.GITHUB_URL}", xbmc.LOGINFO)
+            response = session.get(self.GITHUB_URL, stream=True, timeout=30)
+            response.raise_for_status()
+            return self._parse_database(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE),
+                expected_md5, target_countries, cache
+            )
 
         except requests.exceptions.RequestException as e:
             xbmc.log(f"Error downloading file from GitHub: {e}", xbmc.LOGERROR)
             raise
-        except (gzip.BadGzipFile, json.JSONDecodeError) as e:
+        except (gzip.BadGzipFile, EOFError, zlib.error, json.JSONDecodeError) as e:
             xbmc.log(f"Error parsing GitHub data: {e}", xbmc.LOGERROR)
             raise
         except Exception as e:
@@ -402,3 +756,378 @@ class GithubDataSource(FilmDataSource):
         finally:
             session.close()
 
+    def refresh(self) -> bool:
+        """
+        Bring the local copy up to date without returning any films (used by the
+        background refresh service).
+
+        :return: True if a new database was downloaded.
+        """
+        cache = self._get_cache()
+        if not cache:
+            return False
+        session = self._create_session()
+        try:
+            expected_md5 = self._fetch_expected_md5(session)
+            if cache.has_index(expected_md5):
+                xbmc.log("GitHub database unchanged, local copy is current", xbmc.LOGDEBUG)
+                return False
+            if cache.file_md5() == expected_md5:
+                # Only the parsed index is missing: rebuild it from the local file
+                self._parse_database(cache.iter_db_chunks(), expected_md5, None, cache, keep_raw=False)
+                return False
+            if self._apply_deltas(session, cache, expected_md5):
+                return True
+            response = session.get(self.GITHUB_URL, stream=True, timeout=30)
+            response.raise_for_status()
+            self._parse_database(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE),
+                expected_md5, None, cache, collect=False
+            )
+            xbmc.log("Downloaded a new copy of the GitHub database", xbmc.LOGINFO)
+            return True
+        except Exception as e:
+            xbmc.log(f"Background refresh of the GitHub database failed: {e}", xbmc.LOGWARNING)
+            return False
+        finally:
+            session.close()
+
+    def _get_cached_films(self, cache, expected_md5: str, target_countries) -> Optional[List[Dict[str, Any]]]:
+        """
+        :return: Filtered films from the local copy, or None if it does not match expected_md5.
+        """
+        if cache.has_index(expected_md5):
+            xbmc.log("GitHub database unchanged, using the local copy", xbmc.LOGINFO)
+            try:
+                return self._filter_films(cache.iter_films(), target_countries)
+            except (OSError, ValueError) as e:
+                xbmc.log(f"Local GitHub database index is unreadable, rebuilding: {e}", xbmc.LOGWARNING)
+        if cache.file_md5() == expected_md5:
+            xbmc.log("Rebuilding GitHub database index from the local copy", xbmc.LOGINFO)
+            try:
+                return self._parse_database(cache.iter_db_chunks(), expected_md5, target_countries,
+                                            cache, keep_raw=False)
+            except Exception as e:
+                xbmc.log(f"Local GitHub database copy is unusable, downloading again: {e}", xbmc.LOGWARNING)
+        return None
+
+    def _stream_cached_films(self, cache, target_countries) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the filtered films of the verified local copy as they are read from its index.
+        """
+        try:
+            from .availability import filter_available
+        except ImportError:
+            from availability import filter_available
+
+        xbmc.log("GitHub database unchanged, streaming films from the local copy", xbmc.LOGINFO)
+        total_films = 0
+        kept_films = 0
+
+        def normalized():
+            nonlocal total_films
+            for film in cache.iter_films():
+                total_films += 1
+                self._normalize_film(film)
+                yield film
+
+        for film in filter_available(normalized(), target_countries):
+            kept_films += 1
+            yield film
+
+        xbmc.log(f"Streamed {kept_films} of {total_films} films from the local GitHub database", xbmc.LOGINFO)
+
+    def _fetch_manifest(self, session, url: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: Parsed JSON manifest, or None if it is not published or unreadable.
+        """
+        import requests
+
+        try:
+            response = session.get(url, timeout=10)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            manifest = response.json()
+            return manifest if isinstance(manifest, dict) else None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            xbmc.log(f"Could not fetch {url}: {e}", xbmc.LOGDEBUG)
+            return None
+
+    def _get_shard_films(self, session, country: str, expected_md5: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch the films of one country from its shard instead of the worldwide file.
+
+        :param country: Upper-case ISO 3166-1 alpha-2 code.
+        :param expected_md5: MD5 of the current worldwide file; shards cut from an
+                             older release are not used.
+        :return: Films available in the country, or None to fall back to the full file.
+        """
+        manifest = self._fetch_manifest(session, self.SHARDS_URL + "index.json")
+        if not manifest or manifest.get('version') != self.SHARD_VERSION:
+            return None
+        if manifest.get('source_md5') and manifest['source_md5'] != expected_md5:
+            xbmc.log("Country shards are not from the current release, using the full database", xbmc.LOGINFO)
+            return None
+        entry = (manifest.get('countries') or {}).get(country)
+        if not isinstance(entry, dict) or not entry.get('file') or not entry.get('md5'):
+            xbmc.log(f"No shard published for {country}, using the full database", xbmc.LOGINFO)
+            return None
+
+        shard_cache = self._get_shard_cache(country)
+        try:
+            if shard_cache:
+                films = self._get_cached_films(shard_cache, entry['md5'], [country])
+                if films is not None:
+                    return films
+            shard_url = self.SHARDS_URL + entry['file']
+            xbmc.log(f"Downloading {country} shard ({entry.get('size', '?')} bytes) from {shard_url}", xbmc.LOGINFO)
+            response = session.get(shard_url, stream=True, timeout=30)
+            response.raise_for_status()
+            return self._parse_database(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE),
+                entry['md5'], [country], shard_cache, source_url=shard_url
+            )
+        except Exception as e:
+            xbmc.log(f"Could not use the {country} shard, using the full database: {e}", xbmc.LOGWARNING)
+            return None
+
+    def _fetch_delta(self, session, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Download and verify one delta file.
+
+        :raises ValueError: If the file does not match the manifest.
+        """
+        import gzip
+        import hashlib
+        import json
+
+        response = session.get(self.DELTAS_URL + entry['file'], timeout=30)
+        response.raise_for_status()
+        content = response.content
+        if entry.get('md5') and hashlib.md5(content).hexdigest() != entry['md5']:
+            raise ValueError(f"MD5 verification failed for delta {entry['file']}")
+        delta = json.loads(gzip.decompress(content).decode('utf-8'))
+        meta = delta.get('meta', {})
+        if meta.get('from') != entry.get('from') or meta.get('to') != entry.get('to'):
+            raise ValueError(f"Delta {entry['file']} does not match the manifest")
+        return delta
+
+    def _apply_deltas(self, session, cache, expected_md5: str) -> bool:
+        """
+        Bring the local index up to expected_md5 by replaying published deltas.
+
+        :return: True if the local index now matches expected_md5; False means
+                 the full file has to be downloaded.
+        """
+        try:
+            from .database_delta import (
+                compose_deltas, film_key, find_chain, items_digest_from_hashes, record_hash
+            )
+        except ImportError:
+            from database_delta import (
+                compose_deltas, film_key, find_chain, items_digest_from_hashes, record_hash
+            )
+
+        header = cache.read_header()
+        if not header or not header.get('md5'):
+            return False
+
+        manifest = self._fetch_manifest(session, self.DELTAS_URL + "index.json")
+        if not manifest:
+            return False
+        chain = find_chain(manifest, header['md5'], expected_md5, self.MAX_DELTA_STEPS)
+        if not chain:
+            xbmc.log("Local GitHub database is too far behind for deltas, downloading the full file",
+                     xbmc.LOGINFO)
+            return False
+        delta_size = sum(entry.get('size', 0) for entry in chain)
+        full_size = manifest.get('full_size') or 0
+        if full_size and delta_size > full_size * self.MAX_DELTA_SIZE_RATIO:
+            xbmc.log("GitHub database deltas are not worth it, downloading the full file", xbmc.LOGINFO)
+            return False
+
+        writer = None
+        try:
+            deltas = [self._fetch_delta(session, entry) for entry in chain]
+            upserts, removed, fields = compose_deltas(deltas)
+
+            writer = cache.writer()
+            hashes = []
+            for record in cache.iter_films():
+                key = film_key(record)
+                if key in removed:
+                    continue
+                record = upserts.pop(key, record)
+                writer.write_film(record)
+                hashes.append(record_hash(record))
+            for record in upserts.values():
+                writer.write_film(record)
+                hashes.append(record_hash(record))
+
+            expected_digest = chain[-1].get('to_digest')
+            if expected_digest and items_digest_from_hashes(hashes) != expected_digest:
+                raise ValueError("Patched GitHub database does not match the published release")
+        except Exception as e:
+            xbmc.log(f"Could not apply GitHub database deltas, downloading the full file: {e}", xbmc.LOGWARNING)
+            if writer:
+                writer.discard()
+            return False
+
+        # The compressed copy is now stale; only the patched index matches expected_md5
+        if not writer.commit(expected_md5, fields.get('meta', header.get('meta')), replace_db=False):
+            return False
+        cache.remove_db_copy()
+        xbmc.log(f"Applied {len(chain)} GitHub database delta(s) ({delta_size} bytes)", xbmc.LOGINFO)
+        return True
+
+    def _filter_films(self, films, target_countries) -> List[Dict[str, Any]]:
+        try:
+            from .availability import filter_available
+        except ImportError:
+            from availability import filter_available
+
+        total_films = 0
+
+        def normalized():
+            nonlocal total_films
+            for film in films:
+                total_films += 1
+                self._normalize_film(film)
+                yield film
+
+        films_list = list(filter_available(normalized(), target_countries))
+        xbmc.log(f"Loaded {total_films} films from the local GitHub database", xbmc.LOGINFO)
+        if target_countries:
+            xbmc.log(f"Filtered count: {len(films_list)} (from {total_films} total)", xbmc.LOGINFO)
+        return films_list
+
+    def _parse_database(self, chunks, expected_md5: str, target_countries, cache=None,
+                        keep_raw: bool = True, collect: bool = True,
+                        source_url: str = None) -> List[Dict[str, Any]]:
+        """
+        Hash, decompress, parse and filter the database film by film, storing a
+        verified copy in the cache on the way.
+
+        :param chunks: Iterable of gzip-compressed byte chunks.
+        :param expected_md5: Published MD5 of the file.
+        :param target_countries: Upper-case country codes to filter by, or None.
+        :param cache: Optional GithubDatabaseCache to store the copy and index in.
+        :param keep_raw: If False, the compressed bytes are already cached and only the index is rebuilt.
+        :param collect: If False, films are only indexed and an empty list is returned.
+        :param source_url: URL the bytes came from (defaults to the worldwide file), for errors.
+        :return: Films that passed the country filter.
+        """
+        import hashlib
+        import json
+        import zlib
+        try:
+            from .availability import filter_available
+        except ImportError:
+            from availability import filter_available
+
+        writer = None
+        if cache:
+            try:
+                writer = cache.writer()
+            except OSError as e:
+                xbmc.log(f"Not keeping a local copy of the GitHub database: {e}", xbmc.LOGWARNING)
+
+        hasher = hashlib.md5()
+        sink = writer.write_raw if writer and keep_raw else None
+        reader = _HashingReader(chunks, hasher, sink)
+        fields = {}
+        films_list = []
+        total_films = 0
+
+        def indexed():
+            nonlocal total_films
+            for film in self._iter_items(reader, fields):
+                total_films += 1
+                if writer:
+                    # The index keeps records as published so deltas apply to them verbatim
+                    writer.write_film(film)
+                self._normalize_film(film)
+                yield film
+
+        try:
+            try:
+                if collect:
+                    films_list = list(filter_available(indexed(), target_countries))
+                else:
+                    for _ in indexed():
+                        pass
+            except (OSError, EOFError, zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+                # A corrupt download is reported as such rather than as a parse error
+                reader.drain()
+                self._verify_md5(hasher.hexdigest(), expected_md5, source_url)
+                raise
+            reader.drain()
+
+            # Verify MD5 (nothing is returned or cached from an unverified download)
+            self._verify_md5(hasher.hexdigest(), expected_md5, source_url)
+            xbmc.log(f"MD5 verification successful ({reader.bytes_read} bytes)", xbmc.LOGINFO)
+        except BaseException:
+            if writer:
+                writer.discard()
+            raise
+
+        # Check version compatibility
+        meta = fields.get("meta", {})
+        version = meta.get("version", 1)
+        version_label = meta.get("version_label", "unknown")
+        
+        if version not in self.SUPPORTED_VERSIONS:
+            xbmc.log(f"Warning: Schema version {version} ({version_label}) not officially supported", xbmc.LOGWARNING)
+        else:
+            xbmc.log(f"Schema version: {version} ({version_label})", xbmc.LOGINFO)
+
+        if writer:
+            writer.commit(expected_md5, meta, replace_db=keep_raw)
+
+        xbmc.log(f"Successfully downloaded and parsed {total_films} films from GitHub", xbmc.LOGINFO)
+        if target_countries:
+            xbmc.log(f"Filtered count: {len(films_list)} (from {total_films} total)", xbmc.LOGINFO)
+        return films_list
+
+    def _iter_items(self, reader, fields: Dict[str, Any]):
+        """
+        Decompress and parse the database incrementally.
+
+        :param reader: File-like object returning the gzip-compressed bytes.
+        :param fields: Dict receiving the top-level members other than 'items' (e.g. 'meta').
+        :return: Iterator over the raw film dictionaries.
+        """
+        import gzip
+        import io
+        try:
+            from .json_stream import iter_json_array
+        except ImportError:
+            from json_stream import iter_json_array
+
+        with gzip.GzipFile(fileobj=reader) as gz:
+            text = io.TextIOWrapper(gz, encoding='utf-8')
+            chunks = iter(lambda: text.read(self.STREAM_CHUNK_SIZE), '')
+            yield from iter_json_array(chunks, 'items', fields)
+
+    def _verify_md5(self, calculated_md5: str, expected_md5: str, source_url: str = None):
+        if calculated_md5 != expected_md5:
+            # Log detailed error for debugging
+            xbmc.log(f"MD5 Mismatch! Expected: {expected_md5}, Calculated: {calculated_md5}", xbmc.LOGERROR)
+            raise ValueError(f"MD5 verification failed. Integrity check failed for {source_url or self.GITHUB_URL}")
+
+    @staticmethod
+    def _normalize_film(film: Dict[str, Any]):
+        """
+        Bring a database entry to the shape of an API film, in place.
+        """
+        # Normalization: Map 'mubi_id' to 'id' if 'id' is missing
+        # The plugin expects 'id'
+        if 'id' not in film and 'mubi_id' in film:
+            film['id'] = film['mubi_id']
+        
+        # Normalize 'directors' from list of strings to list of dicts
+        # API returns [{'name': 'Director Name'}], GitHub JSON has ['Director Name']
+        if 'directors' in film and isinstance(film['directors'], list):
+            if film['directors'] and isinstance(film['directors'][0], str):
+                film['directors'] = [{'name': d} for d in film['directors']]
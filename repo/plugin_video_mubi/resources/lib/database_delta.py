@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Per-film deltas between releases of the GitHub film database.
+
+The backend (backend/generate_delta.py) publishes, next to films.json.gz, a
+chain of deltas listing the film records added, changed and removed since
+the previous release, plus a deltas/index.json manifest. A client whose
+local copy is a few releases behind replays the chain on its local index
+instead of downloading the full file. record_hash and items_digest must stay
+identical to the backend's, since the digest is how a patched index is
+verified against the published release.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DELTA_VERSION = 1
+
+
+def film_key(record: Dict[str, Any]) -> Optional[str]:
+    """
+    :return: The record's mubi_id as a string, or None if it has none.
+    """
+    key = record.get('mubi_id', record.get('id'))
+    return str(key) if key is not None else None
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """
+    Hash of a film record's canonical JSON form.
+    """
+    encoded = json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def items_digest_from_hashes(hashes: Iterable[str]) -> str:
+    return hashlib.sha256('\n'.join(sorted(hashes)).encode('utf-8')).hexdigest()
+
+
+def items_digest(items: Iterable[Dict[str, Any]]) -> str:
+    """
+    Order-independent digest of a list of film records.
+    """
+    return items_digest_from_hashes(record_hash(record) for record in items)
+
+
+def find_chain(manifest: Dict[str, Any], from_md5: str, to_md5: str,
+               max_steps: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Find the deltas leading from one release to another.
+
+    :param manifest: Parsed deltas/index.json.
+    :param from_md5: MD5 of the local copy.
+    :param to_md5: MD5 of the published release.
+    :param max_steps: Longest chain worth replaying.
+    :return: Manifest entries in the order to apply them, or None if there is no usable chain.
+    """
+    if not isinstance(manifest, dict) or manifest.get('version') != DELTA_VERSION:
+        return None
+    by_source = {}
+    for entry in manifest.get('deltas', []):
+        if isinstance(entry, dict) and entry.get('from') and entry.get('file'):
+            by_source[entry['from']] = entry
+
+    chain = []
+    current = from_md5
+    while current != to_md5:
+        entry = by_source.get(current)
+        if entry is None or len(chain) >= max_steps:
+            return None
+        chain.append(entry)
+        current = entry.get('to')
+    return chain or None
+
+
+def compose_deltas(deltas: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Set[str], Dict[str, Any]]:
+    """
+    Fold consecutive deltas into one.
+
+    :param deltas: Parsed delta files, oldest first.
+    :return: Tuple (upserts, removed, fields): records to add or replace keyed by
+             mubi_id, mubi_ids to drop, and the newest top-level fields (e.g. 'meta').
+    """
+    upserts: Dict[str, Dict[str, Any]] = {}
+    removed: Set[str] = set()
+    fields: Dict[str, Any] = {}
+    for delta in deltas:
+        for record in list(delta.get('added', [])) + list(delta.get('changed', [])):
+            key = film_key(record)
+            if key is None:
+                continue
+            upserts[key] = record
+            removed.discard(key)
+        for key in delta.get('removed', []):
+            key = str(key)
+            upserts.pop(key, None)
+            removed.add(key)
+        fields = delta.get('fields', fields)
+    return upserts, removed, fields
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Background refresh of the local GitHub film database.
+
+Runs inside the addon's Kodi service. When enabled in the settings it checks
+the published .md5 every few hours and downloads the database only when it
+changed, so the next fast sync can be served from the local copy.
+"""
+
+import time
+
+import xbmc
+import xbmcaddon
+
+from .data_source import GithubDataSource
+
+
+class DatabaseRefreshService:
+    """
+    Periodically refreshes the local copy of the GitHub database.
+    """
+
+    STARTUP_DELAY = 60  # seconds, keeps the check out of Kodi's busy startup
+    CHECK_INTERVAL = 15 * 60  # seconds between looking at the settings
+    DEFAULT_REFRESH_HOURS = 12
+
+    def __init__(self, monitor=None, data_source=None):
+        """
+        :param monitor: xbmc.Monitor used to wait and to detect Kodi shutting down.
+        :param data_source: GithubDataSource to refresh (created on first use).
+        """
+        self.monitor = monitor or xbmc.Monitor()
+        self.data_source = data_source
+        self.last_refresh = None
+
+    def is_enabled(self) -> bool:
+        addon = xbmcaddon.Addon()
+        return (addon.getSettingBool('enable_fast_sync') is True
+                and addon.getSettingBool('github_db_background_refresh') is True)
+
+    def refresh_interval(self) -> float:
+        """
+        :return: Seconds between two refreshes.
+        """
+        hours = xbmcaddon.Addon().getSettingInt('github_db_refresh_hours')
+        if not isinstance(hours, int) or hours <= 0:
+            hours = self.DEFAULT_REFRESH_HOURS
+        return hours * 3600.0
+
+    def run_once(self, now: float = None) -> bool:
+        """
+        Refresh the database if the feature is enabled and a refresh is due.
+
+        :param now: Current Unix time.
+        :return: True if a refresh was attempted.
+        """
+        if not self.is_enabled():
+            return False
+        now = now if now is not None else time.time()
+        if self.last_refresh is not None and now - self.last_refresh < self.refresh_interval():
+            return False
+        self.last_refresh = now
+        if self.data_source is None:
+            self.data_source = GithubDataSource()
+        xbmc.log("Checking for a new GitHub film database", xbmc.LOGDEBUG)
+        self.data_source.refresh()
+        return True
+
+    def run(self):
+        """
+        Service loop; returns when Kodi asks the service to stop.
+        """
+        if self.monitor.waitForAbort(self.STARTUP_DELAY):
+            return
+        while not self.monitor.abortRequested():
+            try:
+                self.run_once()
+            except Exception as e:
+                xbmc.log(f"GitHub database refresh failed: {e}", xbmc.LOGWARNING)
+            if self.monitor.waitForAbort(self.CHECK_INTERVAL):
+                break
@@ -3,6 +3,7 @@
 from .base import BaseMetadataProvider, ExternalMetadataResult
 
 from .factory import MetadataProviderFactory
+from .id_cache import ExternalIdCache
 from .omdb_provider import OMDBProvider
 from .tmdb_provider import TMDBProvider
 from .title_utils import RetryStrategy, TitleNormalizer
@@ -10,6 +11,7 @@ from .title_utils import RetryStrategy, TitleNormalizer
 __all__ = [
     "BaseMetadataProvider",
     "ExternalMetadataResult",
+    "ExternalIdCache",
     "MetadataProviderFactory",
     "OMDBProvider",
     "TMDBProvider",
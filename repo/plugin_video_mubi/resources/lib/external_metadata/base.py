@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+
 
 @dataclass
 class ExternalMetadataResult:
@@ -16,14 +20,52 @@ class ExternalMetadataResult:
     source_provider: str = ""
     success: bool = False
     error_message: Optional[str] = None
+    # The provider answered every search and none matched (unlike network,
+    # HTTP or quota errors, this is worth remembering)
+    not_found: bool = False
 
 
 class BaseMetadataProvider(ABC):
-    """Abstract base class for external metadata providers."""
+    """
+    Abstract base class for external metadata providers.
+
+    Providers are meant to be long-lived (see MetadataProviderFactory): all
+    their requests go through one pooled keep-alive session, shared by the
+    sync workers, and a successful test_connection is remembered.
+    """
+
+    # Keep-alive connections kept per host; extra workers open (and drop) their own
+    POOL_MAXSIZE = 10
 
     def __init__(self, api_key: str, config: Optional[Dict[str, Any]] = None) -> None:
         self.api_key = api_key
         self.config = config or {}
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._connection_ok = False
+
+    @property
+    def session(self) -> requests.Session:
+        """The provider's HTTP session, created on first use."""
+        with self._session_lock:
+            if self._session is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get(self, url: str, **kwargs: Any):
+        """Send a GET request over the provider's pooled session."""
+        return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     @abstractmethod
     def get_imdb_id(
@@ -38,7 +80,7 @@ class BaseMetadataProvider(ABC):
 
     @abstractmethod
     def test_connection(self) -> bool:
-        """Test whether the provider is reachable."""
+        """Test whether the provider is reachable (only successes are remembered)."""
         ...
 
     @property
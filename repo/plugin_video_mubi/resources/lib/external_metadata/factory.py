@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import Any, Dict, Optional
 import xbmc
 import xbmcaddon
@@ -21,7 +22,15 @@ class MetadataProviderFactory:
     - TMDB preferred when available
     - Falls back to OMDB if only OMDB key available
     - Returns None if no keys configured
+
+    Between begin_sync() and end_sync() the selected provider is kept: every
+    film of the sync reuses it (and its pooled connections) without reading
+    the settings again.
     """
+
+    _sync_depth = 0
+    _sync_provider: Optional[BaseMetadataProvider] = None
+    _lock = threading.Lock()
     
     @staticmethod
     def _get_api_keys() -> tuple[str, str]:
@@ -50,8 +59,49 @@ class MetadataProviderFactory:
         """Open the addon settings dialog."""
         xbmcaddon.Addon().openSettings()
 
+    @classmethod
+    def begin_sync(cls):
+        """Keep the provider selected next until the matching end_sync()."""
+        with cls._lock:
+            cls._sync_depth += 1
+
+    @classmethod
+    def end_sync(cls):
+        """Release the sync's provider and close its connections."""
+        with cls._lock:
+            if cls._sync_depth == 0:
+                return
+            cls._sync_depth -= 1
+            if cls._sync_depth:
+                return
+            provider = cls._sync_provider
+            cls._sync_provider = None
+        if provider is not None:
+            provider.close()
+
+    @classmethod
+    def get_provider(cls) -> Optional[BaseMetadataProvider]:
+        """
+        Return the provider of the sync in progress, or select a new one.
+
+        :return: Provider instance or None
+        """
+        with cls._lock:
+            if cls._sync_depth and cls._sync_provider is not None:
+                return cls._sync_provider
+        provider = cls._create_provider()
+        # No provider is not kept: keys entered during the sync (settings dialog) are picked up
+        if provider is not None:
+            with cls._lock:
+                if cls._sync_depth:
+                    if cls._sync_provider is not None:
+                        # Another worker selected it first
+                        return cls._sync_provider
+                    cls._sync_provider = provider
+        return provider
+
     @staticmethod
-    def get_provider() -> Optional[BaseMetadataProvider]:
+    def _create_provider() -> Optional[BaseMetadataProvider]:
         """
         Automatically select and instantiate the best available provider.
         
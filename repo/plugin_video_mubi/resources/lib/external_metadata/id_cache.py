@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import xbmc
+
+from ..profile_cache import get_cache_dir
+from .base import ExternalMetadataResult
+
+SCHEMA = """
+CREATE TABLE ids (
+    key TEXT PRIMARY KEY,
+    found INTEGER NOT NULL,
+    imdb_id TEXT,
+    imdb_url TEXT,
+    tmdb_id TEXT,
+    source_provider TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+
+# Error message of a cached "no match" answer
+NOT_FOUND_PREFIX = "No match found"
+
+
+class ExternalIdCache:
+    """
+    Persistent cache of external id lookups, stored in the profile cache folder.
+
+    Entries are keyed both by MUBI film id and by (title, original title, year),
+    so a film keeps its ids when its library folder is recreated and a title
+    seen under another MUBI id is not looked up again. Without a year a title
+    is too ambiguous to share, so only the MUBI id key is used. Found ids are
+    kept until the cache is cleared; "no match" answers are kept per provider
+    (a TMDB miss does not stop an OMDb lookup) and expire after NEGATIVE_TTL
+    seconds so films that providers add later are eventually found. Transient
+    errors are never cached.
+    """
+
+    FILE_NAME = "external_ids.db"
+    SCHEMA_VERSION = 3
+    NEGATIVE_TTL = 14 * 24 * 3600
+
+    _instances: Dict[Path, "ExternalIdCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        """
+        :param path: Database file (created if missing).
+        :raises sqlite3.Error: If the database cannot be opened.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._connect()
+        except sqlite3.DatabaseError as e:
+            xbmc.log(f"Discarding unreadable external id cache: {e}", xbmc.LOGWARNING)
+            self._conn.close()
+            self.path.unlink()
+            self._connect()
+
+    @classmethod
+    def open(cls) -> Optional["ExternalIdCache"]:
+        """
+        :return: The shared cache of the current profile, or None if it cannot be used.
+        """
+        try:
+            path = get_cache_dir() / cls.FILE_NAME
+        except OSError as e:
+            xbmc.log(f"External id cache unavailable: {e}", xbmc.LOGWARNING)
+            return None
+        with cls._instances_lock:
+            cache = cls._instances.get(path)
+            if cache is None or not cache.path.exists():
+                try:
+                    cache = cls(path)
+                except (sqlite3.Error, OSError) as e:
+                    xbmc.log(f"External id cache unavailable: {e}", xbmc.LOGWARNING)
+                    return None
+                cls._instances[path] = cache
+            return cache
+
+    def _connect(self) -> None:
+        # Films are written from the sync worker threads
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS ids")
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def make_keys(mubi_id, title: str, original_title: Optional[str], year) -> list:
+        """
+        :return: Cache keys of a film, most specific first.
+        """
+        def normalize(value) -> str:
+            return " ".join(str(value or "").split()).casefold()
+
+        keys = [f"mubi:{mubi_id}"] if mubi_id else []
+        if year:
+            keys.append(f"title:{normalize(title)}|{normalize(original_title)}|{normalize(year)}")
+        return keys
+
+    @staticmethod
+    def _miss_key(key: str, provider_name: str) -> str:
+        return f"{key}#miss:{provider_name}"
+
+    @staticmethod
+    def is_cacheable(result: ExternalMetadataResult) -> bool:
+        """
+        :return: True for found ids and definitive "no match" answers (result.not_found),
+            never for network, HTTP or quota errors that are worth retrying on the next sync.
+        """
+        return result.success or result.not_found
+
+    def _read(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                return self._conn.execute(
+                    "SELECT found, imdb_id, imdb_url, tmdb_id, source_provider, checked_at "
+                    "FROM ids WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                xbmc.log(f"External id cache read failed: {e}", xbmc.LOGWARNING)
+                return None
+
+    def get(self, mubi_id, title: str, original_title: Optional[str], year,
+            provider_name: Optional[str] = None, now: float = None) -> Optional[ExternalMetadataResult]:
+        """
+        :param provider_name: Provider that would be asked; only its "no match" answers count.
+        :return: The cached lookup result, or None if the film must be looked up.
+        """
+        now = time.time() if now is None else now
+        keys = self.make_keys(mubi_id, title, original_title, year)
+        for key in keys:
+            row = self._read(key)
+            if row is not None and row[0]:
+                _, imdb_id, imdb_url, tmdb_id, source_provider, _ = row
+                return ExternalMetadataResult(
+                    imdb_id=imdb_id, imdb_url=imdb_url, tmdb_id=tmdb_id,
+                    source_provider=source_provider, success=True,
+                )
+        if not provider_name:
+            return None
+        for key in keys:
+            row = self._read(self._miss_key(key, provider_name))
+            if row is not None and now - row[5] < self.NEGATIVE_TTL:
+                return ExternalMetadataResult(
+                    source_provider=row[4], success=False,
+                    error_message=f"{NOT_FOUND_PREFIX} (cached)", not_found=True,
+                )
+        return None
+
+    def put(self, mubi_id, title: str, original_title: Optional[str], year,
+            result: ExternalMetadataResult, provider_name: Optional[str] = None,
+            now: float = None) -> bool:
+        """
+        Store a lookup result under all the film's keys.
+
+        :param provider_name: Provider that answered (defaults to result.source_provider).
+        :return: True if it was stored, False if it is not cacheable or the write failed.
+        """
+        if not self.is_cacheable(result):
+            return False
+        provider_name = result.source_provider or provider_name or ""
+        if not result.success and not provider_name:
+            return False
+        now = time.time() if now is None else now
+        keys = self.make_keys(mubi_id, title, original_title, year)
+        if not result.success:
+            keys = [self._miss_key(key, provider_name) for key in keys]
+        rows = [
+            (key, int(result.success), result.imdb_id, result.imdb_url,
+             str(result.tmdb_id) if result.tmdb_id else None, provider_name, now)
+            for key in keys
+        ]
+        with self._lock:
+            if self._conn is None:
+                return False
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO ids "
+                        "(key, found, imdb_id, imdb_url, tmdb_id, source_provider, checked_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                    )
+            except sqlite3.Error as e:
+                xbmc.log(f"External id cache write failed: {e}", xbmc.LOGWARNING)
+                return False
+        return True
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 import requests
 import xbmc
 
+from ..rate_limiter import get_provider_rate_limiter
 from .base import BaseMetadataProvider, ExternalMetadataResult
 from .title_utils import TitleNormalizer, RetryStrategy
 
@@ -22,6 +23,7 @@ class OMDBProvider(BaseMetadataProvider):
             max_retries=self.config.get("max_retries", 10),
             initial_backoff=self.config.get("backoff_factor", 1.0),
             multiplier=self.config.get("backoff_multiplier", 1.5),
+            rate_limiter=get_provider_rate_limiter(self.provider_name),
         )
 
 
@@ -40,11 +42,17 @@ class OMDBProvider(BaseMetadataProvider):
 
 
         variants = self.title_normalizer.generate_title_variants(title, original_title)
+        # Stays True only while OMDb answers "not found" for every variant
+        not_found = True
+        error_message = "No match found"
         for variant in variants:
             result = self._request_with_retry(variant, year, media_type)
             if result.success:
 
                 return result
+            not_found = not_found and result.not_found
+            if not result.not_found:
+                error_message = result.error_message or error_message
 
         xbmc.log(
             f"OMDB: Failed to find IMDB ID for '{title}'",
@@ -54,7 +62,8 @@ class OMDBProvider(BaseMetadataProvider):
         result = ExternalMetadataResult(
             success=False,
             source_provider=self.provider_name,
-            error_message="No match found",
+            error_message="No match found" if not_found else f"Lookup failed: {error_message}",
+            not_found=not_found,
         )
 
 
@@ -82,7 +91,7 @@ class OMDBProvider(BaseMetadataProvider):
 
     def _make_request(self, params: Dict[str, str]) -> ExternalMetadataResult:
         try:
-            response = requests.get(self.API_URL, params=params, timeout=10)
+            response = self._get(self.API_URL, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -100,10 +109,12 @@ class OMDBProvider(BaseMetadataProvider):
                     success=True,
                 )
 
+            error = str(data.get("Error") or "")
             return ExternalMetadataResult(
                 success=False,
                 source_provider=self.provider_name,
-                error_message="No IMDB ID returned",
+                error_message=f"No IMDB ID returned: {error}" if error else "No IMDB ID returned",
+                not_found=data.get("Response") == "False" and "not found" in error.lower(),
             )
         except requests.exceptions.HTTPError:
             raise
@@ -116,13 +127,16 @@ class OMDBProvider(BaseMetadataProvider):
             )
 
     def test_connection(self) -> bool:
+        if self._connection_ok:
+            return True
         try:
-            response = requests.get(
+            response = self._get(
                 self.API_URL,
                 params={"apikey": self.api_key, "t": "test", "type": "movie"},
                 timeout=10,
             )
-            return response.status_code == 200
+            self._connection_ok = response.status_code == 200
+            return self._connection_ok
         except Exception:  # pragma: no cover
             xbmc.log("OMDB: Connection test failed", xbmc.LOGERROR)
             return False
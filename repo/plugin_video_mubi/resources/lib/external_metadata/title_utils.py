@@ -175,17 +175,25 @@ class TitleNormalizer:
 
 
 class RetryStrategy:
-    """Utility for retrying OMDB requests with exponential backoff."""
+    """
+    Utility for retrying provider requests with exponential backoff.
+
+    With a rate_limiter (an AdaptiveRateLimiter shared by all users of the
+    provider), every attempt waits for a request slot, and a 429 slows the
+    limiter down and pauses every caller instead of sleeping this thread only.
+    """
 
     def __init__(
         self,
         max_retries: int = 10,
         initial_backoff: float = 1.0,
         multiplier: float = 1.5,
+        rate_limiter=None,
     ) -> None:
         self.max_retries = max_retries
         self.initial_backoff = initial_backoff
         self.multiplier = multiplier
+        self.rate_limiter = rate_limiter
 
     def execute(
         self,
@@ -200,14 +208,30 @@ class RetryStrategy:
                 xbmc.LOGDEBUG,
             )
 
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
             try:
                 result = func()
-                if result.success:
-                    return result
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
                 return result
 
             except requests.exceptions.HTTPError as error:
-                status_code = error.response.status_code if error.response else None
+                status_code = error.response.status_code if error.response is not None else None
+                if status_code == 429 and self.rate_limiter is not None:
+                    retry_after = error.response.headers.get("Retry-After")
+                    try:
+                        retry_after = float(retry_after) if retry_after else None
+                    except ValueError:
+                        retry_after = None
+                    # The next acquire() waits for the pause, together with all other workers
+                    wait_time = self.rate_limiter.on_rate_limited(retry_after)
+                    xbmc.log(
+                        f"HTTP 429 received for '{title}'. Requests paused for {wait_time:.1f}s",
+                        xbmc.LOGWARNING,
+                    )
+                    continue
                 if status_code in [401, 402, 429]:
                     retry_after = error.response.headers.get("Retry-After")
                     wait_time = backoff
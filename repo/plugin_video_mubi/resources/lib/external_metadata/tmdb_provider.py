@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-import requests
 import xbmc
 
+from ..rate_limiter import get_provider_rate_limiter
 from .base import BaseMetadataProvider, ExternalMetadataResult
 from .title_utils import TitleNormalizer, RetryStrategy
 
@@ -31,6 +31,7 @@ class TMDBProvider(BaseMetadataProvider):
             max_retries=self.config.get("max_retries", 3),
             initial_backoff=self.config.get("backoff_factor", 1.0),
             multiplier=self.config.get("backoff_multiplier", 1.5),
+            rate_limiter=get_provider_rate_limiter(self.provider_name),
         )
         
 
@@ -66,26 +67,37 @@ class TMDBProvider(BaseMetadataProvider):
              search_candidates.insert(1, original_title)
 
         tmdb_id = None
+        # Stays True only while every search gets an answer without a match
+        not_found = True
+        error_message = "No match found"
         
         for candidate in search_candidates:
             # 1. Try strict search with year
-            tmdb_id = self._search_movie(candidate, year)
-            if tmdb_id:
-                break
-                
+            searches = [(year, None)]
             # 2. If year provided, try searching WITHOUT year (fuzzy match)
             # This handles cases where MUBI year is off by ±1 year
             if year:
-                xbmc.log(f"TMDB: Trying fuzzy year search for '{candidate}'", xbmc.LOGDEBUG)
-                tmdb_id = self._search_movie(candidate, year=None, target_year=year)
-                if tmdb_id:
+                searches.append((None, year))
+            
+            for search_year, target_year in searches:
+                if target_year:
+                    xbmc.log(f"TMDB: Trying fuzzy year search for '{candidate}'", xbmc.LOGDEBUG)
+                search = self._search(candidate, search_year, target_year)
+                if search.success and search.tmdb_id:
+                    tmdb_id = int(search.tmdb_id)
                     break
+                not_found = not_found and search.not_found
+                if not search.not_found:
+                    error_message = search.error_message or error_message
+            if tmdb_id:
+                break
         
         if not tmdb_id:
             result = ExternalMetadataResult(
                 success=False,
                 source_provider=self.provider_name,
-                error_message="No match found"
+                error_message="No match found" if not_found else f"Lookup failed: {error_message}",
+                not_found=not_found,
             )
             return result
             
@@ -103,6 +115,16 @@ class TMDBProvider(BaseMetadataProvider):
         :param title: Title to search for
         :param year: Strict year filter for API
         :param target_year: Use for fuzzy matching when year is None (±1 year tolerance)
+        :return: TMDB id of the match, or None
+        """
+        result = self._search(title, year, target_year)
+        return int(result.tmdb_id) if result.success and result.tmdb_id else None
+
+    def _search(self, title: str, year: Optional[int], target_year: Optional[int] = None) -> ExternalMetadataResult:
+        """
+        Search for a movie, see _search_movie.
+        
+        :return: The match (tmdb_id set), or a failure with not_found set when TMDB answered without a match
         """
         params = {
             "api_key": self.api_key,
@@ -114,7 +136,7 @@ class TMDBProvider(BaseMetadataProvider):
             params["year"] = str(year)
             
         def do_search() -> ExternalMetadataResult:
-            response = requests.get(f"{self.BASE_URL}/search/movie", params=params, timeout=10)
+            response = self._get(f"{self.BASE_URL}/search/movie", params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -124,7 +146,8 @@ class TMDBProvider(BaseMetadataProvider):
                 return ExternalMetadataResult(
                     success=False,
                     source_provider=self.provider_name,
-                    error_message="No match found"
+                    error_message="No match found",
+                    not_found=True,
                 )
                 
             # If target_year is provided (fuzzy search), find best match
@@ -149,7 +172,8 @@ class TMDBProvider(BaseMetadataProvider):
                 return ExternalMetadataResult(
                     success=False,
                     source_provider=self.provider_name,
-                    error_message=f"No match found within 2 years of {target_year}"
+                    error_message=f"No match found within 2 years of {target_year}",
+                    not_found=True,
                 )
                 
             # Return the ID of the first result (default strict behavior)
@@ -162,27 +186,30 @@ class TMDBProvider(BaseMetadataProvider):
         try:
             # retry_strategy expects a function that returns ExternalMetadataResult
             result = self.retry_strategy.execute(do_search, title)
-            
             if result.success and result.tmdb_id:
-                return int(result.tmdb_id)
-            return None
+                int(result.tmdb_id)  # Raises on a malformed id, like a failed search
+            return result
             
         except Exception as e:
             xbmc.log(f"TMDB: Search failed for '{title}': {e}", xbmc.LOGWARNING)
-            return None
+            return ExternalMetadataResult(
+                success=False,
+                source_provider=self.provider_name,
+                error_message=str(e),
+            )
 
     def _get_movie_details(self, tmdb_id: int) -> ExternalMetadataResult:
         """Get movie details including external IDs."""
-        try:
-            # We need the external_ids, which can be fetched with append_to_response
-            # or via a separate endpoint. append_to_response is efficient.
-            url = f"{self.BASE_URL}/movie/{tmdb_id}"
-            params = {
-                "api_key": self.api_key,
-                "append_to_response": "external_ids"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+        # We need the external_ids, which can be fetched with append_to_response
+        # or via a separate endpoint. append_to_response is efficient.
+        url = f"{self.BASE_URL}/movie/{tmdb_id}"
+        params = {
+            "api_key": self.api_key,
+            "append_to_response": "external_ids"
+        }
+
+        def fetch_details() -> ExternalMetadataResult:
+            response = self._get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -200,23 +227,25 @@ class TMDBProvider(BaseMetadataProvider):
                 result_data["imdb_url"] = f"https://www.imdb.com/title/{imdb_id}/"
                 
             return ExternalMetadataResult(**result_data)
-            
-        except Exception as e:
-            xbmc.log(f"TMDB: Failed to get details for ID {tmdb_id}: {e}", xbmc.LOGERROR)
-            return ExternalMetadataResult(
-                success=False,
-                source_provider=self.provider_name,
-                error_message=str(e)
-            )
+
+        # Throttled and retried on 429 like the searches
+        result = self.retry_strategy.execute(fetch_details, f"TMDB ID {tmdb_id}")
+        if not result.success:
+            xbmc.log(f"TMDB: Failed to get details for ID {tmdb_id}: {result.error_message}", xbmc.LOGERROR)
+            result.source_provider = self.provider_name
+        return result
 
     def test_connection(self) -> bool:
         """Test whether the provider is reachable."""
+        if self._connection_ok:
+            return True
         try:
-            response = requests.get(
+            response = self._get(
                 f"{self.BASE_URL}/configuration",
                 params={"api_key": self.api_key},
                 timeout=10
             )
-            return response.status_code == 200
+            self._connection_ok = response.status_code == 200
+            return self._connection_ok
         except Exception:
             return False
@@ -1,18 +1,26 @@
+import hashlib
 import os
 from pathlib import Path
 import xbmc
 import xml.etree.ElementTree as ET
-import requests
 from requests.exceptions import RequestException
 import json
-import time
 import re
 from typing import Optional, List
-from .external_metadata import MetadataProviderFactory
-from datetime import datetime, timezone
+from .external_metadata import ExternalIdCache, MetadataProviderFactory
+from .availability import is_live_in, playable_window
+from .artwork_store import ArtworkStore
+from .artwork_tier import estimate_savings, get_artwork_tier, is_downloaded
 
 
 class Film:
+    # refresh_nfo results
+    NFO_UNCHANGED = "UNCHANGED"
+    NFO_UPDATED = "UPDATED"
+    NFO_STALE = "STALE"
+    # Bump when the availability section's layout changes, so stored hashes stop matching
+    NFO_STATE_VERSION = 1
+
     def __init__(self, mubi_id: str, title: str, artwork: str, web_url: str, metadata,
                  available_countries: dict = None):
         if not mubi_id or not metadata:
@@ -32,6 +40,8 @@ class Film:
         # Dictionary of country codes where this film is available with availability details
         # Format: {'code': {'availability': 'live', 'expires_at': ..., ...}}
         self.available_countries = available_countries or {}
+        # Estimated artwork bytes not downloaded because of the artwork tier (set by _download_all_artwork)
+        self.artwork_bytes_saved = 0
 
     def __eq__(self, other):
         if not isinstance(other, Film):
@@ -50,34 +60,7 @@ class Film:
         
         :return: True if playable in at least one country, False otherwise.
         """
-        if not self.available_countries:
-            return False
-            
-        now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-        
-        for details in self.available_countries.values():
-            if not details:
-                continue
-                
-            available_at = details.get('available_at')
-            availability_ends_at = details.get('availability_ends_at')
-            
-            # If available_at is missing, assume not started yet (safe default)
-            if not available_at:
-                continue
-                
-            # Check start time
-            if now < available_at:
-                continue
-                
-            # Check end time (if present)
-            if availability_ends_at and now > availability_ends_at:
-                continue
-                
-            # If we got here, it's valid for this country
-            return True
-            
-        return False
+        return is_live_in(self.available_countries, rule=playable_window)
 
 
     def __hash__(self):
@@ -297,16 +280,25 @@ class Film:
             # Skip if explicitly requested (e.g. GitHub sync)
             if not skip_external_metadata:
                 provider = MetadataProviderFactory.get_provider()
-                
-                if provider:
-                    time.sleep(1) # Small delay to be nice to APIs
+                provider_name = provider.provider_name if provider else None
+                id_cache = ExternalIdCache.open()
+                lookup = (self.mubi_id, self.title, self.metadata.originaltitle, self.metadata.year)
+                result = id_cache.get(*lookup, provider_name=provider_name) if id_cache else None
+
+                if result:
+                    xbmc.log(f"Using cached external ids for '{self.title}'", xbmc.LOGDEBUG)
+                elif provider:
+                    # Requests are paced by the provider's shared rate limiter
                     result = provider.get_imdb_id(
                         title=self.title,
                         original_title=self.metadata.originaltitle,
                         year=self.metadata.year,
                         media_type="movie"
                     )
+                    if id_cache:
+                        id_cache.put(*lookup, result, provider_name=provider_name)
 
+                if result:
                     if result.success:
                         if result.imdb_id:
                             imdb_id = result.imdb_id
@@ -358,24 +350,108 @@ class Film:
         try:
             # Parse the existing NFO file
             tree = ET.parse(nfo_file)
-            root = tree.getroot()
+        except ET.ParseError as e:
+            xbmc.log(f"Failed to parse NFO file for '{self.title}': {e}", xbmc.LOGERROR)
+            return False
+        except OSError as e:
+            xbmc.log(f"Failed to update NFO file for '{self.title}': {e}", xbmc.LOGERROR)
+            return False
+        return self._write_nfo_availability(tree, nfo_file)
+
+    def refresh_nfo(self, nfo_file: Path) -> Optional[str]:
+        """
+        Bring an existing NFO file up to date with the film's availability and rating.
+
+        The file is parsed once. It carries a hash of the inputs its availability
+        and rating were written from (see nfo_state_hash); if it matches, nothing
+        is written, so re-syncing an unchanged library does not rewrite every NFO.
+
+        :param nfo_file: Path to the existing NFO file.
+        :return:
+            - NFO_UNCHANGED if the file is already up to date (not written).
+            - NFO_UPDATED if the availability section was rewritten.
+            - NFO_STALE if the rating differs or the file is unreadable: the NFO must be recreated.
+            - None if the file could not be written.
+        """
+        try:
+            tree = ET.parse(nfo_file)
+        except (ET.ParseError, OSError) as e:
+            xbmc.log(f"Cannot read NFO file for '{self.title}', recreating it: {e}", xbmc.LOGWARNING)
+            return self.NFO_STALE
+
+        root = tree.getroot()
+        state_hash = root.find("mubi_sync_hash")
+        if state_hash is not None and state_hash.text == self.nfo_state_hash():
+            return self.NFO_UNCHANGED
+
+        if not self._is_rating_synced_in(root):
+            return self.NFO_STALE
+
+        return self.NFO_UPDATED if self._write_nfo_availability(tree, nfo_file) else None
+
+    def nfo_state_hash(self) -> str:
+        """
+        Hash of the availability and rating inputs of the NFO, stored in its
+        mubi_sync_hash element.
+        """
+        state = {
+            'version': self.NFO_STATE_VERSION,
+            'countries': self.available_countries,
+            'rating': getattr(self.metadata, 'rating', None),
+            'bayesian_rating': getattr(self.metadata, 'bayesian_rating', None),
+        }
+        encoded = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def sync_fingerprint(self) -> str:
+        """
+        Hash of everything the film's folder is built from (metadata, availability,
+        rating, artwork), recorded in the sync manifest.
+        """
+        metadata = vars(self.metadata) if hasattr(self.metadata, '__dict__') else self.metadata
+        state = {
+            'version': self.NFO_STATE_VERSION,
+            'mubi_id': str(self.mubi_id),
+            'title': self.title,
+            'artwork': self.artwork,
+            'web_url': self.web_url,
+            'metadata': metadata,
+            'countries': self.available_countries,
+        }
+        encoded = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def _set_nfo_state_hash(self, movie: ET.Element) -> None:
+        """
+        Record nfo_state_hash in the NFO so the next sync can skip rewriting it.
+        """
+        state_hash = movie.find("mubi_sync_hash")
+        if state_hash is None:
+            state_hash = ET.SubElement(movie, "mubi_sync_hash")
+        state_hash.text = self.nfo_state_hash()
+
+    def _write_nfo_availability(self, tree: ET.ElementTree, nfo_file: Path) -> bool:
+        """
+        Replace the availability section of a parsed NFO and write it back.
+
+        :return: True if successful, False if failed.
+        """
+        root = tree.getroot()
 
-            # Remove existing mubi_availability element if present
-            existing_availability = root.find("mubi_availability")
-            if existing_availability is not None:
-                root.remove(existing_availability)
+        # Remove existing mubi_availability element if present
+        existing_availability = root.find("mubi_availability")
+        if existing_availability is not None:
+            root.remove(existing_availability)
 
-            # Add updated availability information
-            self._add_mubi_availability_to_tree(root)
+        # Add updated availability information
+        self._add_mubi_availability_to_tree(root)
+        self._set_nfo_state_hash(root)
 
+        try:
             # Write back to file
             tree.write(nfo_file, encoding="utf-8", xml_declaration=False)
             xbmc.log(f"Updated MUBI availability for '{self.title}'", xbmc.LOGDEBUG)
             return True
-
-        except ET.ParseError as e:
-            xbmc.log(f"Failed to parse NFO file for '{self.title}': {e}", xbmc.LOGERROR)
-            return False
         except OSError as e:
             xbmc.log(f"Failed to update NFO file for '{self.title}': {e}", xbmc.LOGERROR)
             return False
@@ -393,8 +469,16 @@ class Film:
             
         try:
             tree = ET.parse(nfo_file)
-            root = tree.getroot()
-            
+            return self._is_rating_synced_in(tree.getroot())
+        except Exception as e:
+            xbmc.log(f"Error checking rating sync for '{self.title}': {e}", xbmc.LOGWARNING)
+            return False
+
+    def _is_rating_synced_in(self, root: ET.Element) -> bool:
+        """
+        is_rating_synced for an already parsed NFO.
+        """
+        try:
             # Find rating elements
             # XML path: movie -> ratings -> rating
             ratings_node = root.find("ratings")
@@ -689,6 +773,7 @@ class Film:
 
         # Add MUBI availability information (countries where this film is available)
         self._add_mubi_availability_to_tree(movie)
+        self._set_nfo_state_hash(movie)
 
         return ET.tostring(movie)
 
@@ -774,13 +859,7 @@ class Film:
 
             # Download the thumbnail
             xbmc.log(f"Downloading thumbnail for '{self.title}' from {image_url}", xbmc.LOGDEBUG)
-            response = requests.get(image_url, timeout=30, stream=True)
-            response.raise_for_status()
-
-            # Save the thumbnail locally
-            with open(local_thumbnail_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            self._fetch_artwork(image_url, local_thumbnail_path)
 
             xbmc.log(f"Successfully downloaded thumbnail for '{self.title}' to {local_thumbnail_path}", xbmc.LOGDEBUG)
             return str(local_thumbnail_path)
@@ -795,6 +874,10 @@ class Film:
 
         :param film_path: Path to the film folder
         :param film_folder_name: Sanitized folder name for the film
+        Artwork types the artwork tier does not keep are not downloaded. Only
+        artwork missing from the film folder, and actually transferred when kept,
+        counts towards artwork_bytes_saved.
+
         :return: Dictionary mapping artwork types to local file paths
         """
         artwork_paths = {}
@@ -802,6 +885,10 @@ class Film:
         try:
             # Get artwork URLs from metadata
             artwork_urls = self._get_all_artwork_urls()
+            tier = get_artwork_tier()
+            self.artwork_bytes_saved = 0
+            # Types whose download was avoided or made smaller by the tier
+            saved_types = []
 
             for artwork_type, url in artwork_urls.items():
                 if not url:
@@ -837,15 +924,14 @@ class Film:
                         artwork_paths[artwork_type] = str(local_path)
                         continue
 
+                    if not is_downloaded(artwork_type, tier):
+                        saved_types.append(artwork_type)
+                        continue
+
                     # Download the artwork
                     xbmc.log(f"Downloading {artwork_type} for '{self.title}' from {url}", xbmc.LOGDEBUG)
-                    response = requests.get(url, timeout=30, stream=True)
-                    response.raise_for_status()
-
-                    # Save the artwork locally
-                    with open(local_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                    if self._fetch_artwork(url, local_path) == 'downloaded':
+                        saved_types.append(artwork_type)
 
                     artwork_paths[artwork_type] = str(local_path)
                     xbmc.log(f"Successfully downloaded {artwork_type} for '{self.title}' to {local_path}", xbmc.LOGDEBUG)
@@ -854,12 +940,37 @@ class Film:
                     xbmc.log(f"Failed to download {artwork_type} for '{self.title}': {e}", xbmc.LOGWARNING)
                     continue
 
+            self.artwork_bytes_saved = estimate_savings(saved_types, tier)
             return artwork_paths
 
         except Exception as e:
             xbmc.log(f"Error downloading artwork for '{self.title}': {e}", xbmc.LOGERROR)
             return {}
 
+    def _fetch_artwork(self, url: str, local_path: Path) -> str:
+        """
+        Save an image to local_path, through the artwork store when it is available
+        (no transfer for an image downloaded before, e.g. for a renamed or re-added film).
+
+        :return: 'stored', 'revalidated' or 'downloaded' (see ArtworkStore.fetch).
+        :raises Exception: If the download failed.
+        """
+        store = ArtworkStore.open()
+        if store is not None:
+            outcome = store.fetch(url, local_path)
+            xbmc.log(f"Artwork {url}: {outcome}", xbmc.LOGDEBUG)
+            return outcome
+
+        response = ArtworkStore.http_get(url, timeout=30, stream=True)
+        try:
+            response.raise_for_status()
+            with open(local_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+        finally:
+            response.close()
+        return 'downloaded'
+
     def _get_all_artwork_urls(self) -> dict:
         """
         Get all available artwork URLs from metadata.
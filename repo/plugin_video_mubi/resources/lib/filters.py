@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import xbmc
 import xbmcaddon
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 
 class FilmFilter:
     """
@@ -61,26 +61,40 @@ class FilmFilter:
             return films_data
 
         initial_count = len(films_data)
-        
-        filtered_films = []
-        for film in films_data:
-            # Check if any of the film's genres matches the skip list
-            # The structure of 'genres' in raw API response is usually a list of strings
-            # In some Mubi API responses it might be objects, but from scraper.py/mubi.py it seems to be list
-            
-            # Safe extraction
-            film_genres = film.get('genres') or []
-            
-            # Normalize to lower case for comparison
-            film_genres_lower = [g.lower() for g in film_genres]
-            
-            should_skip = any(skip_g in film_genres_lower for skip_g in self.skip_genres)
-            
-            if not should_skip:
-                filtered_films.append(film)
+        filtered_films = [film for film in films_data if not self._should_skip(film)]
 
         removed_count = initial_count - len(filtered_films)
         if removed_count > 0:
             xbmc.log(f"FilmFilter: Removed {removed_count} films based on genre filtering.", xbmc.LOGINFO)
             
         return filtered_films
+
+    def iter_films(self, films_data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Like filter_films, but lazily: films are checked as they are pulled from the iterable.
+
+        :param films_data: Iterable of raw film data dictionaries.
+        :return: Iterator over the films that are kept.
+        """
+        removed_count = 0
+        for film in films_data:
+            if self.skip_genres and self._should_skip(film):
+                removed_count += 1
+                continue
+            yield film
+
+        if removed_count > 0:
+            xbmc.log(f"FilmFilter: Removed {removed_count} films based on genre filtering.", xbmc.LOGINFO)
+
+    def _should_skip(self, film: Dict[str, Any]) -> bool:
+        # Check if any of the film's genres matches the skip list
+        # The structure of 'genres' in raw API response is usually a list of strings
+        # In some Mubi API responses it might be objects, but from scraper.py/mubi.py it seems to be list
+
+        # Safe extraction
+        film_genres = film.get('genres') or []
+
+        # Normalize to lower case for comparison
+        film_genres_lower = [g.lower() for g in film_genres]
+
+        return any(skip_g in film_genres_lower for skip_g in self.skip_genres)
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Verified local copy of the GitHub film database.
+
+The cache directory holds three files:
+
+- ``films.json.gz``: the last downloaded database, byte-for-byte, whose MD5
+  matched the published ``.md5`` file. It is removed once a delta has been
+  applied to the index, since it no longer matches.
+- ``films_index.jsonl``: the same film records as published, one JSON object
+  per line, so a cache hit needs no decompression, can still be read one
+  film at a time and can be patched with the published per-film deltas.
+- ``films_index.json``: header with the MD5, ``meta`` block and film count.
+  It is written last and removed first, so its presence means the index is
+  complete and belongs to that MD5.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import xbmc
+
+try:
+    from .profile_cache import atomic_write_bytes
+except ImportError:
+    from profile_cache import atomic_write_bytes
+
+
+class GithubDatabaseCache:
+    """
+    Local copy of films.json.gz plus its parsed index.
+    """
+
+    DB_FILE = 'films.json.gz'
+    INDEX_FILE = 'films_index.jsonl'
+    HEADER_FILE = 'films_index.json'
+    VERSION = 2
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, cache_dir: Path):
+        """
+        :param cache_dir: Directory for the cached files (created if needed).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.db_path = self.cache_dir / self.DB_FILE
+        self.index_path = self.cache_dir / self.INDEX_FILE
+        self.header_path = self.cache_dir / self.HEADER_FILE
+
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: Header of the cached index, or None if there is no usable index.
+        """
+        try:
+            with open(self.header_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            xbmc.log(f"Ignoring unreadable GitHub database index: {e}", xbmc.LOGWARNING)
+            return None
+        if not isinstance(header, dict) or header.get('version') != self.VERSION:
+            return None
+        if not self.index_path.is_file():
+            return None
+        return header
+
+    def has_index(self, md5: str) -> bool:
+        """
+        :return: True if the parsed index was built from the database with this MD5.
+        """
+        header = self.read_header()
+        return bool(header) and header.get('md5') == md5
+
+    def file_md5(self) -> Optional[str]:
+        """
+        :return: MD5 of the cached films.json.gz, or None if there is none.
+        """
+        hasher = hashlib.md5()
+        try:
+            with open(self.db_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.READ_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+        except OSError:
+            return None
+        return hasher.hexdigest()
+
+    def iter_db_chunks(self) -> Iterator[bytes]:
+        """
+        :return: Iterator over the bytes of the cached films.json.gz.
+        """
+        with open(self.db_path, 'rb') as f:
+            yield from iter(lambda: f.read(self.READ_CHUNK_SIZE), b'')
+
+    def iter_films(self) -> Iterator[Dict[str, Any]]:
+        """
+        :return: Iterator over the film records of the cached index.
+        """
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def remove_db_copy(self):
+        """
+        Remove the compressed copy (e.g. once a delta made it stale).
+        """
+        try:
+            self.db_path.unlink()
+        except OSError:
+            pass
+
+    def writer(self) -> 'GithubDatabaseWriter':
+        """
+        :return: Writer for a new copy; nothing replaces the current copy until it is committed.
+        """
+        return GithubDatabaseWriter(self)
+
+    def clear(self):
+        """
+        Remove the cached copy.
+        """
+        for path in (self.header_path, self.index_path, self.db_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class GithubDatabaseWriter:
+    """
+    Builds a new cached copy next to the current one and swaps it in on commit.
+    """
+
+    def __init__(self, cache: GithubDatabaseCache):
+        self.cache = cache
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        cache.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._db_tmp = cache.db_path.with_name(cache.db_path.name + suffix)
+        self._index_tmp = cache.index_path.with_name(cache.index_path.name + suffix)
+        self._db_file = open(self._db_tmp, 'wb')
+        self._index_file = open(self._index_tmp, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write_raw(self, chunk: bytes):
+        """Append downloaded (compressed) bytes."""
+        self._db_file.write(chunk)
+
+    def write_film(self, film: Dict[str, Any]):
+        """Append a film record to the index."""
+        self._index_file.write(json.dumps(film, separators=(',', ':')))
+        self._index_file.write('\n')
+        self.count += 1
+
+    def _close_files(self):
+        for f in (self._db_file, self._index_file):
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def commit(self, md5: str, meta: Dict[str, Any] = None, replace_db: bool = True) -> bool:
+        """
+        Replace the cached copy with the one written so far.
+
+        :param md5: Verified MD5 of the downloaded database.
+        :param meta: The database's 'meta' block.
+        :param replace_db: If False, only the index is replaced (it was rebuilt from the cached file).
+        :return: True if the new copy is in place.
+        """
+        self._close_files()
+        cache = self.cache
+        try:
+            # Header goes first and comes back last: a missing header means "no cache"
+            try:
+                cache.header_path.unlink()
+            except FileNotFoundError:
+                pass
+            if replace_db:
+                os.replace(self._db_tmp, cache.db_path)
+            else:
+                self._db_tmp.unlink()
+            os.replace(self._index_tmp, cache.index_path)
+            header = {
+                'version': GithubDatabaseCache.VERSION,
+                'md5': md5,
+                'meta': meta or {},
+                'count': self.count,
+                'stored_at': time.time(),
+            }
+            atomic_write_bytes(cache.header_path, json.dumps(header).encode('utf-8'))
+            return True
+        except OSError as e:
+            xbmc.log(f"Could not store local copy of the GitHub database: {e}", xbmc.LOGWARNING)
+            self.discard()
+            return False
+
+    def discard(self):
+        """
+        Drop the partially written copy.
+        """
+        self._close_files()
+        for path in (self._db_tmp, self._index_tmp):
+            try:
+                path.unlink()
+            except OSError:
+                pass
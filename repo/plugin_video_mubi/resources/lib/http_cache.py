@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache for MUBI API GET responses.
+
+Entries are keyed by method, URL, query parameters and the headers that
+change the response (account token, client, country and language). Responses
+carrying an ETag or Last-Modified are always revalidated with If-None-Match /
+If-Modified-Since, so an unchanged page costs a 304 instead of a full JSON
+body. Responses without validators are served from disk until their TTL
+expires. prune() drops entries not stored or revalidated for MAX_AGE and
+caps the cache at MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import xbmc
+
+from .profile_cache import atomic_write_bytes
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response built from a cache entry.
+    """
+
+    def __init__(self, entry: dict, body: bytes):
+        self.status_code = entry.get('status', 200)
+        self.headers = dict(entry.get('headers', {}))
+        self.url = entry.get('url')
+        self.content = body
+        self.encoding = 'utf-8'
+        self.from_cache = True
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        return None
+
+
+class HttpCache:
+    """
+    File-backed response cache (one metadata file and one body file per entry).
+    """
+
+    DEFAULT_TTL = 6 * 3600  # seconds, for responses without ETag / Last-Modified
+    MAX_AGE = 30 * 24 * 3600  # seconds an entry is kept after it was last stored or revalidated
+    MAX_ENTRIES = 2000
+    PRUNE_INTERVAL = 24 * 3600
+
+    # Request headers whose value changes the response body (compared case-insensitively).
+    # The key is a hash, so the token itself is never written to disk.
+    VARY_HEADERS = ('authorization', 'client', 'client-country', 'accept-language')
+
+    def __init__(self, cache_dir: Path, default_ttl: int = DEFAULT_TTL):
+        """
+        :param cache_dir: Directory holding the cache files.
+        :param default_ttl: Seconds a response without validators stays fresh.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def make_key(self, method: str, url: str, params: dict = None, headers: dict = None) -> str:
+        """
+        :return: Stable hex key for a request.
+        """
+        headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+        vary = {name: headers.get(name) for name in self.VARY_HEADERS}
+        raw = json.dumps(
+            [method.upper(), url, sorted((params or {}).items()), vary],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Load a cache entry.
+
+        :return: Entry metadata with the body under 'body', or None if missing or unreadable.
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def has_validators(entry: dict) -> bool:
+        return bool(entry.get('etag') or entry.get('last_modified'))
+
+    def is_fresh(self, entry: dict) -> bool:
+        """
+        :return: True if a validator-less entry can be served without contacting the server.
+        """
+        return not self.has_validators(entry) and time.time() < entry.get('expires_at', 0)
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """
+        :return: If-None-Match / If-Modified-Since headers for revalidating an entry.
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key: str, url: str, response) -> bool:
+        """
+        Save a 200 response.
+
+        :return: True if the response was cached.
+        """
+        body = getattr(response, 'content', None)
+        if not isinstance(body, (bytes, bytearray)):
+            return False
+        headers = getattr(response, 'headers', None) or {}
+        cache_control = str(headers.get('Cache-Control', '')).lower()
+        if 'no-store' in cache_control:
+            return False
+
+        entry = {
+            'url': url,
+            'status': 200,
+            'stored_at': time.time(),
+            'expires_at': time.time() + self.default_ttl,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'headers': {'Content-Type': headers.get('Content-Type', 'application/json')},
+        }
+        meta_path, body_path = self._paths(key)
+        try:
+            # Body first: a metadata file never points at a missing or stale body
+            atomic_write_bytes(body_path, bytes(body))
+            atomic_write_bytes(meta_path, json.dumps(entry).encode('utf-8'))
+            return True
+        except OSError as e:
+            xbmc.log(f"HTTP cache: could not store {url}: {e}", xbmc.LOGDEBUG)
+            return False
+
+    def refresh(self, key: str, entry: dict, response=None):
+        """
+        Extend an entry after a 304, picking up new validators if the server sent any.
+        """
+        headers = getattr(response, 'headers', None) or {}
+        entry = {k: v for k, v in entry.items() if k != 'body'}
+        entry['stored_at'] = time.time()
+        entry['expires_at'] = time.time() + self.default_ttl
+        if headers.get('ETag'):
+            entry['etag'] = headers.get('ETag')
+        if headers.get('Last-Modified'):
+            entry['last_modified'] = headers.get('Last-Modified')
+        meta_path, _ = self._paths(key)
+        try:
+            atomic_write_bytes(meta_path, json.dumps(entry).encode('utf-8'))
+        except OSError as e:
+            xbmc.log(f"HTTP cache: could not refresh entry: {e}", xbmc.LOGDEBUG)
+
+    def prune(self, now: float = None) -> int:
+        """
+        Delete expired entries and the oldest ones beyond MAX_ENTRIES, at most once
+        per PRUNE_INTERVAL.
+
+        :return: Number of entries deleted.
+        """
+        now = time.time() if now is None else now
+        marker = self.cache_dir / 'pruned_at'
+        try:
+            if now - marker.stat().st_mtime < self.PRUNE_INTERVAL:
+                return 0
+        except OSError:
+            pass
+
+        entries = {}  # key -> mtime of its metadata file (None: body without metadata)
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for dir_entry in it:
+                    key, _, suffix = dir_entry.name.partition('.')
+                    if suffix == 'json':
+                        try:
+                            entries[key] = dir_entry.stat().st_mtime
+                        except OSError:
+                            continue
+                    elif suffix == 'body':
+                        entries.setdefault(key, None)
+        except OSError as e:
+            xbmc.log(f"HTTP cache: could not prune: {e}", xbmc.LOGDEBUG)
+            return 0
+
+        expired = [key for key, mtime in entries.items() if mtime is None or now - mtime > self.MAX_AGE]
+        kept = sorted((mtime, key) for key, mtime in entries.items()
+                      if mtime is not None and now - mtime <= self.MAX_AGE)
+        if len(kept) > self.MAX_ENTRIES:
+            expired.extend(key for _, key in kept[:len(kept) - self.MAX_ENTRIES])
+
+        for key in expired:
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        try:
+            marker.touch()
+        except OSError:
+            pass
+        if expired:
+            xbmc.log(f"HTTP cache: removed {len(expired)} old entries", xbmc.LOGDEBUG)
+        return len(expired)
+
+    def get_stats(self) -> dict:
+        """
+        :return: Counters for cache hits, 304 revalidations and misses.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def record(self, outcome: str):
+        """
+        Count a lookup outcome: 'hit', 'revalidated' or 'miss'.
+        """
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
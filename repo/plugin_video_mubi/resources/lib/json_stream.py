@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental parser for large JSON documents.
+
+The film database is one JSON object whose ``items`` array holds every film.
+JsonObjectStream is fed the document in text chunks and hands back the
+elements of that array as soon as each one is complete, so the caller can
+filter them one at a time instead of holding the whole document in memory.
+Every other top-level member (e.g. ``meta``) is parsed normally and kept in
+``fields``.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+class JsonObjectStream:
+    """
+    Push parser for a top-level JSON object with one large array member.
+    """
+
+    # Parser states
+    _OBJECT_START = 'object_start'
+    _FIRST_KEY = 'first_key'
+    _KEY = 'key'
+    _COLON = 'colon'
+    _VALUE = 'value'
+    _MEMBER_END = 'member_end'
+    _FIRST_ITEM = 'first_item'
+    _ITEM = 'item'
+    _ITEM_END = 'item_end'
+    _DONE = 'done'
+
+    _WHITESPACE = ' \t\n\r'
+
+    # A single value (one film) larger than this is treated as a corrupt document
+    MAX_PENDING_CHARS = 16 * 1024 * 1024
+
+    def __init__(self, array_key: str = 'items'):
+        """
+        :param array_key: Name of the top-level array whose elements are streamed.
+        """
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = self._OBJECT_START
+        self._key = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == self._DONE
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add a chunk of the document.
+
+        :param text: Next piece of the JSON text.
+        :return: Array elements completed by this chunk, in document order.
+        """
+        if text:
+            self._buffer = self._buffer[self._pos:] + text
+            self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the document.
+
+        :return: Any remaining array elements.
+        :raises json.JSONDecodeError: If the document is incomplete or malformed.
+        """
+        items = self._parse(final=True)
+        if self._state != self._DONE:
+            raise json.JSONDecodeError("Unexpected end of JSON document", self._buffer, self._pos)
+        if self._buffer[self._pos:].strip(self._WHITESPACE):
+            raise json.JSONDecodeError("Extra data after JSON document", self._buffer, self._pos)
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        """Advance past whitespace; return True if there is a character to look at."""
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+
+    def _expect(self, char: str):
+        if self._buffer[self._pos] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _decode_value(self, final: bool):
+        """
+        Decode the value at the current position.
+
+        :return: Tuple (complete, value). complete is False if more text is needed.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            if len(self._buffer) - self._pos > self.MAX_PENDING_CHARS:
+                raise
+            return False, None
+        # A number or literal running to the end of the buffer may continue in the next chunk
+        if end == len(self._buffer) and not final and self._buffer[self._pos] not in '{["':
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        while self._state != self._DONE:
+            if not self._skip_whitespace():
+                break
+            state = self._state
+
+            if state == self._OBJECT_START:
+                self._expect('{')
+                self._state = self._FIRST_KEY
+
+            elif state in (self._FIRST_KEY, self._KEY):
+                if state == self._FIRST_KEY and self._buffer[self._pos] == '}':
+                    self._pos += 1
+                    self._state = self._DONE
+                    continue
+                if self._buffer[self._pos] != '"':
+                    raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+                complete, key = self._decode_value(final)
+                if not complete:
+                    break
+                self._key = key
+                self._state = self._COLON
+
+            elif state == self._COLON:
+                self._expect(':')
+                self._state = self._VALUE
+
+            elif state == self._VALUE:
+                if self._key == self.array_key and self._buffer[self._pos] == '[':
+                    self._pos += 1
+                    self._state = self._FIRST_ITEM
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                self.fields[self._key] = value
+                self._state = self._MEMBER_END
+
+            elif state == self._MEMBER_END:
+                char = self._buffer[self._pos]
+                self._pos += 1
+                if char == ',':
+                    self._state = self._KEY
+                elif char == '}':
+                    self._state = self._DONE
+                else:
+                    raise json.JSONDecodeError("Expecting ',' or '}'", self._buffer, self._pos - 1)
+
+            elif state in (self._FIRST_ITEM, self._ITEM):
+                if state == self._FIRST_ITEM and self._buffer[self._pos] == ']':
+                    self._pos += 1
+                    self._state = self._MEMBER_END
+                    continue
+                complete, value = self._decode_value(final)
+                if not complete:
+                    break
+                items.append(value)
+                self._state = self._ITEM_END
+
+            elif state == self._ITEM_END:
+                char = self._buffer[self._pos]
+                self._pos += 1
+                if char == ',':
+                    self._state = self._ITEM
+                elif char == ']':
+                    self._state = self._MEMBER_END
+                else:
+                    raise json.JSONDecodeError("Expecting ',' or ']'", self._buffer, self._pos - 1)
+        return items
+
+
+def iter_json_array(text_chunks: Iterable[str], array_key: str = 'items',
+                    fields: Dict[str, Any] = None) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level array from a chunked JSON document.
+
+    :param text_chunks: Iterable of text pieces making up the document.
+    :param array_key: Name of the top-level array to stream.
+    :param fields: Optional dict receiving the other top-level members once parsing ends.
+    """
+    stream = JsonObjectStream(array_key)
+    for chunk in text_chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+    if fields is not None:
+        fields.update(stream.fields)
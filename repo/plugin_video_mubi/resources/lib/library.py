@@ -4,16 +4,44 @@ import xbmc
 import xbmcgui
 import xbmcaddon
 from .film import Film
+from .profile_cache import get_cache_dir, is_cache_dir
+from .catalogue_store import CatalogueStore
+from .sync_manifest import SyncManifest
+from .artwork_store import ArtworkStore
+from .artwork_tier import format_size
+from .rate_limiter import get_provider_throttle_stats
 from typing import List, Optional, Tuple, Union
 import os
 import shutil
 from typing import Set
 import re
 import json
+import sqlite3
 
 class Library:
+    # Streaming sync: hydrated films waiting for a worker, and films handed to
+    # workers but not finished yet (per worker)
+    STREAM_QUEUE_SIZE = 64
+    STREAM_IN_FLIGHT_PER_WORKER = 2
+    STREAM_POLL_INTERVAL = 0.2
+    # Results of films that are skipped: folder up to date according to the sync
+    # manifest, or already written by an interrupted run of the sync
+    UNCHANGED = "UNCHANGED"
+    RESUMED = "RESUMED"
+
     def __init__(self):
         self.films = {}  # Dictionary mapping mubi_id to Film object
+        # Delta sync: folders of films unchanged since the last sync (kept on disk
+        # although they are not in self.films) and the snapshot to commit on success
+        self.retained_folders = set()
+        self.sync_snapshot = None
+        # Streaming sync: iterator of Film objects still being fetched and hydrated;
+        # sync_locally writes them as they arrive
+        self.film_stream = None
+        # Resumable sync: checkpoints of the films written by an interrupted run
+        self.sync_journal = None
+        # Folders on disk, their films and input fingerprints (loaded by sync_locally)
+        self.sync_manifest = None
 
     def add_film(self, film: Film):
         if not film or not film.mubi_id or not film.title or not film.metadata:
@@ -38,8 +66,15 @@ class Library:
         :param base_url: The base URL for creating STRM files.
         :param plugin_userdata_path: The path where film folders are stored.
         :param skip_external_metadata: If True, skip attempting to fetch external metadata (IMDB/TMDB) for new films.
+        :raises Exception: Whatever the film_stream raised (fetch or parse errors); no files
+                           are removed in that case.
+
+        Films whose folder is up to date (see sync_manifest) or that were already written
+        by an interrupted run of the same sync (see sync_journal) are not written again.
+        The journal is kept if the sync is cancelled or fails.
         """
         # Films are expected to be already filtered by the time they are added to Library
+        streaming = self.film_stream is not None
 
         # Log films that contain problematic characters for debugging
         for film in self.films.values():
@@ -53,14 +88,23 @@ class Library:
         # Initialize counters
         newly_added = 0
         failed_to_add = 0
+        unchanged = 0
+        resumed = 0
+        artwork_bytes_saved = 0
         availability_updated = 0
         rating_updated = 0
         films_to_kodi_update = []
         films_to_process = len(self.films)
+        synced_folders = {}  # {mubi_id: folder} written or verified in this sync
+        unchanged_ids = set()  # mubi_ids of synced_folders left untouched
+        cancelled = False
 
         # Initialize progress dialog
         pDialog = xbmcgui.DialogProgress()
-        pDialog.create("Syncing with MUBI 2/2", f"Processing {films_to_process} films...")
+        if streaming:
+            pDialog.create("Syncing with MUBI", "Fetching films...")
+        else:
+            pDialog.create("Syncing with MUBI 2/2", f"Processing {films_to_process} films...")
 
         import concurrent.futures
 
@@ -85,43 +129,81 @@ class Library:
         
         processed_count = 0
 
+        # Folders written by earlier syncs, checked against a single listing of the library
+        try:
+            self.sync_manifest = SyncManifest.load(get_cache_dir() / SyncManifest.FILE_NAME, plugin_userdata_path)
+            self.sync_manifest.reconcile()
+        except OSError as e:
+            xbmc.log(f"Sync manifest unavailable, checking every folder: {e}", xbmc.LOGWARNING)
+            self.sync_manifest = None
+
         try:
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit all tasks
-                future_to_film = {
-                    executor.submit(self.prepare_files_for_film, film, base_url, plugin_userdata_path, skip_external_metadata): film
-                    for film in self.films.values()
-                    if self.is_film_valid(film)
-                }
+                if streaming:
+                    # Films are written while later ones are still being fetched
+                    completed = self._stream_to_workers(
+                        executor, max_workers, base_url, plugin_userdata_path, skip_external_metadata
+                    )
+                else:
+                    # Submit all tasks
+                    future_to_film = {
+                        executor.submit(self._sync_film, film, base_url, plugin_userdata_path, skip_external_metadata): film
+                        for film in self.films.values()
+                        if self.is_film_valid(film)
+                    }
+                    completed = (
+                        (future_to_film[future], future)
+                        for future in concurrent.futures.as_completed(future_to_film)
+                    )
 
                 # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_film):
+                for film, future in completed:
                     # Check cancel
                     if pDialog.iscanceled():
                         xbmc.log("User canceled the sync process.", xbmc.LOGDEBUG)
+                        cancelled = True
                         # cancel_futures was added in Python 3.9
                         if sys.version_info >= (3, 9):
                             executor.shutdown(wait=False, cancel_futures=True)
                         else:
                             executor.shutdown(wait=False)
+                        if streaming:
+                            completed.close()  # Stops the producer
                         break
 
-                    film = future_to_film[future]
+                    if future is None:
+                        continue
+
                     processed_count += 1
+                    if streaming:
+                        # The total is only known once the stream ends
+                        films_to_process = len(self.films)
                     
                     # Update progress
-                    percent = int((processed_count / films_to_process) * 100)
+                    percent = int((processed_count / max(films_to_process, 1)) * 100)
                     progress_msg = f"Processing movie {processed_count} of {films_to_process}:\n{film.title}"
                     pDialog.update(percent, progress_msg)
 
                     try:
                         result = future.result()
-                        if result is True:
+                        if result is not False:
+                            synced_folders[film.mubi_id] = film.get_sanitized_folder_name()
+                        if result not in (False, self.UNCHANGED, self.RESUMED):
+                            # Untouched films are covered by the sync manifest
+                            self._journal_written(film)
+                        if result == self.UNCHANGED:
+                            unchanged += 1
+                            unchanged_ids.add(film.mubi_id)
+                        elif result == self.RESUMED:
+                            resumed += 1
+                        elif result is True:
                             newly_added += 1
+                            artwork_bytes_saved += getattr(film, 'artwork_bytes_saved', 0) or 0
                         elif result is False:
                             failed_to_add += 1
                         elif result == "RATING_UPDATED":
                             rating_updated += 1
+                            artwork_bytes_saved += getattr(film, 'artwork_bytes_saved', 0) or 0
                             # Construct path for individual update
                             # film.get_sanitized_folder_name() is reliable
                             fname = film.get_sanitized_folder_name()
@@ -135,8 +217,34 @@ class Library:
                         xbmc.log(f"Unhandled exception processing film '{film.title}': {e}", xbmc.LOGERROR)
                         failed_to_add += 1
 
-            # Final cleanup of obsolete files
-            obsolete_films_count = self.remove_obsolete_files(plugin_userdata_path)
+            if streaming:
+                self.film_stream = None
+
+            # Final cleanup of obsolete files (a cancelled stream never saw the full set of films)
+            if streaming and cancelled:
+                obsolete_films_count = 0
+            else:
+                obsolete_films_count = self.remove_obsolete_files(plugin_userdata_path)
+
+            # Remember what is on disk so the next sync only touches what changed
+            if self.sync_snapshot is not None and not cancelled:
+                self.sync_snapshot.commit(synced_folders)
+            self.update_catalogue_store(plugin_userdata_path, synced_folders, prune=not cancelled,
+                                        unchanged_ids=unchanged_ids)
+
+            # Nothing left to resume once the sync went through
+            if self.sync_journal is not None and not cancelled:
+                self.sync_journal.finish()
+            # Images kept for films that may come back, until they expire
+            if not cancelled:
+                artwork_store = ArtworkStore.open()
+                if artwork_store is not None:
+                    artwork_store.prune()
+            if resumed:
+                xbmc.log(f"Resumed sync: {resumed} films were already written by the interrupted run",
+                         xbmc.LOGINFO)
+            xbmc.log(f"{unchanged} film folders were up to date and left untouched", xbmc.LOGDEBUG)
+            self._log_provider_throttle_stats()
 
             # Construct summary message
             message = (
@@ -146,6 +254,10 @@ class Library:
                 f"Failed to add: {failed_to_add}\n"
                 f"Obsolete movies removed: {obsolete_films_count}"
             )
+            if artwork_bytes_saved > 0:
+                # Same amount of disk space and download traffic
+                message += f"\nArtwork saved by the artwork size setting: ~{format_size(artwork_bytes_saved)}"
+                xbmc.log(f"Artwork tier saved an estimated {artwork_bytes_saved} bytes", xbmc.LOGINFO)
             
             # Trigger individual updates for modified ratings
             if films_to_kodi_update:
@@ -199,8 +311,182 @@ class Library:
         finally:
             # Ensure the dialog is closed in the end
             pDialog.close()
+            if self.sync_journal is not None:
+                self.sync_journal.close()
+            # Folders written before a cancel or failure are recorded too
+            if self.sync_manifest is not None:
+                self.sync_manifest.save()
+
+
+    @staticmethod
+    def _log_provider_throttle_stats():
+        """Log how the shared external metadata rate limiters behaved during the sync."""
+        for provider_name, stats in get_provider_throttle_stats().items():
+            if not stats['requests']:
+                continue
+            xbmc.log(
+                f"{provider_name} rate limiter: {stats['requests']} requests, "
+                f"{stats['total_wait']:.1f}s waited, {stats['rate_limited']} rate-limit responses, "
+                f"rate {stats['current_rate']:.1f}/{stats['max_rate']:.1f} req/s",
+                xbmc.LOGINFO
+            )
+
+    def _stream_to_workers(self, executor, max_workers: int, base_url: str, plugin_userdata_path: Path,
+                           skip_external_metadata: bool):
+        """
+        Run film_stream on a producer thread and hand each film to the workers as it arrives.
+
+        The producer fills a bounded queue, so fetching stays at most
+        STREAM_QUEUE_SIZE films ahead of the workers; films are added to the
+        library as they are taken from it. Closing the returned generator stops
+        the producer.
+
+        :return: Iterator over (film, completed future), or (None, None) while waiting for films.
+        :raises Exception: Re-raises the producer's exception once the films
+                           already handed to workers are done.
+        """
+        import concurrent.futures
+        import queue
+        import threading
+
+        films = queue.Queue(maxsize=self.STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        end = object()
+        failure = []
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    films.put(item, timeout=self.STREAM_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for film in self.film_stream:
+                    if not put(film):
+                        return
+            except Exception as e:
+                xbmc.log(f"Streaming sync stopped: {e}", xbmc.LOGERROR)
+                failure.append(e)
+            put(end)
+
+        producer = threading.Thread(target=produce, name="mubi-sync-producer", daemon=True)
+        producer.start()
+
+        max_in_flight = max(1, max_workers * self.STREAM_IN_FLIGHT_PER_WORKER)
+        in_flight = {}
+        exhausted = False
+        try:
+            while not exhausted or in_flight:
+                # Keep the workers busy, without blocking while some are running
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        film = films.get_nowait() if in_flight else films.get(timeout=self.STREAM_POLL_INTERVAL)
+                    except queue.Empty:
+                        break
+                    if film is end:
+                        exhausted = True
+                        break
+                    seen = getattr(film, 'mubi_id', None) in self.films
+                    try:
+                        self.add_film(film)
+                    except ValueError as e:
+                        xbmc.log(f"Skipping invalid film from stream: {e}", xbmc.LOGWARNING)
+                        continue
+                    if not seen and self.is_film_valid(film):
+                        future = executor.submit(self._sync_film, film, base_url,
+                                                 plugin_userdata_path, skip_external_metadata)
+                        in_flight[future] = film
+
+                if not in_flight:
+                    if not exhausted:
+                        yield None, None  # Still fetching: let the caller check for cancellation
+                    continue
+                done, _ = concurrent.futures.wait(
+                    in_flight, timeout=self.STREAM_POLL_INTERVAL, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                if not done:
+                    yield None, None
+                for future in done:
+                    yield in_flight.pop(future), future
+        finally:
+            stop.set()
+
+        if failure:
+            raise failure[0]
+
+    def _film_fingerprint(self, film: Film) -> Optional[str]:
+        if self.sync_journal is None or self.sync_snapshot is None:
+            return None
+        return self.sync_snapshot.staged_fingerprint(film.mubi_id)
+
+    def _sync_film(self, film: Film, base_url: str, plugin_userdata_path: Path,
+                   skip_external_metadata: bool):
+        """
+        prepare_files_for_film, unless the film's folder is known to be up to date:
+        written from the same inputs by an earlier sync (sync manifest, the folder is
+        not even opened) or by an interrupted run of this sync (sync journal).
+
+        :return: UNCHANGED or RESUMED for a film that is skipped, else prepare_files_for_film's result.
+        """
+        folder = film.get_sanitized_folder_name()
+        manifest = self.sync_manifest
+        fingerprint = film.sync_fingerprint() if manifest is not None else None
+        if manifest is not None and manifest.is_current(folder, film.mubi_id, fingerprint):
+            return self.UNCHANGED
+
+        result = None
+        journal_fingerprint = self._film_fingerprint(film)
+        if journal_fingerprint is not None:
+            if (self.sync_journal.written_folder(film.mubi_id, journal_fingerprint) == folder
+                    and (plugin_userdata_path / folder).is_dir()):
+                result = self.RESUMED
+        if result is None:
+            result = self.prepare_files_for_film(film, base_url, plugin_userdata_path, skip_external_metadata)
+
+        if manifest is not None:
+            if result is False:
+                manifest.discard(folder)
+            else:
+                manifest.record(folder, film.mubi_id, fingerprint)
+        return result
+
+    def _journal_written(self, film: Film):
+        fingerprint = self._film_fingerprint(film)
+        if fingerprint is not None:
+            self.sync_journal.record_written(film.mubi_id, fingerprint, film.get_sanitized_folder_name())
 
+    def update_catalogue_store(self, plugin_userdata_path: Path, synced_folders: dict, prune: bool = True,
+                               unchanged_ids: set = frozenset()) -> int:
+        """
+        Record the synced films in the local catalogue database.
 
+        :param plugin_userdata_path: Path where the film folders are stored.
+        :param synced_folders: {mubi_id: folder} of the films written or verified in this sync.
+        :param prune: If True, drop films no longer in the library (not after a cancelled sync).
+        :param unchanged_ids: mubi_ids of films left untouched, whose folders are not read again.
+        :return: Number of films recorded.
+        """
+        store = CatalogueStore.open()
+        if store is None:
+            return 0
+        try:
+            recorded = store.record_films(
+                (self.films[mubi_id] for mubi_id in synced_folders if mubi_id in self.films),
+                plugin_userdata_path, unchanged_ids
+            )
+            if prune:
+                store.prune(set(synced_folders.values()) | self.retained_folders)
+            xbmc.log(f"Catalogue database holds {len(store)} films ({recorded} recorded)", xbmc.LOGDEBUG)
+            return recorded
+        except (sqlite3.Error, OSError) as e:
+            xbmc.log(f"Could not update the catalogue database: {e}", xbmc.LOGWARNING)
+            return 0
+        finally:
+            store.close()
 
     def is_film_valid(self, film: Film) -> bool:
         # Check that film has all necessary attributes AND at least one available country
@@ -221,7 +507,7 @@ class Library:
     ) -> Union[bool, str, None]:
         """
         Prepare the necessary files for a given film. Creates NFO and STRM files.
-        The NFO file country availability is always updated on each sync.
+        The NFO file country availability is updated on each sync (only written if it changed).
         Full NFO creation is only done if NFO doesn't exist (expensive due to OMDB API calls).
 
         :param film: The Film object to process.
@@ -245,14 +531,12 @@ class Library:
             # Check if NFO already exists (skip expensive NFO creation but always update availability)
             nfo_exists = nfo_file.exists()
             if nfo_exists:
-                # Check if rating needs update (only for GitHub sync/when we have Bayesian data)
-                # If rating is NOT synced, we shouldn't return None; we should proceed to overwrite NFO.
-                rating_synced = film.is_rating_synced(nfo_file)
-                
-                if rating_synced:
-                    # Update country availability in NFO file (quick operation)
-                    xbmc.log(f"Updating availability for '{film.title}' (NFO exists & rating synced).", xbmc.LOGDEBUG)
-                    film.update_nfo_availability(nfo_file)
+                # One parse: up to date, availability to refresh, or rating changed.
+                # If the rating is NOT synced, we shouldn't return None; we should proceed to overwrite NFO.
+                nfo_state = film.refresh_nfo(nfo_file)
+
+                if nfo_state != Film.NFO_STALE:
+                    xbmc.log(f"NFO for '{film.title}' is up to date ({nfo_state}).", xbmc.LOGDEBUG)
                     return None  # Indicate availability was updated (not a new film)
                 else:
                      xbmc.log(f"Forcing NFO update for '{film.title}' due to rating change.", xbmc.LOGINFO)
@@ -325,12 +609,25 @@ class Library:
         """
         # Get a set of sanitized folder names for the current films in the library
         current_film_folders = {film.get_sanitized_folder_name() for film in self.films.values() if self.is_film_valid(film)}
+        # Films skipped by a delta sync are still part of the library
+        current_film_folders |= self.retained_folders
 
         # Track obsolete folder count
         obsolete_folders_count = 0
 
+        # The manifest knows every folder on disk and the files in it
+        manifest = self.sync_manifest
+        if manifest is not None and manifest.library_path == Path(plugin_userdata_path):
+            for folder in manifest.obsolete_folders(current_film_folders):
+                if manifest.remove_folder(folder):
+                    obsolete_folders_count += 1
+            return obsolete_folders_count
+
         # Loop through each directory in plugin_userdata_path
         for folder in plugin_userdata_path.iterdir():
+            if is_cache_dir(folder):
+                # Reserved folder for the addon's caches, never a film
+                continue
             if folder.is_dir() and folder.name not in current_film_folders:
                 # Remove the folder if it's not in the current films
                 shutil.rmtree(folder)
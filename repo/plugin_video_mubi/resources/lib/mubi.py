@@ -22,6 +22,7 @@ import random
 from urllib.parse import urljoin
 from urllib.parse import urlencode
 import time
+import threading
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
@@ -30,6 +31,10 @@ from .metadata import Metadata
 from .film import Film
 from .library import Library
 from .playback import generate_drm_license_key
+from .rate_limiter import get_api_rate_limiter, get_api_circuit_breaker
+from .http_cache import HttpCache, CachedResponse
+from .artwork_tier import get_artwork_tier, select_still
+from .profile_cache import get_cache_dir
 
 
 class Mubi:
@@ -44,18 +49,152 @@ class Mubi:
         'JP': 'Japan',
     }
 
-    def __init__(self, session_manager):
+    # Browse catalogue paging: safety cap on pages fetched per country
+    MAX_PAGES_PER_COUNTRY = 101
+
+    # Connection pool sizing for the shared API session.
+    # pool_connections: number of per-host pools kept alive (api.mubi.com, mubi.com, ...)
+    # pool_maxsize: maximum keep-alive connections per host (also the per-host concurrency limit)
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 10
+
+    def __init__(self, session_manager, pool_connections: Optional[int] = None,
+                 pool_maxsize: Optional[int] = None):
         """
         Initialize the Mubi class with the session manager.
 
         :param session_manager: Instance of SessionManager to handle session data
         :type session_manager: SessionManager
+        :param pool_connections: Optional number of per-host connection pools to keep.
+        :param pool_maxsize: Optional maximum number of keep-alive connections per host.
         """
         self.apiURL = 'https://api.mubi.com/'
         self.UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0'
         self.session_manager = session_manager  # Use session manager for session-related data
         self.library = Library()  # Initialize the Library
 
+        # Long-lived HTTP session shared by all API calls (created lazily, thread-safe)
+        self.pool_connections = pool_connections or self.POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self._http_session = None
+        self._http_adapter = None
+        self._http_lock = threading.Lock()
+        self._request_count = 0
+        self._http_cache = None  # HttpCache, created on first cacheable request (False if unavailable)
+        self.sync_journal = None  # SyncJournal of the library sync in progress, if any
+        self._artwork_tier = None  # Read from the settings on first use
+
+        # Process-wide request budget (AIMD token bucket) and circuit breaker shared
+        # by every MUBI API call, so all threads back off together
+        self.rate_limiter = get_api_rate_limiter()
+        self.circuit_breaker = get_api_circuit_breaker()
+
+    def _get_http_session(self):
+        """
+        Return the shared HTTP session, creating it on first use.
+
+        The session keeps TCP/TLS connections alive between calls so that a
+        multi-country sync does not pay a new handshake for every page.
+        urllib3 connection pools are thread-safe; pool_block=True makes threads
+        wait for a free connection instead of opening extra ones, which enforces
+        the per-host limit.
+
+        :return: requests.Session instance
+        """
+        with self._http_lock:
+            if self._http_session is None:
+                # Retries with exponential backoff for transient errors
+                # Note: 429 (Too Many Requests) is handled separately in _make_api_call
+                retries = Retry(
+                    total=3,
+                    backoff_factor=1,
+                    status_forcelist=[500, 502, 503, 504],
+                    allowed_methods=["GET", "POST", "DELETE", "PUT", "PATCH"]
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=retries,
+                    pool_block=True
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._http_session = session
+                self._http_adapter = adapter
+                xbmc.log(
+                    f"Created pooled HTTP session (pools={self.pool_connections}, "
+                    f"max per host={self.pool_maxsize})",
+                    xbmc.LOGDEBUG
+                )
+            return self._http_session
+
+    def get_connection_stats(self) -> dict:
+        """
+        Report how many API requests were served over reused connections.
+
+        :return: Dict with 'requests', 'connections_opened' and 'connections_reused'.
+                 Connection counts are None if the pool cannot be inspected.
+        """
+        with self._http_lock:
+            request_count = self._request_count
+            adapter = self._http_adapter
+
+        connections_opened = None
+        if adapter is not None:
+            try:
+                pools = adapter.poolmanager.pools
+                connections_opened = sum(
+                    int(pools[key].num_connections) for key in list(pools.keys())
+                )
+            except Exception as e:
+                xbmc.log(f"Could not inspect connection pool: {e}", xbmc.LOGDEBUG)
+
+        connections_reused = None
+        if connections_opened is not None:
+            connections_reused = max(0, request_count - connections_opened)
+
+        return {
+            'requests': request_count,
+            'connections_opened': connections_opened,
+            'connections_reused': connections_reused,
+        }
+
+    def close(self):
+        """
+        Close the shared HTTP session and release pooled connections.
+        """
+        with self._http_lock:
+            if self._http_session is not None:
+                self._http_session.close()
+            self._http_session = None
+            self._http_adapter = None
+
+    def _get_http_cache(self) -> Optional[HttpCache]:
+        """
+        Return the on-disk response cache, creating it in the profile on first use.
+
+        :return: HttpCache instance, or None if the cache directory is not usable.
+        """
+        with self._http_lock:
+            if self._http_cache is None:
+                try:
+                    self._http_cache = HttpCache(get_cache_dir('http'))
+                    self._http_cache.prune()
+                except Exception as e:
+                    xbmc.log(f"HTTP response cache disabled: {e}", xbmc.LOGWARNING)
+                    self._http_cache = False
+            return self._http_cache or None
+
+    def get_cache_stats(self) -> dict:
+        """
+        :return: Response cache counters (hits, revalidated, misses); all zero if the cache is unused.
+        """
+        http_cache = self._http_cache
+        if not http_cache:
+            return {'hits': 0, 'revalidated': 0, 'misses': 0}
+        return http_cache.get_stats()
+
     def _sanitize_headers_for_logging(self, headers):
         """
         Sanitize headers for safe logging by masking sensitive information.
@@ -134,7 +273,16 @@ class Mubi:
 
         return sanitized
 
-    def _make_api_call(self, method, endpoint=None, full_url=None, headers=None, params=None, data=None, json=None):
+    def _make_api_call(self, method, endpoint=None, full_url=None, headers=None, params=None, data=None, json=None,
+                       cache=False):
+        """
+        Make a request to the MUBI API through the shared session, rate limiter and circuit breaker.
+
+        :param cache: If True (GET only), use the on-disk response cache: validator-less
+                      responses are served until their TTL expires, others are revalidated
+                      with If-None-Match / If-Modified-Since.
+        :return: Response object (or CachedResponse), or None on failure.
+        """
         url = full_url if full_url else f"{self.apiURL}{endpoint}"
 
         # Ensure headers are not None and set Accept-Encoding to gzip
@@ -154,26 +302,32 @@ class Mubi:
         if json:
             xbmc.log(f"JSON: {json}", xbmc.LOGDEBUG)
 
-        # Set up retries with exponential backoff for transient errors
-        # Note: 429 (Too Many Requests) is handled separately below with Retry-After
-        session = requests.Session()
-        retries = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "DELETE", "PUT", "PATCH"]
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount('https://', adapter)
-        session.mount('http://', adapter)
+        http_cache = cache_key = cached_entry = None
+        if cache and method.upper() == 'GET':
+            http_cache = self._get_http_cache()
+            if http_cache:
+                cache_key = http_cache.make_key(method, url, params, headers)
+                cached_entry = http_cache.get(cache_key)
+                if cached_entry:
+                    if http_cache.is_fresh(cached_entry):
+                        http_cache.record('hit')
+                        xbmc.log(f"Serving {url} from response cache", xbmc.LOGDEBUG)
+                        return CachedResponse(cached_entry, cached_entry['body'])
+                    headers = dict(headers, **http_cache.conditional_headers(cached_entry))
+
+        session = self._get_http_session()
 
         # Retry loop for rate limiting (429 responses)
-        # Use longer waits to respect MUBI's rate limits (especially for bulk operations)
+        # The wait itself happens in the shared rate limiter, so every thread pauses together
         max_rate_limit_retries = 5
-        base_wait_time = 10  # Start with 10 seconds for rate limit backoff
 
         for attempt in range(max_rate_limit_retries + 1):
+            response = None
             try:
+                if not self._acquire_api_slot(url):
+                    return None
+                with self._http_lock:
+                    self._request_count += 1
                 response = session.request(
                     method,
                     url,
@@ -183,34 +337,29 @@ class Mubi:
                     json=json,
                     timeout=10
                 )
+                self._record_api_response(response)
 
                 # Handle rate limiting (429 Too Many Requests)
                 if response.status_code == 429:
                     if attempt < max_rate_limit_retries:
-                        # Check for Retry-After header (can be seconds or HTTP date)
-                        retry_after = response.headers.get('Retry-After')
-                        if retry_after:
-                            try:
-                                wait_time = int(retry_after)
-                            except ValueError:
-                                # Might be an HTTP date, use base exponential backoff
-                                wait_time = base_wait_time * (2 ** attempt)
-                        else:
-                            # No Retry-After header, use exponential backoff
-                            # 10s, 20s, 40s, 80s, 160s = up to 5+ minutes total
-                            wait_time = base_wait_time * (2 ** attempt)
-
+                        wait_time = self._handle_rate_limited(response)
                         xbmc.log(
-                            f"Rate limited (429). Waiting {wait_time}s before retry "
+                            f"Rate limited (429). All API calls paused for {wait_time:.0f}s before retry "
                             f"(attempt {attempt + 1}/{max_rate_limit_retries})",
                             xbmc.LOGWARNING
                         )
-                        time.sleep(wait_time)
                         continue
                     else:
                         xbmc.log("Rate limit retries exhausted", xbmc.LOGERROR)
                         response.raise_for_status()
 
+                # Unchanged since the cached copy: reuse the stored body
+                if cached_entry and response.status_code == 304:
+                    http_cache.refresh(cache_key, cached_entry, response)
+                    http_cache.record('revalidated')
+                    xbmc.log(f"Not modified, using cached body for {url}", xbmc.LOGDEBUG)
+                    return CachedResponse(cached_entry, cached_entry['body'])
+
                 # Check for invalid token before raising HTTPError
                 if response.status_code in [401, 422]:
                     self._check_and_handle_invalid_token(response)
@@ -218,7 +367,10 @@ class Mubi:
                 # Raise an HTTPError for bad responses (4xx and 5xx)
                 response.raise_for_status()
 
-                session.close()
+                if cache_key and response.status_code == 200:
+                    http_cache.store(cache_key, url, response)
+                    http_cache.record('miss')
+
                 return response
 
             except requests.exceptions.HTTPError as http_err:
@@ -226,24 +378,95 @@ class Mubi:
                 if response is not None:
                     xbmc.log(f"Response Headers: {response.headers}", xbmc.LOGERROR)
                     xbmc.log(f"Response Content: {response.text}", xbmc.LOGERROR)
-                session.close()
                 return None
 
             except requests.exceptions.RequestException as req_err:
                 xbmc.log(f"Request exception occurred: {req_err}", xbmc.LOGERROR)
-                session.close()
+                # Connection errors and exhausted 5xx retries count as server failures
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
                 return None
 
             except Exception as err:
                 xbmc.log(f"An unexpected error occurred: {err}", xbmc.LOGERROR)
-                session.close()
                 return None
 
-        # If we exhausted all retries without returning, close session and return None
-        session.close()
+        # If we exhausted all retries without returning, return None
         xbmc.log("All retry attempts exhausted.", xbmc.LOGERROR)
         return None
 
+    def _acquire_api_slot(self, url) -> bool:
+        """
+        Wait for the shared rate limiter and check the circuit breaker before a request.
+
+        :param url: URL about to be requested (for logging).
+        :return: False if the circuit breaker refuses the request.
+        """
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            xbmc.log(
+                f"MUBI API circuit open after repeated server errors, skipping request: {url}",
+                xbmc.LOGWARNING
+            )
+            return False
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return True
+
+    def _record_api_response(self, response):
+        """
+        Feed a response status back into the shared limiter and circuit breaker.
+
+        :param response: Response returned by the API.
+        """
+        status = getattr(response, 'status_code', None)
+        if not isinstance(status, int):
+            return
+        if self.circuit_breaker is not None:
+            if status >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+        if self.rate_limiter is not None and status < 400 and hasattr(self.rate_limiter, 'on_success'):
+            self.rate_limiter.on_success()
+
+    def _handle_rate_limited(self, response) -> float:
+        """
+        Slow down all API callers after a 429 response.
+
+        :param response: The 429 response.
+        :return: Seconds until requests resume.
+        """
+        retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+        if self.rate_limiter is not None and hasattr(self.rate_limiter, 'on_rate_limited'):
+            return self.rate_limiter.on_rate_limited(retry_after)
+        # No shared limiter: wait in this thread only
+        wait_time = retry_after if retry_after is not None else 10
+        time.sleep(wait_time)
+        return wait_time
+
+    @staticmethod
+    def _parse_retry_after(value) -> Optional[float]:
+        """
+        Parse a Retry-After header given either as seconds or as an HTTP date.
+
+        :param value: Header value, or None.
+        :return: Seconds to wait, or None if the header is missing or invalid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+            return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+        except (TypeError, ValueError, IndexError):
+            return None
+
     def _check_and_handle_invalid_token(self, response):
         """
         Check if the API response indicates an invalid or expired token.
@@ -609,62 +832,38 @@ class Mubi:
             return False
     def _fetch_films_for_country(
         self, country_code: str, playable_only: bool = True, page_callback=None,
-        global_film_ids: set = None
+        global_film_ids: set = None, page_workers: int = 1
     ) -> Tuple[set, dict, int, int]:
         """
         Fetches all films for a specific country from the MUBI API.
 
+        Page 1 is always fetched first. When page_workers > 1 and page 1 reports
+        more pages via meta.total_pages, the remaining pages are requested
+        concurrently (within the client's rate limit) and merged in page order.
+
         :param country_code: ISO 3166-1 alpha-2 country code (e.g., 'CH', 'DE', 'US')
         :param playable_only: If True, only fetch currently playable films.
         :param page_callback: Optional callback called after each page with (globally_new_films).
                               Returns False if cancelled.
         :param global_film_ids: Set of film IDs already discovered from previous countries.
                                 Used to count truly new films for progress display.
+        :param page_workers: Number of pages fetched concurrently once the page count is known.
         :return: Tuple of (film_ids set, film_data dict {id: film_data}, total_count, pages_fetched)
         """
-        endpoint = 'v4/browse/films'
         film_ids = set()
         film_data_map = {}  # {film_id: film_data}
         page = 1
         pages_fetched = 0
         total_count = 0
+        total_pages = 0
 
         # For counting truly new films (not seen in any previous country)
         known_global_ids = global_film_ids or set()
 
         xbmc.log(f"[{country_code}] Starting to fetch films", xbmc.LOGINFO)
 
-        while True:
-            # Generate headers with specific country
-            headers = self.hea_gen_anonymous(country_code=country_code)
-
-            params = {
-                'page': page,
-                'sort': 'title',
-            }
-            if playable_only:
-                params['playable'] = 'true'
-
-            response = self._make_api_call('GET', endpoint=endpoint, headers=headers, params=params)
-
-            if not response:
-                xbmc.log(f"[{country_code}] Failed to retrieve page {page}", xbmc.LOGERROR)
-                break
-
-            data = self._safe_json_parse(response, f"[{country_code}] films page {page}")
-            if not data:
-                break
-
-            films = data.get('films', [])
-            meta = data.get('meta', {})
-            pages_fetched += 1
-
-            # Get total count from first page
-            if page == 1:
-                total_count = meta.get('total_count', 0)
-                total_pages = meta.get('total_pages', 0)
-                xbmc.log(f"[{country_code}] API reports {total_count} films across {total_pages} pages", xbmc.LOGINFO)
-
+        def merge_page(films, page_count) -> bool:
+            """Merge one page in order; returns False if the user cancelled."""
             # Process films
             globally_new_films = 0  # Films not seen in ANY country yet
             for film_entry in films:
@@ -677,18 +876,47 @@ class Mubi:
                         globally_new_films += 1
 
             # Call page callback with globally new films count (throttled to every 5 pages)
-            if page_callback and pages_fetched % 5 == 0:
+            if page_callback and page_count % 5 == 0:
                 should_continue = page_callback(globally_new_films)
                 if should_continue is False:
                     xbmc.log(f"[{country_code}] Cancelled by user", xbmc.LOGINFO)
-                    break
+                    return False
+            return True
+
+        while True:
+            data = self._fetch_films_page(country_code, page, playable_only)
+            if not data:
+                break
+
+            films = data.get('films', [])
+            meta = data.get('meta', {})
+            pages_fetched += 1
+
+            # Get total count from first page
+            if page == 1:
+                total_count = meta.get('total_count', 0)
+                total_pages = meta.get('total_pages', 0)
+                xbmc.log(f"[{country_code}] API reports {total_count} films across {total_pages} pages", xbmc.LOGINFO)
+
+            if not merge_page(films, pages_fetched):
+                break
 
             # Check for next page
             next_page = meta.get('next_page')
             if next_page:
+                if page == 1 and page_workers > 1 and isinstance(total_pages, int) and total_pages > 2:
+                    # Page count is known: fan out the remaining pages
+                    last_page = min(total_pages, self.MAX_PAGES_PER_COUNTRY)
+                    pages_fetched += self._fetch_remaining_pages_parallel(
+                        country_code, playable_only, next_page, last_page, page_workers,
+                        merge_page, pages_fetched
+                    )
+                    break
                 page = next_page
                 # Small delay between pages to avoid rate limiting
-                time.sleep(0.3)
+                # (not needed when a shared rate budget already spaces out requests)
+                if self.rate_limiter is None:
+                    time.sleep(0.3)
             else:
                 break
 
@@ -703,6 +931,96 @@ class Mubi:
         xbmc.log(f"[{country_code}] Completed: {len(film_ids)} unique films from {pages_fetched} pages", xbmc.LOGINFO)
         return film_ids, film_data_map, total_count, pages_fetched
 
+    def _fetch_films_page(self, country_code: str, page: int, playable_only: bool) -> Optional[dict]:
+        """
+        Fetch and parse a single page of the browse catalogue for a country.
+
+        Pages already fetched by an interrupted run of the same sync are replayed
+        from the sync journal, and new pages are checkpointed in it. The first
+        page is always requested: it tells whether the catalogue changed since
+        the stored pages were fetched (they are discarded if it did).
+
+        :return: Parsed page data, or None if the request or parsing failed.
+        """
+        journal = self.sync_journal
+        if journal is not None and page != 1:
+            data = journal.get_page(country_code, page)
+            if data is not None:
+                xbmc.log(f"[{country_code}] Page {page} replayed from the sync journal", xbmc.LOGDEBUG)
+                return data
+
+        # Generate headers with specific country
+        headers = self.hea_gen_anonymous(country_code=country_code)
+
+        params = {
+            'page': page,
+            'sort': 'title',
+        }
+        if playable_only:
+            params['playable'] = 'true'
+
+        response = self._make_api_call('GET', endpoint='v4/browse/films', headers=headers, params=params, cache=True)
+
+        if not response:
+            xbmc.log(f"[{country_code}] Failed to retrieve page {page}", xbmc.LOGERROR)
+            return None
+
+        data = self._safe_json_parse(response, f"[{country_code}] films page {page}")
+        if data and journal is not None:
+            if page == 1:
+                journal.check_catalogue(country_code, journal.catalogue_fingerprint(data))
+            journal.record_page(country_code, page, data)
+        return data
+
+    def _fetch_remaining_pages_parallel(
+        self, country_code: str, playable_only: bool, first_page: int, last_page: int,
+        page_workers: int, merge_page, pages_already_fetched: int
+    ) -> int:
+        """
+        Fetch pages first_page..last_page concurrently and merge them in page order.
+
+        Pages are handed to merge_page strictly in ascending order as soon as
+        each one (and all before it) is available. A page that fails ends the
+        merge, as in the sequential loop: skipping it would leave a gap in an
+        otherwise complete catalogue. Requests are paced by the shared API rate
+        limiter.
+
+        :param merge_page: Callable(films, page_count) merging one page; returns False to stop.
+        :param pages_already_fetched: Pages merged before the fan-out (for callback throttling).
+        :return: Number of pages successfully fetched and merged.
+        """
+        import concurrent.futures
+
+        pages = list(range(first_page, last_page + 1))
+        workers = min(page_workers, len(pages))
+        xbmc.log(
+            f"[{country_code}] Fetching pages {first_page}-{last_page} with {workers} parallel requests",
+            xbmc.LOGINFO
+        )
+
+        merged = 0
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        futures = {}
+        try:
+            futures = {
+                page: executor.submit(self._fetch_films_page, country_code, page, playable_only)
+                for page in pages
+            }
+            for page in pages:
+                data = futures.pop(page).result()
+                if not data:
+                    xbmc.log(f"[{country_code}] Stopping at failed page {page}", xbmc.LOGWARNING)
+                    break
+                merged += 1
+                if not merge_page(data.get('films', []), pages_already_fetched + merged):
+                    break
+        finally:
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return merged
+
     def process_film_data(self, film_data: dict) -> Optional[Film]:
         """
         Hydrates raw film data into a Film object.
@@ -721,7 +1039,8 @@ class Mubi:
         film_wrapper = {'film': film_data}
         return self.get_film_metadata(film_wrapper, available_countries=available_countries)
 
-    def get_all_films(self, playable_only=True, progress_callback=None, countries=None, data_source=None):
+    def get_all_films(self, playable_only=True, progress_callback=None, countries=None, data_source=None,
+                      delta_sync=False, stream=False):
         """
         Retrieves all films from MUBI API by syncing across specified countries.
         Uses the new pipeline: DataSource -> Filter -> Hydrate -> Library.
@@ -730,17 +1049,43 @@ class Mubi:
         :param progress_callback: Optional callback function to report progress.
         :param countries: List of ISO 3166-1 alpha-2 country codes to sync from.
         :param data_source: Optional FilmDataSource instance to use.
+        :param delta_sync: If True, only films added or changed since the last sync are
+                           hydrated into the library; unchanged films keep their folders.
+        :param stream: If True, nothing is fetched yet: the returned Library gets a
+                       film_stream that runs the pipeline film by film while
+                       Library.sync_locally writes files (progress_callback is not used).
         :return: Library instance with all films.
         """
         from .data_source import MubiApiDataSource
         from .filters import FilmFilter
+        from .profile_cache import get_profile_path
+        from .sync_journal import SyncJournal
+        from .sync_snapshot import SyncSnapshot
 
         # 1. Fetch (DataSource)
         # Use provided data source or default to MubiApiDataSource
         source = data_source if data_source else MubiApiDataSource(self)
+
+        # Checkpoint fetched pages and written films so an interrupted sync can resume
+        self.sync_journal = SyncJournal.open(SyncJournal.make_key(source, countries, playable_only))
+
+        if stream:
+            all_films_library = Library()
+            all_films_library.sync_journal = self.sync_journal
+            all_films_library.film_stream = self._iter_sync_films(
+                source, all_films_library, playable_only, countries, delta_sync
+            )
+            return all_films_library
         
         # progress_callback is handled inside data source for the fetching phase
-        raw_films = source.get_films(playable_only=playable_only, progress_callback=progress_callback, countries=countries)
+        try:
+            raw_films = source.get_films(playable_only=playable_only, progress_callback=progress_callback, countries=countries)
+        except Exception:
+            # Keep the checkpoints for the next attempt, but not the connection
+            if self.sync_journal is not None:
+                self.sync_journal.close()
+                self.sync_journal = None
+            raise
         
         xbmc.log(f"Pipeline: Fetched {len(raw_films)} raw films.", xbmc.LOGINFO)
 
@@ -752,7 +1097,21 @@ class Mubi:
 
         # 3. Hydrate & 4. Add to Library
         all_films_library = Library()
-        
+        all_films_library.sync_journal = self.sync_journal
+
+        # Delta sync: skip films that are unchanged since the last sync
+        films_to_sync = None
+        try:
+            snapshot = SyncSnapshot.load(get_cache_dir() / SyncSnapshot.FILE_NAME)
+            delta = snapshot.compute_delta(filtered_films, get_profile_path())
+            all_films_library.sync_snapshot = snapshot
+            if delta_sync and not delta.full_sync:
+                films_to_sync = delta.to_sync
+                all_films_library.retained_folders = snapshot.retained_folders()
+            xbmc.log(f"Pipeline: {delta}", xbmc.LOGINFO)
+        except OSError as e:
+            xbmc.log(f"Sync snapshot unavailable, doing a full sync: {e}", xbmc.LOGWARNING)
+
         if progress_callback:
              try:
                  progress_callback(
@@ -769,6 +1128,8 @@ class Mubi:
         total_films_added = 0
         
         for film_data in filtered_films:
+            if films_to_sync is not None and SyncSnapshot.film_id(film_data) not in films_to_sync:
+                continue
             film = self.process_film_data(film_data)
             if film:
                 all_films_library.add_film(film)
@@ -778,6 +1139,48 @@ class Mubi:
         return all_films_library
 
 
+    def _iter_sync_films(self, source, library, playable_only, countries, delta_sync):
+        """
+        Producer side of a streaming sync: DataSource -> Filter -> delta -> Hydrate, one
+        film at a time. Once the source is exhausted the delta is complete and the
+        folders of unchanged films are handed to the library.
+
+        :return: Iterator over hydrated Film objects.
+        """
+        from .filters import FilmFilter
+        from .profile_cache import get_profile_path
+        from .sync_snapshot import SyncSnapshot
+
+        snapshot = None
+        skip_unchanged = False
+        try:
+            snapshot = SyncSnapshot.load(get_cache_dir() / SyncSnapshot.FILE_NAME)
+            delta = snapshot.begin_delta(get_profile_path())
+            library.sync_snapshot = snapshot
+            skip_unchanged = delta_sync and not delta.full_sync
+        except OSError as e:
+            xbmc.log(f"Sync snapshot unavailable, doing a full sync: {e}", xbmc.LOGWARNING)
+
+        film_filter = FilmFilter()
+        raw_films = source.iter_films(playable_only=playable_only, countries=countries)
+        total_films_added = 0
+
+        for film_data in film_filter.iter_films(raw_films):
+            status = snapshot.stage_film(film_data) if snapshot else None
+            if skip_unchanged and status == 'unchanged':
+                continue
+            film = self.process_film_data(film_data)
+            if film:
+                total_films_added += 1
+                yield film
+
+        if snapshot:
+            delta = snapshot.finish_delta()
+            if skip_unchanged:
+                library.retained_folders = snapshot.retained_folders()
+            xbmc.log(f"Pipeline: {delta}", xbmc.LOGINFO)
+        xbmc.log(f"Pipeline: streamed {total_films_added} films to the library", xbmc.LOGINFO)
+
     def get_watch_list(self):
         """
         Retrieves and adds films to the library from the watchlist
@@ -1004,26 +1407,24 @@ class Mubi:
             xbmc.log(f"Error parsing film metadata: {e}", xbmc.LOGERROR)
             return None
 
+    def _get_artwork_tier(self) -> str:
+        if self._artwork_tier is None:
+            self._artwork_tier = get_artwork_tier()
+        return self._artwork_tier
+
     def _get_best_thumbnail_url(self, film_info: dict) -> str:
         """
-        Get the best available thumbnail URL, preferring retina quality.
+        Get the best available thumbnail URL, in the still size of the artwork
+        tier setting (retina quality by default).
 
         :param film_info: Dictionary containing film data
         :return: Best available thumbnail URL
         """
         try:
-            # Check for enhanced stills with retina quality
-            stills = film_info.get('stills', {})
-            if isinstance(stills, dict):
-                # Prefer retina quality for higher resolution
-                retina_url = stills.get('retina', '')
-                if retina_url:
-                    return retina_url
-
-                # Fallback to standard quality
-                standard_url = stills.get('standard', '')
-                if standard_url:
-                    return standard_url
+            # Check for enhanced stills in the preferred size
+            still_url = select_still(film_info.get('stills', {}), self._get_artwork_tier())
+            if still_url:
+                return still_url
 
             # Final fallback to still_url (handle potential object format)
             still_val = film_info.get('still_url')
@@ -1041,7 +1442,7 @@ class Mubi:
         Supports: thumb (landscape), poster (portrait), fanart (background), clearlogo (title treatment).
 
         Priority sources:
-        - thumb: stills.retina > stills.standard > still_url
+        - thumb: stills in the artwork tier's size (retina > standard by default) > still_url
         - poster: artworks[cover_artwork_vertical] > portrait_image
         - fanart: artworks[centered_background]
         - clearlogo: title_treatment_url
@@ -1056,14 +1457,10 @@ class Mubi:
             if not film_info or not isinstance(film_info, dict):
                 return {}
 
-            # Thumbnail/Landscape images from stills
-            stills = film_info.get('stills', {})
-            if isinstance(stills, dict):
-                # Use retina quality for thumb (landscape)
-                if stills.get('retina'):
-                    artwork_urls['thumb'] = stills['retina']
-                elif stills.get('standard'):
-                    artwork_urls['thumb'] = stills['standard']
+            # Thumbnail/Landscape images from stills, in the size of the artwork tier
+            still_url = select_still(film_info.get('stills', {}), self._get_artwork_tier())
+            if still_url:
+                artwork_urls['thumb'] = still_url
 
             # Fallback to still_url if no stills available
             if 'thumb' not in artwork_urls:
@@ -1226,7 +1623,10 @@ class Mubi:
             params = {'parental_lock_enabled': 'true'}
 
             try:
+                if not self._acquire_api_slot(viewing_url):
+                    return {'error': 'MUBI is temporarily unavailable. Please try again in a moment.'}
                 response = requests.post(viewing_url, headers=headers, params=params, timeout=10)
+                self._record_api_response(response)
                 xbmc.log(f"Viewing availability response: {response.status_code}", xbmc.LOGDEBUG)
 
                 # Check for geo-restriction error (422 with "Film not authorized")
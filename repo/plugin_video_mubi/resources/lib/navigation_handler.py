@@ -11,10 +11,11 @@ from typing import Optional
 from .library import Library
 from .library import Library
 from .playback import play_with_inputstream_adaptive
-import datetime
-import dateutil.parser
+from .profile_cache import is_cache_dir
+from .availability import is_live
 import requests
 import re
+import sqlite3
 
 class LibraryMonitor(xbmc.Monitor):
     def __init__(self):
@@ -544,10 +545,85 @@ class NavigationHandler:
 
 
 
+    @staticmethod
+    def _extract_nfo_availability(mubi_availability_node) -> dict:
+        """
+        :param mubi_availability_node: The <mubi_availability> element of an NFO file (or None).
+        :return: Dict {country_code: {'availability': 'live', ...}}
+        """
+        if mubi_availability_node is None:
+            return {}
+
+        data = {}
+        for country in mubi_availability_node.findall("country"):
+            code = country.get("code")
+            if not code:
+                continue
+
+            details = {}
+            # Extract availability status
+            avail_node = country.find("availability")
+            if avail_node is not None and avail_node.text:
+                details['availability'] = avail_node.text
+            else:
+                details['availability'] = 'live' # Default if missing but country present
+
+            # Extract other fields if needed
+            for field in ['available_at', 'expires_at', 'availability_ends_at']:
+                node = country.find(field)
+                if node is not None and node.text:
+                    details[field] = node.text
+
+            data[code] = details
+        return data
+
+    def _get_indexed_availability(self, film_id: str) -> Optional[dict]:
+        """
+        Look the film up in the catalogue database maintained by the library sync.
+
+        :param film_id: The MUBI film ID.
+        :return: Dict {country_code: {'availability': 'live', ...}}, or None if the
+                 film is not indexed or its NFO file is gone (the caller then scans).
+        """
+        import xml.etree.ElementTree as ET
+        from .catalogue_store import CatalogueStore, nfo_content_hash
+
+        store = CatalogueStore.open(create=False)
+        if store is None:
+            return None
+        try:
+            entry = store.get_entry(film_id)
+            if entry is None:
+                return None
+            nfo_file = Path(entry['nfo_path'])
+            content = nfo_file.read_bytes()
+            if nfo_content_hash(content) == entry['nfo_hash']:
+                xbmc.log(f"Found film_id {film_id} in the catalogue index: {nfo_file}", xbmc.LOGDEBUG)
+                data = store.get_availability(film_id)
+                for details in data.values():
+                    details.setdefault('availability', 'live')
+                return data
+
+            # The NFO changed since the last sync: read just this file
+            root = ET.fromstring(content)
+            uniqueid = root.find(".//uniqueid[@type='mubi']")
+            if uniqueid is not None and uniqueid.text != str(film_id):
+                return None
+            xbmc.log(f"Catalogue index entry for film_id {film_id} is stale, reading {nfo_file}", xbmc.LOGDEBUG)
+            return self._extract_nfo_availability(root.find("mubi_availability"))
+        except (OSError, ET.ParseError, sqlite3.Error) as e:
+            xbmc.log(f"Catalogue index lookup failed for film_id {film_id}: {e}", xbmc.LOGDEBUG)
+            return None
+        finally:
+            store.close()
+
     def _get_available_countries_data_from_nfo(self, film_id: str) -> dict:
         """
         Read the available countries and their availability details from the NFO file.
 
+        The catalogue index written by the library sync answers directly; the
+        profile is only scanned when the index is missing or stale.
+
         :param film_id: The MUBI film ID.
         :return: Dict {country_code: {'availability': 'live', ...}}
         """
@@ -555,11 +631,15 @@ class NavigationHandler:
         import re
         from pathlib import Path
 
+        indexed = self._get_indexed_availability(film_id)
+        if indexed is not None:
+            return indexed
+
         plugin_userdata_path = Path(xbmcvfs.translatePath(self.plugin.getAddonInfo("profile")))
 
         # Search for NFO file containing this film_id
         for film_folder in plugin_userdata_path.iterdir():
-            if not film_folder.is_dir():
+            if not film_folder.is_dir() or is_cache_dir(film_folder):
                 continue
 
             # Find NFO file in the folder
@@ -572,41 +652,13 @@ class NavigationHandler:
                 tree = ET.parse(nfo_file)
                 root = tree.getroot()
 
-                # Helper to extract availability dict from availability element
-                def extract_availability(mubi_availability_node) -> dict:
-                    if mubi_availability_node is None:
-                         return {}
-                    
-                    data = {}
-                    for country in mubi_availability_node.findall("country"):
-                        code = country.get("code")
-                        if not code:
-                             continue
-                        
-                        details = {}
-                        # Extract availability status
-                        avail_node = country.find("availability")
-                        if avail_node is not None and avail_node.text:
-                            details['availability'] = avail_node.text
-                        else:
-                            details['availability'] = 'live' # Default if missing but country present
-                        
-                        # Extract other fields if needed
-                        for field in ['available_at', 'expires_at', 'availability_ends_at']:
-                            node = country.find(field)
-                            if node is not None and node.text:
-                                details[field] = node.text
-                        
-                        data[code] = details
-                    return data
-                
                 # Check if this NFO matches the film_id (look for the STRM file or film ID)
                 uniqueid = root.find(".//uniqueid[@type='mubi']")
                 if uniqueid is not None and uniqueid.text == film_id:
                     # Found the right film
                     mubi_availability = root.find("mubi_availability")
                     xbmc.log(f"Found NFO for film_id {film_id} via uniqueid: {nfo_file}", xbmc.LOGDEBUG)
-                    return extract_availability(mubi_availability)
+                    return self._extract_nfo_availability(mubi_availability)
 
                 # Alternative: check STRM file for exact film_id match
                 strm_files = list(film_folder.glob("*.strm"))
@@ -617,7 +669,7 @@ class NavigationHandler:
                         # Found the right film
                         mubi_availability = root.find("mubi_availability")
                         xbmc.log(f"Found NFO for film_id {film_id} via STRM: {nfo_file}", xbmc.LOGDEBUG)
-                        return extract_availability(mubi_availability)
+                        return self._extract_nfo_availability(mubi_availability)
 
             except (ET.ParseError, OSError) as e:
                 xbmc.log(f"Error parsing NFO file {nfo_file}: {e}", xbmc.LOGWARNING)
@@ -634,40 +686,7 @@ class NavigationHandler:
         :param details: Availability details dict for a country
         :return: True if available, False otherwise
         """
-        # 1. Check date range if available
-        available_at = details.get('available_at')
-        expires_at = details.get('expires_at')
-
-        if available_at or expires_at:
-            try:
-                # Use UTC for comparison as API dates are typically UTC
-                now = datetime.datetime.now(datetime.timezone.utc)
-                
-                is_available = True
-                
-                if available_at:
-                    start_dt = dateutil.parser.parse(available_at)
-                    # ensure timezone awareness
-                    if not start_dt.tzinfo:
-                        start_dt = start_dt.replace(tzinfo=datetime.timezone.utc)
-                    if now < start_dt:
-                        is_available = False
-                
-                if expires_at:
-                    end_dt = dateutil.parser.parse(expires_at)
-                    # ensure timezone awareness
-                    if not end_dt.tzinfo:
-                        end_dt = end_dt.replace(tzinfo=datetime.timezone.utc)
-                    if now > end_dt:
-                        is_available = False
-                
-                return is_available
-            except Exception as e:
-                xbmc.log(f"Error parsing dates for availability check: {e}", xbmc.LOGWARNING)
-                # Fall through to legacy check on error
-
-        # 2. Legacy/Simple check: availability == 'live'
-        return details.get('availability') == 'live'
+        return is_live(details)
 
     def _get_vpn_suggestions(self, available_countries_data: dict, max_suggestions: int = 3) -> list:
         """
@@ -1033,6 +1052,8 @@ class NavigationHandler:
 
             NavigationHandler._sync_in_progress = True
 
+        # One provider (pooled connections, checked key) for the whole sync
+        MetadataProviderFactory.begin_sync()
         try:
             # Check if metadata providers are configured, unless skipping
             if not skip_external_metadata:
@@ -1095,51 +1116,25 @@ class NavigationHandler:
                 pDialog.update(percent, message)
 
             # Sync films
+            # Streaming: films are fetched while Library.sync_locally writes them
+            stream = self.plugin.getSettingBool('enable_streaming_sync') is True
             try:
                 all_films_library = self.mubi.get_all_films(
                     playable_only=True,
                     progress_callback=update_fetch_progress,
                     countries=countries,
-                    data_source=data_source
+                    data_source=data_source,
+                    delta_sync=self.plugin.getSettingBool('enable_delta_sync') is True,
+                    stream=stream
                 )
             except (ValueError, Exception) as e:
-                # Handle specific known errors (ValueError might be MD5 or validation)
-                msg = str(e)
-                
-                # Check for cancellation first (raised as general Exception sometimes)
-                if "canceled" in msg.lower():
-                    pDialog.close()
-                    xbmc.log("User canceled the sync process during film fetching.", xbmc.LOGDEBUG)
-                    return None
-                
-                # Identify error type for cleaner notification
-                error_title = "Sync Failed"
-                if "MD5" in msg:
-                    error_body = "Download integrity check failed."
-                elif "JSON" in msg or "parsing" in msg.lower():
-                    error_body = "Data format error from server."
-                elif "HTTP" in msg or "Connection" in msg or "Max retries" in msg:
-                        error_body = "Network error or server unavailable."
-                else:
-                        error_body = f"Error: {msg}"
-
-                import traceback
-                xbmc.log(f"Sync failed with error: {e}", xbmc.LOGERROR)
-                xbmc.log(f"Full traceback:\n{traceback.format_exc()}", xbmc.LOGERROR)
-                pDialog.close()
-                
-                xbmcgui.Dialog().notification(
-                    "MUBI", 
-                    error_body,
-                    xbmcgui.NOTIFICATION_ERROR,
-                    5000
-                )
-                return None
+                return self._report_fetch_error(e, pDialog)
 
             # Update progress dialog for file creation phase
-            filtered_films_count = len(all_films_library.films)
-            pDialog.update(100, f"Fetched {filtered_films_count} films, creating local files...")
-            xbmc.log(f"Successfully fetched {filtered_films_count} films", xbmc.LOGINFO)
+            if not stream:
+                filtered_films_count = len(all_films_library.films)
+                pDialog.update(100, f"Fetched {filtered_films_count} films, creating local files...")
+                xbmc.log(f"Successfully fetched {filtered_films_count} films", xbmc.LOGINFO)
 
             if pDialog.iscanceled():
                 pDialog.close()
@@ -1154,9 +1149,15 @@ class NavigationHandler:
             time.sleep(0.1)
 
             # Sync files locally
-            all_films_library.sync_locally(
-                self.base_url, plugin_userdata_path, skip_external_metadata=skip_external_metadata
-            )
+            try:
+                all_films_library.sync_locally(
+                    self.base_url, plugin_userdata_path, skip_external_metadata=skip_external_metadata
+                )
+            except Exception as e:
+                if not stream:
+                    raise
+                # Fetch errors surface while files are being written
+                return self._report_fetch_error(e, pDialog)
 
             # Trigger library operations
             monitor = LibraryMonitor()
@@ -1172,10 +1173,47 @@ class NavigationHandler:
             xbmc.log(traceback.format_exc(), xbmc.LOGERROR)
             xbmcgui.Dialog().notification("MUBI", "An unexpected error occurred during sync.", xbmcgui.NOTIFICATION_ERROR)
         finally:
+            MetadataProviderFactory.end_sync()
             with NavigationHandler._sync_lock:
                 NavigationHandler._sync_in_progress = False
                 xbmc.log("Sync operation completed - flag cleared", xbmc.LOGDEBUG)
 
+    def _report_fetch_error(self, e: Exception, pDialog):
+        """
+        Close the sync dialog and notify the user that fetching the films failed.
+        """
+        # Handle specific known errors (ValueError might be MD5 or validation)
+        msg = str(e)
+        
+        # Check for cancellation first (raised as general Exception sometimes)
+        if "canceled" in msg.lower():
+            pDialog.close()
+            xbmc.log("User canceled the sync process during film fetching.", xbmc.LOGDEBUG)
+            return None
+        
+        # Identify error type for cleaner notification
+        if "MD5" in msg:
+            error_body = "Download integrity check failed."
+        elif "JSON" in msg or "parsing" in msg.lower():
+            error_body = "Data format error from server."
+        elif "HTTP" in msg or "Connection" in msg or "Max retries" in msg:
+            error_body = "Network error or server unavailable."
+        else:
+            error_body = f"Error: {msg}"
+
+        import traceback
+        xbmc.log(f"Sync failed with error: {e}", xbmc.LOGERROR)
+        xbmc.log(f"Full traceback:\n{traceback.format_exc()}", xbmc.LOGERROR)
+        pDialog.close()
+        
+        xbmcgui.Dialog().notification(
+            "MUBI", 
+            error_body,
+            xbmcgui.NOTIFICATION_ERROR,
+            5000
+        )
+        return None
+
     def wait_for_library_idle(self, timeout=30):
         """
         Wait until the Kodi library is idle (not scanning or cleaning).
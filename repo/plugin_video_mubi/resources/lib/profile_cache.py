@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Location of the addon's private cache data inside the profile directory.
+
+The profile directory also holds one folder per synced film, and the library
+code treats every other folder there as obsolete. All caches therefore live
+under a single reserved folder (CACHE_DIR_NAME) that film-folder scans skip.
+"""
+
+from pathlib import Path
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+CACHE_DIR_NAME = '.cache'
+
+
+def get_profile_path() -> Path:
+    """
+    :return: The addon profile directory (where film folders are stored).
+    """
+    return Path(xbmcvfs.translatePath(xbmcaddon.Addon().getAddonInfo('profile')))
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Return (and create) a cache sub-directory inside the profile.
+
+    :param parts: Sub-directory names below the cache root, e.g. get_cache_dir('http').
+    :return: Path to the directory.
+    """
+    path = get_profile_path() / CACHE_DIR_NAME
+    for part in parts:
+        path = path / part
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def is_cache_dir(path: Path) -> bool:
+    """
+    :param path: A directory inside the profile.
+    :return: True if it is the reserved cache folder and must not be treated as a film folder.
+    """
+    return Path(path).name == CACHE_DIR_NAME
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Write a file so readers never see a partially written version.
+
+    :param path: Destination file.
+    :param data: File contents.
+    """
+    import os
+    import threading
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        xbmc.log(f"Failed to write cache file {path}", xbmc.LOGDEBUG)
+        raise
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Request-rate budget shared between threads that call the MUBI API.
+
+The limiter is a token bucket: ``rate`` tokens are added per second up to
+``burst``, and every request consumes one. Callers reserve a slot under a
+lock and then sleep once for the computed delay, so concurrent workers are
+spaced out evenly instead of all firing at the same instant.
+
+A single AdaptiveRateLimiter and CircuitBreaker are shared by every MUBI
+API call in the process (see get_api_rate_limiter / get_api_circuit_breaker),
+so a 429 or a run of server errors seen by one thread slows down or stops
+all of them together. External metadata providers (TMDB, OMDb) get one
+AdaptiveRateLimiter each (see get_provider_rate_limiter), shared by all sync
+workers.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting requests per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        :param rate: Sustained number of requests allowed per second.
+        :param burst: Number of requests that may be issued back-to-back.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+        self.acquired = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._last = now
+
+    def _start_time(self, now: float) -> float:
+        """Earliest time a new request may start (hook for subclasses)."""
+        return now
+
+    def reserve(self) -> float:
+        """
+        Reserve one request slot without blocking.
+
+        :return: Number of seconds the caller must wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = self._start_time(now)
+            self._refill(start)
+            self._tokens -= 1.0
+            self.acquired += 1
+            delay = start - now
+            if self._tokens < 0:
+                # Token debt is paid back at `rate` tokens per second
+                delay += -self._tokens / self.rate
+            if delay > 0:
+                self.total_wait += delay
+                return delay
+            return 0.0
+
+    def acquire(self):
+        """
+        Block until a request slot is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket whose rate follows AIMD (additive increase, multiplicative decrease).
+
+    Every successful response nudges the rate up by roughly ``increase_step``
+    requests/s per second of traffic, up to ``max_rate``. A 429 halves the rate
+    (at most once per ``decrease_cooldown`` so a burst of 429s from parallel
+    workers counts as one event) and pauses all callers until the server's
+    Retry-After, or an exponential backoff when no header is sent.
+    """
+
+    BASE_BACKOFF = 10.0  # seconds, doubled for each consecutive 429 without Retry-After
+    MAX_BACKOFF = 160.0
+    # A budget change within this many seconds of a 429 does not reset the rate
+    RECOVERY_WINDOW = 60.0
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.5, max_rate: float = None,
+                 increase_step: float = 0.25, decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 2.0):
+        """
+        :param rate: Initial requests per second.
+        :param burst: Number of requests that may be issued back-to-back.
+        :param min_rate: Floor for multiplicative decrease.
+        :param max_rate: Ceiling for additive increase (defaults to the initial rate).
+        :param increase_step: Requests/s added per second of successful traffic.
+        :param decrease_factor: Multiplier applied to the rate on a 429.
+        :param decrease_cooldown: Minimum seconds between two rate decreases.
+        """
+        super().__init__(rate, burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate) if max_rate else self.rate
+        self.increase_step = float(increase_step)
+        self.decrease_factor = float(decrease_factor)
+        self.decrease_cooldown = float(decrease_cooldown)
+        self._paused_until = 0.0
+        self._last_decrease = None
+        self._consecutive_limited = 0
+        self.rate_limited = 0
+        self.successes = 0
+
+    def _start_time(self, now: float) -> float:
+        return max(now, self._paused_until)
+
+    def on_success(self):
+        """Record a successful response (additive increase)."""
+        with self._lock:
+            self.successes += 1
+            self._consecutive_limited = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase_step / self.rate)
+
+    def on_rate_limited(self, retry_after: float = None) -> float:
+        """
+        Record a 429 response: slow everyone down and pause until the server allows requests again.
+
+        :param retry_after: Seconds from the Retry-After header, if the server sent one.
+        :return: Seconds until requests resume.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.rate_limited += 1
+            self._consecutive_limited += 1
+
+            if self._last_decrease is None or now - self._last_decrease >= self.decrease_cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._last_decrease = now
+
+            if retry_after is None:
+                pause = min(self.MAX_BACKOFF, self.BASE_BACKOFF * (2 ** (self._consecutive_limited - 1)))
+            else:
+                pause = max(0.0, float(retry_after))
+            self._paused_until = max(self._paused_until, now + pause)
+
+            # No saved-up burst: after the pause, requests resume at the new rate
+            self._tokens = min(self._tokens, 0.0)
+            self._last = max(self._last, self._paused_until)
+            return self._paused_until - now
+
+    def configure(self, max_rate: float = None, burst: int = None):
+        """
+        Change the request budget, e.g. for the duration of a sync.
+
+        The current rate is raised to the new ceiling unless the server rate
+        limited us recently, in which case it only gets clamped.
+
+        :return: Tuple (max_rate, burst) of the previous settings, for restoring.
+        """
+        with self._lock:
+            previous = (self.max_rate, self.burst)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+                self._tokens = min(self._tokens, float(self.burst))
+            if max_rate is not None and max_rate > 0:
+                self.max_rate = float(max_rate)
+                recently_limited = (
+                    self._last_decrease is not None
+                    and time.monotonic() - self._last_decrease < self.RECOVERY_WINDOW
+                )
+                self.rate = min(self.rate, self.max_rate) if recently_limited else self.max_rate
+            return previous
+
+    def get_stats(self) -> dict:
+        """
+        :return: Dictionary with request, wait and rate-limit counters.
+        """
+        with self._lock:
+            return {
+                'requests': self.acquired,
+                'total_wait': self.total_wait,
+                'rate_limited': self.rate_limited,
+                'current_rate': self.rate,
+                'max_rate': self.max_rate,
+            }
+
+
+class CircuitBreaker:
+    """
+    Stops requests while the server keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are refused for ``reset_timeout`` seconds. Then a single trial
+    request is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds to refuse requests before a trial request.
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        :return: True if a request may be sent now.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a response that was not a server failure."""
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a server failure (5xx or connection error)."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+# Process-wide instances shared by every MUBI API call
+DEFAULT_API_RATE = 5
+DEFAULT_API_BURST = 4
+
+# External metadata providers: (requests per second, burst), keyed by provider_name.
+# TMDB documents a limit of about 50 requests/s and 20 connections per IP; OMDb
+# documents no per-second limit, only a daily quota (1,000 requests on free keys),
+# so it is paced at the one request per second the sync used to sleep for.
+PROVIDER_RATE_LIMITS = {
+    'TMDB': (20, 10),
+    'OMDB': (1, 2),
+}
+DEFAULT_PROVIDER_RATE_LIMIT = (1, 1)
+
+_api_rate_limiter = None
+_api_circuit_breaker = None
+_provider_rate_limiters = {}
+_singleton_lock = threading.Lock()
+
+
+def get_api_rate_limiter() -> AdaptiveRateLimiter:
+    """
+    :return: The AdaptiveRateLimiter shared by all MUBI API calls in this process.
+    """
+    global _api_rate_limiter
+    with _singleton_lock:
+        if _api_rate_limiter is None:
+            _api_rate_limiter = AdaptiveRateLimiter(rate=DEFAULT_API_RATE, burst=DEFAULT_API_BURST)
+        return _api_rate_limiter
+
+
+def get_api_circuit_breaker() -> CircuitBreaker:
+    """
+    :return: The CircuitBreaker shared by all MUBI API calls in this process.
+    """
+    global _api_circuit_breaker
+    with _singleton_lock:
+        if _api_circuit_breaker is None:
+            _api_circuit_breaker = CircuitBreaker()
+        return _api_circuit_breaker
+
+
+def get_provider_rate_limiter(provider_name: str) -> AdaptiveRateLimiter:
+    """
+    :param provider_name: Name of an external metadata provider, e.g. 'TMDB'.
+    :return: The AdaptiveRateLimiter shared by all requests to that provider in this process.
+    """
+    with _singleton_lock:
+        limiter = _provider_rate_limiters.get(provider_name)
+        if limiter is None:
+            rate, burst = PROVIDER_RATE_LIMITS.get(provider_name, DEFAULT_PROVIDER_RATE_LIMIT)
+            limiter = AdaptiveRateLimiter(rate=rate, burst=burst)
+            _provider_rate_limiters[provider_name] = limiter
+        return limiter
+
+
+def get_provider_throttle_stats() -> dict:
+    """
+    :return: Dictionary {provider_name: AdaptiveRateLimiter.get_stats()} of the providers used so far.
+    """
+    with _singleton_lock:
+        limiters = dict(_provider_rate_limiters)
+    return {name: limiter.get_stats() for name, limiter in limiters.items()}
+
+
+def reset_api_throttle():
+    """
+    Discard the shared limiters and breaker so the next call starts fresh.
+    """
+    global _api_rate_limiter, _api_circuit_breaker
+    with _singleton_lock:
+        _api_rate_limiter = None
+        _api_circuit_breaker = None
+        _provider_rate_limiters.clear()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy-greedy set cover over bitsets.
+
+Used to pick the fewest countries whose catalogues cover every film, both by
+the scraper (backend/scraper.py) and by the add-on's worldwide sync
+(coverage_optimizer.py). backend/set_cover.py is a verbatim copy of this
+file, since the backend and the add-on ship separately; a test keeps them
+identical.
+
+Each subset is stored as an int bitset over the universe, so the gain of a
+candidate is a single AND-NOT and popcount. Selection is CELF-style: gains
+can only shrink as the cover grows, so candidates sit in a heap keyed by
+their last known gain and only the one at the top is re-evaluated. The
+result is the same as the plain greedy algorithm with the same ordering
+(largest gain first, then the smallest tie-break key, then input order).
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+class CoverResult(NamedTuple):
+    selected: List[Hashable]  # Subset keys in selection order
+    gains: List[int]  # Elements newly covered by each selected subset
+    covered: int  # Elements covered by the selection
+    universe: int  # Elements to cover
+
+
+class BitsetIndex:
+    """
+    Subsets of a universe encoded as int bitsets.
+    """
+
+    def __init__(self, subsets: Mapping[Hashable, Iterable[Hashable]], universe: Iterable[Hashable] = None):
+        """
+        :param subsets: {key: elements}; iteration order is the final tie-breaker.
+        :param universe: Elements to cover (defaults to the union of the subsets).
+                         Elements outside it are ignored.
+        """
+        subsets = {key: list(elements) for key, elements in subsets.items()}
+        self.positions: Dict[Hashable, int] = {}
+        if universe is None:
+            universe = (element for elements in subsets.values() for element in elements)
+        for element in universe:
+            self.positions.setdefault(element, len(self.positions))
+
+        # Set bits in a byte buffer and convert once: OR-ing into a growing int is quadratic
+        size = (len(self.positions) + 7) // 8
+        self.bits: Dict[Hashable, int] = {}
+        for key, elements in subsets.items():
+            buffer = bytearray(size)
+            for element in elements:
+                position = self.positions.get(element)
+                if position is not None:
+                    buffer[position >> 3] |= 1 << (position & 7)
+            self.bits[key] = int.from_bytes(buffer, 'little')
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def count(self, key: Hashable) -> int:
+        return _popcount(self.bits.get(key, 0))
+
+
+def greedy_cover(subsets: Mapping[Hashable, Iterable[Hashable]], universe: Iterable[Hashable] = None,
+                 first: Hashable = None, tie_break: Callable[[Hashable], Any] = None) -> CoverResult:
+    """
+    Pick subsets until the universe is covered or no subset adds anything.
+
+    :param subsets: {key: elements}, or a BitsetIndex.
+    :param universe: Elements to cover (defaults to the union of the subsets).
+    :param first: Key to select first, if present (e.g. the user's own country).
+    :param tie_break: Key function ordering candidates with equal gain (smaller first).
+    :return: CoverResult.
+    """
+    index = subsets if isinstance(subsets, BitsetIndex) else BitsetIndex(subsets, universe)
+    full = (1 << len(index)) - 1
+    covered = 0
+    selected: List[Hashable] = []
+    gains: List[int] = []
+
+    if first is not None and first in index.bits:
+        covered = index.bits[first]
+        selected.append(first)
+        gains.append(_popcount(covered))
+
+    # Heap entries: (-gain, tie-break key, input order, round the gain was computed in)
+    heap = []
+    for order, (key, bits) in enumerate(index.bits.items()):
+        if key in selected:
+            continue
+        gain = _popcount(bits & ~covered)
+        if gain:
+            heap.append((-gain, tie_break(key) if tie_break else 0, order, len(selected), key))
+    heapq.heapify(heap)
+
+    while heap and covered != full:
+        negative_gain, tie, order, computed_in, key = heap[0]
+        if computed_in == len(selected):
+            heapq.heappop(heap)
+            covered |= index.bits[key]
+            selected.append(key)
+            gains.append(-negative_gain)
+            continue
+        # Stale upper bound: re-evaluate against the current cover
+        gain = _popcount(index.bits[key] & ~covered)
+        if gain:
+            heapq.heapreplace(heap, (-gain, tie, order, len(selected), key))
+        else:
+            heapq.heappop(heap)
+
+    return CoverResult(selected, gains, _popcount(covered), len(index))
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk journal that lets an interrupted sync resume where it stopped.
+
+While a sync runs, every catalogue page fetched from the MUBI API and every
+film written to the library is checkpointed in a small SQLite database in
+the profile cache folder, one transaction per entry, so a cancel or a Kodi
+shutdown loses at most the page or film in progress. The database runs in
+WAL mode with synchronous=NORMAL: commits are appended to the log without
+an fsync each (only a power cut can lose the latest ones), which keeps the
+write load low on SD-card devices. Films a sync leaves unchanged are not
+checkpointed: the sync manifest already covers them. The next sync with the
+same parameters replays the stored pages instead of requesting them again
+and skips films already written with the same catalogue data (no NFO
+rebuild, no external metadata lookups). The journal is deleted once a sync
+completes.
+
+The browse listing is paginated by offset, so pages from before and after a
+catalogue change do not fit together (films shift across page boundaries).
+The first page of a country is therefore always requested again, and the
+country's stored pages are only replayed if it still matches the
+catalogue fingerprint recorded with them.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import xbmc
+
+from .profile_cache import get_cache_dir
+
+SCHEMA = """
+CREATE TABLE meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE pages (
+    country TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (country, page)
+);
+CREATE TABLE written (
+    film_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    folder TEXT NOT NULL
+);
+"""
+
+
+class SyncJournal:
+    """
+    Checkpoints of the current sync: fetched pages and written films.
+    """
+
+    FILE_NAME = 'sync_journal.db'
+    SCHEMA_VERSION = 1
+    # Older checkpoints describe a catalogue that has likely changed
+    MAX_AGE = 12 * 3600
+
+    def __init__(self, path: Path, key: Dict[str, Any], now: float = None):
+        """
+        Open the journal for a sync, discarding checkpoints of a different,
+        outdated or unreadable one.
+
+        :param path: Database file (created if missing).
+        :param key: Parameters identifying the sync (source, countries, ...).
+        :param now: Current Unix time.
+        :raises sqlite3.Error: If the database cannot be opened.
+        """
+        self.path = Path(path)
+        self.key = json.dumps(key, sort_keys=True, default=str)
+        self._lock = threading.Lock()
+        self._conn = None
+        now = time.time() if now is None else now
+        try:
+            self._connect()
+            resumable = self._prepare(now)
+        except sqlite3.DatabaseError as e:
+            xbmc.log(f"Discarding unreadable sync journal: {e}", xbmc.LOGWARNING)
+            self._conn.close()
+            self._remove_files()
+            self._connect()
+            resumable = self._prepare(now)
+        self.resumed = resumable and (self.page_count() > 0 or self.written_count() > 0)
+        if self.resumed:
+            xbmc.log(
+                f"Resuming interrupted sync: {self.page_count()} pages fetched, "
+                f"{self.written_count()} films written",
+                xbmc.LOGINFO
+            )
+
+    @classmethod
+    def open(cls, key: Dict[str, Any]) -> Optional['SyncJournal']:
+        """
+        :param key: Parameters identifying the sync.
+        :return: The journal in the profile cache folder, or None if it cannot be used.
+        """
+        try:
+            return cls(get_cache_dir() / cls.FILE_NAME, key)
+        except (sqlite3.Error, OSError) as e:
+            xbmc.log(f"Sync journal unavailable, the sync cannot be resumed if interrupted: {e}",
+                     xbmc.LOGWARNING)
+            return None
+
+    def _connect(self):
+        # Pages are checkpointed from the fetch worker threads
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+
+    def _remove_files(self):
+        # The database and its WAL files
+        for path in (self.path, Path(f"{self.path}-wal"), Path(f"{self.path}-shm")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _prepare(self, now: float) -> bool:
+        """
+        :return: True if the stored checkpoints belong to this sync and can be reused.
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            meta = dict(self._conn.execute("SELECT name, value FROM meta"))
+            started_at = float(meta.get('started_at', 0))
+            if meta.get('key') == self.key and now - started_at <= self.MAX_AGE:
+                return True
+        with self._conn:
+            for table in ('meta', 'pages', 'written'):
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(SCHEMA)
+            self._conn.executemany("INSERT INTO meta (name, value) VALUES (?, ?)",
+                                   [('key', self.key), ('started_at', str(now))])
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        return False
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def finish(self):
+        """
+        The sync completed: nothing is left to resume.
+        """
+        self.close()
+        try:
+            self._remove_files()
+        except OSError:
+            pass
+
+    def _execute(self, sql: str, params: tuple = ()):
+        """
+        Run one statement in its own transaction; errors only cost the checkpoint.
+        """
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                with self._conn:
+                    return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                xbmc.log(f"Sync journal write failed: {e}", xbmc.LOGWARNING)
+                return None
+
+    # Fetch checkpoints
+
+    def get_page(self, country: str, page: int) -> Optional[dict]:
+        """
+        :return: The page's parsed response as fetched earlier in this sync, or None.
+        """
+        rows = self._execute("SELECT body FROM pages WHERE country = ? AND page = ?", (country, page))
+        if not rows:
+            return None
+        try:
+            return json.loads(rows[0][0])
+        except ValueError:
+            return None
+
+    def record_page(self, country: str, page: int, data: dict):
+        try:
+            body = json.dumps(data)
+        except (TypeError, ValueError) as e:
+            xbmc.log(f"[{country}] Page {page} not checkpointed: {e}", xbmc.LOGWARNING)
+            return
+        self._execute("INSERT OR REPLACE INTO pages (country, page, body) VALUES (?, ?, ?)",
+                      (country, page, body))
+
+    @staticmethod
+    def catalogue_fingerprint(first_page: dict) -> str:
+        """
+        :param first_page: Parsed first page of a country's listing.
+        :return: Fingerprint that changes when films are added to or removed from the listing.
+        """
+        meta = first_page.get('meta') or {}
+        ids = [film.get('id') for film in first_page.get('films') or [] if isinstance(film, dict)]
+        return json.dumps([meta.get('total_count'), ids], default=str)
+
+    def check_catalogue(self, country: str, fingerprint: str) -> bool:
+        """
+        Compare a country's freshly fetched first page with the one its stored pages came from.
+
+        :return: True if the stored pages can be replayed; if not, they are discarded.
+        """
+        name = f'catalogue:{country}'
+        with self._lock:
+            if self._conn is None:
+                return False
+            try:
+                with self._conn:
+                    row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+                    if row is not None and row[0] == fingerprint:
+                        return True
+                    if row is not None:
+                        self._conn.execute("DELETE FROM pages WHERE country = ?", (country,))
+                    self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                                       (name, fingerprint))
+            except sqlite3.Error as e:
+                xbmc.log(f"Sync journal write failed: {e}", xbmc.LOGWARNING)
+                return False
+        if row is not None:
+            xbmc.log(f"[{country}] Catalogue changed since the interrupted sync, fetching all pages again",
+                     xbmc.LOGINFO)
+        return row is None
+
+    def page_count(self) -> int:
+        rows = self._execute("SELECT COUNT(*) FROM pages")
+        return rows[0][0] if rows else 0
+
+    # Write checkpoints
+
+    def written_folder(self, film_id, fingerprint: str) -> Optional[str]:
+        """
+        :return: Folder the film was written to in this sync, if its data has not changed since.
+        """
+        rows = self._execute("SELECT fingerprint, folder FROM written WHERE film_id = ?", (str(film_id),))
+        if rows and rows[0][0] == fingerprint:
+            return rows[0][1]
+        return None
+
+    def record_written(self, film_id, fingerprint: str, folder: str):
+        self._execute("INSERT OR REPLACE INTO written (film_id, fingerprint, folder) VALUES (?, ?, ?)",
+                      (str(film_id), fingerprint, folder))
+
+    def written_count(self) -> int:
+        rows = self._execute("SELECT COUNT(*) FROM written")
+        return rows[0][0] if rows else 0
+
+    @staticmethod
+    def make_key(source: Any, countries: Optional[Iterable[str]], playable_only: bool) -> Dict[str, Any]:
+        """
+        :return: Journal key for a sync of these countries from this data source.
+        """
+        return {
+            'source': type(source).__name__,
+            'countries': sorted(c.upper() for c in countries) if countries else None,
+            'playable_only': bool(playable_only),
+        }
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Manifest of the film folders written to the library.
+
+For every film folder the manifest records the film's mubi_id, a fingerprint
+of the inputs its files were built from (see Film.sync_fingerprint) and the
+files produced. A sync skips films whose fingerprint matches without opening
+their folder, and obsolete folders are found by diffing the manifest against
+the films of the sync and removed file by file, instead of statting every
+folder and letting rmtree discover their contents.
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import xbmc
+
+from .profile_cache import atomic_write_bytes, is_cache_dir
+
+
+class SyncManifest:
+    """
+    {folder: {'mubi_id', 'fingerprint', 'files'}} for one library directory.
+    """
+
+    FILE_NAME = 'sync_manifest.json'
+    VERSION = 1
+
+    def __init__(self, path: Path, library_path: Path, folders: Dict[str, dict] = None):
+        """
+        :param path: File the manifest is loaded from and saved to.
+        :param library_path: Directory holding the film folders.
+        :param folders: {folder: {'mubi_id', 'fingerprint', 'files'}}.
+        """
+        self.path = Path(path)
+        self.library_path = Path(library_path)
+        self.folders = folders or {}
+        # Folders found on disk that the manifest does not describe (see reconcile)
+        self.unknown = set()
+        # Entries are recorded from the sync worker threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, library_path: Path) -> 'SyncManifest':
+        """
+        Load the manifest of a library directory, returning an empty one if the file is
+        missing, corrupt, outdated or describes another directory.
+        """
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION or data.get('library_path') != str(library_path):
+                xbmc.log("Sync manifest is outdated, rebuilding it", xbmc.LOGINFO)
+                return cls(path, library_path)
+            return cls(path, library_path, folders=data.get('folders', {}))
+        except FileNotFoundError:
+            return cls(path, library_path)
+        except (OSError, ValueError, AttributeError) as e:
+            xbmc.log(f"Could not read sync manifest, rebuilding it: {e}", xbmc.LOGWARNING)
+            return cls(path, library_path)
+
+    def reconcile(self) -> set:
+        """
+        Align the manifest with the film folders actually present, with a single listing
+        of the library directory: entries of folders deleted behind the add-on's back are
+        dropped, and folders it does not describe are remembered in 'unknown'.
+
+        :return: The unknown folders.
+        """
+        try:
+            with os.scandir(self.library_path) as entries:
+                present = {entry.name for entry in entries
+                           if entry.is_dir() and not is_cache_dir(Path(entry.path))}
+        except OSError as e:
+            xbmc.log(f"Could not list the library folder: {e}", xbmc.LOGWARNING)
+            present = set(self.folders)
+        with self._lock:
+            for folder in set(self.folders) - present:
+                del self.folders[folder]
+            self.unknown = present - set(self.folders)
+        return self.unknown
+
+    def is_current(self, folder: str, mubi_id, fingerprint: str) -> bool:
+        """
+        :return: True if the folder was written for this film from the same inputs.
+        """
+        entry = self.folders.get(folder)
+        return bool(entry) and entry.get('mubi_id') == str(mubi_id) and entry.get('fingerprint') == fingerprint
+
+    def record(self, folder: str, mubi_id, fingerprint: str, files: Iterable[str] = None):
+        """
+        Record a folder written in this sync.
+
+        :param files: Names of the files in the folder (listed from disk if omitted).
+        """
+        if files is None:
+            try:
+                files = os.listdir(self.library_path / folder)
+            except OSError:
+                files = []
+        with self._lock:
+            self.unknown.discard(folder)
+            self.folders[folder] = {'mubi_id': str(mubi_id), 'fingerprint': fingerprint, 'files': sorted(files)}
+
+    def discard(self, folder: str):
+        with self._lock:
+            self.folders.pop(folder, None)
+
+    def obsolete_folders(self, current_folders: Iterable[str]) -> List[str]:
+        """
+        :param current_folders: Folders of the films in the library.
+        :return: Known and unknown folders that belong to no current film.
+        """
+        return sorted((set(self.folders) | self.unknown) - set(current_folders))
+
+    def remove_folder(self, folder: str) -> bool:
+        """
+        Delete a film folder: the files recorded for it, then the folder itself. A folder
+        holding anything else (or not described by the manifest) is removed with rmtree.
+
+        :return: True if the folder is gone.
+        """
+        folder_path = self.library_path / folder
+        entry = self.folders.get(folder)
+        try:
+            if entry is not None:
+                for name in entry.get('files', []):
+                    try:
+                        (folder_path / name).unlink()
+                    except FileNotFoundError:
+                        pass
+                try:
+                    folder_path.rmdir()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    shutil.rmtree(folder_path)
+            else:
+                shutil.rmtree(folder_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            xbmc.log(f"Could not remove obsolete folder '{folder}': {e}", xbmc.LOGWARNING)
+            return False
+        with self._lock:
+            self.folders.pop(folder, None)
+            self.unknown.discard(folder)
+        return True
+
+    def save(self) -> bool:
+        """
+        :return: True if the manifest was written to disk.
+        """
+        with self._lock:
+            data = {'version': self.VERSION, 'library_path': str(self.library_path), 'folders': dict(self.folders)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, json.dumps(data).encode('utf-8'))
+            return True
+        except OSError as e:
+            xbmc.log(f"Could not save sync manifest: {e}", xbmc.LOGWARNING)
+            return False
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot of the last successful library sync, used for delta syncs.
+
+For every film written to disk the snapshot records a hash of its catalogue
+data, its per-country availability and the folder it was written to. The
+next sync diffs the freshly fetched catalogue against it and only hydrates
+and writes films that were added or changed; unchanged films keep their
+folders and removed films are cleaned up as obsolete.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import xbmc
+
+from .availability import to_epoch
+from .profile_cache import atomic_write_bytes
+
+
+class SyncDelta:
+    """
+    Result of comparing a fetched catalogue with the last sync snapshot.
+    """
+
+    def __init__(self, added=None, removed=None, changed=None, unchanged=None, full_sync=False):
+        self.added = set(added or ())
+        self.removed = set(removed or ())
+        self.changed = set(changed or ())
+        self.unchanged = set(unchanged or ())
+        self.full_sync = full_sync
+
+    @property
+    def to_sync(self) -> set:
+        """Film ids that need hydrating and writing."""
+        return self.added | self.changed
+
+    def __repr__(self):
+        return (
+            f"SyncDelta(added={len(self.added)}, changed={len(self.changed)}, "
+            f"removed={len(self.removed)}, unchanged={len(self.unchanged)}, full_sync={self.full_sync})"
+        )
+
+
+class SyncSnapshot:
+    """
+    Film ids, content hashes, availability and folders from the last sync.
+    """
+
+    FILE_NAME = 'sync_snapshot.json'
+    VERSION = 1
+
+    # Availability fields whose timestamps make a film appear or disappear
+    WINDOW_FIELDS = ('available_at', 'availability_ends_at', 'expires_at')
+
+    def __init__(self, path: Path, films: Dict[str, dict] = None, synced_at: float = None):
+        """
+        :param path: File the snapshot is loaded from and saved to.
+        :param films: {film_id: {'hash', 'countries', 'folder'}} from the last sync.
+        :param synced_at: Unix time of the last successful sync.
+        """
+        self.path = Path(path)
+        self.films = films or {}
+        self.synced_at = synced_at
+        self._staged = {}  # {film_id: {'hash', 'countries'}} for films being synced now
+        self._delta = None
+        self._now = None
+        self._profile_path = None
+
+    @classmethod
+    def load(cls, path: Path) -> 'SyncSnapshot':
+        """
+        Load a snapshot, returning an empty one if the file is missing, corrupt or outdated.
+        """
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != cls.VERSION:
+                xbmc.log("Sync snapshot has an old format, doing a full sync", xbmc.LOGINFO)
+                return cls(path)
+            return cls(path, films=data.get('films', {}), synced_at=data.get('synced_at'))
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError, AttributeError) as e:
+            xbmc.log(f"Could not read sync snapshot, doing a full sync: {e}", xbmc.LOGWARNING)
+            return cls(path)
+
+    def is_empty(self) -> bool:
+        return not self.films
+
+    @staticmethod
+    def film_id(raw_film: dict) -> Optional[str]:
+        film_id = raw_film.get('id', raw_film.get('mubi_id'))
+        return str(film_id) if film_id is not None else None
+
+    @staticmethod
+    def film_hash(raw_film: dict) -> str:
+        """
+        Hash of a film's catalogue data, excluding availability (compared separately).
+        """
+        content = {k: v for k, v in raw_film.items() if k != 'available_countries'}
+        encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def _window_boundary_passed(self, countries: dict, now: float) -> bool:
+        """
+        True if an availability window opened or closed since the last sync, so a
+        film whose data did not change may still have to be added or removed.
+        """
+        if not self.synced_at:
+            return False
+        for details in (countries or {}).values():
+            if not isinstance(details, dict):
+                continue
+            for field in self.WINDOW_FIELDS:
+                value = details.get(field)
+                if not value:
+                    continue
+                boundary = to_epoch(value)
+                if boundary is None:
+                    return True  # Cannot tell: re-check the film
+                if self.synced_at < boundary <= now:
+                    return True
+        return False
+
+    def compute_delta(self, raw_films: Iterable[dict], profile_path: Path = None,
+                      now: float = None) -> SyncDelta:
+        """
+        Diff a fetched (and filtered) catalogue against the snapshot and stage it for commit.
+
+        :param raw_films: Raw film dictionaries, including 'available_countries'.
+        :param profile_path: Directory holding the film folders; unchanged films whose
+                             folder disappeared are synced again.
+        :param now: Current Unix time (for availability windows).
+        :return: SyncDelta with film ids (as strings).
+        """
+        self.begin_delta(profile_path, now)
+        for raw_film in raw_films:
+            self.stage_film(raw_film)
+        return self.finish_delta()
+
+    def begin_delta(self, profile_path: Path = None, now: float = None) -> SyncDelta:
+        """
+        Start diffing a catalogue that arrives film by film (see stage_film).
+
+        :return: The SyncDelta being filled; 'removed' is only known after finish_delta.
+        """
+        self._now = now if now is not None else time.time()
+        self._profile_path = Path(profile_path) if profile_path is not None else None
+        self._staged = {}
+        self._delta = SyncDelta(full_sync=self.is_empty())
+        return self._delta
+
+    def stage_film(self, raw_film: dict) -> Optional[str]:
+        """
+        Diff one film against the snapshot and stage it for commit.
+
+        :return: 'added', 'changed' or 'unchanged', or None if the film has no id.
+        """
+        film_id = self.film_id(raw_film)
+        if film_id is None:
+            return None
+        delta = self._delta
+        # Normalised through JSON so it compares equal to the stored copy
+        countries = json.loads(json.dumps(raw_film.get('available_countries') or {}, default=str))
+        staged = {'hash': self.film_hash(raw_film), 'countries': countries}
+        self._staged[film_id] = staged
+
+        previous = self.films.get(film_id)
+        if previous is None:
+            delta.added.add(film_id)
+            return 'added'
+        if (previous.get('hash') != staged['hash']
+                or previous.get('countries') != countries
+                or self._window_boundary_passed(countries, self._now)):
+            delta.changed.add(film_id)
+            return 'changed'
+        if self._profile_path is not None and not (self._profile_path / previous.get('folder', '')).is_dir():
+            delta.added.add(film_id)
+            return 'added'
+        delta.unchanged.add(film_id)
+        return 'unchanged'
+
+    def finish_delta(self) -> SyncDelta:
+        """
+        :return: The complete SyncDelta, once every fetched film has been staged.
+        """
+        self._delta.removed = set(self.films) - set(self._staged)
+        return self._delta
+
+    def staged_fingerprint(self, film_id) -> Optional[str]:
+        """
+        :return: Hash of a staged film's catalogue data and availability, or None if not staged.
+        """
+        staged = self._staged.get(str(film_id))
+        if staged is None:
+            return None
+        encoded = json.dumps([staged['hash'], staged['countries']], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+    def retained_folders(self) -> set:
+        """
+        :return: Folder names of films left untouched by the staged delta.
+        """
+        if self._delta is None:
+            return set()
+        return {self.films[i]['folder'] for i in self._delta.unchanged if self.films[i].get('folder')}
+
+    def commit(self, synced_folders: Dict[str, str]) -> bool:
+        """
+        Record a successful sync: unchanged films are carried over, films written in
+        this sync are stored with their new hash, and everything else is dropped (so
+        failed or skipped films are retried next time).
+
+        :param synced_folders: {film_id: folder name} for films written successfully.
+        :return: True if the snapshot was saved.
+        """
+        if self._delta is None:
+            return False
+
+        films = {film_id: self.films[film_id] for film_id in self._delta.unchanged}
+        for film_id, folder in synced_folders.items():
+            film_id = str(film_id)
+            staged = self._staged.get(film_id)
+            if staged is None:
+                continue
+            films[film_id] = {'hash': staged['hash'], 'countries': staged['countries'], 'folder': folder}
+
+        self.films = films
+        self.synced_at = time.time()
+        self._delta = None
+        self._staged = {}
+        return self.save()
+
+    def save(self) -> bool:
+        """
+        :return: True if the snapshot was written to disk.
+        """
+        data = {'version': self.VERSION, 'synced_at': self.synced_at, 'films': self.films}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, json.dumps(data, default=str).encode('utf-8'))
+            return True
+        except OSError as e:
+            xbmc.log(f"Could not save sync snapshot: {e}", xbmc.LOGWARNING)
+            return False
+
+    def clear(self):
+        """
+        Forget the last sync so the next one is a full sync.
+        """
+        self.films = {}
+        self.synced_at = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
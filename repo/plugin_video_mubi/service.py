@@ -0,0 +1,9 @@
+# Kodi service for the MUBI add-on.
+# Keeps the local copy of the fast sync film database up to date in the background
+# when enabled in the add-on settings.
+
+from resources.lib.database_service import DatabaseRefreshService
+
+
+if __name__ == '__main__':
+    DatabaseRefreshService().run()
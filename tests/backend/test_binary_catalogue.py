@@ -0,0 +1,123 @@
+"""
+Test suite for the memory-mapped binary catalogue reader.
+
+Framework: pytest
+"""
+
+import pytest
+
+from backend.binary_catalogue import BinaryCatalogue
+from backend.generate_binary import build_catalogue
+from plugin_video_mubi.resources.lib.availability import (
+    AvailabilityIndex, catalogue_window, is_live_in, playable_window,
+)
+
+T = 1_750_000_000  # 2025-06-15T15:06:40Z
+
+FILMS = [
+    {"mubi_id": 30, "title": "Amélie", "year": 2001, "duration": 122, "short_synopsis": "Paris",
+     "average_rating_out_of_ten": 8.1, "popularity": 900,
+     "available_countries": {"FR": {"availability": "live", "available_at": "2025-01-01T00:00:00Z",
+                                    "expires_at": "2026-01-01T00:00:00Z"}}},
+    {"mubi_id": 10, "title": "Upcoming", "year": 2024,
+     "available_countries": {"US": {"availability": "upcoming", "available_at": "2025-07-01T00:00:00Z"},
+                             "DE": {"availability": "live"}}},
+    {"mubi_id": 20, "title": "Expired",
+     "available_countries": {"US": {"available_at": "2024-01-01T00:00:00Z",
+                                    "expires_at": "2025-01-01T00:00:00Z",
+                                    "availability_ends_at": "2025-01-01T00:00:00Z"}}},
+]
+
+# Absent, unparseable and non-ISO dates, which the availability rules treat differently
+MALFORMED = [
+    {"mubi_id": 40, "title": "Bad end",
+     "available_countries": {"US": {"availability": "live", "available_at": "2025-01-01T00:00:00Z",
+                                    "availability_ends_at": "not a date"}}},
+    {"mubi_id": 50, "title": "Bad expiry",
+     "available_countries": {"US": {"availability": "live", "expires_at": "soon"},
+                             "FR": {"availability": "upcoming", "available_at": "garbage",
+                                    "expires_at": "2026-01-01T00:00:00Z"}}},
+    {"mubi_id": 60, "title": "Bad start",
+     "available_countries": {"DE": {"availability": "live", "available_at": "??",
+                                    "availability_ends_at": "2026-01-01T00:00:00Z"},
+                             "US": {"available_at": "", "expires_at": None, "availability": "live"}}},
+    {"mubi_id": 70, "title": "Loose format",
+     "available_countries": {"US": {"available_at": "June 1, 2025", "expires_at": "1 Jan 2026",
+                                    "availability_ends_at": "2026/01/01"},
+                             "FR": {"available_at": 1735689600, "availability": "live"}}},
+]
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    path = tmp_path / "films.bin"
+    path.write_bytes(build_catalogue({"meta": {"version": 1, "generated": "g"}, "items": FILMS}))
+    with BinaryCatalogue(path) as catalogue:
+        yield catalogue
+
+
+def test_columns_and_strings(catalogue):
+    assert len(catalogue) == 3
+    assert list(catalogue.ids) == [10, 20, 30]
+    assert catalogue.meta == {"version": 1, "generated": "g"}
+
+    position = catalogue.position(30)
+    assert catalogue.title(position) == "Amélie"
+    assert catalogue.synopsis(position) == "Paris"
+    assert catalogue.years[position] == 2001
+    assert catalogue.ratings[position] == pytest.approx(8.1)
+    assert catalogue.position(25) is None
+
+    film = catalogue.film(catalogue.position(10))
+    assert film["year"] == 2024 and film["average_rating_out_of_ten"] is None
+    assert set(film["available_countries"]) == {"DE", "US"}
+
+
+def test_sort_without_materialising(catalogue):
+    by_year = sorted(range(len(catalogue)), key=catalogue.years.__getitem__, reverse=True)
+    assert [catalogue.ids[p] for p in by_year] == [10, 30, 20]
+
+
+@pytest.mark.parametrize("countries", [None, ["US"], ["fr"], ["DE", "FR"], ["JP"]])
+@pytest.mark.parametrize("at", [T, T + 30 * 86400, T + 400 * 86400])
+def test_live_mask_matches_availability_engine(catalogue, countries, at):
+    films = sorted(FILMS, key=lambda f: f["mubi_id"])
+
+    expected = AvailabilityIndex.from_films(films).live_mask(countries and [c.upper() for c in countries], at)
+    assert catalogue.live_mask(countries, at) == expected
+
+    playable = AvailabilityIndex.from_films(films, rule=playable_window).live_mask(
+        countries and [c.upper() for c in countries], at)
+    assert catalogue.live_mask(countries, at, rule='playable') == playable
+
+
+@pytest.mark.parametrize("countries", [None, ["US"], ["FR"], ["DE"], ["DE", "FR"]])
+@pytest.mark.parametrize("at", [T, T + 30 * 86400, T + 400 * 86400])
+@pytest.mark.parametrize("rule, window", [("catalogue", catalogue_window), ("playable", playable_window)])
+def test_live_mask_matches_is_live_in(tmp_path, countries, at, rule, window):
+    films = sorted(FILMS + MALFORMED, key=lambda f: f["mubi_id"])
+    path = tmp_path / "films.bin"
+    path.write_bytes(build_catalogue({"items": films}))
+
+    expected = [int(is_live_in(film["available_countries"], countries, at, rule=window)) for film in films]
+    with BinaryCatalogue(path) as catalogue:
+        assert list(catalogue.live_mask(countries, at, rule=rule)) == expected
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "films.bin"
+    path.write_bytes(b"not a catalogue" * 20)
+    with pytest.raises(ValueError):
+        BinaryCatalogue(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        BinaryCatalogue(path)
+
+
+def test_rejects_truncated_file(tmp_path):
+    content = build_catalogue({"items": FILMS})
+    path = tmp_path / "films.bin"
+    path.write_bytes(content[:len(content) // 2])
+    with pytest.raises(ValueError):
+        BinaryCatalogue(path)
@@ -0,0 +1,98 @@
+"""
+Test suite for generate_binary module.
+
+Framework: pytest
+Coverage: build_catalogue layout, string table, generate_binary output
+"""
+
+import hashlib
+import json
+import math
+import struct
+
+from backend.generate_binary import (
+    HEADER, INVALID, MAGIC, MISSING, SECTION_ENTRY, SECTIONS, build_catalogue, generate_binary,
+)
+
+
+def _sections(content):
+    offset = len(MAGIC) + HEADER.size
+    result = {}
+    for i, (name, _) in enumerate(SECTIONS):
+        start, length = SECTION_ENTRY.unpack_from(content, offset + i * SECTION_ENTRY.size)
+        assert start % 8 == 0
+        result[name] = content[start:start + length]
+    return result
+
+
+def _column(section, code):
+    return list(struct.unpack(f"<{len(section) // struct.calcsize(code)}{code}", section))
+
+
+DATA = {
+    "meta": {"version": 1, "generated": "x"},
+    "items": [
+        {"mubi_id": 20, "title": "Second", "year": 2001, "short_synopsis": "Shared",
+         "ratings": [{"source": "bayesian", "score_over_10": 7.5, "voters": 10}],
+         "available_countries": {"us": {"availability": "live", "available_at": "2025-01-01T00:00:00Z"}}},
+        {"mubi_id": 10, "title": "First", "short_synopsis": "Shared", "average_rating_out_of_ten": 8.0,
+         "available_countries": {"FR": {"availability": "upcoming", "expires_at": "bad date"},
+                                 "US": {"availability_ends_at": "2026-01-01T00:00:00Z"}}},
+        {"title": "No id"},
+    ],
+}
+
+
+def test_columns_sorted_by_id():
+    content = build_catalogue(DATA)
+    assert content.startswith(MAGIC)
+    version, films, windows, countries, strings = HEADER.unpack_from(content, len(MAGIC))
+    assert (version, films, windows, countries) == (2, 2, 3, 2)
+    sections = _sections(content)
+
+    assert _column(sections['ids'], 'I') == [10, 20]
+    assert _column(sections['years'], 'H') == [0, 2001]
+    ratings = _column(sections['ratings'], 'f')
+    assert ratings[0] == 8.0 and math.isnan(ratings[1])
+    assert _column(sections['bayesian'], 'f')[1] == 7.5
+    assert _column(sections['window_offsets'], 'I') == [0, 2, 3]
+    assert _column(sections['window_films'], 'I') == [0, 0, 1]
+    assert sections['countries'] == b"FRUS"
+    assert _column(sections['window_flags'], 'H') == [0, 0, 1]
+    assert _column(sections['window_expires_at'], 'q')[0] == INVALID  # Unparseable
+    assert _column(sections['window_available_at'], 'q')[0] == MISSING  # Absent
+    assert _column(sections['window_available_at'], 'q')[2] == 1735689600
+    assert json.loads(sections['meta']) == DATA["meta"]
+
+
+def test_dates_parse_like_the_addon():
+    from backend.generate_binary import _to_epoch
+    from plugin_video_mubi.resources.lib.availability import to_epoch
+
+    for value in ("2025-01-01T00:00:00Z", "2025-01-01", "June 1, 2025", "2026/01/01 10:00"):
+        assert _to_epoch(value) == to_epoch(value)
+    assert (_to_epoch(None), _to_epoch(""), _to_epoch("bad date"), _to_epoch(123)) == \
+        (MISSING, MISSING, INVALID, INVALID)
+
+
+def test_strings_stored_once():
+    sections = _sections(build_catalogue(DATA))
+
+    titles = _column(sections['titles'], 'I')
+    synopses = _column(sections['synopses'], 'I')
+    assert synopses[0] == synopses[1]
+    assert len(set(titles + synopses)) == 3
+    assert sections['strings'].count(b"Shared") == 1
+
+
+def test_generate_binary_writes_md5(tmp_path):
+    path = tmp_path / "films.json"
+    path.write_text(json.dumps(DATA))
+
+    md5 = generate_binary(str(path))
+
+    content = (tmp_path / "films.bin").read_bytes()
+    assert md5 == hashlib.md5(content).hexdigest()
+    assert (tmp_path / "films.bin.md5").read_text() == md5
+    assert build_catalogue(DATA) == content
+    assert generate_binary(str(tmp_path / "missing.json")) is None
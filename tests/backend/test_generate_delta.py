@@ -0,0 +1,126 @@
+"""
+Test suite for generate_delta module.
+
+Framework: pytest
+Coverage: compute_delta, generate_delta (chain carry-forward), digest parity with the addon
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+from backend.generate_delta import compute_delta, generate_delta, items_digest, record_hash
+
+
+def _film(mubi_id, title, rating=7.0):
+    return {"mubi_id": mubi_id, "title": title, "average_rating": rating}
+
+
+def _release(directory, films, generated="2026-01-01"):
+    """Write films.json, films.json.gz and films.json.gz.md5 into directory."""
+    os.makedirs(directory, exist_ok=True)
+    data = {"meta": {"version": 1, "generated": generated}, "items": films}
+    json_path = os.path.join(directory, "films.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    gz_path = json_path + ".gz"
+    with gzip.open(gz_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+    with open(gz_path, "rb") as f:
+        md5 = hashlib.md5(f.read()).hexdigest()
+    with open(gz_path + ".md5", "w") as f:
+        f.write(md5)
+    return json_path, md5
+
+
+class TestComputeDelta:
+
+    def test_added_changed_removed(self):
+        previous = {"items": [_film(1, "A"), _film(2, "B"), _film(3, "C")]}
+        current = {"meta": {"version": 1}, "items": [_film(1, "A"), _film(2, "B", 8.0), _film(4, "D")]}
+
+        delta = compute_delta(previous, current)
+
+        assert [f["mubi_id"] for f in delta["added"]] == [4]
+        assert [f["mubi_id"] for f in delta["changed"]] == [2]
+        assert delta["removed"] == ["3"]
+        assert delta["fields"] == {"meta": {"version": 1}}
+
+    def test_key_order_does_not_count_as_change(self):
+        previous = {"items": [{"mubi_id": 1, "title": "A", "year": 2000}]}
+        current = {"items": [{"year": 2000, "title": "A", "mubi_id": 1}]}
+
+        delta = compute_delta(previous, current)
+
+        assert delta["changed"] == []
+
+    def test_items_digest_is_order_independent(self):
+        films = [_film(1, "A"), _film(2, "B")]
+        assert items_digest(films) == items_digest(list(reversed(films)))
+        assert items_digest(films) != items_digest(films[:1])
+
+
+class TestGenerateDelta:
+
+    def test_generates_delta_and_manifest(self, tmp_path):
+        previous_path, previous_md5 = _release(str(tmp_path / "history"), [_film(1, "A"), _film(2, "B")])
+        current_path, current_md5 = _release(str(tmp_path / "out"), [_film(1, "A", 9.0), _film(3, "C")], "2026-01-02")
+
+        manifest = generate_delta(previous_path, current_path, str(tmp_path / "history"), str(tmp_path / "out"))
+
+        assert manifest["latest"] == current_md5
+        entry, = manifest["deltas"]
+        assert (entry["from"], entry["to"]) == (previous_md5, current_md5)
+        assert (entry["added"], entry["changed"], entry["removed"]) == (1, 1, 1)
+
+        delta_path = tmp_path / "out" / "deltas" / entry["file"]
+        with open(delta_path, "rb") as f:
+            assert hashlib.md5(f.read()).hexdigest() == entry["md5"]
+        with gzip.open(delta_path, "rt", encoding="utf-8") as f:
+            delta = json.load(f)
+        assert delta["meta"] == {"version": 1, "from": previous_md5, "to": current_md5}
+        assert delta["fields"]["meta"]["generated"] == "2026-01-02"
+
+        with open(tmp_path / "out" / "deltas" / "index.json") as f:
+            assert json.load(f) == manifest
+
+    def test_carries_chain_forward_and_trims(self, tmp_path):
+        releases = [[_film(1, f"A{i}")] for i in range(4)]
+        history = str(tmp_path / "history")
+        previous_path, _ = _release(history, releases[0])
+
+        # Publish three releases in a row, each run deploying what the next one reads back
+        for i, films in enumerate(releases[1:], start=1):
+            out = str(tmp_path / f"out{i}")
+            current_path, _ = _release(out, films, f"2026-01-0{i}")
+            manifest = generate_delta(previous_path, current_path, history, out, keep=2)
+            history, previous_path = out, current_path
+
+        assert len(manifest["deltas"]) == 2
+        assert manifest["deltas"][0]["to"] == manifest["deltas"][1]["from"]
+        for entry in manifest["deltas"]:
+            assert os.path.exists(os.path.join(history, "deltas", entry["file"]))
+
+    def test_without_previous_release_only_writes_manifest(self, tmp_path):
+        current_path, current_md5 = _release(str(tmp_path / "out"), [_film(1, "A")])
+
+        manifest = generate_delta(str(tmp_path / "missing.json"), current_path,
+                                  str(tmp_path / "history"), str(tmp_path / "out"))
+
+        assert manifest == {"version": 1, "latest": current_md5,
+                            "full_size": os.path.getsize(current_path + ".gz"), "deltas": []}
+
+    def test_requires_compressed_release(self, tmp_path):
+        (tmp_path / "films.json").write_text('{"items": []}')
+        assert generate_delta(str(tmp_path / "prev.json"), str(tmp_path / "films.json"),
+                              str(tmp_path), str(tmp_path / "out")) is None
+
+
+def test_digest_matches_addon_implementation():
+    """The addon verifies patched copies with its own digest; both must agree."""
+    from plugin_video_mubi.resources.lib import database_delta
+
+    films = [_film(1, "Amélie"), {"mubi_id": 2, "title": "B", "nested": {"z": 1, "a": [1.5, None]}}]
+    assert database_delta.items_digest(films) == items_digest(films)
+    assert database_delta.record_hash(films[0]) == record_hash(films[0])
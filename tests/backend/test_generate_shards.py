@@ -0,0 +1,88 @@
+"""
+Test suite for generate_shards module.
+
+Framework: pytest
+Coverage: is_listed, build_shards, generate_shards output and manifest
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+
+from backend.generate_shards import build_shards, generate_shards, is_listed
+
+NOW = datetime.datetime(2026, 6, 1, tzinfo=datetime.timezone.utc)
+
+
+def _film(mubi_id, countries):
+    return {"mubi_id": mubi_id, "title": f"Film {mubi_id}", "available_countries": countries}
+
+
+class TestBuildShards:
+
+    def test_is_listed_window(self):
+        assert is_listed({"availability": "live"}, NOW)
+        assert is_listed({"available_at": "2026-07-01T00:00:00Z"}, NOW)  # Opens before the next scrape
+        assert not is_listed({"expires_at": "2026-05-01T00:00:00Z"}, NOW)
+        assert not is_listed({"availability_ends_at": "2026-05-31T23:59:59Z"}, NOW)
+        assert is_listed({"expires_at": "not a date"}, NOW)
+        assert not is_listed(None, NOW)
+
+    def test_films_grouped_by_country(self):
+        data = {"items": [
+            _film(1, {"CH": {"availability": "live"}, "de": {"availability": "live"}}),
+            _film(2, {"CH": {"expires_at": "2020-01-01T00:00:00Z"}, "US": {"availability": "live"}}),
+            _film(3, {}),
+        ]}
+
+        shards = build_shards(data, NOW)
+
+        assert {k: [f["mubi_id"] for f in v] for k, v in shards.items()} == {"CH": [1], "DE": [1], "US": [2]}
+        # Records are kept whole, with every country's availability
+        assert set(shards["US"][0]["available_countries"]) == {"CH", "US"}
+
+
+class TestGenerateShards:
+
+    def _write_release(self, tmp_path, items):
+        path = tmp_path / "films.json"
+        path.write_text(json.dumps({"meta": {"version": 1, "generated": "x"}, "items": items}))
+        (tmp_path / "films.json.gz.md5").write_text("abc123")
+        return str(path)
+
+    def test_writes_shards_and_manifest(self, tmp_path):
+        path = self._write_release(tmp_path, [
+            _film(1, {"CH": {"availability": "live"}}),
+            _film(2, {"CH": {"availability": "live"}, "FR": {"availability": "live"}}),
+        ])
+
+        manifest = generate_shards(path)
+
+        assert manifest["version"] == 1
+        assert manifest["source_md5"] == "abc123"
+        assert set(manifest["countries"]) == {"CH", "FR"}
+        entry = manifest["countries"]["CH"]
+        shard_path = tmp_path / "countries" / entry["file"]
+        with open(shard_path, "rb") as f:
+            assert hashlib.md5(f.read()).hexdigest() == entry["md5"]
+        assert os.path.getsize(shard_path) == entry["size"]
+        with gzip.open(shard_path, "rt", encoding="utf-8") as f:
+            shard = json.load(f)
+        assert [f["mubi_id"] for f in shard["items"]] == [1, 2]
+        assert shard["meta"]["country"] == "CH"
+        assert shard["meta"]["total_count"] == entry["count"] == 2
+        with open(tmp_path / "countries" / "index.json") as f:
+            assert json.load(f) == manifest
+
+    def test_unchanged_shards_are_byte_identical(self, tmp_path):
+        path = self._write_release(tmp_path, [_film(1, {"CH": {"availability": "live"}})])
+
+        first = generate_shards(path)["countries"]["CH"]["md5"]
+        second = generate_shards(path)["countries"]["CH"]["md5"]
+
+        assert first == second
+
+    def test_missing_input(self, tmp_path):
+        assert generate_shards(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,104 @@
+"""
+Test suite for set_cover module.
+
+Framework: pytest
+Coverage: greedy_cover parity with the plain greedy loop, tie-breaking,
+uncovered elements, the add-on copy and the benchmark on the real catalogue
+"""
+
+import filecmp
+import os
+import random
+
+from backend.benchmark_set_cover import legacy_greedy, load_subsets, run_benchmark
+from backend.set_cover import BitsetIndex, greedy_cover
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+
+
+def _eager_greedy(subsets, universe, first=None, tie_break=None):
+    """Reference: recompute every gain each round, best (gain, tie, order) wins."""
+    covered, selected = set(), []
+    if first in subsets:
+        covered |= subsets[first]
+        selected.append(first)
+    order = {key: i for i, key in enumerate(subsets)}
+    while covered != universe:
+        candidates = [key for key in subsets if key not in selected]
+        if not candidates:
+            break
+        best = min(candidates, key=lambda k: (-len(subsets[k] - covered),
+                                              tie_break(k) if tie_break else 0, order[k]))
+        if not subsets[best] - covered:
+            break
+        covered |= subsets[best]
+        selected.append(best)
+    return selected
+
+
+def _random_subsets(seed, countries=40, films=300):
+    rng = random.Random(seed)
+    return {
+        f"c{i:02d}": {rng.randrange(films) for _ in range(rng.randrange(0, films // 4))}
+        for i in range(countries)
+    }
+
+
+class TestGreedyCover:
+
+    def test_matches_eager_greedy(self):
+        for seed in range(25):
+            subsets = _random_subsets(seed)
+            universe = set().union(*subsets.values())
+            tiers = {key: random.Random(key).randrange(1, 5) for key in subsets}
+            result = greedy_cover(subsets, universe, first='c07', tie_break=tiers.get)
+            assert result.selected == _eager_greedy(subsets, universe, 'c07', tiers.get)
+            assert result.covered == len(universe)
+            assert sum(result.gains) == result.covered
+
+    def test_matches_scraper_loop_without_tie_break(self):
+        for seed in range(10):
+            subsets = _random_subsets(seed)
+            universe = set().union(*subsets.values())
+            assert greedy_cover(subsets, universe).selected == legacy_greedy(subsets, universe)
+
+    def test_tie_break_then_input_order(self):
+        subsets = {'a': {1, 2}, 'b': {3, 4}, 'c': {5, 6}}
+        assert greedy_cover(subsets).selected == ['a', 'b', 'c']
+        assert greedy_cover(subsets, tie_break={'a': 3, 'b': 1, 'c': 2}.get).selected == ['b', 'c', 'a']
+
+    def test_first_is_selected_even_if_smaller(self):
+        subsets = {'big': {1, 2, 3}, 'small': {4}}
+        result = greedy_cover(subsets, first='small')
+        assert result.selected == ['small', 'big']
+        assert result.gains == [1, 3]
+        assert greedy_cover(subsets, first='missing').selected == ['big', 'small']
+
+    def test_uncoverable_elements_are_reported(self):
+        result = greedy_cover({'a': {1}, 'b': {1, 2}}, universe={1, 2, 3})
+        assert result.selected == ['b']
+        assert (result.covered, result.universe) == (2, 3)
+
+    def test_elements_outside_universe_are_ignored(self):
+        index = BitsetIndex({'a': {1, 9}, 'b': {2}}, universe=[1, 2])
+        assert len(index) == 2
+        assert index.count('a') == 1
+        assert greedy_cover(index).selected == ['a', 'b']
+
+    def test_empty_input(self):
+        assert greedy_cover({}).selected == []
+        assert greedy_cover({'a': set()}).selected == []
+
+
+class TestSharedEngine:
+
+    def test_addon_copy_is_identical(self):
+        addon_copy = os.path.join(PROJECT_ROOT, 'repo', 'plugin_video_mubi', 'resources', 'lib', 'set_cover.py')
+        backend_copy = os.path.join(PROJECT_ROOT, 'backend', 'set_cover.py')
+        assert filecmp.cmp(addon_copy, backend_copy, shallow=False)
+
+    def test_benchmark_on_shipped_catalogue(self):
+        subsets = load_subsets()
+        stats = run_benchmark(subsets, repeat=1)  # Raises if the engine disagrees with the old loop
+        assert stats['films'] > 1000
+        assert 0 < stats['selected'] < stats['countries']
@@ -102,6 +102,32 @@ def mock_sleep(mocker):
     """
     return mocker.patch('time.sleep')
 
+
+@pytest.fixture(autouse=True)
+def reset_api_throttle():
+    """
+    Start every test with a fresh process-wide MUBI API rate limiter and
+    circuit breaker, so 429s or 5xx simulated by one test cannot slow down
+    or block the next one.
+    """
+    from plugin_video_mubi.resources.lib import rate_limiter
+    rate_limiter.reset_api_throttle()
+    yield
+    rate_limiter.reset_api_throttle()
+
+
+@pytest.fixture(autouse=True)
+def isolated_profile_cache(tmp_path, monkeypatch):
+    """
+    Point the addon's on-disk caches at a per-test directory so cached API
+    responses never leak between tests or into the shared mock profile path.
+    """
+    from plugin_video_mubi.resources.lib import profile_cache
+    profile_dir = tmp_path / "profile"
+    profile_dir.mkdir()
+    monkeypatch.setattr(profile_cache, 'get_profile_path', lambda: profile_dir)
+    return profile_dir
+
 # Mock xbmc and related modules
 sys.modules['xbmc'] = MagicMock()
 sys.modules['xbmc'].__file__ = None
@@ -0,0 +1,100 @@
+"""
+Test suite for the content-addressed artwork store.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from plugin_video_mubi.resources.lib.artwork_store import ArtworkStore
+
+URL = "https://images.mubi.com/poster.jpg"
+
+
+def _response(body=b"image", status=200, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.iter_content.return_value = [body[:2], body[2:]]
+    return response
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtworkStore(tmp_path / "artwork")
+
+
+@patch("plugin_video_mubi.resources.lib.artwork_store.ArtworkStore.http_get")
+def test_renamed_folder_costs_no_transfer(mock_get, store, tmp_path):
+    mock_get.return_value = _response(headers={"ETag": '"v1"'})
+    first = tmp_path / "Old Title (2020)-poster.jpg"
+    second = tmp_path / "New Title (2020)-poster.jpg"
+
+    assert store.fetch(URL, first) == "downloaded"
+    assert store.fetch(URL, second) == "stored"
+    assert mock_get.call_count == 1
+    assert second.read_bytes() == b"image"
+    assert os.stat(first).st_ino == os.stat(second).st_ino  # Hard links to the stored image
+
+
+@patch("plugin_video_mubi.resources.lib.artwork_store.ArtworkStore.http_get")
+def test_identical_images_are_stored_once(mock_get, store, tmp_path):
+    mock_get.return_value = _response()
+    store.fetch(URL, tmp_path / "a.jpg")
+    store.fetch(URL.replace("poster", "thumb"), tmp_path / "b.jpg")
+    assert len(list(store.objects_dir.glob("*/*"))) == 1
+
+
+@patch("plugin_video_mubi.resources.lib.artwork_store.ArtworkStore.http_get")
+def test_stale_entry_is_revalidated(mock_get, store, tmp_path):
+    mock_get.return_value = _response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    store.fetch(URL, tmp_path / "a.jpg")
+
+    not_modified = _response(status=304)
+    mock_get.return_value = not_modified
+    with patch("plugin_video_mubi.resources.lib.artwork_store.time.time",
+               return_value=os.path.getmtime(tmp_path / "a.jpg") + ArtworkStore.FRESH_FOR + 1):
+        assert store.fetch(URL, tmp_path / "b.jpg") == "revalidated"
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+    not_modified.iter_content.assert_not_called()
+    not_modified.close.assert_called_once()  # Connection goes back to the pool
+    assert (tmp_path / "b.jpg").read_bytes() == b"image"
+
+
+@patch("plugin_video_mubi.resources.lib.artwork_store.ArtworkStore.http_get")
+def test_prune_keeps_linked_images(mock_get, store, tmp_path):
+    mock_get.return_value = _response(b"kept")
+    store.fetch(URL, tmp_path / "kept.jpg")
+    mock_get.return_value = _response(b"unused")
+    store.fetch(URL.replace("poster", "thumb"), tmp_path / "gone.jpg")
+    (tmp_path / "gone.jpg").unlink()
+
+    later = os.path.getmtime(tmp_path / "kept.jpg") + ArtworkStore.RETENTION + 1
+    assert store.prune(now=later) == 1
+    assert [p.read_bytes() for p in store.objects_dir.glob("*/*")] == [b"kept"]
+    assert len(list(store.urls_dir.glob("*.json"))) == 1
+    assert store.prune(now=later) == 0  # At most once per interval
+
+
+@patch("plugin_video_mubi.resources.lib.artwork_store.ArtworkStore.http_get")
+def test_failed_download_stores_nothing(mock_get, store, tmp_path):
+    response = _response()
+    response.raise_for_status.side_effect = RuntimeError("404")
+    mock_get.return_value = response
+    with pytest.raises(RuntimeError):
+        store.fetch(URL, tmp_path / "a.jpg")
+    response.close.assert_called_once()
+    assert not (tmp_path / "a.jpg").exists()
+    assert store._load_entry(URL) is None
+
+
+def test_downloads_share_one_pooled_session(store):
+    with patch.object(ArtworkStore, "_http_session", None):
+        with patch("plugin_video_mubi.resources.lib.artwork_store.requests.Session") as mock_session:
+            ArtworkStore.http_get(URL)
+            ArtworkStore.http_get(URL)
+    mock_session.assert_called_once()
+    assert mock_session.return_value.get.call_count == 2
@@ -0,0 +1,96 @@
+"""
+Test suite for the artwork resolution tiers.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from plugin_video_mubi.resources.lib import artwork_tier
+from plugin_video_mubi.resources.lib.artwork_tier import (
+    POSTERS_ONLY, RETINA, SMALL, STANDARD, estimate_savings, get_artwork_tier, is_downloaded, select_still
+)
+
+STILLS = {'small': 's.jpg', 'medium': 'm.jpg', 'standard': 'std.jpg', 'retina': 'r.jpg'}
+
+
+def test_setting_maps_to_tier():
+    with patch.object(artwork_tier.xbmcaddon, 'Addon') as mock_addon:
+        mock_addon.return_value.getSettingInt.return_value = 2
+        assert get_artwork_tier() == SMALL
+        mock_addon.return_value.getSettingInt.return_value = 9
+        assert get_artwork_tier() == RETINA
+        mock_addon.return_value.getSettingInt.return_value = MagicMock()
+        assert get_artwork_tier() == RETINA
+
+
+def test_select_still_by_tier():
+    assert select_still(STILLS, RETINA) == 'r.jpg'
+    assert select_still(STILLS, STANDARD) == 'std.jpg'
+    assert select_still(STILLS, SMALL) == 'm.jpg'
+    assert select_still({'retina': 'r.jpg'}, SMALL) == 'r.jpg'  # Best available fallback
+    assert select_still({}, RETINA) is None
+    assert select_still(None, RETINA) is None
+
+
+def test_downloaded_types():
+    assert all(is_downloaded(t, RETINA) for t in ('thumb', 'poster', 'fanart', 'banner', 'clearlogo'))
+    assert not is_downloaded('fanart', SMALL)
+    assert is_downloaded('poster', POSTERS_ONLY)
+    assert not is_downloaded('thumb', POSTERS_ONLY)
+
+
+def test_estimate_savings():
+    types = ['thumb', 'poster', 'fanart', 'banner', 'clearlogo']
+    assert estimate_savings(types, RETINA) == 0
+    assert 0 < estimate_savings(types, STANDARD) < estimate_savings(types, SMALL) < estimate_savings(types, POSTERS_ONLY)
+    assert estimate_savings(['poster'], POSTERS_ONLY) == 0
+
+
+def test_mubi_selects_tier_sized_stills():
+    from plugin_video_mubi.resources.lib.mubi import Mubi
+
+    mubi = Mubi(MagicMock())
+    mubi._artwork_tier = SMALL
+    film_info = {'stills': STILLS, 'artworks': [{'format': 'centered_background', 'image_url': 'bg.jpg'}]}
+    assert mubi._get_best_thumbnail_url(film_info) == 'm.jpg'
+    assert mubi._get_all_artwork_urls(film_info)['thumb'] == 'm.jpg'
+
+
+def test_film_skips_artwork_outside_tier(tmp_path):
+    from plugin_video_mubi.resources.lib.film import Film
+
+    metadata = MagicMock()
+    metadata.image = 'http://example.com/thumb.jpg'
+    metadata.artwork_urls = {'poster': 'http://example.com/poster.jpg', 'fanart': 'http://example.com/bg.jpg'}
+    film = Film('1', 'Film', '', '', metadata)
+
+    with patch('plugin_video_mubi.resources.lib.film.get_artwork_tier', return_value=POSTERS_ONLY), \
+         patch.object(Film, '_fetch_artwork') as mock_fetch:
+        paths = film._download_all_artwork(tmp_path, 'Film (2020)')
+
+    assert list(paths) == ['poster']
+    assert mock_fetch.call_args.args[0] == 'http://example.com/poster.jpg'
+    assert film.artwork_bytes_saved == estimate_savings(['thumb', 'poster', 'fanart'], POSTERS_ONLY) > 0
+
+
+def test_film_savings_only_count_downloaded_artwork(tmp_path):
+    from plugin_video_mubi.resources.lib.film import Film
+
+    metadata = MagicMock()
+    metadata.image = 'http://example.com/thumb.jpg'
+    metadata.artwork_urls = {'poster': 'http://example.com/poster.jpg'}
+    film = Film('1', 'Film', '', '', metadata)
+
+    def download(tier, outcome):
+        with patch('plugin_video_mubi.resources.lib.film.get_artwork_tier', return_value=tier), \
+             patch.object(Film, '_fetch_artwork', return_value=outcome):
+            film._download_all_artwork(tmp_path, 'Film (2020)')
+        return film.artwork_bytes_saved
+
+    assert download(STANDARD, 'downloaded') == estimate_savings(['thumb'], STANDARD) > 0
+    assert download(STANDARD, 'stored') == 0
+    assert download(STANDARD, 'revalidated') == 0
+
+    # Artwork already in the film folder was not downloaded this sync
+    (tmp_path / 'Film (2020)-thumb.jpg').write_bytes(b'x')
+    assert download(STANDARD, 'downloaded') == 0
+    assert download(POSTERS_ONLY, 'downloaded') == 0
@@ -3,6 +3,10 @@ from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone, timedelta
 from plugin_video_mubi.resources.lib.film import Film
 from plugin_video_mubi.resources.lib.library import Library
+from plugin_video_mubi.resources.lib import availability
+from plugin_video_mubi.resources.lib.availability import (
+    AvailabilityIndex, catalogue_window, filter_available, playable_window, to_epoch
+)
 
 class MockMetadata:
     def __init__(self):
@@ -120,3 +124,67 @@ class TestAvailability(unittest.TestCase):
         # Invalid film
         invalid_film = self.create_film({'US': {'available_at': self.future, 'availability_ends_at': self.far_future}})
         self.assertFalse(library.is_film_valid(invalid_film))
+
+
+class TestAvailabilityEngine(unittest.TestCase):
+    """Test the shared epoch-window availability checks."""
+
+    T = 1_750_000_000  # 2025-06-15T15:06:40Z
+
+    def iso(self, offset):
+        return datetime.fromtimestamp(self.T + offset, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    def test_to_epoch(self):
+        self.assertEqual(to_epoch("2025-06-15T15:06:40Z"), self.T)
+        self.assertEqual(to_epoch("2025-06-15T15:06:40"), self.T)  # Naive means UTC
+        self.assertEqual(to_epoch("2025-06-15T17:06:40.123+02:00"), self.T)
+        self.assertIsNone(to_epoch("not a date"))
+        self.assertIsNone(to_epoch(None))
+
+    def test_catalogue_window(self):
+        self.assertEqual(catalogue_window({'available_at': self.iso(-10), 'expires_at': self.iso(10)}),
+                         (self.T - 10, self.T + 10))
+        self.assertEqual(catalogue_window({'availability': 'live'}), availability.ALWAYS)
+        self.assertEqual(catalogue_window({'availability': 'upcoming'}), availability.NEVER)
+        # Unparseable dates fall back to the status
+        self.assertEqual(catalogue_window({'expires_at': 'garbage', 'availability': 'live'}), availability.ALWAYS)
+        self.assertEqual(catalogue_window(None), availability.NEVER)
+
+    def test_playable_window(self):
+        self.assertEqual(playable_window({'available_at': self.iso(-10)}), (self.T - 10, availability.OPEN_END))
+        self.assertEqual(playable_window({'availability_ends_at': self.iso(10), 'availability': 'live'}),
+                         availability.NEVER)
+
+    def test_live_mask_batches_films(self):
+        films = [
+            {'available_countries': {'US': {'available_at': self.iso(-10), 'expires_at': self.iso(10)}}},
+            {'available_countries': {'US': {'available_at': self.iso(10)}, 'fr': {'availability': 'live'}}},
+            {'available_countries': {'GB': {'expires_at': self.iso(-1)}}},
+            {'available_countries': {}},
+        ]
+        index = AvailabilityIndex.from_films(films)
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(list(index.live_mask(['US'], self.T)), [1, 0, 0, 0])
+        self.assertEqual(list(index.live_mask(['US', 'FR'], self.T)), [1, 1, 0, 0])
+        self.assertEqual(list(index.live_mask(None, self.T - 100)), [0, 1, 1, 0])
+        self.assertEqual(list(index.live_mask(['US'], self.T + 10)), [1, 1, 0, 0])  # Bounds are inclusive
+        self.assertEqual(index.live_countries(self.T), ['FR', 'US'])
+
+    def test_index_restricted_to_countries(self):
+        index = AvailabilityIndex(['US'])
+        index.add({'US': {'availability': 'live'}, 'FR': {'availability': 'live'}})
+
+        self.assertEqual(list(index.live_mask(['FR'], self.T)), [0])
+        self.assertEqual(list(index.live_mask(['US'], self.T)), [1])
+
+    def test_filter_available_keeps_order_across_batches(self):
+        films = [
+            {'id': i, 'available_countries': {'US': {'availability': 'live' if i % 3 else 'upcoming'}}}
+            for i in range(10)
+        ]
+
+        kept = list(filter_available(iter(films), ['US'], self.T, batch_size=4))
+
+        self.assertEqual([f['id'] for f in kept], [1, 2, 4, 5, 7, 8])
+        self.assertEqual(len(list(filter_available(films, None))), 10)
@@ -0,0 +1,169 @@
+"""
+Test suite for the SQLite catalogue store.
+
+Framework: pytest
+"""
+
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from plugin_video_mubi.resources.lib.catalogue_store import CatalogueStore
+
+T = 1_750_000_000  # 2025-06-15T15:06:40Z
+
+NFO = (
+    b'<movie><title>Film</title>'
+    b'<uniqueid type="mubi" default="true">1</uniqueid>'
+    b'<imdbid>tt0000001</imdbid><uniqueid type="imdb">tt0000001</uniqueid>'
+    b'<uniqueid type="tmdb">42</uniqueid>'
+    b'<poster>Film (2020)-poster.jpg</poster><fanart><thumb>Film (2020)-fanart.jpg</thumb></fanart>'
+    b'<thumb>https://remote/thumb.jpg</thumb></movie>'
+)
+
+
+class FakeFilm(SimpleNamespace):
+    def get_sanitized_folder_name(self):
+        return self.folder
+
+
+def _film(mubi_id="1", folder="Film (2020)", countries=None):
+    return FakeFilm(mubi_id=mubi_id, title="Film", folder=folder, metadata=SimpleNamespace(year=2020),
+                    available_countries=countries if countries is not None else {
+                        "us": {"availability": "live", "available_at": "2025-01-01T00:00:00Z",
+                               "expires_at": "2026-01-01T00:00:00Z"},
+                        "FR": {"availability": "live"},
+                        "DE": {"availability": "upcoming"},
+                    })
+
+
+def _write_nfo(library, film, content=NFO):
+    folder = library / film.folder
+    folder.mkdir(exist_ok=True)
+    (folder / f"{film.folder}.nfo").write_bytes(content)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CatalogueStore(tmp_path / "catalogue.db") as store:
+        yield store
+
+
+def test_record_and_look_up(store, tmp_path):
+    film = _film()
+    _write_nfo(tmp_path, film)
+
+    assert store.record_films([film], tmp_path) == 1
+
+    row = store.get_film(1)
+    assert row["title"] == "Film" and row["year"] == 2020
+    assert (row["imdb_id"], row["tmdb_id"]) == ("tt0000001", "42")
+    assert row["artwork"] == {
+        "poster": str(tmp_path / "Film (2020)" / "Film (2020)-poster.jpg"),
+        "fanart": str(tmp_path / "Film (2020)" / "Film (2020)-fanart.jpg"),
+    }
+    assert store.get_nfo_path("1") == tmp_path / "Film (2020)" / "Film (2020).nfo"
+    assert row["available_countries"]["US"] == {
+        "availability": "live", "available_at": "2025-01-01T00:00:00Z", "expires_at": "2026-01-01T00:00:00Z"}
+    assert len(store) == 1
+
+
+def test_films_in_country_uses_windows(store, tmp_path):
+    film = _film()
+    _write_nfo(tmp_path, film)
+    store.record_films([film], tmp_path)
+
+    assert store.films_in_country("us", T) == ["1"]
+    assert store.films_in_country("US", T + 365 * 86400) == []
+    assert store.films_in_country("FR", T) == ["1"]  # No dates: 'live' status
+    assert store.films_in_country("DE", T) == []
+
+
+def test_unchanged_nfo_is_not_reparsed(store, tmp_path):
+    film = _film()
+    _write_nfo(tmp_path, film)
+    store.record_films([film], tmp_path)
+
+    film.available_countries = {"GB": {"availability": "live"}}
+    with patch.object(CatalogueStore, "_read_nfo") as read_nfo:
+        store.record_films([film], tmp_path)
+    read_nfo.assert_not_called()
+    assert set(store.get_availability(1)) == {"GB"}
+    assert store.get_film(1)["imdb_id"] == "tt0000001"
+
+    _write_nfo(tmp_path, film, b'<movie><uniqueid type="imdb">tt9</uniqueid></movie>')
+    store.record_films([film], tmp_path)
+    assert store.get_film(1)["imdb_id"] == "tt9"
+    assert store.get_film(1)["artwork"] == {}
+
+
+def test_unchanged_films_only_refresh_synced_at(store, tmp_path):
+    film = _film()
+    _write_nfo(tmp_path, film)
+    store.record_films([film], tmp_path)
+    store._conn.execute("UPDATE films SET synced_at = 0")
+
+    # The folder is not read, and availability rows are kept as they are
+    (tmp_path / film.folder / f"{film.folder}.nfo").unlink()
+    film.available_countries = {"GB": {"availability": "live"}}
+    assert store.record_films([film], tmp_path, unchanged_ids=[1]) == 1
+    assert store.get_entry(1)["synced_at"] > 0
+    assert set(store.get_availability(1)) == {"US", "FR", "DE"}
+
+    # A film missing from the index is still recorded from its NFO
+    other = _film("2", "Other")
+    _write_nfo(tmp_path, other)
+    assert store.record_films([other], tmp_path, unchanged_ids=["2"]) == 1
+    assert store.get_film(2)["imdb_id"] == "tt0000001"
+
+
+def test_missing_nfo_is_skipped(store, tmp_path):
+    assert store.record_films([_film()], tmp_path) == 0
+    assert store.get_film(1) is None
+
+
+def test_prune(store, tmp_path):
+    films = [_film("1", "A"), _film("2", "B")]
+    for film in films:
+        _write_nfo(tmp_path, film)
+    store.record_films(films, tmp_path)
+
+    assert store.prune({"B"}) == 1
+
+    assert store.get_film(1) is None
+    assert store.get_availability(1) == {}
+    assert store.get_film(2) is not None
+
+
+def test_corrupt_database_is_rebuilt(tmp_path):
+    path = tmp_path / "catalogue.db"
+    path.write_bytes(b"not a database" * 100)
+
+    with CatalogueStore(path) as store:
+        assert len(store) == 0
+
+
+def test_old_schema_is_replaced(tmp_path):
+    path = tmp_path / "catalogue.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE films (mubi_id TEXT)")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    film = _film()
+    _write_nfo(tmp_path, film)
+    with CatalogueStore(path) as store:
+        assert store.record_films([film], tmp_path) == 1
+
+
+def test_open_uses_profile_cache():
+    store = CatalogueStore.open()
+    try:
+        assert store.path.parent.name == ".cache"
+        assert isinstance(store.path, Path)
+    finally:
+        store.close()
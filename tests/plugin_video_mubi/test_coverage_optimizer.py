@@ -115,3 +115,61 @@ class TestCoverageOptimizer:
         assert result is not None
         assert 'films' in result
         assert len(result['films']) == 6
+
+
+class TestCoveragePlanCache:
+    """Test that coverage plans are computed once per catalogue version and country."""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        from plugin_video_mubi.resources.lib import coverage_optimizer
+
+        catalogue_file = tmp_path / "country_catalogue.json"
+        catalogue_file.write_text(json.dumps({
+            "generated": "v1",
+            "films": {"1": ["us", "gb"], "2": ["us"], "3": ["gb"], "5": ["gb"], "4": ["jp"]},
+        }))
+        coverage_optimizer._plan_cache.clear()
+        with patch.object(coverage_optimizer, '_get_catalogue_path', return_value=str(catalogue_file)):
+            yield coverage_optimizer, catalogue_file
+        coverage_optimizer._plan_cache.clear()
+
+    def test_menu_render_does_not_reload_catalogue(self, optimizer):
+        coverage_optimizer, _ = optimizer
+        stats = coverage_optimizer.get_coverage_stats("US")
+        assert stats['optimal_countries'] == ["US", "GB", "JP"]
+        assert stats['user_country_films'] == 2
+
+        with patch.object(coverage_optimizer, 'load_country_catalogue', side_effect=AssertionError("parsed")):
+            assert coverage_optimizer.get_coverage_stats("us") == stats
+            assert coverage_optimizer.get_optimal_countries("US") == ["US", "GB", "JP"]
+
+    def test_plan_survives_restart_via_disk_cache(self, optimizer):
+        coverage_optimizer, _ = optimizer
+        expected = coverage_optimizer.get_optimal_countries("GB")
+
+        coverage_optimizer._plan_cache.clear()  # New plugin invocation
+        with patch.object(coverage_optimizer, 'load_country_catalogue', side_effect=AssertionError("parsed")):
+            assert coverage_optimizer.get_optimal_countries("GB") == expected
+
+    def test_each_country_gets_its_own_plan(self, optimizer):
+        coverage_optimizer, _ = optimizer
+        assert coverage_optimizer.get_optimal_countries("US")[0] == "US"
+        assert coverage_optimizer.get_optimal_countries("JP")[0] == "JP"
+
+    def test_new_catalogue_version_recomputes(self, optimizer):
+        coverage_optimizer, catalogue_file = optimizer
+        assert coverage_optimizer.get_optimal_countries("US") == ["US", "GB", "JP"]
+
+        catalogue_file.write_text(json.dumps({"generated": "v2", "films": {"1": ["us"], "2": ["fr"]}}))
+        os.utime(catalogue_file, ns=(0, 10 ** 18))
+
+        assert coverage_optimizer.get_optimal_countries("US") == ["US", "FR"]
+
+    def test_touched_catalogue_with_same_version_keeps_plans(self, optimizer):
+        coverage_optimizer, catalogue_file = optimizer
+        coverage_optimizer.get_optimal_countries("US")
+        os.utime(catalogue_file, ns=(0, 10 ** 18))
+
+        with patch.object(coverage_optimizer, '_compute_plan', side_effect=AssertionError("recomputed")):
+            assert coverage_optimizer.get_optimal_countries("US") == ["US", "GB", "JP"]
@@ -77,6 +77,185 @@ class TestMubiApiDataSource:
         with pytest.raises(Exception, match="API Error"):
             data_source.get_films(countries=countries)
 
+    @staticmethod
+    def _country_fetcher(catalogues):
+        """Build a _fetch_films_for_country side effect from {country: [film ids]}."""
+        def fetch(country_code, playable_only=True, page_callback=None, global_film_ids=None):
+            ids = catalogues.get(country_code, [])
+            data = {
+                film_id: {'id': film_id, 'title': f'Film {film_id}',
+                          'consumable': {'availability': 'live', 'country': country_code}}
+                for film_id in ids
+            }
+            if page_callback:
+                page_callback(len(ids))
+            return set(ids), data, len(ids), 1
+        return fetch
+
+    def test_parallel_fetch_merges_all_countries(self):
+        """Test that countries fetched concurrently are merged like a sequential sync."""
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        catalogues = {'US': [1, 2], 'GB': [2, 3], 'FR': [3, 4], 'JP': [5]}
+        mubi_mock._fetch_films_for_country.side_effect = self._country_fetcher(catalogues)
+        data_source = MubiApiDataSource(mubi_mock, max_workers=3, requests_per_second=50)
+
+        films = data_source.get_films(countries=list(catalogues))
+
+        by_id = {film['id']: film for film in films}
+        assert set(by_id) == {1, 2, 3, 4, 5}
+        assert set(by_id[2]['available_countries']) == {'US', 'GB'}
+        assert set(by_id[3]['available_countries']) == {'GB', 'FR'}
+        assert 'consumable' not in by_id[1]
+        assert mubi_mock._fetch_films_for_country.call_count == 4
+        # Shared rate budget is only installed for the duration of the fetch
+        assert mubi_mock.rate_limiter is None
+
+    def test_parallel_fetch_uses_shared_rate_limiter(self):
+        """Test that all workers share the process-wide limiter with the configured budget."""
+        from plugin_video_mubi.resources.lib.rate_limiter import get_api_rate_limiter
+
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        seen_limiters = []
+        seen_budgets = []
+
+        def fetch(country_code, playable_only=True, page_callback=None, global_film_ids=None):
+            seen_limiters.append(mubi_mock.rate_limiter)
+            seen_budgets.append(mubi_mock.rate_limiter.max_rate)
+            return set(), {}, 0, 1
+
+        mubi_mock._fetch_films_for_country.side_effect = fetch
+        data_source = MubiApiDataSource(mubi_mock, max_workers=2, requests_per_second=7)
+
+        data_source.get_films(countries=['US', 'GB', 'FR'])
+
+        assert len(seen_limiters) == 3
+        # Every worker goes through the process-wide limiter, capped at the sync budget
+        assert all(limiter is get_api_rate_limiter() for limiter in seen_limiters)
+        assert seen_budgets == [7, 7, 7]
+        # Budget is restored afterwards
+        assert get_api_rate_limiter().max_rate != 7
+
+    def test_parallel_fetch_reports_progress_per_country(self):
+        """Test that progress is reported from the calling thread for every country."""
+        import threading
+
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        catalogues = {'US': [1], 'GB': [2], 'FR': [3]}
+        mubi_mock._fetch_films_for_country.side_effect = self._country_fetcher(catalogues)
+        data_source = MubiApiDataSource(mubi_mock, max_workers=3, requests_per_second=50)
+
+        calls = []
+        main_thread = threading.current_thread()
+
+        def progress_callback(**kwargs):
+            assert threading.current_thread() is main_thread
+            calls.append(kwargs)
+
+        data_source.get_films(progress_callback=progress_callback, countries=['US', 'GB', 'FR'])
+
+        assert calls[0] == {'current_films': 0, 'total_films': 0, 'current_country': 1,
+                            'total_countries': 3, 'country_code': 'US'}
+        assert len(calls) >= 4
+        assert calls[-1]['current_films'] == 3
+
+    def test_parallel_fetch_user_cancel(self):
+        """Test that a cancelling progress callback stops the parallel fetch."""
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        catalogues = {'US': [1, 2], 'GB': [3], 'FR': [4]}
+        mubi_mock._fetch_films_for_country.side_effect = self._country_fetcher(catalogues)
+        data_source = MubiApiDataSource(mubi_mock, max_workers=2, requests_per_second=50)
+
+        call_count = [0]
+
+        def progress_callback(**kwargs):
+            call_count[0] += 1
+            if call_count[0] > 1:
+                raise Exception("User canceled sync operation")
+
+        films = data_source.get_films(progress_callback=progress_callback, countries=['US', 'GB', 'FR'])
+
+        # Partial result without availability injection, as in the sequential path
+        assert len(films) < 4
+        assert all('available_countries' not in film for film in films)
+        assert mubi_mock.rate_limiter is None
+
+    def test_parallel_fetch_error_propagates(self):
+        """Test that a worker exception is raised to the caller."""
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        mubi_mock._fetch_films_for_country.side_effect = Exception("API Error")
+        data_source = MubiApiDataSource(mubi_mock, max_workers=4, requests_per_second=50)
+
+        with pytest.raises(Exception, match="API Error"):
+            data_source.get_films(countries=['US', 'GB'])
+        assert mubi_mock.rate_limiter is None
+
+    def test_single_worker_uses_sequential_fetch(self):
+        """Test that max_workers=1 keeps the sequential country order."""
+        mubi_mock = Mock()
+        order = []
+
+        def fetch(country_code, playable_only=True, page_callback=None, global_film_ids=None):
+            order.append(country_code)
+            return set(), {}, 0, 1
+
+        mubi_mock._fetch_films_for_country.side_effect = fetch
+        data_source = MubiApiDataSource(mubi_mock, max_workers=1)
+
+        data_source.get_films(countries=['US', 'GB', 'FR'])
+
+        assert order == ['US', 'GB', 'FR']
+
+    def test_single_country_fans_out_pages(self):
+        """Test that a single-country sync asks for parallel pages under a shared budget."""
+        from plugin_video_mubi.resources.lib.rate_limiter import AdaptiveRateLimiter
+
+        mubi_mock = Mock()
+        mubi_mock.rate_limiter = None
+        seen = {}
+
+        def fetch(country_code, playable_only=True, page_callback=None, global_film_ids=None,
+                  page_workers=1):
+            seen['page_workers'] = page_workers
+            seen['limiter'] = mubi_mock.rate_limiter
+            seen['max_rate'] = mubi_mock.rate_limiter.max_rate
+            return {1}, {1: {'id': 1}}, 1, 1
+
+        mubi_mock._fetch_films_for_country.side_effect = fetch
+        data_source = MubiApiDataSource(mubi_mock, max_workers=3, requests_per_second=6)
+
+        films = data_source.get_films(countries=['FR'])
+
+        assert len(films) == 1
+        assert seen['page_workers'] == 3
+        assert isinstance(seen['limiter'], AdaptiveRateLimiter)
+        assert seen['max_rate'] == 6
+        assert mubi_mock.rate_limiter is None
+
+    def test_parallel_settings_fall_back_to_defaults(self):
+        """Test that invalid settings fall back to the class defaults."""
+        data_source = MubiApiDataSource(Mock())
+
+        with patch('xbmcaddon.Addon') as mock_addon:
+            mock_addon.return_value.getSettingInt.return_value = 0
+            workers, rate = data_source._resolve_parallel_settings()
+
+        assert workers == MubiApiDataSource.DEFAULT_COUNTRY_WORKERS
+        assert rate == MubiApiDataSource.DEFAULT_REQUESTS_PER_SECOND
+
+    def test_parallel_settings_are_capped(self):
+        """Test that the worker count is bounded."""
+        data_source = MubiApiDataSource(Mock(), max_workers=64, requests_per_second=3)
+
+        workers, rate = data_source._resolve_parallel_settings()
+
+        assert workers == MubiApiDataSource.MAX_COUNTRY_WORKERS
+        assert rate == 3
+
 
 class TestGithubDataSource:
     """Test cases for the GithubDataSource class."""
@@ -135,7 +314,7 @@ class TestGithubDataSource:
             
             # Mock gzip response
             gzip_response = Mock()
-            gzip_response.content = mock_gzip_data
+            gzip_response.iter_content.return_value = iter([mock_gzip_data])
             gzip_response.raise_for_status = Mock()
             
             session_instance.get.side_effect = [md5_response, gzip_response]
@@ -165,7 +344,7 @@ class TestGithubDataSource:
             
             # Mock gzip response
             gzip_response = Mock()
-            gzip_response.content = mock_gzip_data
+            gzip_response.iter_content.return_value = iter([mock_gzip_data])
             gzip_response.raise_for_status = Mock()
             
             session_instance.get.side_effect = [md5_response, gzip_response]
@@ -210,10 +389,10 @@ class TestGithubDataSource:
             md5_response.raise_for_status = Mock()
             
             gzip_response = Mock()
-            gzip_response.content = mock_gzip_data
+            gzip_response.iter_content.return_value = iter([mock_gzip_data])
             gzip_response.raise_for_status = Mock()
             
-            session_instance.get.side_effect = [md5_response, gzip_response]
+            session_instance.get.side_effect = [md5_response, Mock(status_code=404), gzip_response]
             session_instance.mount = Mock()
             session_instance.close = Mock()
             
@@ -243,7 +422,7 @@ class TestGithubDataSource:
             md5_response.raise_for_status = Mock()
             
             gzip_response = Mock()
-            gzip_response.content = bad_data
+            gzip_response.iter_content.return_value = iter([bad_data])
             gzip_response.raise_for_status = Mock()
             
             session_instance.get.side_effect = [md5_response, gzip_response]
@@ -299,10 +478,10 @@ class TestGithubDataSource:
             md5_response.raise_for_status = Mock()
             
             gzip_response = Mock()
-            gzip_response.content = gzip_data
+            gzip_response.iter_content.return_value = iter([gzip_data])
             gzip_response.raise_for_status = Mock()
             
-            session_instance.get.side_effect = [md5_response, gzip_response]
+            session_instance.get.side_effect = [md5_response, Mock(status_code=404), gzip_response]
             session_instance.mount = Mock()
             session_instance.close = Mock()
             
@@ -0,0 +1,55 @@
+"""
+Test suite for the background database refresh service.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from plugin_video_mubi.resources.lib.database_service import DatabaseRefreshService
+
+
+def _addon(fast_sync=True, background=True, hours=2):
+    addon = MagicMock()
+    addon.getSettingBool.side_effect = lambda key: {
+        'enable_fast_sync': fast_sync,
+        'github_db_background_refresh': background,
+    }.get(key, False)
+    addon.getSettingInt.return_value = hours
+    return addon
+
+
+@patch('xbmcaddon.Addon')
+def test_run_once_refreshes_when_due(mock_addon):
+    mock_addon.return_value = _addon(hours=2)
+    data_source = MagicMock()
+    service = DatabaseRefreshService(monitor=MagicMock(), data_source=data_source)
+
+    assert service.run_once(now=1000.0)
+    assert not service.run_once(now=1000.0 + 3600)
+    assert service.run_once(now=1000.0 + 2 * 3600)
+    assert data_source.refresh.call_count == 2
+
+
+@patch('xbmcaddon.Addon')
+def test_run_once_disabled(mock_addon):
+    data_source = MagicMock()
+    service = DatabaseRefreshService(monitor=MagicMock(), data_source=data_source)
+
+    mock_addon.return_value = _addon(background=False)
+    assert not service.run_once(now=1000.0)
+    mock_addon.return_value = _addon(fast_sync=False)
+    assert not service.run_once(now=1000.0)
+    data_source.refresh.assert_not_called()
+
+
+@patch('xbmcaddon.Addon')
+def test_run_stops_on_abort(mock_addon):
+    mock_addon.return_value = _addon()
+    data_source = MagicMock()
+    monitor = MagicMock()
+    monitor.abortRequested.return_value = False
+    monitor.waitForAbort.side_effect = [False, True]  # Startup delay, then abort
+
+    DatabaseRefreshService(monitor=monitor, data_source=data_source).run()
+
+    data_source.refresh.assert_called_once()
+    assert monitor.waitForAbort.call_args_list[0].args == (DatabaseRefreshService.STARTUP_DELAY,)
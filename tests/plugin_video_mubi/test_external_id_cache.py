@@ -0,0 +1,151 @@
+"""
+Test suite for the persistent external id cache.
+"""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from plugin_video_mubi.resources.lib.external_metadata.base import ExternalMetadataResult
+from plugin_video_mubi.resources.lib.external_metadata.id_cache import ExternalIdCache
+from plugin_video_mubi.resources.lib.film import Film
+
+FOUND = ExternalMetadataResult(imdb_id="tt123", tmdb_id="456", source_provider="TMDB", success=True)
+MISSING = ExternalMetadataResult(source_provider="TMDB", success=False, error_message="No match found", not_found=True)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExternalIdCache(tmp_path / ExternalIdCache.FILE_NAME)
+    yield cache
+    cache.close()
+
+
+def test_found_ids_are_kept_under_both_keys(cache):
+    assert cache.put(1, "Stalker", "Сталкер", 1979, FOUND)
+
+    by_id = cache.get(1, "Renamed", None, None, now=float("inf"))
+    assert (by_id.success, by_id.imdb_id, by_id.tmdb_id) == (True, "tt123", "456")
+    by_title = cache.get(2, "  stalker ", "сталкер", "1979")
+    assert by_title.imdb_id == "tt123"
+    assert cache.get(3, "Stalker", "Сталкер", 1980) is None
+
+
+def test_title_without_year_is_not_shared(cache):
+    assert ExternalIdCache.make_keys(1, "Stalker", None, None) == ["mubi:1"]
+    assert cache.put(1, "Stalker", None, None, FOUND)
+
+    assert cache.get(1, "Stalker", None, None).imdb_id == "tt123"
+    assert cache.get(2, "Stalker", None, None) is None
+
+
+def test_misses_expire_and_errors_are_not_cached(cache):
+    assert cache.put(1, "Unknown", None, 2020, MISSING, now=1000)
+    hit = cache.get(1, "Unknown", None, 2020, provider_name="TMDB", now=1000 + ExternalIdCache.NEGATIVE_TTL - 1)
+    assert hit.success is False
+    assert cache.get(1, "Unknown", None, 2020, provider_name="TMDB",
+                     now=1000 + ExternalIdCache.NEGATIVE_TTL + 1) is None
+
+    error = ExternalMetadataResult(success=False, error_message="HTTP 503")
+    assert not cache.put(2, "Other", None, 2020, error, provider_name="TMDB")
+    assert cache.get(2, "Other", None, 2020, provider_name="TMDB") is None
+
+    # Only the not_found marker makes a miss definitive, not the error text
+    failed = ExternalMetadataResult(source_provider="TMDB", success=False, error_message="No match found")
+    assert not cache.put(3, "Other", None, 2020, failed)
+
+
+def test_miss_only_applies_to_the_provider_that_answered(cache):
+    assert cache.put(1, "Unknown", None, 2020, MISSING)
+
+    assert cache.get(1, "Unknown", None, 2020, provider_name="TMDB").success is False
+    assert cache.get(1, "Unknown", None, 2020, provider_name="OMDB") is None
+    assert cache.get(1, "Unknown", None, 2020) is None
+
+    found = ExternalMetadataResult(imdb_id="tt9", source_provider="OMDB", success=True)
+    assert cache.put(1, "Unknown", None, 2020, found)
+    assert cache.get(1, "Unknown", None, 2020, provider_name="TMDB").imdb_id == "tt9"
+
+
+def test_cache_survives_reopening(tmp_path):
+    path = tmp_path / ExternalIdCache.FILE_NAME
+    first = ExternalIdCache(path)
+    first.put(1, "Stalker", None, 1979, FOUND)
+    first.close()
+    assert ExternalIdCache(path).get(1, "Stalker", None, 1979).imdb_id == "tt123"
+
+    Path(path).write_bytes(b"not a database" * 100)
+    assert ExternalIdCache(path).get(1, "Stalker", None, 1979) is None
+
+
+@patch('plugin_video_mubi.resources.lib.external_metadata.factory.MetadataProviderFactory.get_provider')
+def test_recreated_folder_reuses_cached_ids(mock_get_provider, tmp_path):
+    provider = Mock()
+    provider.get_imdb_id.return_value = FOUND
+    mock_get_provider.return_value = provider
+    metadata = Mock(originaltitle="Stalker", year=1979, trailer="", rating=0, votes=0, artwork_urls={})
+    film = Film("123", "Stalker", "", "", metadata)
+
+    with patch.object(Film, '_get_nfo_tree', return_value=b"<movie/>") as mock_tree:
+        film.create_nfo_file(tmp_path, "plugin://plugin.video.mubi/")
+        film.create_nfo_file(tmp_path, "plugin://plugin.video.mubi/")
+
+    provider.get_imdb_id.assert_called_once()
+    assert mock_tree.call_args.args[2:4] == ("tt123", "456")
+
+
+@patch('plugin_video_mubi.resources.lib.external_metadata.factory.MetadataProviderFactory.get_provider')
+def test_tmdb_miss_does_not_block_omdb_lookup(mock_get_provider, tmp_path):
+    tmdb = Mock(provider_name="TMDB")
+    tmdb.get_imdb_id.return_value = MISSING
+    omdb = Mock(provider_name="OMDB")
+    omdb.get_imdb_id.return_value = ExternalMetadataResult(imdb_id="tt9", source_provider="OMDB", success=True)
+    metadata = Mock(originaltitle="Unknown", year=2020, trailer="", rating=0, votes=0, artwork_urls={})
+    film = Film("123", "Unknown", "", "", metadata)
+
+    with patch.object(Film, '_get_nfo_tree', return_value=b"<movie/>") as mock_tree:
+        mock_get_provider.return_value = tmdb
+        film.create_nfo_file(tmp_path, "plugin://plugin.video.mubi/")
+        mock_get_provider.return_value = omdb
+        film.create_nfo_file(tmp_path, "plugin://plugin.video.mubi/")
+
+    omdb.get_imdb_id.assert_called_once()
+    assert mock_tree.call_args.args[2] == "tt9"
+
+
+@pytest.mark.parametrize("failure", ["connection", "server_error"])
+@patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
+def test_provider_errors_are_not_cached_as_misses(mock_get, failure, cache):
+    from plugin_video_mubi.resources.lib.external_metadata import TMDBProvider
+    import requests
+
+    if failure == "connection":
+        mock_get.side_effect = ConnectionError("network unreachable")
+    else:
+        response = Mock()
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(status_code=503)
+        mock_get.return_value = response
+
+    result = TMDBProvider("key").get_imdb_id("Stalker", year=1979)
+
+    assert (result.success, result.not_found) == (False, False)
+    assert not cache.put(1, "Stalker", None, 1979, result)
+    assert cache.get(1, "Stalker", None, 1979, provider_name="TMDB") is None
+
+
+@patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
+def test_provider_answers_without_match_are_cached(mock_get, cache):
+    from plugin_video_mubi.resources.lib.external_metadata import OMDBProvider
+
+    response = Mock()
+    response.json.return_value = {"Response": "False", "Error": "Movie not found!"}
+    mock_get.return_value = response
+    result = OMDBProvider("key").get_imdb_id("Unknown", year=2020)
+
+    assert result.not_found is True
+    assert cache.put(1, "Unknown", None, 2020, result)
+    assert cache.get(1, "Unknown", None, 2020, provider_name="OMDB").success is False
+
+    mock_get.side_effect = ConnectionError("network unreachable")
+    assert OMDBProvider("key").get_imdb_id("Other", year=2020).not_found is False
@@ -61,7 +61,7 @@ class TestOMDBProvider:
 
 
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_api_success(self, mock_get):
         """Test successful OMDB API call."""
         # Arrange
@@ -81,7 +81,7 @@ class TestOMDBProvider:
         assert result.imdb_url == "https://www.imdb.com/title/tt1234567/"
         assert result.source_provider == "OMDB"
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_title_variants(self, mock_get):
         """Test provider tries multiple title variants."""
         # Arrange
@@ -107,7 +107,7 @@ class TestOMDBProvider:
         assert result.imdb_id == "tt9999999"
         assert mock_get.call_count == 2  # Tried 2 variants
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_no_match_found(self, mock_get):
         """Test provider returns failure when no match found."""
         # Arrange
@@ -126,7 +126,7 @@ class TestOMDBProvider:
         assert result.imdb_id is None
         assert "No match found" in result.error_message
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_test_connection_success(self, mock_get):
         """Test connection test succeeds with valid response."""
         # Arrange
@@ -139,7 +139,7 @@ class TestOMDBProvider:
         # Act & Assert
         assert provider.test_connection() is True
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_test_connection_401(self, mock_get):
         """Test connection test fails with 401 (invalid API key)."""
         # Arrange
@@ -152,7 +152,7 @@ class TestOMDBProvider:
         # Act & Assert
         assert provider.test_connection() is False
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
     def test_provider_test_connection_failure(self, mock_get):
         """Test connection test fails with network error."""
         # Arrange
@@ -445,6 +445,45 @@ class TestMetadataProviderFactory:
         provider = MetadataProviderFactory.get_provider()
         assert provider is None
 
+    def test_provider_is_kept_for_the_sync(self, mock_addon):
+        """Test that a sync reuses one provider without reading the settings per film."""
+        mock_addon.getSetting.side_effect = lambda key: "tmdb_key" if key == "tmdb_api_key" else ""
+        MetadataProviderFactory.begin_sync()
+        try:
+            provider = MetadataProviderFactory.get_provider()
+            reads = mock_addon.getSetting.call_count
+            assert MetadataProviderFactory.get_provider() is provider
+            assert mock_addon.getSetting.call_count == reads
+        finally:
+            with patch.object(provider, 'close') as mock_close:
+                MetadataProviderFactory.end_sync()
+            mock_close.assert_called_once()
+
+        # Outside a sync every call selects a provider from the current settings
+        assert MetadataProviderFactory.get_provider() is not provider
+
+    def test_missing_provider_is_not_kept_for_the_sync(self, mock_addon):
+        """Test that keys entered after the first check are picked up during the sync."""
+        mock_addon.getSetting.return_value = ""
+        MetadataProviderFactory.begin_sync()
+        try:
+            assert MetadataProviderFactory.get_provider() is None
+            mock_addon.getSetting.side_effect = lambda key: "omdb_key" if key == "omdbapiKey" else ""
+            assert isinstance(MetadataProviderFactory.get_provider(), OMDBProvider)
+        finally:
+            MetadataProviderFactory.end_sync()
+
+    @patch('plugin_video_mubi.resources.lib.external_metadata.omdb_provider.OMDBProvider._get')
+    def test_successful_connection_test_is_remembered(self, mock_get, mock_addon):
+        """Test that test_connection only queries the API until it succeeds once."""
+        mock_get.side_effect = [Mock(status_code=503), Mock(status_code=200)]
+        provider = OMDBProvider("test_key")
+
+        assert provider.test_connection() is False
+        assert provider.test_connection() is True
+        assert provider.test_connection() is True
+        assert mock_get.call_count == 2
+
 
 class TestKodiAPICompatibility:
     """Test cases for Kodi API compatibility scanning."""
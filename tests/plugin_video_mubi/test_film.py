@@ -633,9 +633,8 @@ class TestFilm:
             assert base_url in content
             assert film.mubi_id in content
 
-    @patch('plugin_video_mubi.resources.lib.film.time.sleep')
     @patch('plugin_video_mubi.resources.lib.external_metadata.factory.MetadataProviderFactory.get_provider')
-    def test_create_nfo_file_success(self, mock_get_provider, mock_sleep, mock_metadata):
+    def test_create_nfo_file_success(self, mock_get_provider, mock_metadata):
         """Test successful NFO file creation."""
         from plugin_video_mubi.resources.lib.external_metadata.base import ExternalMetadataResult
 
@@ -1358,6 +1357,46 @@ class TestFilmNfoAvailability:
         assert country_elements[0].get('code') == 'US'
 
 
+    def test_refresh_nfo_skips_unchanged_film(self, mock_metadata, tmp_path):
+        """Test refresh_nfo() parses once and does not rewrite an up-to-date NFO."""
+        film = Film("123", "Test Film", "", "", mock_metadata, available_countries={'US': {}})
+        film.create_nfo_file(tmp_path, "plugin://test/")
+        nfo_file = tmp_path / f"{film.get_sanitized_folder_name()}.nfo"
+
+        with patch.object(ET, "parse", wraps=ET.parse) as mock_parse, \
+             patch.object(ET.ElementTree, "write") as mock_write:
+            assert film.refresh_nfo(nfo_file) == Film.NFO_UNCHANGED
+        assert mock_parse.call_count == 1
+        mock_write.assert_not_called()
+
+    def test_refresh_nfo_rewrites_changed_availability(self, mock_metadata, tmp_path):
+        """Test refresh_nfo() rewrites the availability section when countries change."""
+        film = Film("123", "Test Film", "", "", mock_metadata, available_countries={'US': {}})
+        film.create_nfo_file(tmp_path, "plugin://test/")
+        nfo_file = tmp_path / f"{film.get_sanitized_folder_name()}.nfo"
+
+        film.available_countries = {'US': {}, 'DE': {}}
+        assert film.refresh_nfo(nfo_file) == Film.NFO_UPDATED
+        availability = ET.parse(nfo_file).getroot().find("mubi_availability")
+        assert [c.get('code') for c in availability.findall("country")] == ['DE', 'US']
+        assert ET.parse(nfo_file).getroot().find("mubi_sync_hash").text == film.nfo_state_hash()
+        assert film.refresh_nfo(nfo_file) == Film.NFO_UNCHANGED
+
+    def test_refresh_nfo_detects_rating_change(self, mock_metadata, tmp_path):
+        """Test refresh_nfo() asks for a new NFO when the rating changed, and for an unreadable one."""
+        film = Film("123", "Test Film", "", "", mock_metadata, available_countries={'US': {}})
+        film.create_nfo_file(tmp_path, "plugin://test/")
+        nfo_file = tmp_path / f"{film.get_sanitized_folder_name()}.nfo"
+        content = nfo_file.read_bytes()
+
+        mock_metadata.rating = 6.5
+        assert film.refresh_nfo(nfo_file) == Film.NFO_STALE
+        assert nfo_file.read_bytes() == content
+
+        nfo_file.write_text("not valid xml <><>")
+        assert film.refresh_nfo(nfo_file) == Film.NFO_STALE
+
+
 class TestFilmSanitizationEdgeCases:
     """Test edge cases for filename sanitization."""
 
@@ -1462,7 +1501,7 @@ class TestFilmSanitizationEdgeCases:
         assert title_elem is not None
         assert title_elem.text == special_title
 
-    @patch('plugin_video_mubi.resources.lib.film.requests.get')
+    @patch('plugin_video_mubi.resources.lib.film.ArtworkStore.http_get')
     def test_download_thumbnail_success(self, mock_get, mock_metadata, tmp_path):
         """Test successful thumbnail download."""
         # Create a film instance with mock metadata
@@ -1490,7 +1529,7 @@ class TestFilmSanitizationEdgeCases:
         with open(result, 'rb') as f:
             assert f.read() == b'image_data'
 
-    @patch('plugin_video_mubi.resources.lib.film.requests.get')
+    @patch('plugin_video_mubi.resources.lib.film.ArtworkStore.http_get')
     def test_download_thumbnail_network_error(self, mock_get, mock_metadata, tmp_path):
         """Test network error during thumbnail download."""
         # Arrange
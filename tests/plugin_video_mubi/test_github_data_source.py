@@ -37,10 +37,23 @@ class TestGithubDataSource(unittest.TestCase):
         """Helper to create gzipped JSON content."""
         json_data = json.dumps(data).encode('utf-8')
         out = io.BytesIO()
-        with gzip.GzipFile(fileobj=out, mode='w') as f:
+        with gzip.GzipFile(fileobj=out, mode='w', mtime=0) as f:
             f.write(json_data)
         return out.getvalue()
 
+    def _streaming_response(self, content, chunk_size=None):
+        """Helper to mock a streamed download of `content` (optionally in fixed-size chunks)."""
+        response = MagicMock()
+        response.status_code = 200
+
+        def iter_content(chunk_size=1):
+            size = forced_chunk_size or chunk_size
+            return iter([content[i:i + size] for i in range(0, len(content), size)])
+
+        forced_chunk_size = chunk_size
+        response.iter_content.side_effect = iter_content
+        return response
+
     @patch('requests.Session')
     def test_get_films_success(self, mock_session_cls):
         """Test successful download and parsing of films."""
@@ -64,9 +77,7 @@ class TestGithubDataSource(unittest.TestCase):
         mock_md5_resp.status_code = 200
         
         # Mock Content response
-        mock_content_resp = MagicMock()
-        mock_content_resp.content = content
-        mock_content_resp.status_code = 200
+        mock_content_resp = self._streaming_response(content)
         
         mock_session.get.side_effect = [mock_md5_resp, mock_content_resp]
 
@@ -96,8 +107,7 @@ class TestGithubDataSource(unittest.TestCase):
         mock_md5_resp = MagicMock()
         mock_md5_resp.text = fake_md5
         
-        mock_content_resp = MagicMock()
-        mock_content_resp.content = content
+        mock_content_resp = self._streaming_response(content)
         
         mock_session.get.side_effect = [mock_md5_resp, mock_content_resp]
 
@@ -142,7 +152,8 @@ class TestGithubDataSource(unittest.TestCase):
         
         mock_session.get.side_effect = [
             MagicMock(text=md5),
-            MagicMock(content=content)
+            MagicMock(status_code=404),  # No country shards published
+            self._streaming_response(content)
         ]
 
         # Ask for US films
@@ -179,7 +190,7 @@ class TestGithubDataSource(unittest.TestCase):
         
         mock_session.get.side_effect = [
             MagicMock(text=md5),
-            MagicMock(content=content)
+            self._streaming_response(content)
         ]
         
         self.data_source.get_films()
@@ -190,5 +201,381 @@ class TestGithubDataSource(unittest.TestCase):
         # But we could check call args if we really wanted to be strict.
         pass
 
+    @patch('requests.Session')
+    def test_get_films_streams_small_chunks(self, mock_session_cls):
+        """Test that films are parsed correctly when the download arrives in tiny chunks."""
+        mock_session = mock_session_cls.return_value
+
+        items = [
+            {"id": i, "title": f"Film \u00e9\u6f22 {i}", "average_rating": 7.25 + i,
+             "directors": ["Dir"], "available_countries": {"US": {"availability": "live"}}}
+            for i in range(50)
+        ]
+        items.append({"id": 99, "title": "Elsewhere", "available_countries": {"FR": {"availability": "live"}}})
+        # 'meta' after 'items' must still be picked up
+        content = self._create_gzipped_content({"items": items, "meta": {"version": 1}})
+        md5 = hashlib.md5(content).hexdigest()
+
+        mock_session.get.side_effect = [
+            MagicMock(text=md5),
+            MagicMock(status_code=404),  # No country shards published
+            self._streaming_response(content, chunk_size=7)
+        ]
+
+        films = self.data_source.get_films(countries=['us'])
+
+        self.assertEqual([f['id'] for f in films], list(range(50)))
+        self.assertEqual(films[3]['title'], "Film \u00e9\u6f22 3")
+        self.assertEqual(films[3]['average_rating'], 10.25)
+        self.assertEqual(films[0]['directors'], [{'name': 'Dir'}])
+        _, kwargs = mock_session.get.call_args
+        self.assertTrue(kwargs.get('stream'))
+
+    @patch('requests.Session')
+    def test_get_films_corrupt_download_reports_md5_failure(self, mock_session_cls):
+        """Test that a truncated download fails the MD5 check instead of a parse error."""
+        mock_session = mock_session_cls.return_value
+
+        content = self._create_gzipped_content({"items": [{"id": i} for i in range(100)]})
+        md5 = hashlib.md5(content).hexdigest()
+
+        mock_session.get.side_effect = [
+            MagicMock(text=md5),
+            self._streaming_response(content[:len(content) // 2], chunk_size=16)
+        ]
+
+        with self.assertRaises(ValueError) as cm:
+            self.data_source.get_films()
+        self.assertIn("MD5 verification failed", str(cm.exception))
+
+    def _mock_download(self, mock_session, films_data, md5=None, single_country=False):
+        """Queue an MD5 response and a streamed download of films_data."""
+        content = self._create_gzipped_content(films_data)
+        responses = [MagicMock(text=md5 or hashlib.md5(content).hexdigest())]
+        if single_country:
+            responses.append(MagicMock(status_code=404))  # No country shards published
+        responses.append(self._streaming_response(content))
+        mock_session.get.side_effect = responses
+        return content
+
+    FILMS = {
+        "meta": {"version": 1},
+        "items": [
+            {"id": 1, "title": "US Film", "directors": ["Dir A"],
+             "available_countries": {"US": {"availability": "live"}}},
+            {"id": 2, "title": "FR Film", "available_countries": {"FR": {"availability": "live"}}},
+        ]
+    }
+
+    @patch('requests.Session')
+    def test_get_films_uses_local_copy_when_md5_unchanged(self, mock_session_cls):
+        """Test that an unchanged .md5 skips the download and parse."""
+        mock_session = mock_session_cls.return_value
+        content = self._mock_download(mock_session, self.FILMS, single_country=True)
+        first = self.data_source.get_films(countries=['US'])
+
+        mock_session.get.reset_mock()
+        mock_session.get.side_effect = [MagicMock(text=hashlib.md5(content).hexdigest())]
+        second = GithubDataSource().get_films(countries=['US'])
+
+        self.assertEqual(mock_session.get.call_count, 1)  # Only the .md5
+        self.assertEqual(second, first)
+        self.assertEqual(second[0]['directors'], [{'name': 'Dir A'}])
+
+    @patch('requests.Session')
+    def test_get_films_downloads_when_md5_changed(self, mock_session_cls):
+        """Test that a new .md5 replaces the local copy."""
+        mock_session = mock_session_cls.return_value
+        self._mock_download(mock_session, self.FILMS)
+        self.data_source.get_films()
+
+        updated = {"items": self.FILMS["items"] + [{"id": 3, "title": "New"}]}
+        content = self._create_gzipped_content(updated)
+        mock_session.get.side_effect = [
+            MagicMock(text=hashlib.md5(content).hexdigest()),
+            MagicMock(status_code=404),  # No delta feed published
+            self._streaming_response(content)
+        ]
+        films = GithubDataSource().get_films()
+
+        self.assertEqual([f['id'] for f in films], [1, 2, 3])
+        header = GithubDataSource()._get_cache().read_header()
+        self.assertEqual(header['count'], 3)
+
+    @patch('requests.Session')
+    def test_get_films_offline_uses_local_copy(self, mock_session_cls):
+        """Test that the local copy is used when the .md5 cannot be fetched."""
+        import requests
+        mock_session = mock_session_cls.return_value
+        self._mock_download(mock_session, self.FILMS)
+        self.data_source.get_films()
+
+        mock_session.get.side_effect = requests.exceptions.ConnectionError("offline")
+        films = GithubDataSource().get_films()
+
+        self.assertEqual([f['id'] for f in films], [1, 2])
+
+    @patch('requests.Session')
+    def test_get_films_rebuilds_index_from_local_file(self, mock_session_cls):
+        """Test that a missing index is rebuilt from the verified local file without downloading."""
+        mock_session = mock_session_cls.return_value
+        content = self._mock_download(mock_session, self.FILMS)
+        self.data_source.get_films()
+        cache = self.data_source._get_cache()
+        cache.header_path.unlink()
+        cache.index_path.unlink()
+
+        mock_session.get.side_effect = [MagicMock(text=hashlib.md5(content).hexdigest())]
+        films = GithubDataSource().get_films(countries=['FR'])
+
+        self.assertEqual([f['id'] for f in films], [2])
+        self.assertTrue(cache.has_index(hashlib.md5(content).hexdigest()))
+
+    @patch('requests.Session')
+    def test_get_films_md5_mismatch_keeps_no_copy(self, mock_session_cls):
+        """Test that an unverified download is never stored."""
+        mock_session = mock_session_cls.return_value
+        self._mock_download(mock_session, self.FILMS, md5="wronghash")
+
+        with self.assertRaises(ValueError):
+            self.data_source.get_films()
+
+        cache = self.data_source._get_cache()
+        self.assertIsNone(cache.read_header())
+        self.assertEqual(list(cache.cache_dir.iterdir()), [])
+
+    @patch('requests.Session')
+    def test_iter_films_streams_local_copy(self, mock_session_cls):
+        """Test that iter_films yields from the verified local copy, and only a verified download otherwise."""
+        mock_session = mock_session_cls.return_value
+        content = self._mock_download(mock_session, self.FILMS)
+        self.assertEqual([f['id'] for f in self.data_source.iter_films()], [1, 2])  # Downloaded and verified
+
+        mock_session.get.reset_mock()
+        mock_session.get.side_effect = [MagicMock(text=hashlib.md5(content).hexdigest())]
+        source = GithubDataSource()
+        with patch.object(source, 'get_films') as mock_get_films:
+            stream = source.iter_films(countries=['us'])
+            first = next(stream)
+            self.assertEqual((first['id'], first['directors']), (1, [{'name': 'Dir A'}]))
+            self.assertEqual(list(stream), [])
+        mock_get_films.assert_not_called()
+        self.assertEqual(mock_session.get.call_count, 1)  # Only the .md5
+
+    @patch('requests.Session')
+    def test_refresh_downloads_only_when_changed(self, mock_session_cls):
+        """Test that refresh() stores a new copy and then only checks the .md5."""
+        mock_session = mock_session_cls.return_value
+        content = self._mock_download(mock_session, self.FILMS)
+
+        self.assertTrue(self.data_source.refresh())
+
+        mock_session.get.reset_mock()
+        mock_session.get.side_effect = [MagicMock(text=hashlib.md5(content).hexdigest())]
+        self.assertFalse(self.data_source.refresh())
+        self.assertEqual(mock_session.get.call_count, 1)
+
+    def _publish(self, tmp_path, releases, shards=False):
+        """
+        Publish consecutive releases with the backend delta generator (and
+        optionally the country shards of the last one).
+
+        :return: Tuple (files, md5s): {url: bytes} as served by GitHub and the release MD5s.
+        """
+        from backend.generate_delta import generate_delta
+
+        history = tmp_path / "history"
+        history.mkdir()
+        previous_json = None
+        md5s = []
+        for i, data in enumerate(releases):
+            out = tmp_path / f"release{i}"
+            out.mkdir()
+            (out / "films.json").write_text(json.dumps(data))
+            content = self._create_gzipped_content(data)
+            (out / "films.json.gz").write_bytes(content)
+            md5s.append(hashlib.md5(content).hexdigest())
+            (out / "films.json.gz.md5").write_text(md5s[-1])
+            if previous_json:
+                generate_delta(str(previous_json), str(out / "films.json"), str(history), str(out))
+            history, previous_json = out, out / "films.json"
+
+        files = {GithubDataSource.GITHUB_URL: (history / "films.json.gz").read_bytes()}
+        files[GithubDataSource.GITHUB_URL + ".md5"] = md5s[-1].encode()
+        deltas = history / "deltas"
+        if deltas.exists():
+            for path in deltas.iterdir():
+                files[GithubDataSource.DELTAS_URL + path.name] = path.read_bytes()
+        if shards:
+            from backend.generate_shards import generate_shards
+            generate_shards(str(history / "films.json"))
+            for path in (history / "countries").iterdir():
+                files[GithubDataSource.SHARDS_URL + path.name] = path.read_bytes()
+        return files, md5s
+
+    def _serve(self, mock_session, files):
+        """Route session.get calls to the published files; record the URLs requested."""
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            if url not in files:
+                return MagicMock(status_code=404)
+            content = files[url]
+            if url == GithubDataSource.GITHUB_URL or url.startswith(GithubDataSource.SHARDS_URL) and url.endswith(".gz"):
+                return self._streaming_response(content)
+            response = MagicMock(status_code=200, content=content, text=content.decode('latin-1'))
+            response.json.side_effect = lambda: json.loads(content)
+            return response
+
+        mock_session.get.side_effect = get
+        return requested
+
+    # Films every release shares, so deltas are small next to the full file
+    CATALOGUE = [
+        {"mubi_id": 1000 + i, "title": f"Catalogue film {i}", "synopsis": "x" * 200,
+         "available_countries": {"DE": {"availability": "live"}}}
+        for i in range(200)
+    ]
+
+    RELEASES = [
+        {"meta": {"version": 1, "generated": "1"}, "items": CATALOGUE + [
+            {"mubi_id": 1, "title": "A", "directors": ["Dir"], "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 2, "title": "B", "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 3, "title": "C", "available_countries": {"FR": {"availability": "live"}}},
+        ]},
+        {"meta": {"version": 1, "generated": "2"}, "items": CATALOGUE + [
+            {"mubi_id": 1, "title": "A", "directors": ["Dir"], "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 2, "title": "B (restored)", "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 4, "title": "D", "available_countries": {"US": {"availability": "live"}}},
+        ]},
+        {"meta": {"version": 1, "generated": "3"}, "items": CATALOGUE + [
+            {"mubi_id": 1, "title": "A", "directors": ["Dir"], "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 2, "title": "B (restored)", "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 4, "title": "D", "available_countries": {"US": {"availability": "live"}}},
+            {"mubi_id": 5, "title": "E", "available_countries": {"US": {"availability": "live"}}},
+        ]},
+    ]
+
+    def _seed_local_copy(self, mock_session, release):
+        """Download a release into the local cache."""
+        self._mock_download(mock_session, release)
+        self.data_source.get_films()
+
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.tmp_path = tmp_path
+
+    @patch('requests.Session')
+    def test_get_films_applies_delta_chain(self, mock_session_cls):
+        """Test that a local copy two releases behind is patched with deltas, not re-downloaded."""
+        mock_session = mock_session_cls.return_value
+        self._seed_local_copy(mock_session, self.RELEASES[0])
+        files, md5s = self._publish(self.tmp_path, self.RELEASES)
+        requested = self._serve(mock_session, files)
+
+        films = GithubDataSource().get_films(countries=['US'])
+
+        self.assertNotIn(GithubDataSource.GITHUB_URL, requested)
+        self.assertEqual(sorted(f['id'] for f in films), [1, 2, 4, 5])
+        self.assertEqual(len(GithubDataSource().get_films()), 204)
+        self.assertEqual(next(f for f in films if f['id'] == 2)['title'], "B (restored)")
+        self.assertEqual(films[0]['directors'], [{'name': 'Dir'}])
+
+        cache = self.data_source._get_cache()
+        header = cache.read_header()
+        self.assertEqual(header['md5'], md5s[-1])
+        self.assertEqual(header['meta']['generated'], "3")
+        self.assertFalse(cache.db_path.exists())
+
+        # The next sync is served locally
+        requested.clear()
+        GithubDataSource().get_films()
+        self.assertEqual(requested, [GithubDataSource.GITHUB_URL + ".md5"])
+
+    @patch('requests.Session')
+    def test_get_films_falls_back_when_delta_chain_is_broken(self, mock_session_cls):
+        """Test that a local copy older than the chain downloads the full file."""
+        mock_session = mock_session_cls.return_value
+        self._seed_local_copy(mock_session, {"items": [{"mubi_id": 9, "title": "Ancient"}]})
+        files, md5s = self._publish(self.tmp_path, self.RELEASES)
+        requested = self._serve(mock_session, files)
+
+        films = GithubDataSource().get_films(countries=['US'])
+
+        self.assertIn(GithubDataSource.GITHUB_URL, requested)
+        self.assertEqual(sorted(f['id'] for f in films), [1, 2, 4, 5])
+
+    @patch('requests.Session')
+    def test_get_films_falls_back_when_patched_copy_does_not_verify(self, mock_session_cls):
+        """Test that a delta producing the wrong content is discarded."""
+        mock_session = mock_session_cls.return_value
+        self._seed_local_copy(mock_session, self.RELEASES[0])
+        files, md5s = self._publish(self.tmp_path, self.RELEASES)
+        index_url = GithubDataSource.DELTAS_URL + "index.json"
+        manifest = json.loads(files[index_url])
+        manifest['deltas'][-1]['to_digest'] = "0" * 64
+        files[index_url] = json.dumps(manifest).encode()
+        requested = self._serve(mock_session, files)
+
+        films = GithubDataSource().get_films(countries=['US'])
+
+        self.assertIn(GithubDataSource.GITHUB_URL, requested)
+        self.assertEqual(sorted(f['id'] for f in films), [1, 2, 4, 5])
+        self.assertEqual(self.data_source._get_cache().read_header()['md5'], md5s[-1])
+
+    @patch('requests.Session')
+    def test_get_films_single_country_uses_shard(self, mock_session_cls):
+        """Test that a single-country sync downloads only that country's shard, then reuses it."""
+        mock_session = mock_session_cls.return_value
+        files, md5s = self._publish(self.tmp_path, self.RELEASES, shards=True)
+        requested = self._serve(mock_session, files)
+
+        films = GithubDataSource().get_films(countries=['us'])
+
+        self.assertNotIn(GithubDataSource.GITHUB_URL, requested)
+        self.assertIn(GithubDataSource.SHARDS_URL + "US.json.gz", requested)
+        self.assertEqual(sorted(f['id'] for f in films), [1, 2, 4, 5])
+        self.assertEqual(films[0]['directors'], [{'name': 'Dir'}])
+        self.assertIsNone(self.data_source._get_cache().read_header())
+
+        # The next sync is served from the local copy of the shard
+        requested.clear()
+        again = GithubDataSource().get_films(countries=['US'])
+        self.assertEqual(again, films)
+        self.assertEqual(requested, [GithubDataSource.GITHUB_URL + ".md5", GithubDataSource.SHARDS_URL + "index.json"])
+
+    @patch('requests.Session')
+    def test_get_films_ignores_stale_shards(self, mock_session_cls):
+        """Test that shards cut from another release are not used."""
+        mock_session = mock_session_cls.return_value
+        files, md5s = self._publish(self.tmp_path, self.RELEASES, shards=True)
+        index_url = GithubDataSource.SHARDS_URL + "index.json"
+        manifest = json.loads(files[index_url])
+        manifest['source_md5'] = md5s[0]
+        files[index_url] = json.dumps(manifest).encode()
+        requested = self._serve(mock_session, files)
+
+        films = GithubDataSource().get_films(countries=['US'])
+
+        self.assertIn(GithubDataSource.GITHUB_URL, requested)
+        self.assertNotIn(GithubDataSource.SHARDS_URL + "US.json.gz", requested)
+        self.assertEqual(sorted(f['id'] for f in films), [1, 2, 4, 5])
+
+    @patch('requests.Session')
+    def test_get_films_without_shard_for_country(self, mock_session_cls):
+        """Test that a country without a shard, or several countries, use the full database."""
+        mock_session = mock_session_cls.return_value
+        files, md5s = self._publish(self.tmp_path, self.RELEASES, shards=True)
+        requested = self._serve(mock_session, files)
+
+        self.assertEqual(GithubDataSource().get_films(countries=['JP']), [])
+        self.assertIn(GithubDataSource.GITHUB_URL, requested)
+
+        requested.clear()
+        films = GithubDataSource().get_films(countries=['US', 'DE'])
+        self.assertEqual(len(films), 204)
+        self.assertFalse(any(url.startswith(GithubDataSource.SHARDS_URL) for url in requested))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,136 @@
+"""
+Test suite for the on-disk MUBI API response cache.
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from plugin_video_mubi.resources.lib.http_cache import HttpCache, CachedResponse
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    return HttpCache(tmp_path, default_ttl=60)
+
+
+def _response(body=b'{"films": []}', headers=None):
+    response = Mock()
+    response.status_code = 200
+    response.content = body
+    response.headers = headers or {}
+    return response
+
+
+class TestHttpCache:
+    """Test cases for HttpCache."""
+
+    def test_key_depends_on_params_and_country(self, http_cache):
+        """Test that country and params are part of the key, but irrelevant headers are not."""
+        url = 'https://api.mubi.com/v4/browse/films'
+        base = http_cache.make_key('GET', url, {'page': 1}, {'Client-Country': 'CH', 'User-Agent': 'a'})
+
+        assert base == http_cache.make_key('GET', url, {'page': 1}, {'Client-Country': 'CH', 'User-Agent': 'b'})
+        assert base != http_cache.make_key('GET', url, {'page': 2}, {'Client-Country': 'CH'})
+        assert base != http_cache.make_key('GET', url, {'page': 1}, {'Client-Country': 'DE'})
+
+    def test_key_depends_on_account_and_language(self, http_cache):
+        """Test that a response cached for one account or language is not replayed for another."""
+        url = 'https://api.mubi.com/v4/browse/films'
+        base = http_cache.make_key('GET', url, None, {'Authorization': 'Bearer a', 'accept-language': 'en'})
+
+        assert base != http_cache.make_key('GET', url, None, {'Authorization': 'Bearer b', 'accept-language': 'en'})
+        assert base != http_cache.make_key('GET', url, None, {'Authorization': 'Bearer a', 'accept-language': 'fr'})
+        assert base == http_cache.make_key('GET', url, None, {'authorization': 'Bearer a', 'Accept-Language': 'en'})
+
+    def test_prune_expires_and_caps_entries(self, http_cache, tmp_path):
+        """Test that old entries, orphan bodies and entries beyond the cap are deleted."""
+        import os
+        now = time.time()
+        for i in range(4):
+            key = http_cache.make_key('GET', f'https://x/{i}')
+            http_cache.store(key, f'https://x/{i}', _response())
+            meta_path, _ = http_cache._paths(key)
+            age = HttpCache.MAX_AGE + 1 if i == 0 else 10 - i  # Entry 0 expired, entry 1 oldest of the rest
+            os.utime(meta_path, (now - age, now - age))
+        (tmp_path / 'orphan.body').write_bytes(b'x')
+
+        with patch.object(HttpCache, 'MAX_ENTRIES', 2):
+            assert http_cache.prune(now=now) == 3
+            assert http_cache.prune(now=now) == 0  # At most once per interval
+
+        remaining = sorted(p.name for p in tmp_path.glob('*.json'))
+        expected = sorted(http_cache._paths(http_cache.make_key('GET', f'https://x/{i}'))[0].name for i in (2, 3))
+        assert remaining == expected
+        assert len(list(tmp_path.glob('*.body'))) == 2
+
+    def test_store_and_get_roundtrip(self, http_cache):
+        """Test that a stored body and validators can be read back."""
+        key = http_cache.make_key('GET', 'https://x/y')
+        http_cache.store(key, 'https://x/y', _response(headers={'ETag': 'W/"abc"'}))
+
+        entry = http_cache.get(key)
+
+        assert entry['body'] == b'{"films": []}'
+        assert entry['etag'] == 'W/"abc"'
+        assert http_cache.conditional_headers(entry) == {'If-None-Match': 'W/"abc"'}
+
+    def test_get_missing_entry(self, http_cache):
+        """Test that a missing entry returns None."""
+        assert http_cache.get('nope') is None
+
+    def test_entry_with_validators_is_never_fresh(self, http_cache):
+        """Test that entries with validators are always revalidated."""
+        key = http_cache.make_key('GET', 'https://x/y')
+        http_cache.store(key, 'https://x/y', _response(headers={'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+
+        entry = http_cache.get(key)
+
+        assert not http_cache.is_fresh(entry)
+        assert 'If-Modified-Since' in http_cache.conditional_headers(entry)
+
+    def test_entry_without_validators_uses_ttl(self, http_cache):
+        """Test TTL fallback for responses without validators."""
+        key = http_cache.make_key('GET', 'https://x/y')
+        http_cache.store(key, 'https://x/y', _response())
+        entry = http_cache.get(key)
+
+        assert http_cache.is_fresh(entry)
+        with patch('time.time', return_value=time.time() + 120):
+            assert not http_cache.is_fresh(entry)
+
+    def test_no_store_is_respected(self, http_cache):
+        """Test that Cache-Control: no-store responses are not written."""
+        key = http_cache.make_key('GET', 'https://x/y')
+
+        assert not http_cache.store(key, 'https://x/y', _response(headers={'Cache-Control': 'no-store'}))
+        assert http_cache.get(key) is None
+
+    def test_non_bytes_body_is_not_stored(self, http_cache):
+        """Test that responses without a real body are skipped."""
+        response = _response()
+        response.content = Mock()
+
+        assert not http_cache.store('k', 'https://x/y', response)
+
+    def test_refresh_updates_validators(self, http_cache):
+        """Test that a 304 with a new ETag updates the entry."""
+        key = http_cache.make_key('GET', 'https://x/y')
+        http_cache.store(key, 'https://x/y', _response(headers={'ETag': '"1"'}))
+
+        http_cache.refresh(key, http_cache.get(key), Mock(headers={'ETag': '"2"'}))
+
+        entry = http_cache.get(key)
+        assert entry['etag'] == '"2"'
+        assert entry['body'] == b'{"films": []}'
+
+    def test_cached_response_behaves_like_response(self):
+        """Test the response stand-in returned on cache hits."""
+        response = CachedResponse({'status': 200, 'headers': {}}, b'{"a": 1}')
+
+        assert response.status_code == 200
+        assert response.json() == {'a': 1}
+        assert response.text == '{"a": 1}'
+        assert response.raise_for_status() is None
+        assert response.from_cache
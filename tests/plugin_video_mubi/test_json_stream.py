@@ -0,0 +1,74 @@
+"""
+Test suite for the incremental JSON parser.
+"""
+
+import json
+
+import pytest
+
+from plugin_video_mubi.resources.lib.json_stream import JsonObjectStream, iter_json_array
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+DOCUMENT = {
+    "meta": {"version": 1, "generated": "2026-01-01T00:00:00Z"},
+    "items": [
+        {"id": 1, "title": "A \"quoted\" title, with [brackets] {and} braces"},
+        {"id": 2, "rating": 12345.678e-2, "flags": [True, False, None]},
+        12345,
+        "plain string",
+        [1, [2, [3]]],
+    ],
+    "total": 1234567,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+def test_items_and_fields_match_json_load(chunk_size):
+    text = json.dumps(DOCUMENT, indent=1)
+    fields = {}
+
+    items = list(iter_json_array(_chunks(text, chunk_size), 'items', fields))
+
+    assert items == DOCUMENT["items"]
+    assert fields == {"meta": DOCUMENT["meta"], "total": DOCUMENT["total"]}
+
+
+def test_items_are_returned_as_soon_as_complete():
+    stream = JsonObjectStream('items')
+
+    assert stream.feed('{"items": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert stream.feed(': 2}') == [{"id": 2}]
+    assert stream.feed(']}') == []
+    assert stream.close() == []
+    assert stream.done
+
+
+def test_number_split_across_chunks_is_not_truncated():
+    stream = JsonObjectStream('items')
+
+    assert stream.feed('{"items": [12') == []
+    assert stream.feed('34]}') == [1234]
+    stream.close()
+
+
+def test_empty_object_and_array():
+    assert list(iter_json_array(['{}'])) == []
+    assert list(iter_json_array(['{"items": []}'])) == []
+
+
+def test_truncated_document_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(['{"items": [{"id": 1}, {"id": 2']))
+
+
+def test_malformed_document_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(['{"items": [1 2]}']))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(['["not", "an", "object"]']))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(['{"items": []} trailing']))
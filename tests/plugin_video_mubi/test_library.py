@@ -9,9 +9,11 @@ Structure: All tests follow Arrange-Act-Assert pattern
 Coverage: Happy path, edge cases, and error handling
 """
 
+import pytest
 import tempfile
 from unittest.mock import Mock, patch, call
 from pathlib import Path
+import xml.etree.ElementTree as ET
 from plugin_video_mubi.resources.lib.film import Film
 from plugin_video_mubi.resources.lib.library import Library
 import os
@@ -160,8 +162,7 @@ def test_prepare_files_for_film_success(mock_create_strm, mock_create_nfo):
 
 
 @patch.object(Film, "create_nfo_file")
-@patch.object(Film, "update_nfo_availability")
-def test_prepare_files_for_film_nfo_exists_availability_updated(mock_update_availability, mock_create_nfo):
+def test_prepare_files_for_film_nfo_exists_availability_updated(mock_create_nfo):
     """Test that when NFO exists, availability is updated in NFO file."""
     with tempfile.TemporaryDirectory() as tmpdirname:
         plugin_userdata_path = Path(tmpdirname)
@@ -175,7 +176,7 @@ def test_prepare_files_for_film_nfo_exists_availability_updated(mock_update_avai
             artwork="http://example.com/art2.jpg",
             web_url="http://example.com",
             metadata=metadata,
-            available_countries=["CH", "DE", "US"]
+            available_countries={"CH": {}, "DE": {}, "US": {}}
         )
         library.add_film(film)
 
@@ -198,9 +199,6 @@ def test_prepare_files_for_film_nfo_exists_availability_updated(mock_update_avai
         </movie>"""
         nfo_file.write_text(nfo_content)
 
-        # Mock update_nfo_availability to return True
-        mock_update_availability.return_value = True
-
         # Run prepare_files_for_film
         base_url = "plugin://plugin.video.mubi/"
         omdb_api_key = "fake_api_key"
@@ -214,8 +212,16 @@ def test_prepare_files_for_film_nfo_exists_availability_updated(mock_update_avai
         # Assert that create_nfo_file was NOT called (NFO already exists)
         mock_create_nfo.assert_not_called()
 
-        # Assert that update_nfo_availability WAS called (to update country availability)
-        mock_update_availability.assert_called_once_with(nfo_file)
+        # Assert that the country availability was written to the NFO
+        availability = ET.parse(nfo_file).getroot().find("mubi_availability")
+        assert [c.get("code") for c in availability.findall("country")] == ["CH", "DE", "US"]
+
+        # Nothing changed since: the NFO is parsed once and not rewritten
+        with patch.object(ET, "parse", wraps=ET.parse) as mock_parse, \
+             patch.object(ET.ElementTree, "write") as mock_write:
+            assert library.prepare_files_for_film(film, base_url, plugin_userdata_path) is None
+        assert mock_parse.call_count == 1
+        mock_write.assert_not_called()
 
 
 @patch.object(Film, "create_nfo_file")
@@ -295,6 +301,39 @@ def test_remove_obsolete_files():
         # Check that the current film folder was not removed
         assert current_folder.exists(), "Current film folder should not have been removed."
 
+def test_remove_obsolete_files_keeps_cache_dir():
+    """Test that the reserved cache folder in the profile is never treated as a film folder."""
+    from plugin_video_mubi.resources.lib.profile_cache import CACHE_DIR_NAME
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        cache_dir = plugin_userdata_path / CACHE_DIR_NAME / "http"
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "entry.json").write_text("{}")
+        (plugin_userdata_path / "Old Film (2021)").mkdir()
+
+        library = Library()
+        removed = library.remove_obsolete_files(plugin_userdata_path)
+
+        assert removed == 1
+        assert (cache_dir / "entry.json").exists()
+        assert not (plugin_userdata_path / "Old Film (2021)").exists()
+
+def test_remove_obsolete_files_keeps_retained_folders():
+    """Test that folders of films skipped by a delta sync are not removed."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        (plugin_userdata_path / "Unchanged Film (2020)").mkdir()
+        (plugin_userdata_path / "Old Film (2021)").mkdir()
+
+        library = Library()
+        library.retained_folders = {"Unchanged Film (2020)"}
+        removed = library.remove_obsolete_files(plugin_userdata_path)
+
+        assert removed == 1
+        assert (plugin_userdata_path / "Unchanged Film (2020)").exists()
+        assert not (plugin_userdata_path / "Old Film (2021)").exists()
+
 def test_remove_obsolete_files_with_artwork():
     """Test that obsolete film folders are completely removed including all artwork files."""
     with tempfile.TemporaryDirectory() as tmpdirname:
@@ -945,4 +984,238 @@ class TestRegressionTests:
             # Assertions
             assert removed_count == 1, f"Expected 1 remove, got {removed_count}"
             assert not film_folder.exists(), "Night on Earth folder should have been removed."
-            assert valid_folder.exists(), "Valid film folder should be preserved."
\ No newline at end of file
+            assert valid_folder.exists(), "Valid film folder should be preserved."
+
+
+def _write_folder(film, base_url, path, *args):
+    (path / film.get_sanitized_folder_name()).mkdir(exist_ok=True)
+    return True
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+def test_sync_locally_streams_films_to_workers(mock_dialog_progress, mock_addon):
+    """Test that streamed films are written as they arrive and obsolete folders removed at the end."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        (plugin_userdata_path / "Gone (2001)").mkdir()
+        mock_addon.return_value.getSettingInt.return_value = 2
+        mock_dialog_progress.return_value.iscanceled.return_value = False
+        metadata = MockMetadata(year=2023)
+        films = [
+            Film(mubi_id=str(i), title=f"Streamed {i}", artwork="", web_url="",
+                 metadata=metadata, available_countries=VALID_COUNTRY_DATA)
+            for i in range(5)
+        ]
+        library = Library()
+        library.film_stream = iter(films)
+        library.STREAM_QUEUE_SIZE = 1
+
+        with patch.object(Library, "prepare_files_for_film", side_effect=_write_folder) as mock_prepare:
+            library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+
+        assert mock_prepare.call_count == 5
+        assert set(library.films) == {str(i) for i in range(5)}
+        assert library.film_stream is None
+        assert sorted(p.name for p in plugin_userdata_path.iterdir()) == \
+            sorted(film.get_sanitized_folder_name() for film in films)
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+def test_sync_locally_stream_failure_keeps_library(mock_dialog_progress, mock_addon):
+    """Test that a failing stream is re-raised without removing folders or committing the snapshot."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        (plugin_userdata_path / "Not Fetched Yet (2001)").mkdir()
+        mock_dialog_progress.return_value.iscanceled.return_value = False
+        film = Film(mubi_id="1", title="First", artwork="", web_url="",
+                    metadata=MockMetadata(year=2023), available_countries=VALID_COUNTRY_DATA)
+
+        def stream():
+            yield film
+            raise ValueError("MD5 verification failed")
+
+        library = Library()
+        library.film_stream = stream()
+        library.sync_snapshot = Mock()
+
+        with patch.object(Library, "prepare_files_for_film", side_effect=_write_folder):
+            with pytest.raises(ValueError, match="MD5"):
+                library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+
+        assert (plugin_userdata_path / "Not Fetched Yet (2001)").exists()
+        assert (plugin_userdata_path / film.get_sanitized_folder_name()).exists()
+        library.sync_snapshot.commit.assert_not_called()
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+def test_sync_locally_skips_folders_in_sync_manifest(mock_dialog_progress, mock_addon, tmp_path):
+    """Test that a re-sync does not touch up-to-date folders and removes obsolete ones from the manifest."""
+    plugin_userdata_path = tmp_path / "library"
+    plugin_userdata_path.mkdir()
+    mock_dialog_progress.return_value.iscanceled.return_value = False
+    metadata = MockMetadata(year=2023)
+
+    def make_film(i, countries=VALID_COUNTRY_DATA):
+        return Film(mubi_id=str(i), title=f"Film {i}", artwork="", web_url="",
+                    metadata=metadata, available_countries=dict(countries))
+
+    def sync(films):
+        library = Library()
+        for film in films:
+            library.add_film(film)
+        with patch.object(Library, "prepare_files_for_film", side_effect=_write_folder) as mock_prepare:
+            library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+        return sorted(call.args[0].mubi_id for call in mock_prepare.call_args_list)
+
+    assert sync([make_film(i) for i in range(3)]) == ["0", "1", "2"]
+
+    # Film 0 unchanged, film 1 changed, film 2 gone, film 3 new, and a folder deleted by hand
+    (plugin_userdata_path / make_film(0).get_sanitized_folder_name()).rmdir()
+    changed = dict(VALID_COUNTRY_DATA, **{"XX": {}})
+    with patch("pathlib.Path.iterdir", side_effect=AssertionError("folders listed one by one")):
+        assert sync([make_film(0), make_film(1, changed), make_film(3)]) == ["0", "1", "3"]
+    assert sync([make_film(0), make_film(1, changed), make_film(3)]) == []
+    assert sorted(p.name for p in plugin_userdata_path.iterdir()) == \
+        sorted(make_film(i).get_sanitized_folder_name() for i in (0, 1, 3))
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+def test_sync_locally_resumes_from_sync_journal(mock_dialog_progress, mock_addon, tmp_path):
+    """Test that films written by an interrupted sync are not written again, and the journal is cleared."""
+    from plugin_video_mubi.resources.lib.sync_journal import SyncJournal
+    from plugin_video_mubi.resources.lib.sync_snapshot import SyncSnapshot
+
+    plugin_userdata_path = tmp_path / "library"
+    plugin_userdata_path.mkdir()
+    mock_dialog_progress.return_value.iscanceled.return_value = False
+    metadata = MockMetadata(year=2023)
+    films = [Film(mubi_id=str(i), title=f"Film {i}", artwork="", web_url="",
+                  metadata=metadata, available_countries=VALID_COUNTRY_DATA) for i in range(3)]
+    snapshot = SyncSnapshot(tmp_path / SyncSnapshot.FILE_NAME)
+    snapshot.compute_delta([{'id': i, 'title': f"Film {i}"} for i in range(3)])
+
+    # The interrupted run wrote film 0; film 1 was written too but its folder is gone since
+    journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, {'sync': 1})
+    for film in films[:2]:
+        journal.record_written(film.mubi_id, snapshot.staged_fingerprint(film.mubi_id),
+                               film.get_sanitized_folder_name())
+    (plugin_userdata_path / films[0].get_sanitized_folder_name()).mkdir()
+
+    library = Library()
+    for film in films:
+        library.add_film(film)
+    library.sync_snapshot = snapshot
+    library.sync_journal = journal
+
+    with patch.object(Library, "prepare_files_for_film", side_effect=_write_folder) as mock_prepare:
+        library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+
+    assert sorted(call.args[0].mubi_id for call in mock_prepare.call_args_list) == ["1", "2"]
+    assert set(snapshot.films) == {"0", "1", "2"}
+    assert not journal.path.exists()
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+def test_sync_locally_does_not_journal_unchanged_films(mock_dialog_progress, mock_addon, tmp_path):
+    """Test that only films written by the sync are checkpointed in the journal."""
+    from plugin_video_mubi.resources.lib.sync_journal import SyncJournal
+
+    mock_dialog_progress.return_value.iscanceled.return_value = False
+    metadata = MockMetadata(year=2023)
+    library = Library()
+    for i in range(2):
+        library.add_film(Film(mubi_id=str(i), title=f"Film {i}", artwork="", web_url="",
+                              metadata=metadata, available_countries=VALID_COUNTRY_DATA))
+    library.sync_journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, {'sync': 1})
+
+    results = {"0": Library.UNCHANGED, "1": True}
+    with patch.object(Library, "_sync_film", side_effect=lambda film, *args: results[film.mubi_id]), \
+         patch.object(Library, "_film_fingerprint", return_value="abc"), \
+         patch.object(SyncJournal, "record_written") as mock_record, \
+         patch.object(SyncJournal, "finish"):
+        library.sync_locally("plugin://plugin.video.mubi/", tmp_path)
+
+    assert [call.args[0] for call in mock_record.call_args_list] == ["1"]
+    library.sync_journal.close()
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+@patch.object(Library, "prepare_files_for_film")
+@patch.object(Library, "remove_obsolete_files")
+def test_sync_locally_commits_sync_snapshot(mock_remove_obsolete, mock_prepare_files, mock_dialog_progress, mock_addon):
+    """Test that only films written successfully are recorded in the sync snapshot."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        library = Library()
+        mock_addon.return_value.getSettingBool.return_value = False
+        mock_dialog_progress.return_value.iscanceled.return_value = False
+
+        metadata = MockMetadata(year=2023)
+        film1 = Film(mubi_id="123", title="Sample Movie 1", artwork="http://example.com/art1.jpg",
+                     web_url="http://example.com/film1", metadata=metadata, available_countries=VALID_COUNTRY_DATA)
+        film2 = Film(mubi_id="456", title="Sample Movie 2", artwork="http://example.com/art2.jpg",
+                     web_url="http://example.com/film2", metadata=metadata, available_countries=VALID_COUNTRY_DATA)
+        library.add_film(film1)
+        library.add_film(film2)
+        mock_prepare_files.side_effect = lambda film, *args: film.mubi_id == "123"
+
+        library.sync_snapshot = Mock()
+        library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+
+        library.sync_snapshot.commit.assert_called_once_with({"123": film1.get_sanitized_folder_name()})
+
+
+@patch("xbmcaddon.Addon")
+@patch("xbmcgui.DialogProgress")
+@patch.object(Library, "remove_obsolete_files")
+def test_sync_locally_records_catalogue_store(mock_remove_obsolete, mock_dialog_progress, mock_addon):
+    """Test that written films are indexed in the catalogue database and removed ones pruned."""
+    from plugin_video_mubi.resources.lib.catalogue_store import CatalogueStore
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        plugin_userdata_path = Path(tmpdirname)
+        mock_dialog_progress.return_value.iscanceled.return_value = False
+        metadata = MockMetadata(year=2023)
+        film = Film(mubi_id="123", title="Sample Movie", artwork="", web_url="",
+                    metadata=metadata, available_countries=VALID_COUNTRY_DATA)
+
+        def write_nfo(film, base_url, path, *args):
+            folder = path / film.get_sanitized_folder_name()
+            folder.mkdir(exist_ok=True)
+            (folder / f"{folder.name}.nfo").write_text(
+                '<movie><uniqueid type="imdb">tt0000123</uniqueid><poster>p.jpg</poster></movie>')
+            return True
+
+        with patch.object(Library, "prepare_files_for_film", side_effect=write_nfo):
+            library = Library()
+            library.add_film(film)
+            library.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+
+            with CatalogueStore.open() as store:
+                row = store.get_film("123")
+                assert row["imdb_id"] == "tt0000123"
+                assert row["folder"] == film.get_sanitized_folder_name()
+                assert row["artwork"] == {"poster": str(plugin_userdata_path / row["folder"] / "p.jpg")}
+                assert set(row["available_countries"]) == set(c.upper() for c in VALID_COUNTRY_DATA)
+
+            # An unchanged film is kept without reading its NFO again
+            with patch.object(Library, "_sync_film", return_value=Library.UNCHANGED), \
+                 patch.object(CatalogueStore, "_record_film") as mock_record:
+                again = Library()
+                again.add_film(film)
+                again.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+            mock_record.assert_not_called()
+            with CatalogueStore.open() as store:
+                assert store.get_film("123")["imdb_id"] == "tt0000123"
+
+            # The film left the catalogue: its row goes with its folder
+            empty = Library()
+            empty.sync_locally("plugin://plugin.video.mubi/", plugin_userdata_path)
+            with CatalogueStore.open() as store:
+                assert store.get_film("123") is None
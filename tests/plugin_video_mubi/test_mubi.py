@@ -1424,8 +1424,9 @@ class TestMubi:
         with patch('time.sleep') as mock_sleep:
             result = mubi_instance._make_api_call("GET", "test")
 
-            # Should have slept for 2 seconds (from Retry-After header)
-            mock_sleep.assert_called_once_with(2)
+            # Should have paused for the Retry-After (2s) plus one slot at the reduced rate
+            mock_sleep.assert_called_once()
+            assert 2 <= mock_sleep.call_args[0][0] < 3
             # Should have retried and succeeded
             assert result == mock_response_200
 
@@ -1743,7 +1744,8 @@ class TestMubi:
 
         assert result == mock_response
         mock_session.request.assert_called_once()
-        mock_session.close.assert_called_once()
+        # Pooled session stays open for reuse by later calls
+        mock_session.close.assert_not_called()
 
     @patch('time.time')
     @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
@@ -1765,7 +1767,7 @@ class TestMubi:
         result = mubi_instance._make_api_call('GET', endpoint='test')
 
         assert result is None
-        mock_session.close.assert_called_once()
+        mock_session.close.assert_not_called()
 
     @patch('time.time')
     @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
@@ -1783,7 +1785,213 @@ class TestMubi:
         result = mubi_instance._make_api_call('GET', endpoint='test')
 
         assert result is None
-        mock_session.close.assert_called_once()
+        mock_session.close.assert_not_called()
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_reuses_pooled_session(self, mock_session_class, mubi_instance):
+        """Test that consecutive API calls share one long-lived session."""
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_session.request.return_value = mock_response
+        mock_session_class.return_value = mock_session
+
+        mubi_instance._make_api_call('GET', endpoint='first')
+        mubi_instance._make_api_call('GET', endpoint='second')
+        mubi_instance._make_api_call('GET', endpoint='third')
+
+        mock_session_class.assert_called_once()
+        assert mock_session.request.call_count == 3
+
+    @patch('plugin_video_mubi.resources.lib.mubi.HTTPAdapter')
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_pooled_session_uses_configured_pool_size(self, mock_session_class, mock_adapter_class, mock_session):
+        """Test that pool size and per-host limits are passed to the adapter."""
+        mubi = Mubi(mock_session, pool_connections=2, pool_maxsize=6)
+
+        mubi._get_http_session()
+
+        kwargs = mock_adapter_class.call_args[1]
+        assert kwargs['pool_connections'] == 2
+        assert kwargs['pool_maxsize'] == 6
+        assert kwargs['pool_block'] is True
+
+    def test_pooled_session_defaults(self, mubi_instance):
+        """Test default pool sizing when no overrides are given."""
+        assert mubi_instance.pool_connections == Mubi.POOL_CONNECTIONS
+        assert mubi_instance.pool_maxsize == Mubi.POOL_MAXSIZE
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_get_connection_stats_counts_reuse(self, mock_session_class, mubi_instance):
+        """Test that the reuse counter reports requests minus new connections."""
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_session.request.return_value = mock_response
+        mock_session_class.return_value = mock_session
+
+        for _ in range(5):
+            mubi_instance._make_api_call('GET', endpoint='test')
+
+        pool = Mock()
+        pool.num_connections = 1
+        pools = {('https', 'api.mubi.com', 443): pool}
+        mubi_instance._http_adapter = Mock()
+        mubi_instance._http_adapter.poolmanager.pools = pools
+
+        stats = mubi_instance.get_connection_stats()
+
+        assert stats == {'requests': 5, 'connections_opened': 1, 'connections_reused': 4}
+
+    def test_get_connection_stats_before_first_call(self, mubi_instance):
+        """Test stats are safe to read before any request was made."""
+        stats = mubi_instance.get_connection_stats()
+
+        assert stats['requests'] == 0
+        assert stats['connections_opened'] is None
+        assert stats['connections_reused'] is None
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_close_releases_pooled_session(self, mock_session_class, mubi_instance):
+        """Test that close() shuts the session and a new one is created afterwards."""
+        first_session = Mock()
+        second_session = Mock()
+        mock_session_class.side_effect = [first_session, second_session]
+
+        assert mubi_instance._get_http_session() is first_session
+        mubi_instance.close()
+
+        first_session.close.assert_called_once()
+        assert mubi_instance._get_http_session() is second_session
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_uses_shared_rate_limiter(self, mock_session_class, mubi_instance):
+        """Test that an installed rate limiter is consulted before each request."""
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_session.request.return_value = mock_response
+        mock_session_class.return_value = mock_session
+        mubi_instance.rate_limiter = Mock()
+
+        mubi_instance._make_api_call('GET', endpoint='a')
+        mubi_instance._make_api_call('GET', endpoint='b')
+
+        assert mubi_instance.rate_limiter.acquire.call_count == 2
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_429_slows_down_other_clients(self, mock_session_class, mock_session):
+        """Test that a 429 seen by one client pauses every client in the process."""
+        http_session = Mock()
+        limited = Mock(status_code=429, headers={'Retry-After': '30'})
+        ok = Mock(status_code=200)
+        http_session.request.side_effect = [limited, ok, ok]
+        mock_session_class.return_value = http_session
+
+        first = Mubi(mock_session)
+        second = Mubi(mock_session)
+        assert first.rate_limiter is second.rate_limiter
+
+        with patch('time.sleep') as mock_sleep:
+            first._make_api_call('GET', endpoint='a')
+            second._make_api_call('GET', endpoint='b')
+
+        # Both the retry and the other client's call waited for the shared pause
+        waits = [c[0][0] for c in mock_sleep.call_args_list]
+        assert len(waits) == 2
+        assert all(wait > 20 for wait in waits)
+        assert first.rate_limiter.rate_limited == 1
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_circuit_breaker_stops_requests(self, mock_session_class, mubi_instance):
+        """Test that sustained 5xx responses stop further requests."""
+        http_session = Mock()
+        error_response = Mock(status_code=503)
+        error_response.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        http_session.request.return_value = error_response
+        mock_session_class.return_value = http_session
+        threshold = mubi_instance.circuit_breaker.failure_threshold
+
+        for _ in range(threshold):
+            assert mubi_instance._make_api_call('GET', endpoint='test') is None
+        assert http_session.request.call_count == threshold
+
+        # Circuit is open: no request goes out
+        assert mubi_instance._make_api_call('GET', endpoint='test') is None
+        assert http_session.request.call_count == threshold
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_cache_revalidates_with_etag(self, mock_session_class, mubi_instance):
+        """Test that a cached page is revalidated and a 304 returns the stored body."""
+        http_session = Mock()
+        first = Mock(status_code=200, content=b'{"films": [{"id": 1}]}', headers={'ETag': '"v1"'})
+        not_modified = Mock(status_code=304, headers={})
+        http_session.request.side_effect = [first, not_modified]
+        mock_session_class.return_value = http_session
+        headers = {'Client-Country': 'CH'}
+
+        mubi_instance._make_api_call('GET', endpoint='v4/browse/films', headers=dict(headers),
+                                     params={'page': 1}, cache=True)
+        result = mubi_instance._make_api_call('GET', endpoint='v4/browse/films', headers=dict(headers),
+                                              params={'page': 1}, cache=True)
+
+        sent_headers = http_session.request.call_args_list[1][1]['headers']
+        assert sent_headers['If-None-Match'] == '"v1"'
+        assert result.json() == {'films': [{'id': 1}]}
+        assert mubi_instance.get_cache_stats() == {'hits': 0, 'revalidated': 1, 'misses': 1}
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_cache_serves_fresh_entry_without_request(self, mock_session_class, mubi_instance):
+        """Test that a response without validators is served from disk within its TTL."""
+        http_session = Mock()
+        http_session.request.return_value = Mock(status_code=200, content=b'{"films": []}', headers={})
+        mock_session_class.return_value = http_session
+
+        mubi_instance._make_api_call('GET', endpoint='v4/browse/films', params={'page': 1}, cache=True)
+        result = mubi_instance._make_api_call('GET', endpoint='v4/browse/films', params={'page': 1}, cache=True)
+
+        assert http_session.request.call_count == 1
+        assert result.from_cache
+        assert mubi_instance.get_cache_stats()['hits'] == 1
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_cache_keyed_by_country(self, mock_session_class, mubi_instance):
+        """Test that different catalogue countries do not share cache entries."""
+        http_session = Mock()
+        http_session.request.return_value = Mock(status_code=200, content=b'{"films": []}', headers={})
+        mock_session_class.return_value = http_session
+
+        mubi_instance._make_api_call('GET', endpoint='v4/browse/films', headers={'Client-Country': 'CH'},
+                                     params={'page': 1}, cache=True)
+        mubi_instance._make_api_call('GET', endpoint='v4/browse/films', headers={'Client-Country': 'DE'},
+                                     params={'page': 1}, cache=True)
+
+        assert http_session.request.call_count == 2
+
+    @patch('plugin_video_mubi.resources.lib.mubi.requests.Session')
+    def test_make_api_call_without_cache_flag_does_not_cache(self, mock_session_class, mubi_instance):
+        """Test that only opted-in calls use the response cache."""
+        http_session = Mock()
+        http_session.request.return_value = Mock(status_code=200, content=b'{}', headers={})
+        mock_session_class.return_value = http_session
+
+        mubi_instance._make_api_call('GET', endpoint='v4/me')
+        mubi_instance._make_api_call('GET', endpoint='v4/me')
+
+        assert http_session.request.call_count == 2
+        assert mubi_instance.get_cache_stats() == {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+    def test_parse_retry_after(self, mubi_instance):
+        """Test Retry-After parsing for seconds, HTTP dates and junk."""
+        import email.utils
+        import time
+
+        assert mubi_instance._parse_retry_after('5') == 5
+        assert mubi_instance._parse_retry_after(None) is None
+        assert mubi_instance._parse_retry_after('soon') is None
+
+        future = email.utils.formatdate(time.time() + 60, usegmt=True)
+        assert mubi_instance._parse_retry_after(future) == pytest.approx(60, abs=2)
 
     @patch('xbmc.executebuiltin')
     @patch('xbmcgui.Dialog')
@@ -2172,8 +2380,9 @@ class TestMubi:
             # Attempt 1: 429 -> wait 20s
             # Attempt 2: 200 -> return
             assert mock_sleep.call_count == 2
-            mock_sleep.assert_any_call(10)  # First retry: 10 * 2^0 = 10 seconds
-            mock_sleep.assert_any_call(20)  # Second retry: 10 * 2^1 = 20 seconds
+            waits = [c[0][0] for c in mock_sleep.call_args_list]
+            assert 10 <= waits[0] < 11  # First retry: 10 * 2^0 = 10 seconds
+            assert 20 <= waits[1] < 21  # Second retry: 10 * 2^1 = 20 seconds
             assert result == mock_response_200
 
     # Additional tests for V4 API migration and missing coverage
@@ -2379,6 +2588,16 @@ class TestMubi:
             # API call should have been attempted at least once
             assert mock_api_call.call_count >= 1
 
+    def test_get_all_films_closes_journal_when_fetch_fails(self, mubi_instance):
+        """Test that a failed fetch does not leave the sync journal open."""
+        data_source = Mock()
+        data_source.get_films.side_effect = RuntimeError("API down")
+
+        with pytest.raises(RuntimeError):
+            mubi_instance.get_all_films(data_source=data_source, countries=['CH'])
+
+        assert mubi_instance.sync_journal is None
+
     def test_get_all_films_with_progress_callback(self, mubi_instance):
         """Test get_all_films with progress callback for multi-country sync."""
         # Mock the API response - single page per country
@@ -2809,6 +3028,137 @@ class TestMultiCountrySync:
             assert hasattr(film_result, 'available_countries')
             assert set(film_result.available_countries) == {'CH', 'DE', 'FR'}
 
+    def test_get_all_films_delta_sync_skips_unchanged_films(self, mubi_instance, isolated_profile_cache):
+        """Test delta sync only hydrates films added or changed since the last sync."""
+        from plugin_video_mubi.resources.lib.filters import FilmFilter
+        from plugin_video_mubi.resources.lib.sync_snapshot import SyncSnapshot
+
+        raw_films = [{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]
+        data_source = Mock()
+        data_source.get_films.side_effect = lambda **kwargs: [dict(f) for f in raw_films]
+
+        def hydrate(film_data):
+            film = Mock()
+            film.mubi_id = str(film_data['id'])
+            return film
+
+        with patch.object(FilmFilter, 'filter_films', side_effect=lambda films: films), \
+             patch.object(mubi_instance, 'process_film_data', side_effect=hydrate) as mock_hydrate:
+            # First sync: no snapshot yet, everything is hydrated
+            library = mubi_instance.get_all_films(data_source=data_source, delta_sync=True)
+            assert mock_hydrate.call_count == 2
+            for folder in ('A (2020)', 'B (2020)'):
+                (isolated_profile_cache / folder).mkdir()
+            library.sync_snapshot.commit({'1': 'A (2020)', '2': 'B (2020)'})
+
+            # Second sync: film 2 changed, film 1 did not
+            raw_films[1]['title'] = 'B2'
+            mock_hydrate.reset_mock()
+            library = mubi_instance.get_all_films(data_source=data_source, delta_sync=True)
+
+            assert [c.args[0]['id'] for c in mock_hydrate.call_args_list] == [2]
+            assert set(library.films) == {'2'}
+            assert library.retained_folders == {'A (2020)'}
+
+            # Without delta sync every film is hydrated again
+            mock_hydrate.reset_mock()
+            library = mubi_instance.get_all_films(data_source=data_source)
+            assert mock_hydrate.call_count == 2
+            assert library.retained_folders == set()
+
+        assert (isolated_profile_cache / '.cache' / SyncSnapshot.FILE_NAME).exists()
+
+    def test_get_all_films_stream_hydrates_lazily(self, mubi_instance, isolated_profile_cache):
+        """Test that a streaming sync fetches nothing up front and yields films one by one."""
+        from plugin_video_mubi.resources.lib.filters import FilmFilter
+        from plugin_video_mubi.resources.lib.sync_snapshot import SyncSnapshot
+
+        raw_films = [{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]
+        data_source = Mock()
+        data_source.iter_films.side_effect = lambda **kwargs: iter([dict(f) for f in raw_films])
+
+        def hydrate(film_data):
+            film = Mock()
+            film.mubi_id = str(film_data['id'])
+            return film
+
+        with patch.object(FilmFilter, 'iter_films', side_effect=lambda films: films), \
+             patch.object(mubi_instance, 'process_film_data', side_effect=hydrate) as mock_hydrate:
+            # Seed the snapshot with film 1 as it is now
+            snapshot = SyncSnapshot.load(isolated_profile_cache / '.cache' / SyncSnapshot.FILE_NAME)
+            snapshot.compute_delta([dict(raw_films[0])])
+            (isolated_profile_cache / 'A (2020)').mkdir()
+            snapshot.commit({'1': 'A (2020)'})
+
+            library = mubi_instance.get_all_films(data_source=data_source, delta_sync=True, stream=True)
+            data_source.iter_films.assert_not_called()
+            assert len(library.films) == 0
+
+            stream = library.film_stream
+            first = next(stream)
+            assert first.mubi_id == '2'  # Film 1 is unchanged and skipped
+            assert library.retained_folders == set()  # Not known before the stream ends
+            assert list(stream) == []
+            assert mock_hydrate.call_count == 1
+            assert library.retained_folders == {'A (2020)'}
+            data_source.get_films.assert_not_called()
+
+    def test_fetch_films_page_replays_sync_journal(self, mubi_instance, tmp_path):
+        """Test that pages fetched before an interrupted sync are replayed instead of requested again."""
+        from plugin_video_mubi.resources.lib.sync_journal import SyncJournal
+
+        page = {'films': [{'id': 1, 'title': 'A'}], 'meta': {'next_page': None}}
+        mock_response = Mock()
+        mock_response.json.return_value = page
+        key = {'source': 'MubiApiDataSource', 'countries': ['US'], 'playable_only': True}
+
+        with patch.object(mubi_instance, 'hea_gen_anonymous', return_value={}), \
+             patch.object(mubi_instance, '_make_api_call', return_value=mock_response) as mock_call:
+            mubi_instance.sync_journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, key)
+            assert mubi_instance._fetch_films_page('US', 1, True) == page
+            assert mubi_instance._fetch_films_page('US', 2, True) == page
+            mubi_instance.sync_journal.close()
+
+            # Kodi restarted: a new run of the same sync
+            mubi_instance.sync_journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, key)
+            assert mubi_instance.sync_journal.resumed
+            assert mubi_instance._fetch_films_page('US', 1, True) == page
+            assert mubi_instance._fetch_films_page('US', 2, True) == page
+            mubi_instance.sync_journal.close()
+
+        # Page 1 is requested again to check the catalogue, page 2 is replayed
+        assert mock_call.call_count == 3
+
+    def test_fetch_films_page_discards_journal_of_changed_catalogue(self, mubi_instance, tmp_path):
+        """Test that stored pages are not mixed with pages of a catalogue that changed since."""
+        from plugin_video_mubi.resources.lib.sync_journal import SyncJournal
+
+        key = {'source': 'MubiApiDataSource', 'countries': ['US'], 'playable_only': True}
+        before = {'films': [{'id': 1}], 'meta': {'total_count': 2, 'next_page': 2}}
+        after = {'films': [{'id': 3}], 'meta': {'total_count': 3, 'next_page': 2}}
+
+        def respond(data):
+            response = Mock()
+            response.json.return_value = data
+            return response
+
+        with patch.object(mubi_instance, 'hea_gen_anonymous', return_value={}), \
+             patch.object(mubi_instance, '_make_api_call') as mock_call:
+            mubi_instance.sync_journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, key)
+            mock_call.return_value = respond(before)
+            mubi_instance._fetch_films_page('US', 1, True)
+            mubi_instance._fetch_films_page('US', 2, True)
+            mubi_instance.sync_journal.close()
+
+            # A film was added before the interrupted sync resumed
+            mubi_instance.sync_journal = SyncJournal(tmp_path / SyncJournal.FILE_NAME, key)
+            mock_call.return_value = respond(after)
+            assert mubi_instance._fetch_films_page('US', 1, True) == after
+            assert mubi_instance._fetch_films_page('US', 2, True) == after
+            mubi_instance.sync_journal.close()
+
+        assert mock_call.call_count == 4  # Nothing replayed
+
     def test_get_all_films_single_country(self, mubi_instance):
         """Test syncing from single country works correctly."""
         film_data = {
@@ -2974,6 +3324,95 @@ class TestMultiCountrySync:
             assert pages == 2
             assert 1 in film_ids and 4 in film_ids
 
+    @staticmethod
+    def _paged_api(total_pages, per_page=2, failing_pages=()):
+        """Build a _make_api_call side effect serving browse pages by 'page' param."""
+        def api_call(method, endpoint=None, headers=None, params=None, **kwargs):
+            page = params['page']
+            if page in failing_pages:
+                return None
+            response = Mock()
+            response.json.return_value = {
+                'films': [{'id': (page - 1) * per_page + i + 1} for i in range(per_page)],
+                'meta': {
+                    'total_count': total_pages * per_page,
+                    'total_pages': total_pages,
+                    'next_page': page + 1 if page < total_pages else None
+                }
+            }
+            return response
+        return api_call
+
+    @patch('xbmc.log')
+    @patch('xbmcaddon.Addon')
+    def test_fetch_films_for_country_parallel_pages(self, mock_addon, mock_log):
+        """Test that remaining pages are fanned out and merged in page order."""
+        mock_session = Mock()
+        mock_session.token = 'test-token'
+
+        with patch.object(Mubi, '_make_api_call', side_effect=self._paged_api(12)) as mock_api:
+            mubi = Mubi(mock_session)
+            page_counts = []
+            film_ids, film_data, total, pages = mubi._fetch_films_for_country(
+                'CH', page_callback=lambda n: page_counts.append(n) or True, page_workers=4
+            )
+
+        assert pages == 12
+        assert total == 24
+        assert film_ids == set(range(1, 25))
+        # Merge order follows page order regardless of completion order
+        assert list(film_data) == list(range(1, 25))
+        # Callback throttling is unchanged: every 5th merged page
+        assert page_counts == [2, 2]
+        assert sorted(call[1]['params']['page'] for call in mock_api.call_args_list) == list(range(1, 13))
+
+    @patch('xbmc.log')
+    @patch('xbmcaddon.Addon')
+    def test_fetch_films_for_country_parallel_pages_stop_at_failed_page(self, mock_addon, mock_log):
+        """Test that a failed middle page stops the merge, like the sequential loop."""
+        mock_session = Mock()
+        mock_session.token = 'test-token'
+
+        api = self._paged_api(5, failing_pages=(3,))
+        with patch.object(Mubi, '_make_api_call', side_effect=api):
+            mubi = Mubi(mock_session)
+            film_ids, film_data, total, pages = mubi._fetch_films_for_country('CH', page_workers=3)
+
+        # Pages after the gap are not merged even though they were fetched
+        assert pages == 2
+        assert film_ids == {1, 2, 3, 4}
+
+    @patch('xbmc.log')
+    @patch('xbmcaddon.Addon')
+    def test_fetch_films_for_country_parallel_pages_cancel(self, mock_addon, mock_log):
+        """Test that a cancelling page callback stops merging further pages."""
+        mock_session = Mock()
+        mock_session.token = 'test-token'
+
+        with patch.object(Mubi, '_make_api_call', side_effect=self._paged_api(10)):
+            mubi = Mubi(mock_session)
+            film_ids, film_data, total, pages = mubi._fetch_films_for_country(
+                'CH', page_callback=lambda n: False, page_workers=3
+            )
+
+        assert pages == 5
+        assert film_ids == set(range(1, 11))
+
+    @patch('xbmc.log')
+    @patch('xbmcaddon.Addon')
+    def test_fetch_films_for_country_parallel_pages_keeps_caller_limiter(self, mock_addon, mock_log):
+        """Test that a rate limiter installed by the caller is used and kept."""
+        mock_session = Mock()
+        mock_session.token = 'test-token'
+        limiter = Mock()
+
+        with patch.object(Mubi, '_make_api_call', side_effect=self._paged_api(4)):
+            mubi = Mubi(mock_session)
+            mubi.rate_limiter = limiter
+            mubi._fetch_films_for_country('CH', page_workers=2)
+
+        assert mubi.rate_limiter is limiter
+
     @patch('xbmc.log')
     @patch('xbmcaddon.Addon')
     def test_fetch_films_for_country_empty_results(self, mock_addon, mock_log):
@@ -1267,6 +1267,63 @@ class TestGetAvailableCountriesFromNfo:
         # Should find the NFO via uniqueid element
         assert "JP" in result
 
+    def _index_film(self, library_path, film_id, nfo_countries, countries):
+        """Write a film folder and record it in the catalogue database, as a sync does."""
+        from types import SimpleNamespace
+        from plugin_video_mubi.resources.lib.catalogue_store import CatalogueStore
+
+        folder = library_path / f"Film {film_id} (2020)"
+        folder.mkdir(parents=True)
+        nfo = folder / f"{folder.name}.nfo"
+        nfo.write_text(f"""<movie><uniqueid type="mubi">{film_id}</uniqueid>
+<mubi_availability>{nfo_countries}</mubi_availability></movie>""")
+        film = SimpleNamespace(mubi_id=film_id, title=folder.name, metadata=None,
+                               available_countries=countries,
+                               get_sanitized_folder_name=lambda: folder.name)
+        with CatalogueStore.open() as store:
+            store.record_films([film], library_path)
+        return nfo
+
+    @patch('xbmcvfs.translatePath')
+    def test_indexed_film_skips_profile_scan(self, mock_translate_path, navigation_handler, tmp_path):
+        """Test that an indexed film is answered from the catalogue database without walking the profile."""
+        self._index_film(tmp_path / "library", "321", '<country code="CH"/>',
+                         {"CH": {"availability": "live", "expires_at": "2099-01-01T00:00:00Z"}, "FR": {}})
+        mock_translate_path.return_value = str(tmp_path / "library")
+
+        with patch('pathlib.Path.iterdir', side_effect=AssertionError("profile scanned")):
+            result = navigation_handler._get_available_countries_data_from_nfo("321")
+
+        assert result == {"CH": {"availability": "live", "expires_at": "2099-01-01T00:00:00Z"},
+                          "FR": {"availability": "live"}}
+
+    @patch('xbmcvfs.translatePath')
+    def test_stale_index_entry_reads_only_its_nfo(self, mock_translate_path, navigation_handler, tmp_path):
+        """Test that an NFO changed since the last sync is read directly."""
+        nfo = self._index_film(tmp_path / "library", "321", "", {"CH": {"availability": "live"}})
+        nfo.write_text("""<movie><uniqueid type="mubi">321</uniqueid>
+<mubi_availability><country code="DE"><availability>upcoming</availability></country></mubi_availability></movie>""")
+        mock_translate_path.return_value = str(tmp_path / "library")
+
+        with patch('pathlib.Path.iterdir', side_effect=AssertionError("profile scanned")):
+            result = navigation_handler._get_available_countries_data_from_nfo("321")
+
+        assert result == {"DE": {"availability": "upcoming"}}
+
+    @patch('xbmcvfs.translatePath')
+    def test_missing_index_entry_falls_back_to_scan(self, mock_translate_path, navigation_handler, tmp_path):
+        """Test that films the index does not know (or whose NFO moved) are found by scanning."""
+        nfo = self._index_film(tmp_path / "old", "321", '<country code="JP"/>', {"CH": {"availability": "live"}})
+        library = tmp_path / "library"
+        library.mkdir()
+        nfo.parent.rename(library / nfo.parent.name)
+        mock_translate_path.return_value = str(library)
+
+        result = navigation_handler._get_available_countries_data_from_nfo("321")
+
+        assert result == {"JP": {"availability": "live"}}  # Read from the NFO found by the scan
+        assert navigation_handler._get_available_countries_data_from_nfo("999") == {}
+
 
 class TestCountriesModule:
     """Test cases for the countries module helper functions."""
@@ -1981,14 +2038,6 @@ class TestWorldwideSyncMenuLabel:
 class TestIsCountryAvailable:
     """Test date-based availability checking logic."""
 
-    @pytest.fixture(autouse=True)
-    def patch_dateutil(self):
-        """Patch dateutil.parser.parse to use datetime.fromisoformat since dateutil is mocked."""
-        # Use simple lambda to handle any extra args if necessary, though fromisoformat takes only string
-        side_effect = lambda s: datetime.datetime.fromisoformat(s)
-        with patch('plugin_video_mubi.resources.lib.navigation_handler.dateutil.parser.parse', side_effect=side_effect):
-            yield
-
     @pytest.fixture
     def navigation_handler(self):
         """Fixture providing a NavigationHandler instance."""
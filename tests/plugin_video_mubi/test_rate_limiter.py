@@ -0,0 +1,339 @@
+"""
+Test suite for the shared request-rate limiter and circuit breaker.
+"""
+
+from unittest.mock import patch
+import threading
+
+import pytest
+
+from plugin_video_mubi.resources.lib.rate_limiter import (
+    RateLimiter,
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    get_api_rate_limiter,
+    get_api_circuit_breaker,
+    get_provider_rate_limiter,
+    get_provider_throttle_stats,
+    reset_api_throttle,
+)
+
+
+class TestRateLimiter:
+    """Test cases for the RateLimiter token bucket."""
+
+    def test_burst_is_free(self):
+        """Test that requests within the burst do not wait."""
+        limiter = RateLimiter(rate=2, burst=3)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter._last = 100.0
+            delays = [limiter.reserve() for _ in range(3)]
+
+        assert delays == [0.0, 0.0, 0.0]
+
+    def test_requests_beyond_burst_are_spaced(self):
+        """Test that each request beyond the burst waits 1/rate longer."""
+        limiter = RateLimiter(rate=4, burst=1)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter._last = 100.0
+            delays = [limiter.reserve() for _ in range(4)]
+
+        assert delays == pytest.approx([0.0, 0.25, 0.5, 0.75])
+        assert limiter.total_wait == pytest.approx(1.5)
+        assert limiter.acquired == 4
+
+    def test_tokens_refill_over_time(self):
+        """Test that idle time refills the bucket up to the burst size."""
+        limiter = RateLimiter(rate=1, burst=2)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter._last = 100.0
+            limiter.reserve()
+            limiter.reserve()
+        with patch('time.monotonic', return_value=110.0):
+            delays = [limiter.reserve() for _ in range(3)]
+
+        assert delays == pytest.approx([0.0, 0.0, 1.0])
+
+    def test_acquire_sleeps_for_reserved_delay(self):
+        """Test that acquire sleeps once for the reserved delay."""
+        limiter = RateLimiter(rate=2, burst=1)
+
+        with patch('time.monotonic', return_value=100.0), \
+             patch('time.sleep') as mock_sleep:
+            limiter._last = 100.0
+            limiter.acquire()
+            limiter.acquire()
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.5))
+
+    def test_concurrent_reservations_are_unique(self):
+        """Test that concurrent callers never get the same slot."""
+        limiter = RateLimiter(rate=10, burst=1)
+        delays = []
+        lock = threading.Lock()
+
+        def worker():
+            delay = limiter.reserve()
+            with lock:
+                delays.append(round(delay, 1))
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter._last = 100.0
+            threads = [threading.Thread(target=worker) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(delays) == [round(i * 0.1, 1) for i in range(10)]
+
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+
+class TestAdaptiveRateLimiter:
+    """Test cases for the AIMD rate limiter shared by MUBI API calls."""
+
+    def test_success_increases_rate_up_to_max(self):
+        """Test additive increase stops at the ceiling."""
+        limiter = AdaptiveRateLimiter(rate=2, max_rate=3, increase_step=1)
+
+        for _ in range(20):
+            limiter.on_success()
+
+        assert limiter.rate == 3
+
+    def test_rate_limited_halves_rate_once_per_cooldown(self):
+        """Test that a burst of 429s from parallel callers counts as one decrease."""
+        limiter = AdaptiveRateLimiter(rate=8, min_rate=1, decrease_cooldown=2)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter.on_rate_limited(1)
+            limiter.on_rate_limited(1)
+            limiter.on_rate_limited(1)
+        assert limiter.rate == 4
+        assert limiter.rate_limited == 3
+
+        with patch('time.monotonic', return_value=103.0):
+            limiter.on_rate_limited(1)
+        assert limiter.rate == 2
+
+    def test_rate_never_drops_below_min(self):
+        """Test the multiplicative decrease floor."""
+        limiter = AdaptiveRateLimiter(rate=1, min_rate=0.5, decrease_cooldown=0)
+
+        for _ in range(5):
+            limiter.on_rate_limited(0)
+
+        assert limiter.rate == 0.5
+
+    def test_retry_after_pauses_all_callers(self):
+        """Test that a Retry-After pause delays every later reservation."""
+        limiter = AdaptiveRateLimiter(rate=10, burst=5)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter._last = 100.0
+            pause = limiter.on_rate_limited(retry_after=3)
+            delays = [limiter.reserve() for _ in range(3)]
+
+        assert pause == pytest.approx(3)
+        # Callers are released after the pause and spaced at the reduced rate
+        assert delays[0] >= 3
+        assert delays[0] < delays[1] < delays[2]
+
+    def test_backoff_without_retry_after_is_exponential(self):
+        """Test consecutive 429s without a header double the pause."""
+        limiter = AdaptiveRateLimiter(rate=4)
+
+        with patch('time.monotonic', return_value=100.0):
+            first = limiter.on_rate_limited()
+        with patch('time.monotonic', return_value=100.0):
+            second = limiter.on_rate_limited()
+
+        assert first == pytest.approx(10)
+        assert second == pytest.approx(20)
+
+    def test_success_resets_backoff(self):
+        """Test that a successful response resets the exponential backoff."""
+        limiter = AdaptiveRateLimiter(rate=4)
+
+        with patch('time.monotonic', return_value=100.0):
+            limiter.on_rate_limited()
+            limiter.on_success()
+            pause = limiter.on_rate_limited()
+
+        assert pause == pytest.approx(10)
+
+    def test_configure_returns_previous_budget(self):
+        """Test that configure can be undone with its return value."""
+        limiter = AdaptiveRateLimiter(rate=5, burst=4)
+
+        previous = limiter.configure(max_rate=12, burst=6)
+        assert (limiter.max_rate, limiter.burst, limiter.rate) == (12, 6, 12)
+
+        limiter.configure(*previous)
+        assert (limiter.max_rate, limiter.burst) == (5, 4)
+        assert limiter.rate == 5
+
+    def test_configure_after_recent_429_only_clamps(self):
+        """Test that a new budget does not undo a recent backoff."""
+        limiter = AdaptiveRateLimiter(rate=8)
+        limiter.on_rate_limited(0)
+
+        limiter.configure(max_rate=20)
+
+        assert limiter.rate == 4
+        assert limiter.max_rate == 20
+
+
+class TestCircuitBreaker:
+    """Test cases for the API circuit breaker."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+        for _ in range(3):
+            assert breaker.allow_request()
+            breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failure_count(self):
+        """Test that an intermittent error does not open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        """Test recovery through a single trial request."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with patch('time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('time.monotonic', return_value=111.0):
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+            breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_trial_reopens(self):
+        """Test that a failing trial request opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with patch('time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('time.monotonic', return_value=111.0):
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert not breaker.allow_request()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestSharedApiThrottle:
+    """Test cases for the process-wide limiter and breaker accessors."""
+
+    def test_singletons_are_shared(self):
+        """Test that every caller gets the same instances."""
+        assert get_api_rate_limiter() is get_api_rate_limiter()
+        assert get_api_circuit_breaker() is get_api_circuit_breaker()
+
+    def test_reset_creates_fresh_instances(self):
+        """Test that reset discards the shared state."""
+        limiter = get_api_rate_limiter()
+        breaker = get_api_circuit_breaker()
+
+        reset_api_throttle()
+
+        assert get_api_rate_limiter() is not limiter
+        assert get_api_circuit_breaker() is not breaker
+
+
+def _real_response(status_code, headers):
+    """Build a real requests.Response (conftest replaces the requests module with a mock)."""
+    import sys
+    mocked = {name: module for name, module in sys.modules.items()
+              if name == 'requests' or name.startswith('requests.')}
+    for name in mocked:
+        del sys.modules[name]
+    try:
+        from requests.models import Response
+    finally:
+        for name in [n for n in sys.modules if n == 'requests' or n.startswith('requests.')]:
+            del sys.modules[name]
+        sys.modules.update(mocked)
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+class TestProviderThrottle:
+    """Test cases for the external metadata provider limiters."""
+
+    def test_one_limiter_per_provider(self):
+        """Test that all providers of a kind share a limiter with the documented budget."""
+        from plugin_video_mubi.resources.lib.external_metadata import OMDBProvider, TMDBProvider
+
+        first, second = TMDBProvider(api_key="a"), TMDBProvider(api_key="b")
+        assert first.retry_strategy.rate_limiter is second.retry_strategy.rate_limiter
+        assert first.retry_strategy.rate_limiter is get_provider_rate_limiter("TMDB")
+        assert OMDBProvider(api_key="c").retry_strategy.rate_limiter is not first.retry_strategy.rate_limiter
+        assert get_provider_rate_limiter("TMDB").max_rate > get_provider_rate_limiter("OMDB").max_rate
+
+    def test_stats_per_provider(self):
+        """Test that wait statistics are reported for each provider used."""
+        get_provider_rate_limiter("TMDB").acquire()
+        stats = get_provider_throttle_stats()
+        assert list(stats) == ["TMDB"]
+        assert stats["TMDB"]["requests"] == 1
+
+        reset_api_throttle()
+        assert get_provider_throttle_stats() == {}
+
+    def test_429_pauses_all_workers(self):
+        """Test that a 429 seen by one request slows down the shared limiter instead of one thread."""
+        import requests
+        from plugin_video_mubi.resources.lib.external_metadata import ExternalMetadataResult, RetryStrategy
+
+        limiter = get_provider_rate_limiter("TMDB")
+        strategy = RetryStrategy(max_retries=3, rate_limiter=limiter)
+        calls = []
+
+        response = _real_response(429, {"Retry-After": "3"})
+        assert not response  # A real 4xx response is falsy
+
+        def request():
+            calls.append(1)
+            if len(calls) == 1:
+                error = requests.exceptions.HTTPError()
+                error.response = response
+                raise error
+            return ExternalMetadataResult(imdb_id="tt1", success=True)
+
+        with patch('time.sleep') as mock_sleep:
+            result = strategy.execute(request, "Film")
+
+        assert result.success
+        # One wait, in the shared limiter (not the per-thread Retry-After + 1 backoff)
+        mock_sleep.assert_called_once()
+        assert 2.9 <= mock_sleep.call_args.args[0] <= 3.1
+        stats = limiter.get_stats()
+        assert stats["rate_limited"] == 1
+        assert stats["current_rate"] < stats["max_rate"]
+        # The retry waited for the server's pause in the shared limiter
+        assert stats["requests"] == 2 and stats["total_wait"] >= 2.9
@@ -0,0 +1,96 @@
+"""
+Test suite for the resumable sync journal.
+"""
+
+from plugin_video_mubi.resources.lib.sync_journal import SyncJournal
+
+KEY = {'source': 'MubiApiDataSource', 'countries': ['FR', 'US'], 'playable_only': True}
+
+
+def _journal(tmp_path, key=KEY, now=1000.0):
+    return SyncJournal(tmp_path / SyncJournal.FILE_NAME, key, now=now)
+
+
+def test_pages_and_films_survive_reopening(tmp_path):
+    journal = _journal(tmp_path)
+    assert not journal.resumed
+    journal.record_page('US', 1, {'films': [{'id': 1}], 'meta': {'next_page': 2}})
+    journal.record_written(1, 'abc', 'Film (2020)')
+    journal.close()
+
+    journal = _journal(tmp_path, now=2000.0)
+    assert journal.resumed
+    assert journal.get_page('US', 1) == {'films': [{'id': 1}], 'meta': {'next_page': 2}}
+    assert journal.get_page('US', 2) is None
+    assert journal.get_page('FR', 1) is None
+    assert journal.written_folder('1', 'abc') == 'Film (2020)'
+    assert journal.written_folder('1', 'changed') is None
+    journal.close()
+
+
+def test_other_or_stale_sync_starts_over(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_page('US', 1, {'films': []})
+    journal.close()
+
+    other = _journal(tmp_path, key=dict(KEY, countries=['US']))
+    assert not other.resumed
+    assert other.get_page('US', 1) is None
+    other.record_page('US', 1, {'films': []})
+    other.close()
+
+    stale = _journal(tmp_path, key=dict(KEY, countries=['US']), now=1000.0 + SyncJournal.MAX_AGE + 1)
+    assert not stale.resumed
+    assert stale.page_count() == 0
+    stale.close()
+
+
+def test_finish_removes_journal(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_written('1', 'abc', 'Film (2020)')
+    journal.finish()
+    assert not journal.path.exists()
+    # Closed: checkpoints become no-ops
+    journal.record_page('US', 1, {'films': []})
+    assert journal.get_page('US', 1) is None
+
+
+def test_journal_commits_without_fsync_per_entry(tmp_path):
+    journal = _journal(tmp_path)
+    assert journal._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert journal._conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    journal.record_written('1', 'abc', 'Film (2020)')
+    journal.finish()
+    assert list(tmp_path.glob(f"{SyncJournal.FILE_NAME}*")) == []
+
+
+def test_corrupt_file_is_replaced(tmp_path):
+    (tmp_path / SyncJournal.FILE_NAME).write_bytes(b'not a database' * 100)
+    journal = _journal(tmp_path)
+    assert not journal.resumed
+    journal.record_page('US', 1, {'films': []})
+    assert journal.get_page('US', 1) == {'films': []}
+    journal.close()
+
+
+def test_changed_catalogue_discards_country_pages(tmp_path):
+    journal = _journal(tmp_path)
+    first = {'films': [{'id': 1}], 'meta': {'total_count': 2}}
+    assert journal.check_catalogue('US', SyncJournal.catalogue_fingerprint(first))  # Recorded for later runs
+    journal.record_page('US', 2, {'films': [{'id': 2}]})
+    journal.record_page('FR', 2, {'films': [{'id': 2}]})
+
+    assert journal.check_catalogue('US', SyncJournal.catalogue_fingerprint(first))
+    assert journal.get_page('US', 2) is not None
+
+    changed = {'films': [{'id': 0}], 'meta': {'total_count': 3}}
+    assert not journal.check_catalogue('US', SyncJournal.catalogue_fingerprint(changed))
+    assert journal.get_page('US', 2) is None
+    assert journal.get_page('FR', 2) is not None  # Other countries are checked separately
+    journal.close()
+
+
+def test_make_key_ignores_country_order_and_case():
+    source = object()
+    assert SyncJournal.make_key(source, ['us', 'FR'], True) == SyncJournal.make_key(source, ['FR', 'US'], 1)
+    assert SyncJournal.make_key(source, None, False)['countries'] is None
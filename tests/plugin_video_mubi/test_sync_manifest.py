@@ -0,0 +1,67 @@
+"""
+Test suite for the sync manifest of written film folders.
+"""
+
+import json
+
+from plugin_video_mubi.resources.lib.sync_manifest import SyncManifest
+
+
+def _library(tmp_path, *folders):
+    library_path = tmp_path / "library"
+    library_path.mkdir()
+    (library_path / ".cache").mkdir()
+    for folder in folders:
+        (library_path / folder).mkdir()
+        (library_path / folder / f"{folder}.nfo").write_text("<movie/>")
+    return library_path
+
+
+def test_save_and_load_round_trip(tmp_path):
+    library_path = _library(tmp_path, "A (2020)")
+    manifest = SyncManifest(tmp_path / SyncManifest.FILE_NAME, library_path)
+    manifest.record("A (2020)", 1, "abc")
+    assert manifest.folders["A (2020)"] == {'mubi_id': '1', 'fingerprint': 'abc', 'files': ['A (2020).nfo']}
+    assert manifest.save()
+
+    loaded = SyncManifest.load(tmp_path / SyncManifest.FILE_NAME, library_path)
+    assert loaded.is_current("A (2020)", "1", "abc")
+    assert not loaded.is_current("A (2020)", "1", "changed")
+    assert not loaded.is_current("A (2020)", "2", "abc")
+
+    # A manifest of another library directory is not used
+    assert SyncManifest.load(tmp_path / SyncManifest.FILE_NAME, tmp_path).folders == {}
+
+
+def test_corrupt_or_outdated_manifest_is_empty(tmp_path):
+    path = tmp_path / SyncManifest.FILE_NAME
+    path.write_text("{not json")
+    assert SyncManifest.load(path, tmp_path).folders == {}
+    path.write_text(json.dumps({'version': 0, 'library_path': str(tmp_path), 'folders': {'A': {}}}))
+    assert SyncManifest.load(path, tmp_path).folders == {}
+
+
+def test_reconcile_drops_deleted_and_finds_unknown_folders(tmp_path):
+    library_path = _library(tmp_path, "Known (2020)", "Unknown (2019)")
+    manifest = SyncManifest(tmp_path / SyncManifest.FILE_NAME, library_path, folders={
+        "Known (2020)": {'mubi_id': '1', 'fingerprint': 'a', 'files': []},
+        "Deleted (2018)": {'mubi_id': '2', 'fingerprint': 'b', 'files': []},
+    })
+    assert manifest.reconcile() == {"Unknown (2019)"}
+    assert set(manifest.folders) == {"Known (2020)"}
+    assert manifest.obsolete_folders(["Known (2020)"]) == ["Unknown (2019)"]
+
+
+def test_remove_folder_deletes_recorded_files(tmp_path):
+    library_path = _library(tmp_path, "A (2020)", "B (2021)", "C (2022)")
+    manifest = SyncManifest(tmp_path / SyncManifest.FILE_NAME, library_path)
+    manifest.record("A (2020)", 1, "a")
+    manifest.record("B (2021)", 2, "b")
+    (library_path / "B (2021)" / "extra.jpg").write_bytes(b"user file")
+    manifest.reconcile()
+
+    assert manifest.remove_folder("A (2020)")
+    assert manifest.remove_folder("B (2021)")  # Not only recorded files: rmtree
+    assert manifest.remove_folder("C (2022)")  # Unknown folder: rmtree
+    assert [p.name for p in library_path.iterdir()] == [".cache"]
+    assert manifest.folders == {} and manifest.unknown == set()
@@ -0,0 +1,171 @@
+"""
+Test suite for the delta sync snapshot.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from plugin_video_mubi.resources.lib.sync_snapshot import SyncSnapshot, SyncDelta
+
+
+def _iso(dt):
+    return dt.isoformat().replace('+00:00', 'Z')
+
+
+NOW = datetime.now(timezone.utc)
+PAST = _iso(NOW - timedelta(days=365))
+FUTURE = _iso(NOW + timedelta(days=365))
+
+
+def _film(film_id, title="Film", ends_at=FUTURE, **extra):
+    film = {
+        'id': film_id,
+        'title': title,
+        'year': 2020,
+        'available_countries': {
+            'US': {'available_at': PAST, 'availability_ends_at': ends_at, 'availability': 'live'}
+        },
+    }
+    film.update(extra)
+    return film
+
+
+def _synced_snapshot(tmp_path, films):
+    """Snapshot after a successful sync of `films` into tmp_path/profile."""
+    profile = tmp_path / "profile"
+    profile.mkdir(exist_ok=True)
+    snapshot = SyncSnapshot(tmp_path / SyncSnapshot.FILE_NAME)
+    snapshot.compute_delta(films, profile)
+    folders = {}
+    for film in films:
+        folder = f"{film['title']} ({film['year']})"
+        (profile / folder).mkdir(exist_ok=True)
+        folders[str(film['id'])] = folder
+    assert snapshot.commit(folders)
+    return SyncSnapshot.load(snapshot.path), profile
+
+
+def test_load_missing_file_returns_empty_snapshot(tmp_path):
+    snapshot = SyncSnapshot.load(tmp_path / "missing.json")
+    assert snapshot.is_empty()
+
+
+def test_load_corrupt_or_outdated_file_returns_empty_snapshot(tmp_path):
+    path = tmp_path / SyncSnapshot.FILE_NAME
+    path.write_text("{not json")
+    assert SyncSnapshot.load(path).is_empty()
+
+    path.write_text(json.dumps({'version': 0, 'films': {'1': {}}}))
+    assert SyncSnapshot.load(path).is_empty()
+
+
+def test_first_sync_is_full_sync(tmp_path):
+    snapshot = SyncSnapshot(tmp_path / SyncSnapshot.FILE_NAME)
+    delta = snapshot.compute_delta([_film(1), _film(2)])
+
+    assert delta.full_sync
+    assert delta.added == {'1', '2'}
+    assert delta.to_sync == {'1', '2'}
+
+
+def test_commit_round_trip(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A"), _film(2, "B")])
+
+    assert set(snapshot.films) == {'1', '2'}
+    assert snapshot.films['1']['folder'] == "A (2020)"
+    assert snapshot.synced_at is not None
+
+
+def test_delta_detects_added_changed_removed_and_unchanged(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A"), _film(2, "B"), _film(3, "C")])
+
+    delta = snapshot.compute_delta([
+        _film(1, "A"),                       # unchanged
+        _film(2, "B", average_rating=8.1),   # metadata changed
+        _film(4, "D"),                       # new
+    ], profile)
+
+    assert not delta.full_sync
+    assert delta.unchanged == {'1'}
+    assert delta.changed == {'2'}
+    assert delta.added == {'4'}
+    assert delta.removed == {'3'}
+    assert snapshot.retained_folders() == {"A (2020)"}
+
+
+def test_availability_change_marks_film_changed(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A")])
+
+    later = _iso(NOW + timedelta(days=400))
+    delta = snapshot.compute_delta([_film(1, "A", ends_at=later)], profile)
+
+    assert delta.changed == {'1'}
+
+
+def test_passed_window_boundary_marks_film_changed(tmp_path):
+    soon = _iso(NOW + timedelta(hours=1))
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A", ends_at=soon)])
+
+    delta = snapshot.compute_delta([_film(1, "A", ends_at=soon)], profile,
+                                   now=time.time() + 2 * 3600)
+
+    assert delta.changed == {'1'}
+
+
+def test_missing_folder_is_synced_again(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A")])
+    (profile / "A (2020)").rmdir()
+
+    delta = snapshot.compute_delta([_film(1, "A")], profile)
+
+    assert delta.added == {'1'}
+    assert snapshot.retained_folders() == set()
+
+
+def test_commit_drops_films_that_failed_to_sync(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A")])
+
+    snapshot.compute_delta([_film(1, "A"), _film(2, "B")], profile)
+    snapshot.commit({})  # Film 2 failed
+
+    reloaded = SyncSnapshot.load(snapshot.path)
+    assert set(reloaded.films) == {'1'}
+
+
+def test_commit_without_delta_does_nothing(tmp_path):
+    snapshot = SyncSnapshot(tmp_path / SyncSnapshot.FILE_NAME)
+    assert snapshot.commit({'1': 'A (2020)'}) is False
+    assert not snapshot.path.exists()
+
+
+def test_clear_removes_snapshot(tmp_path):
+    snapshot, _ = _synced_snapshot(tmp_path, [_film(1, "A")])
+    snapshot.clear()
+
+    assert snapshot.is_empty()
+    assert not snapshot.path.exists()
+
+
+def test_sync_delta_repr_counts():
+    delta = SyncDelta(added={'1'}, changed={'2', '3'})
+    assert "added=1" in repr(delta)
+    assert "changed=2" in repr(delta)
+
+
+def test_staging_films_one_by_one_matches_compute_delta(tmp_path):
+    snapshot, profile = _synced_snapshot(tmp_path, [_film(1, "A"), _film(2, "B"), _film(3, "C")])
+
+    delta = snapshot.begin_delta(profile)
+    assert snapshot.stage_film(_film(1, "A")) == 'unchanged'
+    assert snapshot.stage_film(_film(2, "B2")) == 'changed'
+    assert snapshot.stage_film(_film(4, "D")) == 'added'
+    assert snapshot.stage_film({'title': 'No id'}) is None
+    assert delta.removed == set()  # Only known once every film was staged
+    assert snapshot.finish_delta() is delta
+    assert delta.removed == {'3'}
+
+    expected = SyncSnapshot.load(snapshot.path).compute_delta(
+        [_film(1, "A"), _film(2, "B2"), _film(4, "D")], profile)
+    assert repr(expected) == repr(delta)
+    assert snapshot.retained_folders() == {"A (2020)"}
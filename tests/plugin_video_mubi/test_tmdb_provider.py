@@ -25,7 +25,7 @@ class TestTMDBProvider:
         assert provider.provider_name == "TMDB"
         assert provider.BASE_URL == "https://api.themoviedb.org/3"
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_search_movie_success(self, mock_get):
         """Test successful movie search."""
         # Arrange
@@ -57,7 +57,7 @@ class TestTMDBProvider:
             timeout=10
         )
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_search_movie_no_results(self, mock_get):
         """Test movie search returns None when no results."""
         # Arrange
@@ -74,7 +74,7 @@ class TestTMDBProvider:
         # Assert
         assert tmdb_id is None
         
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_search_movie_fuzzy_year(self, mock_get):
         """Test fuzzy year matching."""
         # Arrange
@@ -99,7 +99,7 @@ class TestTMDBProvider:
         # Assert
         assert tmdb_id == 102
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_search_movie_fuzzy_year_extended_tolerance(self, mock_get):
         """Test fuzzy year matching with increased tolerance (±2 years)."""
         # Arrange
@@ -124,7 +124,7 @@ class TestTMDBProvider:
         args, kwargs = mock_get.call_args
         assert "year" not in kwargs['params']
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_get_movie_details_success(self, mock_get):
         """Test fetching movie details including IMDB ID."""
         # Arrange
@@ -150,7 +150,7 @@ class TestTMDBProvider:
         assert result.imdb_url == "https://www.imdb.com/title/tt9876543/"
         assert result.source_provider == "TMDB"
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_get_imdb_id_integration(self, mock_get):
         """Test full flow of get_imdb_id."""
         # Arrange
@@ -181,7 +181,7 @@ class TestTMDBProvider:
         assert result.tmdb_id == "100"
         assert result.imdb_id == "tt100"
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_get_imdb_id_fallback_original_title(self, mock_get):
         """Test fallback to original title if primary title search fails."""
         # Arrange
@@ -221,7 +221,7 @@ class TestTMDBProvider:
         # Search calls: English Strict, English Fuzzy, Original Strict
         assert mock_get.call_count == 4
 
-    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.requests.get')
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
     def test_get_imdb_id_fallback_fuzzy_year(self, mock_get):
         """Test fallback to fuzzy year search if strict search fails."""
         # Arrange
@@ -267,3 +267,22 @@ class TestTMDBProvider:
         # Call 2: Fuzzy
         args2, kwargs2 = mock_get.call_args_list[1]
         assert "year" not in kwargs2['params']
+
+    @patch('plugin_video_mubi.resources.lib.external_metadata.tmdb_provider.TMDBProvider._get')
+    def test_get_imdb_id_marks_definitive_miss(self, mock_get):
+        """Test a miss is only definitive when every search was answered."""
+        # Arrange
+        empty = Mock()
+        empty.json.return_value = {"results": []}
+        mock_get.side_effect = [empty, ConnectionError("timeout")] + [empty] * 20
+
+        # Act
+        partial = TMDBProvider("test_key").get_imdb_id("Movie", year=2023)
+        mock_get.side_effect = None
+        mock_get.return_value = empty
+        definitive = TMDBProvider("test_key").get_imdb_id("Movie", year=2023)
+
+        # Assert
+        assert (partial.success, partial.not_found) == (False, False)
+        assert "timeout" in partial.error_message
+        assert (definitive.not_found, definitive.error_message) == (True, "No match found")